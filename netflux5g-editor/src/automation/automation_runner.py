@@ -1,17 +1,25 @@
 import os
+import shutil
 import subprocess
+import tempfile
 import threading
 import time
+import shlex
 import signal
 import yaml
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer, pyqtSlot, Qt
 from PyQt5.QtWidgets import QMessageBox, QProgressDialog, QApplication
 from export.mininet_export import MininetExporter
 from manager.controller import ControllerManager
+from automation.export_cache import SCRIPT_NAME, captures_dir
 from utils.debug import debug_print, error_print, warning_print
 from prerequisites.checker import PrerequisitesChecker
 from utils.docker_utils import DockerUtils
 
+# Per-run outputs (logs, mininet.log, traffic results); exports themselves may be shared cache entries
+RUNS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export', 'runs')
+MAX_RUN_DIRS = 20
+
 class AutomationRunner(QObject):
     """Handler for running automated deployment of Mininet scripts."""
 
@@ -29,9 +37,21 @@ class AutomationRunner(QObject):
         # Process tracking
         self.docker_process = None
         self.mininet_process = None
+        self.mininet_supervisor = None
+        # Run > Supervise Mininet Headless: stream progress events instead of opening the CLI in a terminal
+        self.supervised = False
+        self.ready_timeout = 600
         self.is_running = False
         self.export_dir = None
+        self.run_dir = None
         self.mininet_script_path = None
+        self.export_cache = None
+        self.last_export_cache_hit = False
+        self.last_teardown_results = {}
+        self.last_traffic_report = None
+        self.stage_timings = {}
+        self._stage_clock = time.monotonic()
+        self.traffic_thread = None
         
         # Connect signals - ensure they're connected on the main thread
         if hasattr(self.main_window, 'status_manager'):
@@ -48,32 +68,95 @@ class AutomationRunner(QObject):
             self.progress_dialog.close()
             self.progress_dialog = None
     
-    def _create_working_directory(self):
-        """Create a working directory for the deployment."""
-        from datetime import datetime
-        
-        # Create a timestamped directory in the mininet folder with proper numbering
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Get the base directory (where the main script is located)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def prepare_export(self, nodes, links):
+        """
+        Make an export directory ready for the topology, reusing a cached export when nothing changed.
 
-        # Create mininet directory if it doesn't exist
-        mininet_dir = os.path.join(base_dir, "export","mininet")
-        os.makedirs(mininet_dir, exist_ok=True)
-        
-        # Create timestamped export directory
-        export_dir = os.path.join(mininet_dir, f"netflux5g_export_{timestamp}")
-        os.makedirs(export_dir, exist_ok=True)
-        
-        debug_print(f"Created working directory: {export_dir}")
-        return export_dir
-    
-    def _generate_mininet_script(self):
-        """Generate Mininet script."""
-        script_name = "netflux5g_topology.py"
-        self.mininet_script_path = os.path.join(self.export_dir, script_name)
-        self.mininet_exporter.export_to_mininet_script(self.mininet_script_path)
+        Exports live in the ExportCache keyed by a canonical hash of the topology,
+        the referenced config files and the exporter. A miss builds the script,
+        5g-configs and run_mininet.sh in a fresh directory and publishes it.
+
+        Returns:
+            bool: True if a cached export was reused
+        """
+        from automation.export_cache import ExportCache, topology_key
+
+        if self.export_cache is None:
+            self.export_cache = ExportCache()
+        key = topology_key(nodes, links, self.mininet_exporter.compact_mode)
+        cached_dir = self.export_cache.lookup(key)
+        if cached_dir:
+            self.export_dir = cached_dir
+            self.mininet_script_path = os.path.join(cached_dir, SCRIPT_NAME)
+            debug_print(f"Reusing cached export: {cached_dir}")
+            self.status_updated.emit("Topology unchanged, reusing cached export")
+            self._mark_stage('export_cache_hit')
+            return True
+
+        # Step 1: Create working directory
+        self.status_updated.emit("Creating working directory...")
+        self.progress_updated.emit(20)
+        build_dir = self.export_cache.begin(key)
+        self.export_dir = build_dir
+        debug_print(f"Created working directory: {build_dir}")
+        self._mark_stage('create_directory')
+        try:
+            # Step 2: Copy 5G configuration files (if any VGCore components exist)
+            self.status_updated.emit("Copying 5G configuration files...")
+            self.progress_updated.emit(30)
+            try:
+                copied_count, missing_count = self._copy_5g_configs(nodes)
+                if copied_count > 0:
+                    self.status_updated.emit(f"Synced {copied_count} 5G configuration files")
+                if missing_count > 0:
+                    warning_print(f"WARNING: {missing_count} configuration files could not be copied")
+            except Exception as e:
+                # For simple topology run, only warn about missing configs, don't fail
+                warning_print(f"WARNING: 5G config copy failed: {e}")
+                self.status_updated.emit("Warning: Some 5G configurations may be missing")
+            self._mark_stage('copy_configs')
+
+            # Step 3: Generate Mininet script
+            self.status_updated.emit("Generating Mininet script...")
+            self.progress_updated.emit(60)
+            self._generate_mininet_script((nodes, links))
+            self._write_run_script()
+            self._mark_stage('generate_script')
+
+            self.export_dir = self.export_cache.commit(key, build_dir, {
+                'nodes': len(nodes),
+                'links': len(links),
+                'topology_file': getattr(self.main_window, 'current_file', None)
+            })
+        except Exception:
+            self.export_cache.abort(build_dir)
+            raise
+        self.mininet_script_path = os.path.join(self.export_dir, SCRIPT_NAME)
+        return False
+
+    def _create_run_dir(self):
+        """
+        Fresh directory for this run's outputs, outside the export directory.
+
+        A cached export is reused by every run of the same topology, so logs and
+        results written next to it would mix runs. The oldest run directories
+        beyond MAX_RUN_DIRS are removed.
+        """
+        os.makedirs(RUNS_DIR, exist_ok=True)
+        runs = sorted(entry for entry in os.listdir(RUNS_DIR) if os.path.isdir(os.path.join(RUNS_DIR, entry)))
+        for entry in runs[:max(0, len(runs) - MAX_RUN_DIRS + 1)]:
+            # Container logs may be root-owned; whatever cannot be removed is left for the next prune
+            shutil.rmtree(os.path.join(RUNS_DIR, entry), ignore_errors=True)
+        run_dir = tempfile.mkdtemp(prefix=time.strftime('%Y%m%d-%H%M%S-'), dir=RUNS_DIR)
+        # Created here so the log bind mount is not created root-owned by Docker
+        os.makedirs(os.path.join(run_dir, "log"), exist_ok=True)
+        debug_print(f"Run directory: {run_dir}")
+        return run_dir
+
+    def _generate_mininet_script(self, topology=None):
+        """Generate Mininet script from the run's (nodes, links) snapshot."""
+        self.mininet_script_path = os.path.join(self.export_dir, SCRIPT_NAME)
+        self.mininet_exporter.export_to_mininet_script(self.mininet_script_path, topology=topology)
         
         # Verify the script was created
         if not os.path.exists(self.mininet_script_path):
@@ -109,169 +192,123 @@ class AutomationRunner(QObject):
                     debug_print(f"DEBUG: First item keys: {list(data[0].keys()) if isinstance(data[0], dict) else type(data[0])}")
         debug_print(f"DEBUG: === End Component '{component_name}' Debug ===")
     
-    def _copy_5g_configs(self):
-        """Copy 5G configuration files from VGCore components to export directory."""
-        import shutil
-        import os
-        
-        # Get nodes to check for VGCore components
-        nodes, _ = self.main_window.extractTopology()
+    def _copy_5g_configs(self, nodes=None):
+        """
+        Sync 5G configuration files from VGCore components into the export directory.
+
+        Configs go through the content-addressed ConfigCache: only configs whose
+        source file or embedded content changed are stored and written; unchanged
+        ones are left alone (or hard-linked into a new export directory).
+
+        Args:
+            nodes (list): Topology nodes already extracted for this run
+        """
+        from utils.config_cache import ConfigCache
+
+        if nodes is None:
+            nodes, _ = self.main_window.extractTopology()
         core5g_components = [n for n in nodes if n['type'] == 'VGcore']
         
         if not core5g_components:
             debug_print("DEBUG: No VGCore components found, skipping config copy")
-            return
+            return 0, 0
         
-        # Create 5g-configs directory
         configs_dir = os.path.join(self.export_dir, "5g-configs")
-        os.makedirs(configs_dir, exist_ok=True)
-        debug_print(f"DEBUG: Created 5g-configs directory: {configs_dir}")
-        
+        cache = ConfigCache()
+        entries = {}
+        sources = {}
         missing_configs = []
-        copied_configs = []
+        component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
         
         for component in core5g_components:
             component_name = component.get('name', 'Unknown')
             properties = component.get('properties', {})
             debug_print(f"DEBUG: Processing VGCore component '{component_name}' with {len(properties)} properties")
-            
-            # Debug component properties structure
             self._debug_component_properties(component)
             
-            # Check for 5G component configurations using the correct key format
-            component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
-            
             for comp_type in component_types:
                 # Use the correct key format: {comp_type}_configs
-                config_key = f'{comp_type}_configs'
+                config_data = properties.get(f'{comp_type}_configs')
+                if not isinstance(config_data, list):
+                    continue
                 
-                if config_key in properties:
-                    config_data = properties[config_key]
-                    debug_print(f"DEBUG: Found {config_key} with {len(config_data) if isinstance(config_data, list) else 'non-list'} items")
+                for i, config_item in enumerate(config_data):
+                    if not isinstance(config_item, dict):
+                        continue
                     
-                    if isinstance(config_data, list):
-                        for i, config_item in enumerate(config_data):
-                            if not isinstance(config_item, dict):
-                                continue
-                                
-                            # Get the configuration name
-                            config_name = config_item.get('name', f"{comp_type.lower()}{i + 1}")
-                            
-                            # Try to get the config file path from multiple possible sources
-                            config_file_path = None
-                            config_content = None
-                            
-                            # Method 1: Direct file path stored in config_file_path
-                            if 'config_file_path' in config_item and config_item['config_file_path']:
-                                config_file_path = config_item['config_file_path']
-                                debug_print(f"DEBUG: Found config_file_path: {config_file_path}")
-                            
-                            # Method 2: Path stored in config_path column
-                            elif 'config_path' in config_item and config_item['config_path']:
-                                config_file_path = config_item['config_path']
-                                debug_print(f"DEBUG: Found config_path: {config_file_path}")
-                            
-                            # Method 3: Check if config content is embedded
-                            if 'config_content' in config_item and config_item['config_content']:
-                                config_content = config_item['config_content']
-                                debug_print(f"DEBUG: Found embedded config content for {config_name}")
-                            
-                            # Process the configuration
-                            if config_file_path and os.path.isfile(config_file_path):
-                                # Copy the actual file with simplified naming
-                                try:
-                                    # Use simplified naming: {comp_type.lower()}.yaml or {comp_type.lower()}_{index}.yaml
-                                    if i == 0:  # First instance gets simple name
-                                        dest_filename = f"{comp_type.lower()}.yaml"
-                                    else:  # Additional instances get numbered
-                                        dest_filename = f"{comp_type.lower()}_{i+1}.yaml"
-                                    
-                                    dest_path = os.path.join(configs_dir, dest_filename)
-                                    shutil.copy2(config_file_path, dest_path)
-                                    copied_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'source': config_file_path,
-                                        'destination': dest_path,
-                                        'filename': dest_filename
-                                    })
-                                    debug_print(f"DEBUG: Copied {config_file_path} to {dest_path}")
-                                except Exception as e:
-                                    error_msg = f"Failed to copy {config_file_path}: {str(e)}"
-                                    debug_print(f"DEBUG: {error_msg}")
-                                    missing_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'path': config_file_path,
-                                        'error': error_msg
-                                    })
-                            
-                            elif config_content:
-                                # Save embedded content to file with simplified naming
-                                try:
-                                    # Use simplified naming: {comp_type.lower()}.yaml or {comp_type.lower()}_{index}.yaml
-                                    if i == 0:  # First instance gets simple name
-                                        dest_filename = f"{comp_type.lower()}.yaml"
-                                    else:  # Additional instances get numbered
-                                        dest_filename = f"{comp_type.lower()}_{i+1}.yaml"
-                                    
-                                    dest_path = os.path.join(configs_dir, dest_filename)
-                                    
-                                    # Save the content to file
-                                    if isinstance(config_content, str):
-                                        with open(dest_path, 'w', encoding='utf-8') as f:
-                                            f.write(config_content)
-                                    else:
-                                        # Assume it's structured data that needs YAML formatting
-                                        import yaml
-                                        with open(dest_path, 'w', encoding='utf-8') as f:
-                                            yaml.dump(config_content, f, default_flow_style=False)
-                                    
-                                    copied_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'source': 'embedded_content',
-                                        'destination': dest_path,
-                                        'filename': dest_filename
-                                    })
-                                    debug_print(f"DEBUG: Saved embedded config content to {dest_path}")
-                                except Exception as e:
-                                    error_msg = f"Failed to save embedded config for {config_name}: {str(e)}"
-                                    debug_print(f"DEBUG: {error_msg}")
-                                    missing_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'path': 'embedded_content',
-                                        'error': error_msg
-                                    })
-                            
-                            else:
-                                # No configuration found
-                                missing_configs.append({
-                                    'component': comp_type,
-                                    'name': config_name,
-                                    'path': 'not_specified',
-                                    'error': 'No configuration file path or content specified'
-                                })
-                                debug_print(f"DEBUG: No config found for {comp_type} component '{config_name}'")
-                else:
-                    debug_print(f"DEBUG: Key {config_key} not found in properties")
+                    config_name = config_item.get('name', f"{comp_type.lower()}{i + 1}")
+                    config_file_path = config_item.get('config_file_path') or config_item.get('config_path')
+                    config_content = config_item.get('config_content')
+                    # Simplified naming: {comp_type.lower()}.yaml or {comp_type.lower()}_{index}.yaml
+                    dest_filename = f"{comp_type.lower()}.yaml" if i == 0 else f"{comp_type.lower()}_{i+1}.yaml"
+                    
+                    try:
+                        if config_file_path and os.path.isfile(config_file_path):
+                            entries[dest_filename] = cache.add_file(config_file_path)
+                            sources[dest_filename] = (comp_type, config_name, config_file_path)
+                        elif config_content:
+                            entries[dest_filename] = cache.add_content(config_content)
+                            sources[dest_filename] = (comp_type, config_name, 'embedded_content')
+                        else:
+                            missing_configs.append({
+                                'component': comp_type,
+                                'name': config_name,
+                                'path': 'not_specified',
+                                'error': 'No configuration file path or content specified'
+                            })
+                            debug_print(f"DEBUG: No config found for {comp_type} component '{config_name}'")
+                    except Exception as e:
+                        error_msg = f"Failed to cache config for {config_name}: {str(e)}"
+                        debug_print(f"DEBUG: {error_msg}")
+                        missing_configs.append({
+                            'component': comp_type,
+                            'name': config_name,
+                            'path': config_file_path or 'embedded_content',
+                            'error': error_msg
+                        })
+        
+        results = cache.sync(entries, configs_dir)
         
         # Report results
-        if copied_configs:
-            debug_print(f"DEBUG: Successfully copied {len(copied_configs)} configuration files:")
-            for config in copied_configs:
-                debug_print(f"  - {config['component']} '{config['name']}': {config['source']} -> {config['filename']}")
+        written = [name for name, status in results.items() if status != 'unchanged']
+        debug_print(f"DEBUG: {len(results)} configuration files in {configs_dir}, "
+                    f"{len(written)} written, {len(results) - len(written)} unchanged")
+        for filename in written:
+            comp_type, config_name, source = sources[filename]
+            debug_print(f"  - {comp_type} '{config_name}': {source} -> {filename} ({results[filename]})")
         
         if missing_configs:
             debug_print(f"DEBUG: {len(missing_configs)} configuration files could not be copied:")
             for config in missing_configs:
                 debug_print(f"  - {config['component']} '{config['name']}': {config['error']}")
         
-        return len(copied_configs), len(missing_configs)
+        return len(results), len(missing_configs)
+
+    def _write_run_script(self):
+        """
+        Write run_mininet.sh next to the script; it resolves its own directory so cached
+        exports stay relocatable, and takes the run and captures directories as arguments.
+        """
+        terminal_script = os.path.join(self.export_dir, "run_mininet.sh")
+        with open(terminal_script, 'w') as f:
+            f.write(f"""#!/bin/bash
+EXPORT_DIR="$(cd "$(dirname "${{BASH_SOURCE[0]}}")" && pwd)"
+# Logs go to the run directory given as the first argument (default: the export directory)
+RUN_DIR="${{1:-$EXPORT_DIR}}"
+# Captures go to the second argument (default: the captures folder of the run directory)
+CAPTURES_DIR="${{2:-$RUN_DIR/captures}}"
+echo "Starting Mininet topology..."
+echo "Working directory: $RUN_DIR"
+cd "$RUN_DIR"
+sudo env NETFLUX5G_RUN_DIR="$RUN_DIR" NETFLUX5G_CAPTURES_DIR="$CAPTURES_DIR" python3 "$EXPORT_DIR/{SCRIPT_NAME}"
+echo "Mininet session ended. Press Enter to close..."
+read
+""")
+        os.chmod(terminal_script, 0o755)
+        return terminal_script
 
     def _start_mininet(self):
-        """Start Mininet in a new terminal."""
+        """Start Mininet as a supervised child process, or in a new terminal when not supervised."""
         if not self.mininet_script_path:
             raise Exception("Mininet script path not set")
         
@@ -280,29 +317,33 @@ class AutomationRunner(QObject):
             subprocess.run(["sudo", "mn", "--version"], capture_output=True, check=True)
         except (subprocess.CalledProcessError, FileNotFoundError):
             raise Exception("Mininet is not installed or not accessible")
+
+        if self.supervised:
+            from automation.mininet_supervisor import MininetSupervisor
+            self.mininet_supervisor = MininetSupervisor(self.mininet_script_path, self.export_dir,
+                                                        event_callback=self._on_mininet_event,
+                                                        run_dir=self.run_dir)
+            try:
+                self.mininet_process = self.mininet_supervisor.start()
+            except Exception as e:
+                raise Exception(f"Failed to start Mininet: {str(e)}")
+            return
         
-        # Create a script to run Mininet in a new terminal
+        # Script to run Mininet in a new terminal (part of the cached export)
         terminal_script = os.path.join(self.export_dir, "run_mininet.sh")
-        with open(terminal_script, 'w') as f:
-            f.write(f"""#!/bin/bash
-echo "Starting Mininet topology..."
-echo "Working directory: {self.export_dir}"
-cd "{self.export_dir}"
-sudo python3 "{self.mininet_script_path}"
-echo "Mininet session ended. Press Enter to close..."
-read
-""")
-        
-        os.chmod(terminal_script, 0o755)
+        if not os.path.exists(terminal_script):
+            self._write_run_script()
         
         # Launch in a new terminal window
         try:
             # Try different terminal emulators
+            captures = captures_dir()
+            shell_command = f"bash {shlex.quote(terminal_script)} {shlex.quote(self.run_dir)} {shlex.quote(captures)}"
             terminal_commands = [
-                ["gnome-terminal", "--", "bash", terminal_script],
-                ["xterm", "-e", f"bash {terminal_script}"],
-                ["konsole", "-e", f"bash {terminal_script}"],
-                ["lxterminal", "-e", f"bash {terminal_script}"]
+                ["gnome-terminal", "--", "bash", terminal_script, self.run_dir, captures],
+                ["xterm", "-e", shell_command],
+                ["konsole", "-e", shell_command],
+                ["lxterminal", "-e", shell_command]
             ]
             
             launched = False
@@ -317,10 +358,10 @@ read
             
             if not launched:
                 # Fallback: run in background and log to file
-                log_file = os.path.join(self.export_dir, "mininet.log")
+                log_file = os.path.join(self.run_dir, "mininet.log")
                 self.mininet_process = subprocess.Popen(
-                    ["sudo", "python3", self.mininet_script_path],
-                    cwd=self.export_dir,
+                    ["sudo", "env", f"NETFLUX5G_RUN_DIR={self.run_dir}", "python3", self.mininet_script_path],
+                    cwd=self.run_dir,
                     stdout=open(log_file, 'w'),
                     stderr=subprocess.STDOUT
                 )
@@ -329,8 +370,37 @@ read
         except Exception as e:
             raise Exception(f"Failed to start Mininet: {str(e)}")
     
+    def _wait_for_mininet_ready(self):
+        """Block until the supervised topology is ready; raise if Mininet exits first."""
+        supervisor = self.mininet_supervisor
+        if supervisor.wait_ready(self.ready_timeout):
+            self.stage_timings.update({f"mininet_{name}": value for name, value in supervisor.timings.items()
+                                       if value is not None})
+            return
+        if supervisor.exited_event.is_set():
+            last_lines = "\n".join(supervisor.tail[-5:])
+            raise Exception(f"Mininet exited with code {supervisor.returncode} before the topology was ready"
+                            f"{': ' + last_lines if last_lines else ''}")
+        warning_print(f"WARNING: Topology not ready after {self.ready_timeout}s, leaving Mininet running")
+        self.status_updated.emit("Mininet is still starting, see mininet.log for details")
+
+    def _on_mininet_event(self, event):
+        """Forward a supervised Mininet progress event to the status bar and progress dialog."""
+        from automation.mininet_supervisor import describe_event
+        count = event.get('count', 0)
+        # Large topologies: report the first, every tenth and the last node/UE, but keep the progress bar moving
+        if count <= 1 or count == event.get('total') or count % 10 == 0:
+            self.status_updated.emit(describe_event(event))
+        if self.is_running:
+            # Export stages use 0-65%, the Mininet startup the rest
+            self.progress_updated.emit(65 + event.get('progress', 0) * 35 // 100)
+        if event['event'] == 'exited':
+            self.mininet_process = None
+
     def is_deployment_running(self):
         """Check if deployment is currently running."""
+        if self.mininet_supervisor is not None and self.mininet_supervisor.is_alive():
+            return True
         return self.is_running
     
     def get_deployment_info(self):
@@ -340,22 +410,32 @@ read
             
         return {
             'export_dir': self.export_dir,
+            'run_dir': self.run_dir,
             'mininet_script': self.mininet_script_path,
-            'is_running': self.is_running
+            'is_running': self.is_deployment_running(),
+            'mininet_progress': self.mininet_supervisor.progress() if self.mininet_supervisor else None,
+            'mininet_log': self.mininet_supervisor.log_path if self.mininet_supervisor else None
         }
     
-    def run_topology_only(self):
-        """Run only the topology export and Mininet execution (actionRun)."""
+    def run_topology_only(self, nodes=None, links=None):
+        """
+        Run only the topology export and Mininet execution (actionRun).
+
+        Pass nodes and links when the caller already validated them; otherwise the
+        canvas topology is extracted and confirmed here. Returns True if the run started.
+        """
         if self.is_running:
             QMessageBox.warning(
                 self.main_window,
                 "Already Running",
                 "Automation is already running. Please stop it first."
             )
-            return
+            return False
         
         # Check if we have components to export
-        nodes, links = self.main_window.extractTopology()
+        confirmed = nodes is not None
+        if not confirmed:
+            nodes, links = self.main_window.extractTopology()
         
         if not nodes:
             QMessageBox.information(
@@ -363,7 +443,11 @@ read
                 "No Components",
                 "No network components found to export and run."
             )
-            return
+            return False
+
+        if (not confirmed and hasattr(self.main_window, 'validation_manager') and
+                not self.main_window.validation_manager.confirmTopology(nodes, links, "Run")):
+            return False
             
         # Show progress dialog
         self.progress_dialog = QProgressDialog(
@@ -381,44 +465,36 @@ read
         # Connect progress updates to dialog
         self.progress_updated.connect(self.progress_dialog.setValue, Qt.QueuedConnection)
         
-        # Start the simple automation in a separate thread
-        self.automation_thread = threading.Thread(target=self._run_topology_sequence)
+        # Start the simple automation in a separate thread; every stage shares this topology snapshot
+        self.automation_thread = threading.Thread(target=self._run_topology_sequence, args=(nodes, links))
         self.automation_thread.daemon = True
         self.automation_thread.start()
+        return True
         
-    def _run_topology_sequence(self):
+    def _run_topology_sequence(self, nodes=None, links=None):
         """Run the simple topology export and execution sequence."""
         try:
             self.is_running = True
+            if nodes is None:
+                nodes, links = self.main_window.extractTopology()
+            self.stage_timings = {}
+            self._stage_clock = time.monotonic()
             
-            # Step 1: Create working directory
-            self.status_updated.emit("Creating working directory...")
-            self.progress_updated.emit(20)
-            self.export_dir = self._create_working_directory()
+            # Steps 1-3: Working directory, 5G configs and Mininet script (skipped for an unchanged topology)
+            self.last_export_cache_hit = self.prepare_export(nodes, links)
+            self.run_dir = self._create_run_dir()
             
-            # Step 2: Copy 5G configuration files (if any VGCore components exist)
-            self.status_updated.emit("Copying 5G configuration files...")
-            self.progress_updated.emit(30)
-            try:
-                copied_count, missing_count = self._copy_5g_configs()
-                if copied_count > 0:
-                    self.status_updated.emit(f"Copied {copied_count} 5G configuration files")
-                if missing_count > 0:
-                    warning_print(f"WARNING: {missing_count} configuration files could not be copied")
-            except Exception as e:
-                # For simple topology run, only warn about missing configs, don't fail
-                warning_print(f"WARNING: 5G config copy failed: {e}")
-                self.status_updated.emit("Warning: Some 5G configurations may be missing")
-            
-            # Step 3: Generate Mininet script
-            self.status_updated.emit("Generating Mininet script...")
-            self.progress_updated.emit(60)
-            self._generate_mininet_script()
-            
-            # Step 4: Start Mininet
+            # Step 4: Start Mininet; supervised runs report progress until the topology is ready
             self.status_updated.emit("Starting Mininet network...")
-            self.progress_updated.emit(90)
+            self.progress_updated.emit(65)
             self._start_mininet()
+            if self.supervised:
+                self._wait_for_mininet_ready()
+            self._mark_stage('start_mininet')
+            
+            # Step 5: Point Prometheus at this topology's containers
+            self._update_monitoring_targets(nodes)
+            self._store_benchmark_run()
             
             self.progress_updated.emit(100)
             self.status_updated.emit("Topology exported and started successfully!")
@@ -434,72 +510,113 @@ read
             # Close progress dialog on main thread using signal
             self.close_progress_dialog.emit()
     
+    def run_traffic_test(self, profile='optimized', **overrides):
+        """Run an iperf3 load test across all UEs of the running topology in the background."""
+        if self.traffic_thread and self.traffic_thread.is_alive():
+            QMessageBox.warning(self.main_window, "Traffic Test Running", "A traffic test is already in progress.")
+            return
+        if not self.run_dir:
+            QMessageBox.information(self.main_window, "No Topology Running",
+                                    "Run the topology first, then start a traffic test.")
+            return
+        # The scene is only walked on the GUI thread; the test works from this snapshot
+        nodes, _ = self.main_window.extractTopology()
+        self.traffic_thread = threading.Thread(target=self._run_traffic_test, args=(nodes, profile), kwargs=overrides)
+        self.traffic_thread.daemon = True
+        self.traffic_thread.start()
+
+    def _run_traffic_test(self, nodes, profile, **overrides):
+        """Build the UE/APN/UPF plan from the extracted nodes and run the traffic engine."""
+        try:
+            from automation.traffic_engine import TrafficEngine, build_traffic_plan
+            plan = build_traffic_plan(self.mininet_exporter.categorize_nodes(nodes),
+                                      self.mininet_exporter.sanitize_variable_name)
+            if not plan['clients']:
+                self.status_updated.emit("Traffic test skipped: no UE is mapped to a UPF")
+                return
+            engine = TrafficEngine(plan, profile, results_dir=os.path.join(self.run_dir, "traffic-results"),
+                                   event_callback=self._on_traffic_event, **overrides)
+            self.last_traffic_report = engine.run()
+            self._store_benchmark_run(self.last_traffic_report)
+            summary = self.last_traffic_report['summary']
+            self.status_updated.emit(f"Traffic test finished: {summary['succeeded']}/{summary['runs']} runs, "
+                                     f"{summary['total_bps'] / 1e6:.1f} Mbit/s aggregate")
+        except Exception as e:
+            error_print(f"Traffic test failed: {e}")
+            self.status_updated.emit(f"Traffic test failed: {e}")
+
+    def _mark_stage(self, stage):
+        """Record the time spent since the previous stage mark."""
+        now = time.monotonic()
+        self.stage_timings[stage] = now - self._stage_clock
+        self._stage_clock = now
+
+    def _store_benchmark_run(self, report=None):
+        """
+        Record this deployment's startup timings in the benchmark store, with the
+        traffic report when given; without one the run is stored under the 'startup' profile.
+        """
+        try:
+            from automation.benchmark_store import BenchmarkStore
+            topology_file = getattr(self.main_window, 'current_file', None)
+            with BenchmarkStore() as store:
+                if report is None:
+                    # Unsupervised start_mininet timings end at launch, not at topology ready
+                    parameters = {'export_cache_hit': self.last_export_cache_hit, 'supervised': self.supervised}
+                    run_id = store.create_run(topology_file, 'startup', parameters, notes=self.run_dir)
+                    store.add_timings(run_id, self.stage_timings)
+                else:
+                    run_id = store.ingest_traffic_report(report, topology_file, timings=self.stage_timings,
+                                                         notes=self.run_dir)
+            debug_print(f"{'Startup' if report is None else 'Traffic test'} stored as benchmark run {run_id}")
+        except Exception as e:
+            warning_print(f"WARNING: Could not store benchmark results: {e}")
+
+    def _update_monitoring_targets(self, nodes=None):
+        """Regenerate Prometheus targets for the running topology and hot-reload if Prometheus is up."""
+        try:
+            from utils.prometheus_config import update_prometheus_targets
+            if nodes is None:
+                nodes, _ = self.main_window.extractTopology()
+            reload = DockerUtils.is_container_running("netflux5g-prometheus")
+            success, message = update_prometheus_targets(nodes, self.mininet_exporter, reload=reload)
+            if success:
+                debug_print(message)
+                if reload:
+                    self.status_updated.emit("Monitoring targets updated for topology")
+        except Exception as e:
+            # Monitoring is optional; never fail the topology run over it
+            warning_print(f"WARNING: Could not update monitoring targets: {e}")
+
+    def _on_teardown_event(self, event):
+        """Forward teardown engine messages to the status signal."""
+        if event.get('message'):
+            self.status_updated.emit(event['message'])
+
+    def _on_traffic_event(self, event):
+        """Forward traffic engine messages to the status signal, marked as traffic test output."""
+        if event.get('message'):
+            self.status_updated.emit(f"Traffic test: {event['message']}")
+
     def stop_topology(self):
         """Stop and clean up the topology (actionStop) - focused on mininet cleanup."""
         debug_print("DEBUG: Stop topology called")
         self.status_updated.emit("Cleaning up topology...")
         try:
-            # Stop Mininet process if it's running
-            if self.mininet_process and self.mininet_process.poll() is None:
-                debug_print("Stopping Mininet process...")
-                try:
-                    # Try graceful shutdown first
-                    self.mininet_process.terminate()
-                    self.mininet_process.wait(timeout=20)
-                    debug_print("Mininet process terminated gracefully")
-                except subprocess.TimeoutExpired:
-                    # Force kill if necessary
-                    debug_print("Mininet process did not terminate gracefully, force killing...")
-                    self.mininet_process.kill()
-                    debug_print("Mininet process killed")
-                except Exception as e:
-                    error_print(f"Error stopping Mininet process: {e}")
-                    
-                self.mininet_process = None
-            
-            # Clean up Mininet with sudo mn -c
-            debug_print("Executing 'sudo mn -c' to clean Mininet...")
-            self.status_updated.emit("Executing 'sudo mn -c' to clean Mininet...")
-            
-            try:
-                result = subprocess.run(
-                    ["sudo", "mn", "-c"], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=30
-                )
-                
-                if result.returncode == 0:
-                    debug_print("Mininet cleanup successful")
-                    self.status_updated.emit("Mininet cleanup completed successfully")
-                else:
-                    warning_print(f"Mininet cleanup warning: {result.stderr}")
-                    self.status_updated.emit("Mininet cleanup completed with warnings")
-                    
-            except subprocess.TimeoutExpired:
-                error_print("Mininet cleanup timed out")
-                self.status_updated.emit("Mininet cleanup timed out")
-            except subprocess.CalledProcessError as e:
-                error_print(f"Mininet cleanup failed: {e}")
-                self.status_updated.emit(f"Mininet cleanup failed: {e}")
-            except Exception as e:
-                error_print(f"Unexpected error during Mininet cleanup: {e}")
-                self.status_updated.emit(f"Cleanup error: {e}")
-            
-            # Additional cleanup for any leftover processes
-            try:
-                # Clean up any remaining Open vSwitch processes
-                debug_print("Cleaning up Open vSwitch processes...")
-                subprocess.run(["sudo", "ovs-vsctl", "del-br", "ovs-br"], capture_output=True)
-                
-                # Clean up any remaining network namespaces
-                debug_print("Cleaning up network namespaces...")
-                subprocess.run(["sudo", "ip", "netns", "del", "mn-ns"], capture_output=True)
-                
-            except Exception as e:
-                # These are optional cleanup steps, don't fail if they don't work
-                debug_print(f"Optional cleanup step failed (this is normal): {e}")
-            
+            from utils.teardown import build_topology_teardown_operations, run_teardown
+            if self.mininet_supervisor is not None and self.mininet_supervisor.is_alive():
+                # Let the script stop its own network first
+                self.status_updated.emit("Stopping Mininet network...")
+                _, message = self.mininet_supervisor.stop()
+                debug_print(message)
+            # Process stop, 'mn -c' and leftover container removal run on the teardown engine
+            results = run_teardown(
+                build_topology_teardown_operations(self.mininet_process),
+                event_callback=self._on_teardown_event
+            )
+            self.mininet_process = None
+            self.last_teardown_results = results
+
         except Exception as e:
             error_print(f"Error during topology cleanup: {e}")
             self.status_updated.emit(f"Cleanup error: {e}")
@@ -0,0 +1,385 @@
+"""
+Benchmark result store for NetFlux5G Editor
+Keeps traffic test results, capture statistics and startup timings per run in SQLite and compares runs
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print, warning_print
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export', 'benchmarks', 'benchmarks.db')
+
+# Relative change beyond which a metric is flagged as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    topology_file TEXT,
+    profile TEXT,
+    parameters TEXT NOT NULL DEFAULT '{}',
+    notes TEXT
+);
+CREATE TABLE IF NOT EXISTS iperf_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    ue TEXT, apn TEXT, upf TEXT, slice TEXT, test TEXT,
+    sent_bps REAL, received_bps REAL, retransmits INTEGER,
+    mean_rtt_ms REAL, jitter_ms REAL, lost_percent REAL,
+    success INTEGER NOT NULL, error TEXT
+);
+CREATE TABLE IF NOT EXISTS capture_stats (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL, packets INTEGER, bytes INTEGER, duration REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    stage TEXT NOT NULL, seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_iperf_run ON iperf_results(run_id);
+CREATE INDEX IF NOT EXISTS idx_capture_run ON capture_stats(run_id);
+CREATE INDEX IF NOT EXISTS idx_timings_run ON timings(run_id);
+"""
+
+
+def topology_parameters(topology_file):
+    """
+    Describe a topology file by its component counts.
+
+    Returns:
+        dict: e.g. { 'gnbs': 3, 'ues': 30, 'upfs': 2, 'apns': [...] }
+    """
+    with open(topology_file, 'r') as f:
+        nodes = json.load(f).get('nodes', [])
+    counts = {}
+    for node in nodes:
+        counts[node.get('type')] = counts.get(node.get('type'), 0) + 1
+    apns = sorted({n.get('properties', {}).get('UE_APN', 'internet') for n in nodes if n.get('type') == 'UE'})
+    upfs = sum(len(n.get('properties', {}).get('UPF_configs') or []) for n in nodes if n.get('type') == 'VGcore')
+    return {
+        'gnbs': counts.get('GNB', 0),
+        'ues': counts.get('UE', 0),
+        'aps': counts.get('AP', 0),
+        'switches': counts.get('Switch', 0) + counts.get('Router', 0),
+        'upfs': upfs,
+        'apns': apns,
+        'nodes': len(nodes)
+    }
+
+
+def capture_stats_from_file(path):
+    """
+    Read packet count, data size and duration of a capture file with capinfos.
+
+    Returns:
+        dict or None: { 'name', 'packets', 'bytes', 'duration' }
+    """
+    try:
+        result = subprocess.run(['capinfos', '-T', '-r', '-M', '-c', '-d', '-u', path],
+                                capture_output=True, text=True, timeout=120)
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        warning_print(f"capinfos unavailable for {path}: {e}")
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        warning_print(f"capinfos failed for {path}: {result.stderr.strip()}")
+        return None
+    fields = result.stdout.strip().split('\t')
+    try:
+        return {
+            'name': os.path.basename(path),
+            'packets': int(fields[1]),
+            'bytes': int(fields[2]),
+            'duration': float(fields[3])
+        }
+    except (IndexError, ValueError):
+        warning_print(f"Unexpected capinfos output for {path}: {result.stdout.strip()}")
+        return None
+
+
+class BenchmarkStore:
+    """SQLite-backed history of benchmark runs."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def create_run(self, topology_file=None, profile=None, parameters=None, notes=None, created=None):
+        """Create a run row and return its id."""
+        params = dict(parameters or {})
+        if topology_file and os.path.isfile(topology_file):
+            params.setdefault('topology', topology_parameters(topology_file))
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (created, topology_file, profile, parameters, notes) VALUES (?, ?, ?, ?, ?)',
+                (created or time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 os.path.basename(topology_file) if topology_file else None,
+                 profile, json.dumps(params, sort_keys=True), notes))
+        return cursor.lastrowid
+
+    def add_iperf_results(self, run_id, runs):
+        """Store per-client results as produced by TrafficEngine (report['runs'])."""
+        rows = [(run_id, r.get('ue'), r.get('apn'), r.get('upf'), r.get('slice'), r.get('test'),
+                 r.get('sent_bps'), r.get('received_bps'), r.get('retransmits'), r.get('mean_rtt_ms'),
+                 r.get('jitter_ms'), r.get('lost_percent'), 1 if r.get('success') else 0, r.get('error'))
+                for r in runs]
+        with self.conn:
+            self.conn.executemany('INSERT INTO iperf_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def add_iperf_file(self, run_id, path, **labels):
+        """Store a raw iperf3 -J output file; labels (ue, apn, test, ...) are taken from kwargs or the file name."""
+        from automation.traffic_engine import summarize_iperf_result
+        with open(path, 'r') as f:
+            summary = summarize_iperf_result(json.load(f))
+        summary['success'] = 'error' not in summary
+        labels.setdefault('ue', os.path.splitext(os.path.basename(path))[0])
+        return self.add_iperf_results(run_id, [dict(labels, **summary)])
+
+    def add_capture_stats(self, run_id, stats):
+        rows = [(run_id, s['name'], s.get('packets'), s.get('bytes'), s.get('duration')) for s in stats if s]
+        with self.conn:
+            self.conn.executemany('INSERT INTO capture_stats VALUES (?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def add_timings(self, run_id, timings):
+        """Store stage -> seconds timings (startup, teardown, ...)."""
+        with self.conn:
+            self.conn.executemany('INSERT INTO timings VALUES (?, ?, ?)',
+                                  [(run_id, stage, float(seconds)) for stage, seconds in timings.items()])
+        return len(timings)
+
+    def ingest_traffic_report(self, report, topology_file=None, timings=None, captures=None, notes=None):
+        """
+        Store a TrafficEngine report with its timings and capture statistics as one run.
+
+        Returns:
+            int: The new run id
+        """
+        run_id = self.create_run(topology_file, report.get('profile'),
+                                 {'settings': report.get('settings', {})}, notes, report.get('started'))
+        self.add_iperf_results(run_id, report.get('runs', []))
+        all_timings = dict(timings or {})
+        if 'elapsed' in report:
+            all_timings.setdefault('traffic_test', report['elapsed'])
+        self.add_timings(run_id, all_timings)
+        self.add_capture_stats(run_id, captures or [])
+        debug_print(f"Benchmark run {run_id} stored in {self.db_path}")
+        return run_id
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def list_runs(self, topology_file=None, limit=20):
+        query = ('SELECT r.id, r.created, r.topology_file, r.profile, '
+                 'COUNT(i.run_id) AS clients, SUM(i.success) AS succeeded, '
+                 'SUM(CASE WHEN i.success THEN i.received_bps ELSE 0 END) AS total_bps '
+                 'FROM runs r LEFT JOIN iperf_results i ON i.run_id = r.id ')
+        params = []
+        if topology_file:
+            query += 'WHERE r.topology_file = ? '
+            params.append(os.path.basename(topology_file))
+        query += 'GROUP BY r.id ORDER BY r.id DESC LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def latest_run_id(self, topology_file=None, before=None, profile=None):
+        query = 'SELECT id FROM runs WHERE 1 = 1'
+        params = []
+        if topology_file:
+            query += ' AND topology_file = ?'
+            params.append(os.path.basename(topology_file))
+        if profile is not None:
+            query += ' AND profile = ?'
+            params.append(profile)
+        if before is not None:
+            query += ' AND id < ?'
+            params.append(before)
+        row = self.conn.execute(query + ' ORDER BY id DESC LIMIT 1', params).fetchone()
+        return row['id'] if row else None
+
+    def baseline_run_id(self, candidate_id):
+        """
+        Latest run before candidate_id with the same topology and profile.
+
+        The editor stores a 'startup' run before each traffic run, so the run
+        just before a traffic run usually has none of its metrics.
+        """
+        row = self.conn.execute('SELECT topology_file, profile FROM runs WHERE id = ?', (candidate_id,)).fetchone()
+        if row is None:
+            return None
+        baseline = self.conn.execute(
+            'SELECT id FROM runs WHERE id < ? AND topology_file IS ? AND profile IS ? ORDER BY id DESC LIMIT 1',
+            (candidate_id, row['topology_file'], row['profile'])).fetchone()
+        return baseline['id'] if baseline else None
+
+    def run_metrics(self, run_id):
+        """
+        Flatten a run into comparable metrics.
+
+        Returns:
+            dict: metric name -> (value, higher_is_better)
+        """
+        metrics = {}
+        row = self.conn.execute(
+            'SELECT SUM(CASE WHEN success THEN received_bps ELSE 0 END) AS bps, '
+            'AVG(success) AS success_rate FROM iperf_results WHERE run_id = ?', (run_id,)).fetchone()
+        if row['bps'] is not None:
+            metrics['throughput.total_bps'] = (row['bps'], True)
+            metrics['success_rate'] = (row['success_rate'], True)
+        for column in ('apn', 'test', 'upf'):
+            for group in self.conn.execute(
+                    f'SELECT {column} AS name, SUM(received_bps) AS bps, AVG(mean_rtt_ms) AS rtt, '
+                    f'AVG(jitter_ms) AS jitter, AVG(lost_percent) AS lost '
+                    f'FROM iperf_results WHERE run_id = ? AND success GROUP BY {column}', (run_id,)):
+                metrics[f'throughput.{column}.{group["name"]}'] = (group['bps'], True)
+                if group['rtt'] is not None:
+                    metrics[f'latency.{column}.{group["name"]}.mean_rtt_ms'] = (group['rtt'], False)
+                if group['jitter'] is not None:
+                    metrics[f'latency.{column}.{group["name"]}.jitter_ms'] = (group['jitter'], False)
+                if group['lost'] is not None:
+                    metrics[f'loss.{column}.{group["name"]}.lost_percent'] = (group['lost'], False)
+        for timing in self.conn.execute('SELECT stage, seconds FROM timings WHERE run_id = ?', (run_id,)):
+            metrics[f'timing.{timing["stage"]}'] = (timing['seconds'], False)
+        for capture in self.conn.execute('SELECT name, packets FROM capture_stats WHERE run_id = ?', (run_id,)):
+            metrics[f'capture.{capture["name"]}.packets'] = (capture['packets'], True)
+        return metrics
+
+    def compare_runs(self, baseline_id, candidate_id, threshold=DEFAULT_REGRESSION_THRESHOLD):
+        """
+        Compare two runs metric by metric.
+
+        Returns:
+            list: dicts with metric, baseline, candidate, change and regression flag, regressions first
+        """
+        baseline = self.run_metrics(baseline_id)
+        candidate = self.run_metrics(candidate_id)
+        rows = []
+        for metric in sorted(set(baseline) | set(candidate)):
+            base_value = baseline.get(metric, (None,))[0]
+            cand_value = candidate.get(metric, (None,))[0]
+            higher_is_better = (baseline.get(metric) or candidate.get(metric))[1]
+            change = None
+            regression = False
+            if base_value not in (None, 0) and cand_value is not None:
+                change = (cand_value - base_value) / abs(base_value)
+                regression = (change < -threshold) if higher_is_better else (change > threshold)
+            elif base_value is not None and cand_value is None and higher_is_better:
+                # A metric that disappeared (e.g. an APN with no successful runs) is a regression
+                regression = True
+            rows.append({'metric': metric, 'baseline': base_value, 'candidate': cand_value,
+                         'change': change, 'regression': regression})
+        rows.sort(key=lambda r: (not r['regression'], r['metric']))
+        return rows
+
+
+def format_comparison(rows, baseline_id, candidate_id):
+    """Render compare_runs output as a text table."""
+    lines = [f"Run {baseline_id} -> run {candidate_id}",
+             f"{'metric':<52} {'baseline':>14} {'candidate':>14} {'change':>9}"]
+    for row in rows:
+        def fmt(value):
+            return '-' if value is None else f"{value:.4g}"
+        change = '-' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(f"{row['metric']:<52} {fmt(row['baseline']):>14} {fmt(row['candidate']):>14} {change:>9}{flag}")
+    regressions = sum(1 for row in rows if row['regression'])
+    lines.append(f"{regressions} regression(s) flagged")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NetFlux5G benchmark result store")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Store a traffic engine JSON report as a new run")
+    ingest.add_argument('report')
+    ingest.add_argument('--topology', help="Topology file the run used (e.g. sdn_topology_urban-3-30.nf5g)")
+    ingest.add_argument('--timings', help="JSON file with stage -> seconds startup timings")
+    ingest.add_argument('--capture', action='append', default=[], help="Capture file to summarize (repeatable)")
+    ingest.add_argument('--notes')
+
+    ingest_iperf = commands.add_parser('ingest-iperf', help="Store raw iperf3 -J files as a new run")
+    ingest_iperf.add_argument('files', nargs='+')
+    ingest_iperf.add_argument('--topology')
+    ingest_iperf.add_argument('--notes')
+
+    listing = commands.add_parser('list', help="List stored runs")
+    listing.add_argument('--topology')
+    listing.add_argument('--limit', type=int, default=20)
+
+    compare = commands.add_parser('compare', help="Compare two runs and flag regressions")
+    compare.add_argument('baseline', nargs='?', type=int,
+                         help="Baseline run id (default: previous run with the candidate's topology and profile)")
+    compare.add_argument('candidate', nargs='?', type=int, help="Candidate run id (default: latest run)")
+    compare.add_argument('--topology', help="Restrict default run selection to this topology file")
+    compare.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    compare.add_argument('--json', action='store_true', help="Print the comparison as JSON")
+
+    args = parser.parse_args(argv)
+    with BenchmarkStore(args.db) as store:
+        if args.command == 'ingest':
+            with open(args.report, 'r') as f:
+                report = json.load(f)
+            timings = {}
+            if args.timings:
+                with open(args.timings, 'r') as f:
+                    timings = json.load(f)
+            captures = [capture_stats_from_file(path) for path in args.capture]
+            run_id = store.ingest_traffic_report(report, args.topology, timings, captures, args.notes)
+            print(f"Stored run {run_id}")
+        elif args.command == 'ingest-iperf':
+            run_id = store.create_run(args.topology, 'iperf-files', notes=args.notes)
+            for path in args.files:
+                store.add_iperf_file(run_id, path)
+            print(f"Stored run {run_id} with {len(args.files)} iperf3 result(s)")
+        elif args.command == 'list':
+            for run in store.list_runs(args.topology, args.limit):
+                print(f"{run['id']:>5}  {run['created']}  {run['topology_file'] or '-':<36} "
+                      f"{run['profile'] or '-':<12} {run['succeeded'] or 0}/{run['clients']} ok  "
+                      f"{(run['total_bps'] or 0) / 1e6:.1f} Mbit/s")
+        elif args.command == 'compare':
+            candidate = args.candidate or store.latest_run_id(args.topology)
+            baseline = args.baseline or (candidate and store.baseline_run_id(candidate))
+            if not baseline or not candidate:
+                error_print("Need at least two runs with the same topology and profile to compare")
+                return 2
+            rows = store.compare_runs(baseline, candidate, args.threshold)
+            if not any(row['baseline'] is not None and row['candidate'] is not None for row in rows):
+                error_print(f"Runs {baseline} and {candidate} share no metrics; compare runs of the same profile")
+                return 2
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print(format_comparison(rows, baseline, candidate))
+            return 1 if any(row['regression'] for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Export artifact cache for NetFlux5G Editor
+Keeps exported Mininet scripts, 5g-configs and run scripts keyed by a canonical hash of the topology and exporter
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(SRC_DIR, 'export', 'cache', 'artifacts')
+
+# CI jobs point this at a shared/restored directory to reuse exports across jobs
+CACHE_DIR_ENV = 'NETFLUX5G_EXPORT_CACHE'
+
+# Bump when the layout of a cached export changes
+EXPORT_FORMAT_VERSION = 3
+
+# Scripts capture into this folder at run time; set before exporting, it is
+# embedded in the script (and so part of the key) as the default
+CAPTURES_DIR_ENV = 'NETFLUX5G_CAPTURES_DIR'
+DEFAULT_CAPTURES_DIR = os.path.join(SRC_DIR, 'automation', 'webshark', 'captures')
+
+# Helper modules pulled into the exporter fingerprint through their imports
+_UTILS_IMPORT = re.compile(r'^\s*(?:from|import)\s+utils\.(\w+)', re.M)
+
+# Topology script of every export; the supervisor also looks for it in an export directory
+SCRIPT_NAME = 'netflux5g_topology.py'
+
+META_NAME = '.export-meta.json'
+DEFAULT_MAX_ENTRIES = 20
+
+_exporter_fingerprint = None
+
+
+def captures_dir_override():
+    """The normalized NETFLUX5G_CAPTURES_DIR path, or None when it is not set."""
+    path = os.environ.get(CAPTURES_DIR_ENV)
+    return os.path.normpath(os.path.abspath(os.path.expanduser(path))) if path else None
+
+
+def captures_dir():
+    """Folder the topology scripts run from this checkout write their captures to."""
+    return captures_dir_override() or DEFAULT_CAPTURES_DIR
+
+
+def exporter_sources():
+    """
+    Sources whose changes invalidate every cached export.
+
+    Every module under export/ and this one, plus the utils modules they import,
+    followed transitively.
+    """
+    pending = sorted(glob.glob(os.path.join(SRC_DIR, 'export', '*.py'))) + [os.path.abspath(__file__)]
+    sources = set()
+    while pending:
+        path = pending.pop()
+        if path in sources or not os.path.isfile(path):
+            continue
+        sources.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            pending.extend(os.path.join(SRC_DIR, 'utils', f'{name}.py') for name in _UTILS_IMPORT.findall(f.read()))
+    return sorted(sources)
+
+
+def exporter_fingerprint():
+    """Hash of the exporter sources and export format version (computed once per process)."""
+    global _exporter_fingerprint
+    if _exporter_fingerprint is None:
+        sha = hashlib.sha256(f"format:{EXPORT_FORMAT_VERSION}".encode())
+        for path in exporter_sources():
+            sha.update(os.path.relpath(path, SRC_DIR).encode())
+            with open(path, 'rb') as f:
+                sha.update(f.read())
+        _exporter_fingerprint = sha.hexdigest()[:16]
+    return _exporter_fingerprint
+
+
+def _config_file_paths(nodes):
+    """Config files referenced by VGcore components (their content is part of the export)."""
+    paths = set()
+    for node in nodes:
+        if node.get('type') != 'VGcore':
+            continue
+        for key, items in node.get('properties', {}).items():
+            if not key.endswith('_configs') or not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, dict):
+                    path = item.get('config_file_path') or item.get('config_path')
+                    if path and os.path.isfile(path):
+                        paths.add(os.path.abspath(path))
+    return sorted(paths)
+
+
+def topology_key(nodes, links, compact=False, config_cache=None):
+    """
+    Canonical hash of everything an export depends on.
+
+    Covers the nodes and links (key order independent), the exporter mode and
+    sources, the captures folder override and the content of every referenced
+    config file. Paths of the checkout itself are left out, so checkouts in
+    different places share entries.
+    """
+    sha = hashlib.sha256()
+    sha.update(exporter_fingerprint().encode())
+    sha.update((captures_dir_override() or '').encode('utf-8'))
+    sha.update(b'compact' if compact else b'full')
+    sha.update(json.dumps({'nodes': nodes, 'links': links}, sort_keys=True, separators=(',', ':'),
+                          default=str).encode('utf-8'))
+    if config_cache is None:
+        from utils.config_cache import ConfigCache
+        config_cache = ConfigCache()
+    for path in _config_file_paths(nodes):
+        sha.update(path.encode('utf-8'))
+        sha.update(config_cache.add_file(path).encode())
+    config_cache.save()
+    return sha.hexdigest()
+
+
+class ExportCache:
+    """Directory of complete exports, one sub-directory per topology key."""
+
+    def __init__(self, cache_dir=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:32])
+
+    def lookup(self, key, required=(SCRIPT_NAME, 'run_mininet.sh')):
+        """Return the export directory for key if a complete export is cached, else None."""
+        path = self.entry_path(key)
+        meta = os.path.join(path, META_NAME)
+        if not os.path.isfile(meta) or not all(os.path.exists(os.path.join(path, name)) for name in required):
+            return None
+        try:
+            with open(meta, 'r') as f:
+                if json.load(f).get('key') != key:
+                    return None
+        except (OSError, ValueError):
+            return None
+        os.utime(meta)  # most recently used
+        return path
+
+    def begin(self, key):
+        """Create an empty build directory for key."""
+        path = f"{self.entry_path(key)}.tmp-{os.getpid()}-{int(time.time() * 1000)}"
+        os.makedirs(path)
+        return path
+
+    def commit(self, key, build_dir, info=None):
+        """
+        Publish a finished build directory under its key.
+
+        The rename is atomic, so concurrent jobs never see a half-written export.
+        If a complete export for the key is already there (another job committed
+        it first), that one is kept and the build directory is discarded.
+        """
+        meta = {'key': key, 'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'exporter': exporter_fingerprint()}
+        meta.update(info or {})
+        with open(os.path.join(build_dir, META_NAME), 'w') as f:
+            json.dump(meta, f, indent=2)
+        path = self.entry_path(key)
+        try:
+            os.rename(build_dir, path)
+        except OSError:
+            if self.lookup(key) is not None:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                debug_print(f"Export already cached at {path}")
+                return path
+            # An incomplete leftover entry: replace it
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.rename(build_dir, path)
+            except OSError:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                raise
+        debug_print(f"Export cached at {path}")
+        self.prune()
+        return path
+
+    def abort(self, build_dir):
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    def entries(self):
+        """Cached exports as (last used, path), most recent first."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            meta = os.path.join(self.cache_dir, name, META_NAME)
+            if '.tmp-' not in name and os.path.isfile(meta):
+                found.append((os.path.getmtime(meta), os.path.join(self.cache_dir, name)))
+        return sorted(found, reverse=True)
+
+    def prune(self, max_entries=None):
+        """Remove least recently used exports beyond max_entries and stale build directories."""
+        max_entries = self.max_entries if max_entries is None else max_entries
+        removed = 0
+        for _, path in self.entries()[max_entries:]:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        day_ago = time.time() - 86400
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if '.tmp-' in name and os.path.getmtime(path) < day_ago:
+                shutil.rmtree(path, ignore_errors=True)
+        if removed:
+            debug_print(f"Pruned {removed} cached export(s)")
+        return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a topology through the NetFlux5G export cache")
+    parser.add_argument('topology', nargs='?', help="Topology file (.nf5g)")
+    parser.add_argument('--cache-dir', help=f"Cache directory (default: ${CACHE_DIR_ENV} or {DEFAULT_CACHE_DIR})")
+    parser.add_argument('--compact', action='store_true', help="Export compact (loop-based) scripts")
+    parser.add_argument('--key-only', action='store_true', help="Print the topology key and exit")
+    parser.add_argument('--list', action='store_true', help="List cached exports")
+    parser.add_argument('--prune', type=int, metavar='N', help="Keep only the N most recently used exports")
+    args = parser.parse_args(argv)
+
+    cache = ExportCache(args.cache_dir)
+    if args.list:
+        for used, path in cache.entries():
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(used))}  {path}")
+        return 0
+    if args.prune is not None:
+        print(f"Removed {cache.prune(args.prune)} cached export(s)")
+        return 0
+    if not args.topology:
+        parser.error("topology is required")
+
+    from automation.automation_runner import AutomationRunner
+    from automation.scaling_benchmark import OfflineMainWindow
+    with open(args.topology, 'r') as f:
+        data = json.load(f)
+    main_window = OfflineMainWindow(data.get('nodes', []), data.get('links', []))
+    main_window.current_file = os.path.abspath(args.topology)
+    runner = AutomationRunner(main_window)
+    runner.mininet_exporter.compact_mode = args.compact
+    runner.export_cache = cache
+
+    if args.key_only:
+        print(topology_key(main_window.nodes, main_window.links, args.compact))
+        return 0
+    try:
+        cache_hit = runner.prepare_export(main_window.nodes, main_window.links)
+    except Exception as e:
+        error_print(f"Export failed: {e}")
+        return 1
+    print(f"{'hit' if cache_hit else 'miss'} {runner.export_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
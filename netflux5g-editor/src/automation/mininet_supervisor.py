@@ -0,0 +1,296 @@
+"""
+Mininet process supervisor for NetFlux5G Editor
+Runs an exported topology script as a managed child process and turns its structured output into progress events
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation.export_cache import CAPTURES_DIR_ENV, SCRIPT_NAME, captures_dir
+from utils.debug import debug_print, error_print, warning_print
+
+# Must match MininetExporter.EVENT_PREFIX
+EVENT_PREFIX = "@@NF5G "
+
+LOG_NAME = "mininet.log"
+EVENTS_NAME = "progress.jsonl"
+
+# Share of the startup progress given to each phase (node creation, NF/gNB start, UE registration)
+PHASE_WEIGHTS = (('nodes', 50), ('nfs', 25), ('ues', 25))
+
+
+def parse_output_line(line):
+    """
+    Split one line of script output into (text, event).
+
+    Mininet writes partial lines to the same pipe, so the event prefix may follow
+    other text; that text is returned for the log.
+    """
+    index = line.find(EVENT_PREFIX)
+    if index < 0:
+        return line, None
+    try:
+        event = json.loads(line[index + len(EVENT_PREFIX):])
+    except ValueError:
+        return line, None
+    if not isinstance(event, dict) or 'event' not in event:
+        return line, None
+    return line[:index], event
+
+
+def describe_event(event):
+    """Human readable status line for an event."""
+    kind = event.get('event')
+    node = event.get('node', '')
+    progress = f" ({event['count']}/{event['total']})" if event.get('total') else ""
+    if kind == 'plan':
+        return (f"Deploying {event.get('nodes', 0)} nodes, {event.get('nfs', 0)} network functions "
+                f"and {event.get('ues', 0)} UEs")
+    if kind == 'stage':
+        return f"{event.get('message', event.get('stage', ''))}..."
+    if kind == 'node_created':
+        return f"Created {event.get('kind', 'node').lower()} {node}{progress}"
+    if kind == 'nf_started':
+        return f"Started {event.get('nf', 'NF')} {node}{progress}"
+    if kind == 'gnb_started':
+        return f"Started gNB {node}"
+    if kind == 'ue_registered':
+        return f"UE {node} registered after {event.get('t', 0):.1f}s{progress}"
+    if kind == 'ue_registration_timeout':
+        return f"UE {node} did not register within {event.get('timeout', '?')}s"
+    if kind == 'handover_failed':
+        return f"UE {node} could not move to {event.get('cell') or 'no cell'}: {event.get('error', '')}"
+    if kind == 'ready':
+        return f"Topology ready in {event.get('t', 0):.1f}s"
+    if kind == 'stopped':
+        return "Mininet network stopped"
+    if kind == 'exited':
+        return f"Mininet process exited with code {event.get('returncode')}"
+    return kind
+
+
+class MininetSupervisor:
+    """
+    Supervise one run of an exported topology script.
+
+    The script runs headless (no CLI) with progress events enabled. A reader
+    thread copies its plain output to mininet.log, appends every event to
+    progress.jsonl and passes it, enriched with running counts, to event_callback.
+    Both files, and the logs the script writes, go to run_dir (the export
+    directory unless given), so a cached export can be shared between runs.
+    """
+
+    def __init__(self, script_path, export_dir=None, event_callback=None, use_sudo=True, run_dir=None):
+        self.script_path = os.path.abspath(script_path)
+        self.export_dir = export_dir or os.path.dirname(self.script_path)
+        self.run_dir = os.path.abspath(run_dir or self.export_dir)
+        self.event_callback = event_callback
+        self.use_sudo = use_sudo and os.geteuid() != 0
+        self.log_path = os.path.join(self.run_dir, LOG_NAME)
+        self.events_path = os.path.join(self.run_dir, EVENTS_NAME)
+        self.process = None
+        self.reader_thread = None
+        self.ready_event = threading.Event()
+        self.exited_event = threading.Event()
+        self.returncode = None
+        self.tail = []
+        self._reset_state()
+
+    def _reset_state(self):
+        self.planned = False
+        self.totals = {'nodes': 0, 'nfs': 0, 'ues': 0}
+        self.counts = {'nodes': 0, 'nfs': 0, 'ues': 0}
+        self.stage = None
+        self.timings = {}
+        self.ready_event.clear()
+        self.exited_event.clear()
+        self.returncode = None
+        self.tail = []
+
+    def command(self):
+        env = ["env", "NETFLUX5G_EVENTS=1", "NETFLUX5G_HEADLESS=1", f"NETFLUX5G_RUN_DIR={self.run_dir}",
+               f"{CAPTURES_DIR_ENV}={captures_dir()}"]
+        if self.use_sudo:
+            # sudo resets the environment, so the variables go through env(1)
+            return ["sudo"] + env + ["python3", "-u", self.script_path]
+        return env + [sys.executable, "-u", self.script_path]
+
+    def start(self):
+        """Start the script and the output reader; returns the Popen object."""
+        if self.is_alive():
+            raise RuntimeError("Mininet is already running")
+        self._reset_state()
+        for path in (self.log_path, self.events_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.process = subprocess.Popen(
+            self.command(),
+            cwd=self.run_dir,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        debug_print(f"Mininet supervised as pid {self.process.pid}, logging to: {self.log_path}")
+        self.reader_thread = threading.Thread(target=self._read_output, name="mininet-supervisor", daemon=True)
+        self.reader_thread.start()
+        return self.process
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def wait_ready(self, timeout=None):
+        """
+        Wait until the topology reports ready or the process exits.
+
+        Returns:
+            bool: True once ready, False if the process exited first or the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.ready_event.is_set() and not self.exited_event.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            self.ready_event.wait(0.5 if remaining is None else min(0.5, remaining))
+        return self.ready_event.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the process to exit and its output to be drained."""
+        if self.reader_thread:
+            self.reader_thread.join(timeout)
+        return self.returncode
+
+    def stop(self, grace_period=15):
+        """Ask the script to stop the network (SIGTERM), killing it after grace_period seconds."""
+        if not self.is_alive():
+            return True, "Mininet process not running"
+        try:
+            self.process.send_signal(signal.SIGTERM)
+            self.process.wait(timeout=grace_period)
+            message = "Mininet process stopped"
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait(timeout=5)
+            message = f"Mininet process killed after {grace_period}s grace period"
+        self.wait(5)
+        return True, message
+
+    def progress(self):
+        """Startup progress (0-100) derived from the counts reported so far."""
+        if self.ready_event.is_set():
+            return 100
+        if not self.planned:
+            return 0
+        done = 0.0
+        for phase, weight in PHASE_WEIGHTS:
+            total = self.totals[phase]
+            # A phase this topology does not have counts as complete
+            done += weight * (min(self.counts[phase], total) / total if total else 1)
+        return min(99, int(done))
+
+    def _read_output(self):
+        with open(self.log_path, 'a') as log, open(self.events_path, 'a') as events:
+            for raw in iter(self.process.stdout.readline, b''):
+                text, event = parse_output_line(raw.decode('utf-8', errors='replace'))
+                if text:
+                    log.write(text if event is None else text + "\n")
+                    log.flush()
+                    self.tail = (self.tail + [text.rstrip()])[-20:]
+                if event is not None:
+                    self._handle_event(event)
+                    events.write(json.dumps(event) + "\n")
+                    events.flush()
+            self.process.stdout.close()
+            self.returncode = self.process.wait()
+            event = {'event': 'exited', 'returncode': self.returncode}
+            self._handle_event(event)
+            events.write(json.dumps(event) + "\n")
+        self.exited_event.set()
+
+    def _handle_event(self, event):
+        """Update the run state from an event and forward it."""
+        kind = event['event']
+        phase = {'node_created': 'nodes', 'nf_started': 'nfs',
+                 'ue_registered': 'ues', 'ue_registration_timeout': 'ues'}.get(kind)
+        if kind == 'plan':
+            self.planned = True
+            for key in self.totals:
+                self.totals[key] = int(event.get(key, 0))
+        elif kind == 'stage':
+            self.stage = event.get('stage')
+            self.timings[f"stage_{self.stage}"] = event.get('t')
+        elif phase:
+            self.counts[phase] += 1
+            # The node total is an estimate (e.g. access points generated for gNBs)
+            self.totals[phase] = max(self.totals[phase], self.counts[phase])
+            event['count'] = self.counts[phase]
+            event['total'] = self.totals[phase]
+            if kind == 'ue_registered' and self.counts['ues'] == self.totals['ues']:
+                self.timings['all_ues_registered'] = event.get('t')
+        elif kind == 'ready':
+            self.timings['ready'] = event.get('t')
+            self.ready_event.set()
+        event['progress'] = self.progress()
+        if self.event_callback:
+            try:
+                self.event_callback(event)
+            except Exception as e:
+                warning_print(f"WARNING: Mininet event callback failed: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run an exported NetFlux5G topology headless and print its progress events as JSON lines")
+    parser.add_argument('script', help="Exported topology script or export directory")
+    parser.add_argument('--ready-timeout', type=float, default=600,
+                        help="Give up if the topology is not ready after this many seconds (default: 600)")
+    parser.add_argument('--duration', type=float,
+                        help="Stop the topology this many seconds after it is ready (default: run until interrupted)")
+    parser.add_argument('--no-sudo', action='store_true', help="Run the script without sudo")
+    parser.add_argument('--run-dir', help="Directory for the logs of this run (default: the export directory)")
+    args = parser.parse_args(argv)
+
+    script = args.script
+    if os.path.isdir(script):
+        script = os.path.join(script, SCRIPT_NAME)
+    if not os.path.isfile(script):
+        error_print(f"Topology script not found: {script}")
+        return 2
+
+    def print_event(event):
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+    if args.run_dir:
+        os.makedirs(args.run_dir, exist_ok=True)
+    supervisor = MininetSupervisor(script, event_callback=print_event, use_sudo=not args.no_sudo,
+                                   run_dir=args.run_dir)
+    supervisor.start()
+    try:
+        if not supervisor.wait_ready(args.ready_timeout):
+            if supervisor.exited_event.is_set():
+                error_print(f"Mininet exited before the topology was ready, see {supervisor.log_path}")
+                return 1
+            error_print(f"Topology not ready after {args.ready_timeout:.0f}s")
+            supervisor.stop()
+            return 1
+        if args.duration is None:
+            supervisor.wait()
+        else:
+            supervisor.exited_event.wait(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+    return 0 if supervisor.returncode in (0, -signal.SIGTERM) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,829 @@
+"""
+Offline capture summarizer for NetFlux5G Editor
+Streams pcap/pcapng capture files and summarizes GTP-U, NGAP and PFCP traffic per flow and per UE
+"""
+import argparse
+import json
+import mmap
+import os
+import re
+import socket
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print, warning_print
+
+GTPU_PORT = 2152
+PFCP_PORT = 8805
+NGAP_PORT = 38412
+NGAP_PPID = 60
+
+CAPTURE_EXTENSIONS = ('.pcapng', '.pcap', '.cap')
+SUMMARY_FILENAME = 'capture-summary.json'
+
+# tshark ring buffer files are named <prefix>_<index>_<timestamp>.<ext>
+RING_SUFFIX = re.compile(r'_\d{5}_\d{14}$')
+
+# Link-layer header types (LINKTYPE_*) and where their IP header starts
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = (12, 14, 101, 228)
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+
+NGAP_PROCEDURES = {
+    0: 'AMFConfigurationUpdate', 4: 'DownlinkNASTransport', 9: 'ErrorIndication', 11: 'HandoverNotification',
+    12: 'HandoverPreparation', 13: 'HandoverResourceAllocation', 14: 'InitialContextSetup',
+    15: 'InitialUEMessage', 20: 'NGReset', 21: 'NGSetup', 24: 'Paging', 25: 'PathSwitchRequest',
+    26: 'PDUSessionResourceModify', 28: 'PDUSessionResourceRelease', 29: 'PDUSessionResourceSetup',
+    35: 'RANConfigurationUpdate', 40: 'UEContextModification', 41: 'UEContextRelease',
+    42: 'UEContextReleaseRequest', 44: 'UERadioCapabilityInfoIndication', 46: 'UplinkNASTransport'
+}
+
+# Class 1 procedures: an initiating message answered by a successful/unsuccessful outcome
+NGAP_REQUEST_RESPONSE = {0, 12, 13, 14, 20, 21, 25, 26, 28, 29, 35, 40, 41}
+
+NGAP_IE_AMF_UE_NGAP_ID = 10
+NGAP_IE_RAN_UE_NGAP_ID = 85
+
+PFCP_MESSAGES = {
+    1: 'HeartbeatRequest', 2: 'HeartbeatResponse',
+    5: 'AssociationSetupRequest', 6: 'AssociationSetupResponse',
+    7: 'AssociationUpdateRequest', 8: 'AssociationUpdateResponse',
+    9: 'AssociationReleaseRequest', 10: 'AssociationReleaseResponse',
+    50: 'SessionEstablishmentRequest', 51: 'SessionEstablishmentResponse',
+    52: 'SessionModificationRequest', 53: 'SessionModificationResponse',
+    54: 'SessionDeletionRequest', 55: 'SessionDeletionResponse',
+    56: 'SessionReportRequest', 57: 'SessionReportResponse'
+}
+PFCP_REQUESTS = {1, 5, 7, 9, 50, 52, 54, 56}
+
+# PFCP IE types that are decoded (grouped IEs are walked recursively)
+PFCP_GROUPED_IES = {1, 2, 3, 4, 8, 9, 10, 11}
+PFCP_IE_CAUSE = 19
+PFCP_IE_F_TEID = 21
+PFCP_IE_F_SEID = 57
+PFCP_IE_OUTER_HEADER_CREATION = 84
+PFCP_IE_UE_IP_ADDRESS = 93
+PFCP_CAUSE_ACCEPTED = 1
+
+_U16 = struct.Struct('!H')
+_U32 = struct.Struct('!I')
+_U64 = struct.Struct('!Q')
+_PORTS = struct.Struct('!HH')
+
+
+def capture_point_name(path):
+    """Capture point of a file, e.g. 'upf1-any' for upf1-any_00003_20250101120000.pcapng."""
+    name = os.path.basename(path)
+    for ext in CAPTURE_EXTENSIONS:
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+            break
+    return RING_SUFFIX.sub('', name)
+
+
+def find_capture_files(paths):
+    """Expand files and directories (searched recursively) into capture files, largest first."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(CAPTURE_EXTENSIONS))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            warning_print(f"Capture path not found: {path}")
+    # Largest first so the process pool is not left waiting on one big file at the end
+    return sorted(set(files), key=lambda f: os.path.getsize(f), reverse=True)
+
+
+# ----------------------------------------------------------------------
+# Capture file readers
+# ----------------------------------------------------------------------
+def _iter_pcapng(buf):
+    """Yield (timestamp, linktype, data) for every packet block of a pcapng buffer."""
+    pos, size = 0, len(buf)
+    endian = '<'
+    interfaces = []  # (linktype, timestamp unit)
+    last_ts = 0.0
+    while pos + 12 <= size:
+        block_type, block_len = struct.unpack_from(endian + 'II', buf, pos)
+        if block_type == 0x0A0D0D0A:
+            endian = '<' if bytes(buf[pos + 8:pos + 12]) == b'\x4d\x3c\x2b\x1a' else '>'
+            block_len = struct.unpack_from(endian + 'I', buf, pos + 4)[0]
+            interfaces = []
+        if block_len < 12 or pos + block_len > size:
+            break  # truncated tail of a capture that is still being written
+        if block_type == 6 and interfaces:
+            iface, ts_high, ts_low, cap_len = struct.unpack_from(endian + 'IIII', buf, pos + 8)
+            linktype, unit = interfaces[iface] if iface < len(interfaces) else interfaces[0]
+            last_ts = ((ts_high << 32) | ts_low) * unit
+            yield last_ts, linktype, buf[pos + 28:pos + 28 + min(cap_len, block_len - 32)]
+        elif block_type == 3 and interfaces:
+            orig_len = struct.unpack_from(endian + 'I', buf, pos + 8)[0]
+            yield last_ts, interfaces[0][0], buf[pos + 12:pos + 12 + min(orig_len, block_len - 16)]
+        elif block_type == 2 and interfaces:
+            iface, _, ts_high, ts_low, cap_len = struct.unpack_from(endian + 'HHIII', buf, pos + 8)
+            linktype, unit = interfaces[iface] if iface < len(interfaces) else interfaces[0]
+            last_ts = ((ts_high << 32) | ts_low) * unit
+            yield last_ts, linktype, buf[pos + 28:pos + 28 + min(cap_len, block_len - 32)]
+        elif block_type == 1:
+            linktype = struct.unpack_from(endian + 'H', buf, pos + 8)[0]
+            interfaces.append((linktype, _pcapng_ts_unit(buf, pos + 16, pos + block_len - 4, endian)))
+        pos += block_len
+
+
+def _pcapng_ts_unit(buf, start, end, endian):
+    """Timestamp unit from the if_tsresol option of an Interface Description Block."""
+    while start + 4 <= end:
+        code, length = struct.unpack_from(endian + 'HH', buf, start)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            resolution = buf[start + 4]
+            return 2.0 ** -(resolution & 0x7f) if resolution & 0x80 else 10.0 ** -resolution
+        start += 4 + ((length + 3) & ~3)
+    return 1e-6
+
+
+def _iter_pcap(buf):
+    """Yield (timestamp, linktype, data) for every record of a classic pcap buffer."""
+    magic = bytes(buf[:4])
+    endian = '<' if magic in (b'\xd4\xc3\xb2\xa1', b'\x4d\x3c\xb2\xa1') else '>'
+    unit = 1e-9 if magic in (b'\x4d\x3c\xb2\xa1', b'\xa1\xb2\x3c\x4d') else 1e-6
+    linktype = struct.unpack_from(endian + 'I', buf, 20)[0] & 0x0fffffff
+    record = struct.Struct(endian + 'IIII')
+    pos, size = 24, len(buf)
+    while pos + 16 <= size:
+        ts_sec, ts_frac, cap_len, _ = record.unpack_from(buf, pos)
+        if pos + 16 + cap_len > size:
+            break
+        yield ts_sec + ts_frac * unit, linktype, buf[pos + 16:pos + 16 + cap_len]
+        pos += 16 + cap_len
+
+
+def _iter_packets(buf):
+    magic = bytes(buf[:4])
+    if magic == b'\x0a\x0d\x0d\x0a':
+        return _iter_pcapng(buf)
+    if magic in (b'\xd4\xc3\xb2\xa1', b'\xa1\xb2\xc3\xd4', b'\x4d\x3c\xb2\xa1', b'\xa1\xb2\x3c\x4d'):
+        return _iter_pcap(buf)
+    raise ValueError("not a pcap or pcapng file")
+
+
+def _ipv4_offset(linktype, data):
+    """Offset of the IPv4 header in a link-layer frame, or -1."""
+    if linktype == LINKTYPE_ETHERNET:
+        offset, ethertype = 14, _U16.unpack_from(data, 12)[0] if len(data) >= 14 else 0
+        while ethertype in (0x8100, 0x88a8) and len(data) >= offset + 4:
+            ethertype = _U16.unpack_from(data, offset + 2)[0]
+            offset += 4
+        return offset if ethertype == 0x0800 else -1
+    if linktype == LINKTYPE_LINUX_SLL:
+        return 16 if len(data) >= 16 and _U16.unpack_from(data, 14)[0] == 0x0800 else -1
+    if linktype == LINKTYPE_LINUX_SLL2:
+        return 20 if len(data) >= 20 and _U16.unpack_from(data, 0)[0] == 0x0800 else -1
+    if linktype in LINKTYPE_RAW:
+        return 0
+    if linktype == LINKTYPE_NULL:
+        return 4 if len(data) >= 4 and data[0] in (2, 0) and data[3] in (2, 0) else -1
+    return -1
+
+
+# ----------------------------------------------------------------------
+# Per-file decoding
+# ----------------------------------------------------------------------
+class CaptureFileSummarizer:
+    """Decodes one capture file into flow counters and NGAP/PFCP control-plane events."""
+
+    def __init__(self, path):
+        self.path = path
+        self.capture_point = capture_point_name(path)
+        self.packets = 0
+        self.bytes = 0
+        self.first = None
+        self.last = None
+        # key -> [packets, bytes, first, last]
+        self.flows = {}
+        self.ngap_events = []
+        self.pfcp_events = []
+        # Address hit counts on tunnel (raw IP) interfaces, used to find a UE's own address
+        self.tun_addresses = {}
+        self.tun_packets = 0
+
+    def run(self):
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return self.result()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for ts, linktype, data in _iter_packets(mapped):
+                    self._packet(ts, linktype, data)
+        return self.result()
+
+    def _packet(self, ts, linktype, data):
+        self.packets += 1
+        if self.first is None:
+            self.first = ts
+        self.last = ts
+        offset = _ipv4_offset(linktype, data)
+        if offset < 0 or len(data) < offset + 20 or data[offset] >> 4 != 4:
+            return
+        ihl = (data[offset] & 0x0f) * 4
+        # Count the on-wire IP length; captures are usually cut short by the snaplen
+        length = _U16.unpack_from(data, offset + 2)[0]
+        self.bytes += length
+        proto = data[offset + 9]
+        src = bytes(data[offset + 12:offset + 16])
+        dst = bytes(data[offset + 16:offset + 20])
+        l4 = offset + ihl
+        first_fragment = _U16.unpack_from(data, offset + 6)[0] & 0x1fff == 0
+        sport = dport = 0
+        if first_fragment and proto in (6, 17, 132) and len(data) >= l4 + 4:
+            sport, dport = _PORTS.unpack_from(data, l4)
+
+        if proto == 17 and GTPU_PORT in (sport, dport):
+            if self._gtpu(ts, data, l4 + 8, length):
+                return
+        elif proto == 17 and PFCP_PORT in (sport, dport):
+            self._pfcp(ts, src, dst, data[l4 + 8:])
+        elif proto == 132 and NGAP_PORT in (sport, dport):
+            self._sctp(ts, src, dst, data, l4 + 12)
+
+        if linktype in LINKTYPE_RAW:
+            self.tun_packets += 1
+            counts = self.tun_addresses
+            counts[src] = counts.get(src, 0) + 1
+            counts[dst] = counts.get(dst, 0) + 1
+        self._count(('ip', 0, None, src, dst, proto, sport, dport), ts, length)
+
+    def _count(self, key, ts, length):
+        flow = self.flows.get(key)
+        if flow is None:
+            self.flows[key] = [1, length, ts, ts]
+        else:
+            flow[0] += 1
+            flow[1] += length
+            flow[3] = ts
+
+    def _gtpu(self, ts, data, g, outer_length):
+        """Count a G-PDU under its TEID and inner flow. Returns False if it is not user data."""
+        if len(data) < g + 8 or data[g] >> 5 != 1 or data[g + 1] != 0xff:
+            return False
+        flags = data[g]
+        teid = _U32.unpack_from(data, g + 4)[0]
+        p = g + 8
+        direction = None
+        if flags & 0x07:
+            if len(data) < g + 12:
+                return False
+            next_ext = data[g + 11]
+            p = g + 12
+            while next_ext and p < len(data):
+                ext_len = data[p] * 4
+                if ext_len == 0 or p + ext_len > len(data):
+                    break
+                if next_ext == 0x85:
+                    # PDU Session Container: PDU type 0 = DL PDU SESSION INFORMATION, 1 = UL
+                    direction = 'ul' if data[p + 1] >> 4 == 1 else 'dl'
+                next_ext = data[p + ext_len - 1]
+                p += ext_len
+        if len(data) < p + 20 or data[p] >> 4 != 4:
+            # Non-IPv4 payload: still user traffic on this TEID
+            self._count(('gtpu', teid, direction, None, None, 0, 0, 0), ts, max(outer_length - (p - g) - 8, 0))
+            return True
+        inner_length = _U16.unpack_from(data, p + 2)[0]
+        proto = data[p + 9]
+        l4 = p + (data[p] & 0x0f) * 4
+        sport = dport = 0
+        if proto in (6, 17) and len(data) >= l4 + 4 and _U16.unpack_from(data, p + 6)[0] & 0x1fff == 0:
+            sport, dport = _PORTS.unpack_from(data, l4)
+        self._count(('gtpu', teid, direction, bytes(data[p + 12:p + 16]), bytes(data[p + 16:p + 20]),
+                     proto, sport, dport), ts, inner_length)
+        return True
+
+    def _sctp(self, ts, src, dst, data, p):
+        end = len(data)
+        while p + 4 <= end:
+            chunk_type = data[p]
+            chunk_len = _U16.unpack_from(data, p + 2)[0]
+            if chunk_len < 4:
+                break
+            if chunk_type == 0 and chunk_len >= 17 and p + 16 < end:
+                ppid = _U32.unpack_from(data, p + 12)[0]
+                if ppid in (NGAP_PPID, 0):
+                    event = _decode_ngap(data[p + 16:min(p + chunk_len, end)])
+                    if event:
+                        self.ngap_events.append([ts, socket.inet_ntoa(src), socket.inet_ntoa(dst)] + event)
+            p += (chunk_len + 3) & ~3
+
+    def _pfcp(self, ts, src, dst, payload):
+        event = _decode_pfcp(payload)
+        if event:
+            self.pfcp_events.append([ts, socket.inet_ntoa(src), socket.inet_ntoa(dst)] + event)
+
+    def result(self):
+        """Plain-data result that can cross a process boundary."""
+        def ip(address):
+            return socket.inet_ntoa(address) if address else None
+
+        local_address = None
+        if self.tun_addresses:
+            address, hits = max(self.tun_addresses.items(), key=lambda item: item[1])
+            # On a UE tunnel interface the UE's own address is in (almost) every packet
+            if hits >= 0.9 * self.tun_packets:
+                local_address = ip(address)
+        flows = [[kind, teid, direction, ip(src), ip(dst), proto, sport, dport] + counters
+                 for (kind, teid, direction, src, dst, proto, sport, dport), counters in self.flows.items()]
+        return {
+            'file': self.path,
+            'capture_point': self.capture_point,
+            'packets': self.packets,
+            'bytes': self.bytes,
+            'first': self.first,
+            'last': self.last,
+            'local_address': local_address,
+            'flows': flows,
+            'ngap': self.ngap_events,
+            'pfcp': self.pfcp_events
+        }
+
+
+def _aper_length(pdu, p):
+    """Decode an APER length determinant. Returns (length, next offset) or (None, p) when fragmented."""
+    if p >= len(pdu):
+        return None, p
+    if pdu[p] & 0x80 == 0:
+        return pdu[p], p + 1
+    if pdu[p] & 0xc0 == 0x80 and p + 1 < len(pdu):
+        return ((pdu[p] & 0x3f) << 8) | pdu[p + 1], p + 2
+    return None, p
+
+
+def _decode_ngap(pdu):
+    """
+    Decode the NGAP header and UE identities from an APER-encoded NGAP-PDU.
+
+    Returns:
+        list: [pdu kind (0 initiating, 1 successful, 2 unsuccessful), procedure code,
+               RAN-UE-NGAP-ID, AMF-UE-NGAP-ID] or None
+    """
+    if len(pdu) < 4:
+        return None
+    kind = (pdu[0] >> 5) & 0x03
+    procedure = pdu[1]
+    if kind > 2:
+        return None
+    ran_ue_id = amf_ue_id = None
+    length, p = _aper_length(pdu, 3)
+    if length is not None and p + 3 <= len(pdu):
+        # SEQUENCE extension bit octet, then the ProtocolIE-Container count
+        count = _U16.unpack_from(pdu, p + 1)[0]
+        p += 3
+        for _ in range(count):
+            if p + 4 > len(pdu):
+                break
+            ie_id = _U16.unpack_from(pdu, p)[0]
+            ie_length, value = _aper_length(pdu, p + 3)
+            if ie_length is None or value >= len(pdu):
+                break
+            if ie_id in (NGAP_IE_RAN_UE_NGAP_ID, NGAP_IE_AMF_UE_NGAP_ID):
+                # Constrained whole number: octet count in the leading bits, then the value octets
+                size = (pdu[value] >> 6) + 1 if ie_id == NGAP_IE_RAN_UE_NGAP_ID else (pdu[value] >> 5) + 1
+                if value + 1 + size <= len(pdu):
+                    number = int.from_bytes(pdu[value + 1:value + 1 + size], 'big')
+                    if ie_id == NGAP_IE_RAN_UE_NGAP_ID:
+                        ran_ue_id = number
+                    else:
+                        amf_ue_id = number
+                if ran_ue_id is not None and amf_ue_id is not None:
+                    break
+            p = value + ie_length
+    return [kind, procedure, ran_ue_id, amf_ue_id]
+
+
+def _decode_pfcp(payload):
+    """
+    Decode a PFCP message header and the session IEs used for UE correlation.
+
+    Returns:
+        list: [message type, SEID or None, sequence number, details dict] or None
+    """
+    if len(payload) < 8 or payload[0] >> 5 != 1:
+        return None
+    message_type = payload[1]
+    end = min(len(payload), 4 + _U16.unpack_from(payload, 2)[0])
+    if payload[0] & 0x01:
+        if len(payload) < 16:
+            return None
+        seid = _U64.unpack_from(payload, 4)[0]
+        sequence = int.from_bytes(payload[12:15], 'big')
+        p = 16
+    else:
+        seid = None
+        sequence = int.from_bytes(payload[4:7], 'big')
+        p = 8
+    details = {}
+    if message_type in (50, 51, 52, 53):
+        _walk_pfcp_ies(payload, p, end, details, None)
+    return [message_type, seid, sequence, details]
+
+
+def _walk_pfcp_ies(payload, p, end, details, parent):
+    while p + 4 <= end:
+        ie_type, ie_length = struct.unpack_from('!HH', payload, p)
+        value, p = p + 4, p + 4 + ie_length
+        if p > end:
+            break
+        if ie_type in PFCP_GROUPED_IES:
+            _walk_pfcp_ies(payload, value, p, details, ie_type)
+        elif ie_type == PFCP_IE_CAUSE and ie_length >= 1 and parent is None:
+            details['cause'] = payload[value]
+        elif ie_type == PFCP_IE_F_SEID and ie_length >= 9 and parent is None:
+            details['f_seid'] = _U64.unpack_from(payload, value + 1)[0]
+        elif ie_type == PFCP_IE_UE_IP_ADDRESS and ie_length >= 5 and payload[value] & 0x02:
+            details.setdefault('ue_ips', []).append(socket.inet_ntoa(bytes(payload[value + 1:value + 5])))
+        elif ie_type == PFCP_IE_F_TEID and ie_length >= 5 and not payload[value] & 0x04:
+            # UPF-side F-TEID (in PDI / Created PDR): the uplink tunnel
+            details.setdefault('ul_teids', []).append(_U32.unpack_from(payload, value + 1)[0])
+        elif ie_type == PFCP_IE_OUTER_HEADER_CREATION and ie_length >= 6 and payload[value] & 0x01:
+            # GTP-U/UDP/IPv4 towards the gNB: the downlink tunnel
+            details.setdefault('dl_teids', []).append(_U32.unpack_from(payload, value + 2)[0])
+
+
+def summarize_file(path):
+    """Process pool entry point: summarize one capture file."""
+    try:
+        return CaptureFileSummarizer(path).run()
+    except Exception as e:
+        return {'file': path, 'capture_point': capture_point_name(path), 'error': str(e)}
+
+
+# ----------------------------------------------------------------------
+# Merging and summary tables
+# ----------------------------------------------------------------------
+def _latency_stats(values):
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def percentile(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+    return {'count': len(ordered), 'mean_ms': round(sum(ordered) / len(ordered), 3),
+            'p50_ms': percentile(0.50), 'p95_ms': percentile(0.95), 'max_ms': round(ordered[-1], 3)}
+
+
+def _rate(byte_count, first, last):
+    duration = (last - first) if first is not None and last is not None else 0
+    return round(byte_count * 8 / duration / 1e6, 3) if duration > 0 else 0.0
+
+
+def summarize_pfcp(events):
+    """Pair PFCP requests with responses and rebuild sessions (UE IP, SEIDs, TEIDs)."""
+    pending = {}
+    latencies = {}
+    sessions = {}
+    by_up_seid = {}
+    for ts, src, dst, message_type, seid, sequence, details in sorted(events, key=lambda e: e[0]):
+        if message_type in PFCP_REQUESTS:
+            pending[(src, dst, sequence)] = (ts, message_type, details)
+            if message_type in (52, 54) and seid in by_up_seid:
+                session = by_up_seid[seid]
+                session['dl_teids'].update(details.get('dl_teids', []))
+                session['ul_teids'].update(details.get('ul_teids', []))
+                if message_type == 54:
+                    session['released'] = ts
+            continue
+        request = pending.pop((dst, src, sequence), None)
+        if request is None:
+            continue
+        request_ts, request_type, request_details = request
+        name = PFCP_MESSAGES.get(request_type, f'Type{request_type}')
+        latencies.setdefault(name, []).append((ts - request_ts) * 1000)
+        if message_type == 51 and details.get('cause') == PFCP_CAUSE_ACCEPTED:
+            cp_seid = request_details.get('f_seid', seid)
+            session = {
+                'cp_seid': cp_seid,
+                'up_seid': details.get('f_seid'),
+                'smf': dst,
+                'upf': src,
+                'ue_ips': set(request_details.get('ue_ips', [])) | set(details.get('ue_ips', [])),
+                'ul_teids': set(request_details.get('ul_teids', [])) | set(details.get('ul_teids', [])),
+                'dl_teids': set(request_details.get('dl_teids', [])),
+                'established': ts,
+                'setup_ms': round((ts - request_ts) * 1000, 3),
+                'released': None
+            }
+            sessions[cp_seid] = session
+            if session['up_seid'] is not None:
+                by_up_seid[session['up_seid']] = session
+    return {
+        'messages': {name: _latency_stats(values) for name, values in sorted(latencies.items())},
+        'sessions': list(sessions.values()),
+        'unanswered': len(pending)
+    }
+
+
+def summarize_ngap(events):
+    """Pair NGAP procedures and derive per-UE registration and PDU session setup latency."""
+    pending = {}
+    latencies = {}
+    gnbs = set()
+    ues = {}
+    ordered = sorted(events, key=lambda e: e[0])
+    for ts, src, dst, kind, procedure, _, _ in ordered:
+        if kind == 0 and procedure in (21, 15):
+            gnbs.add(src)
+
+    for ts, src, dst, kind, procedure, ran_ue_id, amf_ue_id in ordered:
+        gnb = src if src in gnbs or dst not in gnbs else dst
+        association = (gnb, dst if gnb == src else src)
+        ue = None
+        if ran_ue_id is not None:
+            ue = ues.setdefault((gnb, ran_ue_id), {'gnb': gnb, 'ran_ue_ngap_id': ran_ue_id, 'amf_ue_ngap_id': None,
+                                                   'initial_ue_message': None, 'registration_ms': None,
+                                                   'pdu_session_setup_ms': []})
+            if amf_ue_id is not None:
+                ue['amf_ue_ngap_id'] = amf_ue_id
+            if kind == 0 and procedure == 15 and ue['initial_ue_message'] is None:
+                ue['initial_ue_message'] = ts
+
+        if procedure not in NGAP_REQUEST_RESPONSE:
+            continue
+        key = (association, procedure, ran_ue_id)
+        if kind == 0:
+            pending.setdefault(key, []).append(ts)
+            continue
+        started = pending.get(key)
+        if not started:
+            continue
+        latency = (ts - started.pop(0)) * 1000
+        name = NGAP_PROCEDURES.get(procedure, f'Procedure{procedure}')
+        latencies.setdefault(name if kind == 1 else f'{name} (failure)', []).append(latency)
+        if ue is not None and kind == 1:
+            if procedure == 14 and ue['initial_ue_message'] is not None and ue['registration_ms'] is None:
+                ue['registration_ms'] = round((ts - ue['initial_ue_message']) * 1000, 3)
+            elif procedure == 29:
+                ue['pdu_session_setup_ms'].append(round(latency, 3))
+
+    return {
+        'procedures': {name: _latency_stats(values) for name, values in sorted(latencies.items())},
+        'ues': list(ues.values()),
+        'unanswered': sum(len(v) for v in pending.values())
+    }
+
+
+def _merge_flows(results):
+    """Merge per-file flow counters into capture point -> flow key -> counters."""
+    merged = {}
+    for result in results:
+        flows = merged.setdefault(result['capture_point'], {})
+        for row in result.get('flows', []):
+            key = tuple(row[:8])
+            packets, byte_count, first, last = row[8:]
+            flow = flows.get(key)
+            if flow is None:
+                flows[key] = [packets, byte_count, first, last]
+            else:
+                flow[0] += packets
+                flow[1] += byte_count
+                flow[2] = min(flow[2], first)
+                flow[3] = max(flow[3], last)
+    return merged
+
+
+def summarize_ues(merged_flows, results, pfcp):
+    """
+    Build the per-UE table.
+
+    GTP-U flows are attributed through the PDU Session Container direction, the PFCP
+    TEIDs, or a known UE address; UE tunnel captures through the file's own address.
+    The same traffic is usually seen at several capture points (gNB and UPF), so each
+    UE reports the capture point that saw the most of its traffic.
+    """
+    ue_ips = {ip for session in pfcp['sessions'] for ip in session['ue_ips']}
+    ul_teids, dl_teids, teid_session = set(), set(), {}
+    for session in pfcp['sessions']:
+        ul_teids |= session['ul_teids']
+        dl_teids |= session['dl_teids']
+        for teid in session['ul_teids'] | session['dl_teids']:
+            teid_session[teid] = session
+    for flows in merged_flows.values():
+        for kind, teid, direction, src, dst, *_ in flows:
+            if kind == 'gtpu' and direction == 'ul' and src:
+                ue_ips.add(src)
+            elif kind == 'gtpu' and direction == 'dl' and dst:
+                ue_ips.add(dst)
+    local_addresses = {}
+    for result in results:
+        if result.get('local_address'):
+            local_addresses[result['capture_point']] = result['local_address']
+            ue_ips.add(result['local_address'])
+
+    observed = {}  # (ue ip, capture point) -> counters
+    for capture_point, flows in merged_flows.items():
+        local = local_addresses.get(capture_point)
+        for (kind, teid, direction, src, dst, *_), (packets, byte_count, first, last) in flows.items():
+            if kind == 'gtpu':
+                if direction is None:
+                    if teid in ul_teids or src in ue_ips:
+                        direction = 'ul'
+                    elif teid in dl_teids or dst in ue_ips:
+                        direction = 'dl'
+                    else:
+                        continue
+                ue_ip = src if direction == 'ul' else dst
+                if ue_ip is None and teid in teid_session and teid_session[teid]['ue_ips']:
+                    ue_ip = sorted(teid_session[teid]['ue_ips'])[0]
+            elif local and local in (src, dst):
+                ue_ip, direction = local, ('ul' if src == local else 'dl')
+            else:
+                continue
+            if ue_ip is None:
+                continue
+            entry = observed.setdefault((ue_ip, capture_point), {
+                'ue_ip': ue_ip, 'observed_at': capture_point, 'teids': set(),
+                'ul_packets': 0, 'ul_bytes': 0, 'dl_packets': 0, 'dl_bytes': 0, 'first': first, 'last': last})
+            entry[f'{direction}_packets'] += packets
+            entry[f'{direction}_bytes'] += byte_count
+            entry['first'] = min(entry['first'], first)
+            entry['last'] = max(entry['last'], last)
+            if kind == 'gtpu':
+                entry['teids'].add(teid)
+
+    sessions_by_ip = {ip: session for session in pfcp['sessions'] for ip in session['ue_ips']}
+    best = {}
+    for (ue_ip, _), entry in observed.items():
+        total = entry['ul_bytes'] + entry['dl_bytes']
+        if ue_ip not in best or total > best[ue_ip]['ul_bytes'] + best[ue_ip]['dl_bytes']:
+            best[ue_ip] = entry
+    ues = []
+    for ue_ip, entry in sorted(best.items()):
+        session = sessions_by_ip.get(ue_ip)
+        ues.append({
+            'ue_ip': ue_ip,
+            'observed_at': entry['observed_at'],
+            'ul_packets': entry['ul_packets'],
+            'ul_bytes': entry['ul_bytes'],
+            'dl_packets': entry['dl_packets'],
+            'dl_bytes': entry['dl_bytes'],
+            'duration': round(entry['last'] - entry['first'], 3),
+            'ul_mbps': _rate(entry['ul_bytes'], entry['first'], entry['last']),
+            'dl_mbps': _rate(entry['dl_bytes'], entry['first'], entry['last']),
+            'teids': sorted(entry['teids'] | (session['ul_teids'] | session['dl_teids'] if session else set())),
+            'pfcp_cp_seid': session['cp_seid'] if session else None,
+            'pdu_session_setup_ms': session['setup_ms'] if session else None
+        })
+    return ues
+
+
+def summarize_flows(merged_flows, top=None):
+    """Flatten merged flows into rows sorted by bytes."""
+    rows = []
+    for capture_point, flows in merged_flows.items():
+        for (kind, teid, direction, src, dst, proto, sport, dport), (packets, byte_count, first, last) in flows.items():
+            rows.append({
+                'capture_point': capture_point, 'kind': kind, 'teid': teid if kind == 'gtpu' else None,
+                'direction': direction, 'src': src, 'dst': dst, 'proto': proto, 'sport': sport, 'dport': dport,
+                'packets': packets, 'bytes': byte_count, 'duration': round(last - first, 3),
+                'mbps': _rate(byte_count, first, last)
+            })
+    rows.sort(key=lambda row: row['bytes'], reverse=True)
+    return rows[:top] if top else rows
+
+
+def summarize_captures(paths, workers=None, top_flows=200, progress_callback=None):
+    """
+    Summarize capture files in a process pool.
+
+    Args:
+        paths (list): Capture files and/or directories (e.g. a capture session directory)
+        workers (int): Worker processes; defaults to the CPU count, 1 disables the pool
+        top_flows (int): Number of flows kept in the flow table (all if None)
+        progress_callback (callable): Called with a message after each file
+
+    Returns:
+        dict: Summary with 'flows', 'ues', 'ngap', 'pfcp', 'files' and totals
+    """
+    started = time.time()
+    files = find_capture_files(paths)
+    results = []
+    workers = min(workers or os.cpu_count() or 1, len(files)) if files else 0
+
+    def collect(result):
+        results.append(result)
+        if result.get('error'):
+            warning_print(f"Could not summarize {result['file']}: {result['error']}")
+        elif progress_callback:
+            progress_callback(f"Summarized {os.path.basename(result['file'])} "
+                              f"({len(results)}/{len(files)}, {result['packets']} packets)")
+
+    if workers <= 1:
+        for path in files:
+            collect(summarize_file(path))
+    else:
+        debug_print(f"Summarizing {len(files)} capture file(s) with {workers} worker process(es)")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(summarize_file, path) for path in files]):
+                collect(future.result())
+
+    ok = [result for result in results if not result.get('error')]
+    merged = _merge_flows(ok)
+    pfcp = summarize_pfcp([event for result in ok for event in result['pfcp']])
+    ngap = summarize_ngap([event for result in ok for event in result['ngap']])
+    ues = summarize_ues(merged, ok, pfcp)
+    for session in pfcp['sessions']:
+        for field in ('ue_ips', 'ul_teids', 'dl_teids'):
+            session[field] = sorted(session[field])
+
+    return {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'elapsed': round(time.time() - started, 3),
+        'workers': workers,
+        'files': [{'file': result['file'], 'capture_point': result['capture_point'],
+                   'packets': result.get('packets', 0), 'bytes': result.get('bytes', 0),
+                   'error': result.get('error')} for result in sorted(results, key=lambda r: r['file'])],
+        'packets': sum(result['packets'] for result in ok),
+        'bytes': sum(result['bytes'] for result in ok),
+        'flows': summarize_flows(merged, top_flows),
+        'ues': ues,
+        'ngap': ngap,
+        'pfcp': pfcp
+    }
+
+
+def write_summary(summary, path):
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    debug_print(f"Capture summary written to {path}")
+    return path
+
+
+def format_summary(summary, top=20):
+    """Render a capture summary as text tables."""
+    lines = [f"{len(summary['files'])} file(s), {summary['packets']} packets, "
+             f"{summary['bytes'] / 1e6:.1f} MB IP traffic, summarized in {summary['elapsed']:.2f}s "
+             f"({summary['workers']} worker(s))", ""]
+
+    lines.append(f"{'UE':<16} {'observed at':<22} {'UL Mbit/s':>10} {'DL Mbit/s':>10} "
+                 f"{'UL MB':>9} {'DL MB':>9} {'PDU setup':>10}")
+    for ue in summary['ues']:
+        setup = '-' if ue['pdu_session_setup_ms'] is None else f"{ue['pdu_session_setup_ms']:.1f}ms"
+        lines.append(f"{ue['ue_ip']:<16} {ue['observed_at']:<22} {ue['ul_mbps']:>10.2f} {ue['dl_mbps']:>10.2f} "
+                     f"{ue['ul_bytes'] / 1e6:>9.2f} {ue['dl_bytes'] / 1e6:>9.2f} {setup:>10}")
+    if not summary['ues']:
+        lines.append("(no UE user-plane traffic found)")
+
+    lines += ["", f"{'flow':<58} {'capture point':<22} {'packets':>9} {'MB':>9} {'Mbit/s':>8}"]
+    for flow in summary['flows'][:top]:
+        label = f"{flow['src']}:{flow['sport']} > {flow['dst']}:{flow['dport']}/{flow['proto']}"
+        if flow['kind'] == 'gtpu':
+            label = f"teid {flow['teid']:#x} {flow['direction'] or '?'} {label}"
+        lines.append(f"{label:<58} {flow['capture_point']:<22} {flow['packets']:>9} "
+                     f"{flow['bytes'] / 1e6:>9.2f} {flow['mbps']:>8.2f}")
+
+    for title, table in (("NGAP procedure", summary['ngap']['procedures']),
+                         ("PFCP message", summary['pfcp']['messages'])):
+        lines += ["", f"{title:<40} {'count':>6} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for name, stats in table.items():
+            lines.append(f"{name:<40} {stats['count']:>6} {stats['mean_ms']:>9.2f} "
+                         f"{stats['p95_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+
+    registered = [ue['registration_ms'] for ue in summary['ngap']['ues'] if ue['registration_ms'] is not None]
+    if registered:
+        stats = _latency_stats(registered)
+        lines += ["", f"UE registration (InitialUEMessage -> InitialContextSetup): {stats['count']} UE(s), "
+                      f"mean {stats['mean_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, max {stats['max_ms']:.1f}ms"]
+    lines.append(f"PFCP sessions established: {len(summary['pfcp']['sessions'])}")
+    failed = [entry for entry in summary['files'] if entry['error']]
+    if failed:
+        lines.append(f"{len(failed)} file(s) could not be read")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize NetFlux5G capture files (GTP-U, NGAP, PFCP)")
+    parser.add_argument('paths', nargs='+', help="Capture files or capture session directories")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=20, help="Flows shown in the text report")
+    parser.add_argument('--json', help="Write the full summary as JSON to this path")
+    args = parser.parse_args(argv)
+
+    summary = summarize_captures(args.paths, workers=args.workers)
+    if not summary['files']:
+        error_print("No capture files found")
+        return 1
+    if args.json:
+        write_summary(summary, args.json)
+    print(format_summary(summary, top=args.top))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
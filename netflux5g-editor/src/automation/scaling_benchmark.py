@@ -0,0 +1,368 @@
+"""
+Scaling benchmark suite for NetFlux5G Editor
+Generates topologies with N gNBs and M UEs and times the offline pipeline stages at each size
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print, warning_print
+
+TESTING_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))), 'testing')
+DEFAULT_TEMPLATE = os.path.join(TESTING_DIR, 'sdn_topology_urban-2-15.nf5g')
+
+# (gNBs, UEs) pairs; the first six mirror the hand-made testing/sdn_topology_urban-*.nf5g files
+DEFAULT_SIZES = [(2, 15), (2, 20), (3, 25), (3, 30), (4, 35), (4, 40), (8, 80), (16, 160)]
+
+STAGES = ('generate', 'load', 'export', 'export_compact', 'config_copy')
+
+# Log-log slope above which a stage is reported as growing super-linearly
+SUPERLINEAR_EXPONENT = 1.5
+
+
+def _replace_strings(value, replacements):
+    """Recursively apply string replacements to every string in a node/property structure."""
+    if isinstance(value, str):
+        for old, new in replacements:
+            value = value.replace(old, new)
+        return value
+    if isinstance(value, dict):
+        return {key: _replace_strings(item, replacements) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_strings(item, replacements) for item in value]
+    return value
+
+
+def _node_index(name):
+    """'GNB #2' -> '2'."""
+    return name.split('#')[-1].strip()
+
+
+def scale_topology(template, gnb_count, ue_count):
+    """
+    Build a topology with gnb_count gNBs and ue_count UEs from a template topology.
+
+    Core, switches and controllers are kept. gNBs are cloned from the template's first gNB and
+    linked round-robin to the switches the template gNBs were linked to. UEs are cloned from the
+    template's first UE, spread round-robin over the gNBs and over the template's APNs.
+    """
+    topology = copy.deepcopy(template)
+    gnb_template = next(n for n in template['nodes'] if n['type'] == 'GNB')
+    ue_template = next(n for n in template['nodes'] if n['type'] == 'UE')
+    template_gnbs = {n['name'] for n in template['nodes'] if n['type'] == 'GNB'}
+    template_ues = [n for n in template['nodes'] if n['type'] == 'UE']
+    apns = sorted({n.get('properties', {}).get('UE_APN', 'internet') for n in template_ues}) or ['internet']
+
+    gnb_uplinks = []
+    for link in template['links']:
+        if link.get('source') in template_gnbs and link.get('destination') not in template_gnbs:
+            gnb_uplinks.append(link)
+    topology['nodes'] = [n for n in topology['nodes'] if n['type'] not in ('GNB', 'UE')]
+    topology['links'] = [l for l in topology['links']
+                         if l.get('source') not in template_gnbs and l.get('destination') not in template_gnbs]
+
+    gnb_index = _node_index(gnb_template['name'])
+    gnb_radius = float(gnb_template.get('properties', {}).get('GNB_Range', 300))
+    columns = max(1, math.ceil(math.sqrt(gnb_count)))
+    gnbs = []
+    for i in range(1, gnb_count + 1):
+        replacements = [(f'GNB #{gnb_index}', f'GNB #{i}'), (f'GNB__{gnb_index}', f'GNB__{i}'),
+                        (f'gnb-hotspot{gnb_index}', f'gnb-hotspot{i}')]
+        gnb = _replace_strings(copy.deepcopy(gnb_template), replacements)
+        gnb['x'] = ((i - 1) % columns) * gnb_radius * 1.5
+        gnb['y'] = ((i - 1) // columns) * gnb_radius * 1.5
+        gnb['properties']['x'], gnb['properties']['y'] = gnb['x'], gnb['y']
+        gnb['component_id'] = gnb_template.get('component_id', 0) + i
+        gnbs.append(gnb)
+        if gnb_uplinks:
+            uplink = copy.deepcopy(gnb_uplinks[(i - 1) % len(gnb_uplinks)])
+            uplink['source'] = gnb['name']
+            uplink['name'] = f'link_gnb_{i}'
+            uplink.setdefault('properties', {}).update(source=gnb['name'], name=uplink['name'])
+            topology['links'].append(uplink)
+    topology['nodes'].extend(gnbs)
+
+    ue_index = _node_index(ue_template['name'])
+    ue_gnb = ue_template.get('properties', {}).get('UE_GNBHostName', 'GNB__1')
+    ue_apn = ue_template.get('properties', {}).get('UE_APN', 'internet')
+    radio_iface = ue_template.get('properties', {}).get('UE_RadioInterface', '')
+    for i in range(1, ue_count + 1):
+        gnb = gnbs[(i - 1) % gnb_count]
+        gnb_number = _node_index(gnb['name'])
+        ue = copy.deepcopy(ue_template)
+        ue['name'] = f'UE #{i}'
+        replacements = [(f'UE #{ue_index}', f'UE #{i}'), (ue_gnb, f'GNB__{gnb_number}')]
+        if radio_iface:
+            replacements.append((radio_iface, f'UE__{i}-wlan0'))
+        props = _replace_strings(ue['properties'], replacements)
+        apn = apns[(i - 1) % len(apns)]
+        for key in ('UE_APN', '5g_apn'):
+            if props.get(key) == ue_apn:
+                props[key] = apn
+        props['UE_MSISDN'] = props['5g_msisdn'] = f'{i:010d}'
+        # Place UEs on a ring inside their gNB's coverage
+        angle = 2 * math.pi * ((i - 1) // gnb_count) / max(1, math.ceil(ue_count / gnb_count))
+        ue['x'] = props['x'] = gnb['x'] + math.cos(angle) * gnb_radius * 0.5
+        ue['y'] = props['y'] = gnb['y'] + math.sin(angle) * gnb_radius * 0.5
+        ue['properties'] = props
+        ue['component_id'] = ue_template.get('component_id', 0) + 10000 + i
+        topology['nodes'].append(ue)
+
+    topology.setdefault('metadata', {})['generated_by'] = f'scaling_benchmark {gnb_count}-{ue_count}'
+    return topology
+
+
+class OfflineMainWindow:
+    """Just enough of the main window for the exporter and config copy to run headless."""
+
+    class _Status:
+        @staticmethod
+        def showCanvasStatus(message):
+            debug_print(message)
+
+    def __init__(self, nodes, links):
+        self.nodes = nodes
+        self.links = links
+        self.status_manager = self._Status()
+        self.showCanvasStatus = self._Status.showCanvasStatus
+        self.current_file = None
+
+    def extractTopology(self):
+        return self.nodes, self.links
+
+
+def _timed(func, repeat):
+    """Run func repeat times; return (median seconds, last result)."""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def benchmark_size(template, gnb_count, ue_count, work_dir, repeat=3):
+    """
+    Time every offline stage for one topology size.
+
+    Returns:
+        dict: size info, per-stage median seconds and generated script sizes
+    """
+    from export.mininet_export import MininetExporter
+    from automation.automation_runner import AutomationRunner
+
+    size_dir = os.path.join(work_dir, f'{gnb_count}-{ue_count}')
+    os.makedirs(size_dir, exist_ok=True)
+    timings = {}
+
+    timings['generate'], topology = _timed(lambda: scale_topology(template, gnb_count, ue_count), repeat)
+    topology_path = os.path.join(size_dir, f'sdn_topology_scaled-{gnb_count}-{ue_count}.nf5g')
+    with open(topology_path, 'w') as f:
+        json.dump(topology, f)
+
+    def load():
+        with open(topology_path, 'r') as f:
+            data = json.load(f)
+        return data, MininetExporter(None).categorize_nodes(data['nodes'])
+    timings['load'], (data, _) = _timed(load, repeat)
+
+    main_window = OfflineMainWindow(data['nodes'], data['links'])
+    exporter = MininetExporter(main_window)
+    script_path = os.path.join(size_dir, 'topology.py')
+    compact_path = os.path.join(size_dir, 'topology_compact.py')
+    timings['export'], _ = _timed(lambda: exporter.export_to_mininet_script(script_path, compact=False), repeat)
+    timings['export_compact'], _ = _timed(lambda: exporter.export_to_mininet_script(compact_path, compact=True),
+                                          repeat)
+
+    runner = AutomationRunner(main_window)
+
+    def copy_configs():
+        runner.export_dir = os.path.join(size_dir, 'deploy')
+        shutil.rmtree(runner.export_dir, ignore_errors=True)
+        os.makedirs(runner.export_dir)
+        return runner._copy_5g_configs()
+    timings['config_copy'], _ = _timed(copy_configs, repeat)
+
+    def file_size(path):
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def line_count(path):
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'r') as f:
+            return sum(1 for _ in f)
+
+    return {
+        'gnbs': gnb_count,
+        'ues': ue_count,
+        'nodes': len(data['nodes']),
+        'links': len(data['links']),
+        'timings': timings,
+        'script_bytes': file_size(script_path),
+        'script_lines': line_count(script_path),
+        'compact_script_bytes': file_size(compact_path),
+        'compact_script_lines': line_count(compact_path)
+    }
+
+
+def scaling_exponent(sizes, values):
+    """Least-squares slope of log(value) over log(size); ~1 is linear, ~2 quadratic."""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def analyze(results):
+    """Compute per-metric scaling exponents against node count."""
+    sizes = [r['nodes'] for r in results]
+    metrics = {f'timing.{stage}': [r['timings'].get(stage, 0.0) for r in results] for stage in STAGES}
+    metrics['script_bytes'] = [r['script_bytes'] for r in results]
+    metrics['compact_script_bytes'] = [r['compact_script_bytes'] for r in results]
+    analysis = {}
+    for metric, values in metrics.items():
+        exponent = scaling_exponent(sizes, values)
+        analysis[metric] = {
+            'exponent': exponent,
+            'superlinear': exponent is not None and exponent > SUPERLINEAR_EXPONENT
+        }
+    return analysis
+
+
+def format_report(results, analysis, width=40):
+    """Render results as a table plus one text bar chart per stage."""
+    lines = [f"{'gNBs':>5} {'UEs':>5} {'nodes':>6} " +
+             ' '.join(f'{stage:>14}' for stage in STAGES) + f" {'script':>10} {'compact':>10}"]
+    for r in results:
+        lines.append(f"{r['gnbs']:>5} {r['ues']:>5} {r['nodes']:>6} " +
+                     ' '.join(f"{r['timings'][stage] * 1000:>12.1f}ms" for stage in STAGES) +
+                     f" {r['script_bytes'] / 1024:>8.1f}KB {r['compact_script_bytes'] / 1024:>8.1f}KB")
+    for metric, info in analysis.items():
+        exponent = '-' if info['exponent'] is None else f"{info['exponent']:.2f}"
+        flag = '  SUPERLINEAR' if info['superlinear'] else ''
+        lines.append('')
+        lines.append(f"{metric} (scaling exponent {exponent}){flag}")
+        key = metric.split('.', 1)[1] if metric.startswith('timing.') else metric
+        values = [r['timings'][key] if metric.startswith('timing.') else r[key] for r in results]
+        peak = max(values) or 1
+        for r, value in zip(results, values):
+            bar = '#' * max(1, int(round(width * value / peak))) if value else ''
+            lines.append(f"  {r['gnbs']:>3}x{r['ues']:<5} {bar:<{width}} {value:.4g}")
+    return '\n'.join(lines)
+
+
+def plot_results(results, path):
+    """Write a PNG chart when matplotlib is available; return the path or None."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        warning_print("matplotlib not installed, skipping chart")
+        return None
+    nodes = [r['nodes'] for r in results]
+    figure, (timing_axis, size_axis) = plt.subplots(1, 2, figsize=(12, 5))
+    for stage in STAGES:
+        timing_axis.plot(nodes, [r['timings'][stage] * 1000 for r in results], marker='o', label=stage)
+    timing_axis.set_xlabel('nodes')
+    timing_axis.set_ylabel('ms (median)')
+    timing_axis.set_title('Pipeline stage time')
+    timing_axis.legend()
+    size_axis.plot(nodes, [r['script_bytes'] / 1024 for r in results], marker='o', label='script')
+    size_axis.plot(nodes, [r['compact_script_bytes'] / 1024 for r in results], marker='o', label='compact script')
+    size_axis.set_xlabel('nodes')
+    size_axis.set_ylabel('KB')
+    size_axis.set_title('Generated script size')
+    size_axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+    return path
+
+
+def store_results(results, db_path=None):
+    """Record each size as a benchmark run so later runs can be compared for regressions."""
+    from automation.benchmark_store import BenchmarkStore, DEFAULT_DB_PATH
+    with BenchmarkStore(db_path or DEFAULT_DB_PATH) as store:
+        for r in results:
+            run_id = store.create_run(f"scaling-{r['gnbs']}-{r['ues']}", 'scaling',
+                                      {'gnbs': r['gnbs'], 'ues': r['ues'], 'nodes': r['nodes']})
+            store.add_timings(run_id, dict(r['timings'], script_kb=r['script_bytes'] / 1024.0))
+
+
+def run_suite(sizes=None, template_path=DEFAULT_TEMPLATE, output_dir=None, repeat=3, keep=False):
+    """
+    Run the scaling suite.
+
+    Returns:
+        dict: { 'results': [...], 'analysis': {...} }
+    """
+    with open(template_path, 'r') as f:
+        template = json.load(f)
+    work_dir = tempfile.mkdtemp(prefix='netflux5g-scaling-')
+    results = []
+    try:
+        for gnb_count, ue_count in sizes or DEFAULT_SIZES:
+            debug_print(f"Benchmarking {gnb_count} gNB(s) / {ue_count} UE(s)...")
+            results.append(benchmark_size(template, gnb_count, ue_count, work_dir, repeat))
+    finally:
+        if keep:
+            print(f"Generated topologies kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    suite = {'template': os.path.basename(template_path), 'repeat': repeat,
+             'results': results, 'analysis': analyze(results)}
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, 'scaling_results.json'), 'w') as f:
+            json.dump(suite, f, indent=2)
+        suite['chart'] = plot_results(results, os.path.join(output_dir, 'scaling_results.png'))
+    return suite
+
+
+def _parse_size(text):
+    gnbs, ues = text.lower().split('x')
+    return int(gnbs), int(ues)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the offline NetFlux5G pipeline over growing topologies")
+    parser.add_argument('--sizes', nargs='+', type=_parse_size, metavar='GNBSxUES',
+                        help="Topology sizes, e.g. 2x15 4x40 16x160")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="Template topology to scale")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per stage (median is reported)")
+    parser.add_argument('--output-dir', help="Write scaling_results.json (and a PNG chart with matplotlib)")
+    parser.add_argument('--store', action='store_true', help="Record results in the benchmark database")
+    parser.add_argument('--keep', action='store_true', help="Keep generated topologies and scripts")
+    args = parser.parse_args(argv)
+
+    try:
+        suite = run_suite(args.sizes, args.template, args.output_dir, args.repeat, args.keep)
+    except Exception as e:
+        error_print(f"Scaling benchmark failed: {e}")
+        return 2
+    print(format_report(suite['results'], suite['analysis']))
+    if args.store:
+        store_results(suite['results'])
+    return 1 if any(info['superlinear'] for info in suite['analysis'].values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
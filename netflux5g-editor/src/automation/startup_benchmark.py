@@ -0,0 +1,130 @@
+"""
+Startup benchmark for NetFlux5G Editor
+Times cold launches of the editor, from process start to an interactive canvas, for the lazy and eager boot paths
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(SRC_DIR, 'main.py')
+
+# Printed by NetFlux5GApp.reportStartupBenchmark
+RESULT_PREFIX = "NF5G_STARTUP "
+
+MODES = {
+    'lazy': [],
+    'eager': ['--eager-startup'],
+}
+
+
+def launch_once(mode, timeout=120):
+    """
+    Start the editor in a fresh process and return its startup report.
+
+    'wall' covers interpreter start-up too; 'total' is measured inside the process
+    from the first line of main.py to the first painted frame.
+    """
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    command = [sys.executable, MAIN_SCRIPT, '--no-welcome', '--startup-benchmark'] + MODES[mode]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, text=True, timeout=timeout)
+    wall = time.perf_counter() - start
+    for line in result.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            report = json.loads(line[len(RESULT_PREFIX):])
+            report['wall'] = round(wall, 4)
+            return report
+    raise RuntimeError(f"{mode} launch printed no startup report (exit code {result.returncode}): "
+                       f"{result.stderr.strip()[-500:]}")
+
+
+def clear_ui_cache():
+    """Remove compiled UI modules so the next launch compiles them again."""
+    from utils.ui_loader import COMPILED_DIR
+    shutil.rmtree(COMPILED_DIR, ignore_errors=True)
+
+
+def run_benchmark(modes=('eager', 'lazy'), repeat=5, cold_ui=False):
+    """
+    Launch each mode repeat times (after one warm-up launch that also compiles the UI).
+
+    Returns:
+        dict: mode -> { 'runs': [reports], 'wall', 'total', 'phases' } with medians
+    """
+    results = {}
+    for mode in modes:
+        if cold_ui:
+            clear_ui_cache()
+        else:
+            launch_once(mode)
+        runs = []
+        for _ in range(repeat):
+            if cold_ui:
+                clear_ui_cache()
+            runs.append(launch_once(mode))
+            debug_print(f"{mode}: {runs[-1]['wall']:.3f}s")
+        phases = {}
+        for run in runs:
+            for phase, seconds in run['phases'].items():
+                phases.setdefault(phase, []).append(seconds)
+        results[mode] = {
+            'runs': runs,
+            'wall': statistics.median(run['wall'] for run in runs),
+            'total': statistics.median(run['total'] for run in runs),
+            'phases': {phase: statistics.median(values) for phase, values in phases.items()},
+        }
+    return results
+
+
+def format_report(results):
+    phases = []
+    for result in results.values():
+        phases.extend(phase for phase in result['phases'] if phase not in phases)
+    modes = list(results)
+    lines = ["Startup time to interactive canvas (median, ms)",
+             f"{'phase':<14}" + "".join(f"{mode:>10}" for mode in modes)]
+    for phase in phases + ['total', 'wall']:
+        row = f"{phase:<14}"
+        for mode in modes:
+            value = results[mode]['phases'].get(phase) if phase not in ('total', 'wall') else results[mode][phase]
+            row += f"{value * 1000:>10.1f}" if value is not None else f"{'-':>10}"
+        lines.append(row)
+    if 'eager' in results and 'lazy' in results and results['eager']['wall']:
+        saved = 1 - results['lazy']['wall'] / results['eager']['wall']
+        lines.append(f"Lazy boot path is {saved * 100:.0f}% faster than the eager one (wall clock)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time NetFlux5G editor cold launches to an interactive canvas")
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=['eager', 'lazy'],
+                        help="Boot paths to compare")
+    parser.add_argument('--repeat', type=int, default=5, help="Launches per mode (median is reported)")
+    parser.add_argument('--cold-ui', action='store_true',
+                        help="Clear the compiled UI cache before every launch")
+    parser.add_argument('--json', action='store_true', help="Print the raw results as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_benchmark(args.modes, args.repeat, args.cold_ui)
+    except Exception as e:
+        error_print(f"Startup benchmark failed: {e}")
+        return 2
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,733 @@
+"""
+Topology generator for NetFlux5G Editor
+Builds large .nf5g topologies from gNB layout, UE distribution, APN/slice mix, switch and core parameters
+"""
+import argparse
+import copy
+import ipaddress
+import json
+import math
+import os
+import random
+import sys
+import time
+import yaml
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import error_print, warning_print
+from utils.power_range_calculator import PowerRangeCalculator
+from utils.mobility import MODELS as MOBILITY_MODELS, MobilityError, parse_speed
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export', '5g-configs')
+
+LAYOUTS = ('grid', 'hex')
+DISTRIBUTIONS = ('uniform', 'hotspot', 'poisson')
+
+DEFAULT_APN_MIX = 'internet=1,internet2=1,web1=1,web2=1'
+DEFAULT_SLICE_MIX = '1:0xffffff=1'
+DEFAULT_GNB_POWER = 30.0
+
+# Subnets of the APNs the exporter routes (MininetExporter.APN_ROUTES); other APNs get one from NEW_APN_POOL
+APN_SUBNETS = {
+    'internet': '10.100.0.0/16',
+    'internet2': '10.200.0.0/16',
+    'web1': '10.51.0.0/16',
+    'web2': '10.52.0.0/16'
+}
+NEW_APN_POOL = ipaddress.ip_network('10.64.0.0/10')
+
+# Network functions of the generated core, one instance each except the UPFs
+CORE_FUNCTIONS = ('AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR')
+CORE_IMAGE = 'adaptive/open5gs:1.0'
+OVS_CONTROLLER = 'tcp:netflux5g-onos-controller:6653'
+
+# Shared subscriber credentials, as in the example topologies
+UE_KEY = '465B5CE8B199B49FAA5F0A2EE238A6BC'
+UE_OP = 'E8ED289DEBA952E4283B54E88E6183CA'
+# UE properties dialog defaults
+UE_POWER = 20
+UE_RANGE = 116
+
+# gNBs served by one aggregation switch when the switch count is not given
+GNBS_PER_SWITCH = 8
+
+# Share of hotspot-distributed UEs placed around the hotspots (the rest are spread uniformly)
+HOTSPOT_SHARE = 0.8
+
+# Draws per UE before a position outside every cell falls back to a point inside one
+MAX_PLACEMENT_TRIES = 100
+
+
+class GeneratorError(ValueError):
+    """Raised for generator parameters that cannot produce a topology."""
+
+
+def parse_mix(text):
+    """
+    Parse 'a=3,b=1' (or 'a,b' for equal weights) into [(value, weight)].
+
+    Used for the APN mix ('internet=2,web1=1') and the slice mix ('1:0xffffff=3,2:000001=1').
+    """
+    mix = []
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        value, _, weight = part.partition('=')
+        try:
+            weight = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise GeneratorError(f"Invalid weight in mix entry {part!r}")
+        if weight < 0:
+            raise GeneratorError(f"Negative weight in mix entry {part!r}")
+        mix.append((value.strip(), weight))
+    if not mix or not sum(weight for _, weight in mix):
+        raise GeneratorError(f"Empty mix: {text!r}")
+    return mix
+
+
+def parse_slice(text):
+    """'1:0xffffff' -> ('1', '0xffffff'); the SD defaults to 0xffffff (no SD)."""
+    sst, _, sd = text.partition(':')
+    sd = sd.strip() or '0xffffff'
+    if not sd.lower().startswith('0x'):
+        sd = f'0x{sd}'
+    try:
+        if not 0 < int(sst) < 256 or not 0 <= int(sd, 16) <= 0xffffff:
+            raise ValueError
+    except ValueError:
+        raise GeneratorError(f"Invalid slice {text!r}, expected SST[:SD] such as 1:0xffffff")
+    return str(int(sst)), sd.lower()
+
+
+def _weighted_cycle(mix, count):
+    """count values in the proportions of mix, interleaved so any prefix keeps the mix."""
+    total = sum(weight for _, weight in mix)
+    values, credit = [], [0.0] * len(mix)
+    for _ in range(count):
+        for i, (_, weight) in enumerate(mix):
+            credit[i] += weight / total
+        best = max(range(len(mix)), key=credit.__getitem__)
+        credit[best] -= 1.0
+        values.append(mix[best][0])
+    return values
+
+
+def cell_range(gnb_power, frequency=None):
+    """Coverage radius (m, 1 m = 1 canvas pixel) of a gNB, as the canvas draws it."""
+    properties = {'GNB_Power': gnb_power}
+    if frequency:
+        properties['GNB_Frequency'] = frequency
+    return PowerRangeCalculator.get_component_range('GNB', properties)
+
+
+def layout_sites(count, layout, radius):
+    """
+    Centres of count cells of the given radius, centred on the origin.
+
+    Grid cells are squares inscribed in the coverage circle (spacing r*sqrt(2));
+    hex cells are hexagons inscribed in it (spacing r*sqrt(3), every other row
+    shifted by half a cell), so both layouts cover the area without gaps.
+    """
+    if layout == 'grid':
+        dx = dy = radius * math.sqrt(2)
+        shift = 0.0
+    elif layout == 'hex':
+        dx = radius * math.sqrt(3)
+        dy = radius * 1.5
+        shift = dx / 2
+    else:
+        raise GeneratorError(f"Unknown layout {layout!r}, expected one of {', '.join(LAYOUTS)}")
+    columns = max(1, math.ceil(math.sqrt(count)))
+    rows = math.ceil(count / columns)
+    x0 = -(columns - 1) * dx / 2
+    y0 = -(rows - 1) * dy / 2
+    return [(x0 + (i % columns) * dx + (shift if (i // columns) % 2 else 0.0), y0 + (i // columns) * dy)
+            for i in range(count)]
+
+
+class _SiteIndex:
+    """Uniform grid over site positions for nearest-site queries."""
+
+    def __init__(self, sites, cell_size):
+        self.sites = sites
+        self.cell_size = cell_size
+        self.buckets = {}
+        self._neighbourhoods = {}
+        for index, (x, y) in enumerate(sites):
+            self.buckets.setdefault(self._key(x, y), []).append(index)
+
+    def _key(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _ring(self, cx, cy, ring):
+        for bx in range(cx - ring, cx + ring + 1):
+            for by in range(cy - ring, cy + ring + 1):
+                if max(abs(bx - cx), abs(by - cy)) == ring:
+                    yield from self.buckets.get((bx, by), ())
+
+    def _closest(self, candidates, x, y):
+        best, best_distance = None, math.inf
+        for index in candidates:
+            sx, sy = self.sites[index]
+            distance = (sx - x) ** 2 + (sy - y) ** 2
+            if distance < best_distance:
+                best, best_distance = index, distance
+        return best, best_distance
+
+    def remove(self, index):
+        """Stop returning a site from nearest()."""
+        bucket = self.buckets[self._key(*self.sites[index])]
+        bucket.remove(index)
+        if not bucket:
+            del self.buckets[self._key(*self.sites[index])]
+        self._neighbourhoods.clear()
+
+    def nearest(self, x, y):
+        cx, cy = self._key(x, y)
+        # Any site within cell_size of the point is in its bucket or the eight around it
+        neighbourhood = self._neighbourhoods.get((cx, cy))
+        if neighbourhood is None:
+            neighbourhood = self._neighbourhoods[cx, cy] = [
+                index for ring in (0, 1) for index in self._ring(cx, cy, ring)]
+        best, best_distance = self._closest(neighbourhood, x, y)
+        if best_distance <= self.cell_size ** 2:
+            return best
+        # Far from every site: widen the search until no unvisited ring can hold a closer one
+        if not self.buckets:
+            return None
+        ring = 2
+        while best is None or (ring - 1) * self.cell_size < math.sqrt(best_distance):
+            candidate, distance = self._closest(self._ring(cx, cy, ring), x, y)
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+            ring += 1
+        return best
+
+
+def _poisson(rng, mean):
+    """Poisson sample (Knuth for small means, normal approximation for large ones)."""
+    if mean <= 0:
+        return 0
+    if mean > 50:
+        return max(0, int(round(rng.gauss(mean, math.sqrt(mean)))))
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def _in_disc(rng, cx, cy, radius):
+    distance = radius * math.sqrt(rng.random())
+    angle = rng.uniform(0, 2 * math.pi)
+    return cx + distance * math.cos(angle), cy + distance * math.sin(angle)
+
+
+def place_ues(rng, count, distribution, sites, radius, hotspots=None):
+    """
+    UE positions over the cell sites, all inside some cell's coverage disc.
+
+    uniform: spread evenly over the covered area (the union of the discs).
+    hotspot: HOTSPOT_SHARE of the UEs in Gaussian clusters (sigma radius/3) around
+             hotspots randomly chosen sites, the rest uniform; draws outside
+             every disc are redrawn.
+    poisson: each cell gets a Poisson number of UEs (mean count / cells) spread
+             uniformly inside it, so count is the expected total.
+    """
+    xs = [x for x, _ in sites]
+    ys = [y for _, y in sites]
+    min_x, max_x = min(xs) - radius, max(xs) + radius
+    min_y, max_y = min(ys) - radius, max(ys) + radius
+    index = _SiteIndex(sites, radius * 2)
+
+    def covered(x, y):
+        sx, sy = sites[index.nearest(x, y)]
+        return (sx - x) ** 2 + (sy - y) ** 2 <= radius ** 2
+
+    def uniform():
+        # Rejection against the discs, so empty layout slots and the box corners get no UEs
+        for _ in range(MAX_PLACEMENT_TRIES):
+            x, y = rng.uniform(min_x, max_x), rng.uniform(min_y, max_y)
+            if covered(x, y):
+                return x, y
+        return _in_disc(rng, *rng.choice(sites), radius)
+
+    def clustered(cx, cy):
+        for _ in range(MAX_PLACEMENT_TRIES):
+            x, y = rng.gauss(cx, radius / 3), rng.gauss(cy, radius / 3)
+            if covered(x, y):
+                return x, y
+        return _in_disc(rng, *sites[index.nearest(cx, cy)], radius)
+
+    if distribution == 'uniform':
+        return [uniform() for _ in range(count)]
+    if distribution == 'hotspot':
+        hotspots = max(1, min(len(sites), hotspots or math.ceil(len(sites) / 4)))
+        centres = [_in_disc(rng, *site, radius / 2) for site in rng.sample(sites, hotspots)]
+        clustered_count = int(round(count * HOTSPOT_SHARE))
+        positions = [clustered(*centres[i % hotspots]) for i in range(clustered_count)]
+        positions.extend(uniform() for _ in range(count - clustered_count))
+        rng.shuffle(positions)
+        return positions
+    if distribution == 'poisson':
+        mean = count / len(sites)
+        return [_in_disc(rng, x, y, radius) for x, y in sites for _ in range(_poisson(rng, mean))]
+    raise GeneratorError(f"Unknown UE distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+
+
+class TopologyGenerator:
+    """
+    Builds a topology dictionary in the format FileManager saves and loads.
+
+    Node properties carry both the properties-dialog keys (UE_APN, GNB_Power)
+    and the mapped keys (5g_apn, wireless_txpower), like topologies saved by
+    the editor, so generated files load, export and run the same way.
+    """
+
+    def __init__(self, gnbs=7, ues=100, layout='hex', distribution='uniform', apn_mix=DEFAULT_APN_MIX,
+                 slice_mix=DEFAULT_SLICE_MIX, switches=None, upfs=1, gnb_power=DEFAULT_GNB_POWER,
+                 frequency=None, hotspots=None, controller=True, mcc='999', mnc='70', tac='1', seed=None,
+                 mobility='static', speed=None):
+        if gnbs < 1:
+            raise GeneratorError("At least one gNB is required")
+        if ues < 0:
+            raise GeneratorError("The UE count cannot be negative")
+        if upfs < 1:
+            raise GeneratorError("The core needs at least one UPF")
+        if layout not in LAYOUTS:
+            raise GeneratorError(f"Unknown layout {layout!r}, expected one of {', '.join(LAYOUTS)}")
+        if distribution not in DISTRIBUTIONS:
+            raise GeneratorError(f"Unknown UE distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+        # Waypoints are drawn per UE in the editor, so only the models are generated
+        if mobility not in MOBILITY_MODELS or mobility == 'waypoints':
+            raise GeneratorError(f"Unknown UE mobility {mobility!r}, expected static, random_waypoint or manhattan")
+        try:
+            parse_speed(speed)
+        except MobilityError as e:
+            raise GeneratorError(str(e))
+        self.gnbs = gnbs
+        self.ues = ues
+        self.layout = layout
+        self.distribution = distribution
+        self.apn_mix = parse_mix(apn_mix) if isinstance(apn_mix, str) else list(apn_mix)
+        slice_mix = parse_mix(slice_mix) if isinstance(slice_mix, str) else list(slice_mix)
+        self.slice_mix = [(parse_slice(value), weight) for value, weight in slice_mix]
+        self.switches = switches if switches else max(1, math.ceil(gnbs / GNBS_PER_SWITCH))
+        self.upfs = upfs
+        self.gnb_power = gnb_power
+        self.frequency = frequency
+        self.hotspots = hotspots
+        self.controller = controller
+        self.mcc, self.mnc, self.tac = str(mcc), str(mnc), str(tac)
+        self.mobility = mobility
+        self.speed = speed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.created_date = time.strftime('%a %b %d %H:%M:%S %Y')
+        self._component_id = 0
+        self._link_count = 0
+
+    def parameters(self):
+        """Parameters recorded in the generated file's metadata (enough to regenerate it)."""
+        return {
+            'gnbs': self.gnbs, 'ues': self.ues, 'layout': self.layout, 'distribution': self.distribution,
+            'apn_mix': ','.join(f'{apn}={weight:g}' for apn, weight in self.apn_mix),
+            'slice_mix': ','.join(f'{sst}:{sd}={weight:g}' for (sst, sd), weight in self.slice_mix),
+            'switches': self.switches, 'upfs': self.upfs, 'gnb_power': self.gnb_power,
+            'frequency': self.frequency, 'hotspots': self.hotspots, 'controller': self.controller,
+            'mcc': self.mcc, 'mnc': self.mnc, 'tac': self.tac, 'seed': self.seed,
+            'mobility': self.mobility, 'speed': self.speed
+        }
+
+    def generate(self):
+        """Return the topology as a dictionary ready for json.dump."""
+        rng = random.Random(self.seed)
+        radius = cell_range(self.gnb_power, self.frequency)
+        sites = layout_sites(self.gnbs, self.layout, radius)
+        apns = list(dict.fromkeys(apn for apn, _ in self.apn_mix))
+        subnets = self._apn_subnets(apns)
+
+        nodes, links = [], []
+        gnb_nodes = [self._gnb(i + 1, x, y, radius) for i, (x, y) in enumerate(sites)]
+        nodes.extend(gnb_nodes)
+
+        positions = place_ues(rng, self.ues, self.distribution, sites, radius, self.hotspots)
+        index = _SiteIndex(sites, radius * 2)
+        ue_apns = _weighted_cycle(self.apn_mix, len(positions))
+        ue_slices = _weighted_cycle(self.slice_mix, len(positions))
+        # Spread the mixes over the area rather than in placement order
+        rng.shuffle(ue_apns)
+        rng.shuffle(ue_slices)
+        for i, (x, y) in enumerate(positions):
+            serving = index.nearest(x, y) + 1
+            nodes.append(self._ue(i + 1, x, y, serving, ue_apns[i], ue_slices[i]))
+
+        # Aggregation switches on a coarser grid over the same area, each serving its nearest gNBs.
+        # Short names (s1, s2, ...) keep switch interface names within IFNAMSIZ.
+        xs = [x for x, _ in sites]
+        ys = [y for _, y in sites]
+        switch_spacing = max(max(xs) - min(xs), max(ys) - min(ys), radius) / math.ceil(math.sqrt(self.switches))
+        switch_sites = layout_sites(self.switches, 'grid', switch_spacing / math.sqrt(2))
+        switch_nodes = [self._node('Switch', i + 1, x, y, {}, name=f"s{i + 1}") for i, (x, y) in enumerate(switch_sites)]
+        nodes.extend(switch_nodes)
+
+        # Each gNB goes to its nearest switch that still has room, so edge switches are not overloaded
+        capacity = math.ceil(len(gnb_nodes) / len(switch_nodes))
+        served = [0] * len(switch_nodes)
+        switch_index = _SiteIndex(switch_sites, switch_spacing)
+        for gnb, (x, y) in zip(gnb_nodes, sites):
+            nearest = switch_index.nearest(x, y)
+            served[nearest] += 1
+            if served[nearest] == capacity:
+                switch_index.remove(nearest)
+            links.append(self._link(gnb['name'], switch_nodes[nearest]['name']))
+        if len(switch_nodes) > 1:
+            pairs = list(zip(switch_nodes, switch_nodes[1:]))
+            if len(switch_nodes) > 2:
+                pairs.append((switch_nodes[-1], switch_nodes[0]))
+            links.extend(self._link(a['name'], b['name']) for a, b in pairs)
+
+        top = min(ys) - 3 * radius
+        core = self._core(min(xs) - radius, top, apns, subnets)
+        nodes.append(core)
+        links.append(self._link(core['name'], switch_nodes[0]['name']))
+
+        if self.controller:
+            controller = self._controller(max(xs) + radius, top)
+            nodes.append(controller)
+            links.extend(self._link(controller['name'], switch['name']) for switch in switch_nodes)
+
+        unrouted = [apn for apn in apns if apn not in APN_SUBNETS]
+        if unrouted:
+            warning_print(f"APNs {', '.join(unrouted)} get new subnets; exported scripts only add UE routes for "
+                          f"{', '.join(APN_SUBNETS)}")
+
+        counts = {}
+        for node in nodes:
+            counts[node['type']] = counts.get(node['type'], 0) + 1
+        return {
+            "version": "1.1",
+            "type": "NetFlux5G_Topology",
+            "metadata": {
+                "created_with": "NetFlux5G Editor",
+                "created_date": self.created_date,
+                "saved_date": self.created_date,
+                "canvas_size": {"width": 1161, "height": 1151},
+                "component_counts": counts,
+                "editor_version": "2.0",
+                "generated_by": "topology_generator",
+                "generator_parameters": self.parameters()
+            },
+            "nodes": nodes,
+            "links": links,
+            "canvas_properties": {
+                "zoom_level": 1.0,
+                "show_grid": False
+            }
+        }
+
+    # Nodes and links
+
+    def _next_id(self):
+        self._component_id += 1
+        return self._component_id
+
+    def _node(self, component_type, number, x, y, properties, name=None):
+        name = name or f"{component_type} #{number}"
+        base = {'name': name, 'type': component_type, 'x': x, 'y': y}
+        base.update(properties)
+        return {
+            'name': name,
+            'type': component_type,
+            'x': x,
+            'y': y,
+            'properties': base,
+            'created_date': self.created_date,
+            'component_id': self._next_id()
+        }
+
+    def _plain(self, component_type, number, x, y):
+        return self._node(component_type, number, x, y, {})
+
+    def _link(self, source, destination):
+        name = f"link_{self._link_count}"
+        self._link_count += 1
+        return {
+            'source': source,
+            'destination': destination,
+            'type': 'ethernet',
+            'properties': {
+                'name': name, 'type': 'ethernet', 'source': source, 'destination': destination,
+                'bandwidth': '', 'delay': '', 'loss': '', 'source_ip': '', 'dest_ip': '', 'enable_ip': False
+            },
+            'name': name,
+            'created_date': self.created_date
+        }
+
+    def _gnb(self, number, x, y, radius):
+        host = f"GNB__{number}"
+        iface = f"{host}-eth0"
+        ssid = f"gnb-hotspot{number}"
+        # A gNB's properties hold one slice; it advertises the first of the mix
+        sst, sd = self.slice_mix[0][0]
+        power = int(self.gnb_power) if float(self.gnb_power).is_integer() else self.gnb_power
+        return self._node('GNB', number, x, y, {
+            "GNB_Power": power, "GNB_Range": int(round(radius)), "range": float(round(radius)),
+            "GNB_OVS_Controller": OVS_CONTROLLER, "GNB_AP_SSID": ssid,
+            "GNB_N2_Interface": iface, "GNB_N3_Interface": iface, "GNB_Radio_Interface": iface,
+            "GNB_AMFHostName": "amf1", "GNB_GNBHostName": host, "GNB_TAC": self.tac,
+            "GNB_MCC": self.mcc, "GNB_MNC": self.mnc, "GNB_SST": sst, "GNB_SD": sd,
+            "GNB_OVS_FailMode": "secure", "GNB_OVS_Protocols": "OpenFlow13", "GNB_OVS_Datapath": "kernel",
+            "GNB_AP_Mode": "g", "GNB_OVS_Enabled": True, "GNB_AP_Enabled": True, "GNB_STP_Enabled": True,
+            "GNB_AP_Channel": 6, "GNB_Bridge_Priority": 32766, "GNB_OVS_BridgeName": "br-gnb",
+            "ap_ap_enabled": "true", "ap_ap_ssid": ssid, "ap_ap_channel": "6", "ap_ap_mode": "g",
+            "ap_ovs_controller": OVS_CONTROLLER, "ap_ap_failmode": "secure", "ap_openflow_protocols": "OpenFlow13",
+            "ovs_ovs_enabled": "true", "ovs_ovs_controller": OVS_CONTROLLER, "ovs_ovs_bridge_name": "br-gnb",
+            "ovs_ovs_fail_mode": "secure", "ovs_openflow_protocols": "OpenFlow13", "ovs_ovs_datapath": "kernel",
+            "5g_amf_hostname": "amf1", "5g_gnb_hostname": host, "5g_tac": self.tac, "5g_mcc": self.mcc,
+            "5g_mnc": self.mnc, "5g_sst": sst, "5g_sd": sd,
+            "network_n2_iface": iface, "network_n3_iface": iface, "network_radio_iface": iface,
+            "network_bridge_priority": "32766", "network_stp_enabled": "true", "network_ueransim_component": "gnb",
+            "wireless_txpower": power, "ueransim_component": "gnb"
+        })
+
+    def _ue(self, number, x, y, gnb_number, apn, network_slice):
+        gnb_host = f"GNB__{gnb_number}"
+        msisdn = f"{number:010d}"
+        radio_iface = f"UE__{number}-wlan0"
+        imei = f"35693803{number % 10 ** 7:07d}"
+        sst, sd = network_slice
+        mobility = {}
+        if self.mobility != 'static':
+            mobility = {"UE_Mobility": self.mobility}
+            if self.speed:
+                mobility["UE_Speed"] = str(self.speed)
+        return self._node('UE', number, x, y, dict({
+            "UE_Power": UE_POWER, "UE_GNBHostName": gnb_host, "UE_APN": apn, "UE_MSISDN": msisdn,
+            "UE_MCC": self.mcc, "UE_MNC": self.mnc, "UE_KEY": UE_KEY, "UE_OP": UE_OP,
+            "UE_SST": sst, "UE_SD": sd, "UE_IMEI": imei, "UE_IMEISV": "4370816125816151", "UE_GNB_IP": "",
+            "UE_TunnelInterface": "uesimtun0", "UE_RadioInterface": radio_iface, "UE_AssociationMode": "auto",
+            "UE_OPType": "OPC", "UE_SessionType": "IPv4", "UE_Range": UE_RANGE, "UE_PDUSessions": 1,
+            "5g_gnb_hostname": gnb_host, "5g_apn": apn, "5g_msisdn": msisdn, "5g_mcc": self.mcc,
+            "5g_mnc": self.mnc, "5g_key": UE_KEY, "5g_op_type": "OPC", "5g_op": UE_OP, "5g_sst": sst,
+            "5g_sd": sd, "5g_imei": imei, "5g_imeisv": "4370816125816151",
+            "network_tunnel_iface": "uesimtun0", "network_radio_iface": radio_iface,
+            "network_session_type": "IPv4", "network_pdu_sessions": "1", "network_ueransim_component": "ue",
+            "wireless_association": "auto", "wireless_txpower": UE_POWER, "wireless_range": UE_RANGE,
+            "ueransim_component": "ue"
+        }, **mobility))
+
+    def _controller(self, x, y):
+        return self._node('Controller', 1, x, y, {
+            "Controller_IPAddress": "127.0.0.1", "Controller_Name": "Control1", "Controller_Port": "6653",
+            "Controller_Type": "Remote Controller", "Controller_ProtocolMode": "TCP"
+        })
+
+    # 5G core
+
+    @staticmethod
+    def _apn_subnets(apns):
+        subnets = {apn: APN_SUBNETS[apn] for apn in apns if apn in APN_SUBNETS}
+        taken = [ipaddress.ip_network(subnet) for subnet in APN_SUBNETS.values()]
+        pool = (net for net in NEW_APN_POOL.subnets(new_prefix=16) if not any(net.overlaps(t) for t in taken))
+        for apn in apns:
+            if apn not in subnets:
+                subnets[apn] = str(next(pool))
+        return subnets
+
+    def _core(self, x, y, apns, subnets):
+        """VGcore with one instance per network function and self.upfs UPFs sharing out the APNs."""
+        configs = {}
+        upf_apns = [apns[i::self.upfs] for i in range(self.upfs)]
+        for i, served in enumerate(upf_apns):
+            configs.setdefault('UPF', []).append(self._core_config('UPF', f"upf{i + 1}", self._upf_config(
+                i + 1, served, subnets)))
+        for function in CORE_FUNCTIONS:
+            content = _load_core_config(function)
+            if function == 'AMF':
+                content = self._amf_config(content)
+            elif function == 'SMF':
+                content = self._smf_config(content, upf_apns, subnets)
+            elif function == 'NSSF':
+                content = self._nssf_config(content)
+            configs[function] = [self._core_config(function, f"{function.lower()}1", content)]
+
+        sst, sd = self.slice_mix[0][0]
+        properties = {f"{function}_configs": configs[function] for function in ('UPF',) + CORE_FUNCTIONS}
+        properties.update({
+            "VGCore_DockerImage": "adaptive/open5gs:latest", "VGCore_DockerNetwork": "netflux5g",
+            "VGCore_DatabaseURI": "mongodb://netflux5g-mongodb/open5gs", "VGCore_NetworkInterface": "eth0",
+            "VGCore_MCC": self.mcc, "VGCore_MNC": self.mnc, "VGCore_TAC": self.tac, "VGCore_SST": sst,
+            "VGCore_SD": sd, "VGCore_BridgePriority": "32768", "VGCore_OVSController": OVS_CONTROLLER,
+            "VGCore_ControllerPort": "6653", "VGCore_OVSBridgeName": "br-open5gs",
+            "VGCore_OpenFlowProtocols": "OpenFlow13", "VGCore_OVSFailMode": "secure",
+            "VGCore_OVSDatapath": "kernel", "VGCore_DockerEnabled": True, "VGCore_EnableNAT": True,
+            "VGCore_STPEnabled": True, "VGCore_OVSEnabled": True,
+            "docker_docker_enabled": True, "docker_docker_image": "adaptive/open5gs:latest",
+            "docker_docker_network": "netflux5g", "docker_database_uri": "mongodb://netflux5g-mongodb/open5gs",
+            "5gcore_network_interface": "eth0", "5gcore_mcc": self.mcc, "5gcore_mnc": self.mnc,
+            "5gcore_tac": self.tac, "5gcore_sst": sst, "5gcore_sd": sd, "5gcore_enable_nat": True,
+            "ovs_ovs_enabled": True, "ovs_ovs_controller": OVS_CONTROLLER, "ovs_ovs_bridge_name": "br-open5gs",
+            "ovs_ovs_fail_mode": "secure", "ovs_openflow_protocols": "OpenFlow13", "ovs_ovs_datapath": "kernel",
+            "ovs_controller_port": "6653", "ovs_bridge_priority": "32768", "ovs_stp_enabled": True
+        })
+        return self._node('VGcore', 1, x, y, properties)
+
+    @staticmethod
+    def _core_config(function, name, content):
+        """One row of a VGcore *_configs table, with the configuration embedded."""
+        filename = f"{function.lower()}.yaml" if function != 'UPF' else f"{name}.yaml"
+        return {
+            "name": name,
+            "config_display": f"✓ {filename}",
+            "config_content": content,
+            "imported": True,
+            "config_filename": filename,
+            "image": CORE_IMAGE,
+            "component_type": function,
+            "volumes": [],
+            "config_file_path": ""
+        }
+
+    @staticmethod
+    def _upf_config(number, apns, subnets):
+        content = _load_core_config('UPF')
+        upf = content.setdefault('upf', {})
+        iface = f"upf{number}-eth0"
+        upf['pfcp'] = {'server': [{'dev': iface}], 'client': None}
+        upf['gtpu'] = {'server': [{'dev': iface}]}
+        upf['session'] = [
+            {'subnet': subnets[apn], 'gateway': _gateway(subnets[apn]), 'dnn': apn,
+             'dev': 'ogstun' if i == 0 else f'ogstun{i + 1}'}
+            for i, apn in enumerate(apns)
+        ]
+        return content
+
+    def _plmn_id(self):
+        return {'mcc': int(self.mcc), 'mnc': int(self.mnc)}
+
+    def _s_nssai(self):
+        slices = []
+        for (sst, sd), _ in self.slice_mix:
+            entry = {'sst': int(sst)}
+            if sd != '0xffffff':
+                entry['sd'] = sd
+            if entry not in slices:
+                slices.append(entry)
+        return slices
+
+    def _amf_config(self, content):
+        amf = content.setdefault('amf', {})
+        amf['guami'] = [{'plmn_id': self._plmn_id(), 'amf_id': {'region': 2, 'set': 1}}]
+        amf['tai'] = [{'plmn_id': self._plmn_id(), 'tac': int(self.tac)}]
+        amf['plmn_support'] = [{'plmn_id': self._plmn_id(), 's_nssai': self._s_nssai()}]
+        return content
+
+    @staticmethod
+    def _smf_config(content, upf_apns, subnets):
+        smf = content.setdefault('smf', {})
+        pfcp = smf.setdefault('pfcp', {})
+        pfcp['client'] = {'upf': [{'address': f"upf{i + 1}", 'dnn': apns} for i, apns in enumerate(upf_apns) if apns]}
+        smf['session'] = [{'subnet': subnets[apn], 'gateway': _gateway(subnets[apn]), 'dnn': apn}
+                          for apns in upf_apns for apn in apns]
+        return content
+
+    def _nssf_config(self, content):
+        client = content.setdefault('nssf', {}).setdefault('sbi', {}).setdefault('client', {})
+        nrf = (client.get('nsi') or [{}])[0].get('uri', 'http://mn.nrf1:7777')
+        client['nsi'] = [{'uri': nrf, 's_nssai': entry} for entry in self._s_nssai()]
+        return content
+
+
+def _gateway(subnet):
+    return str(next(ipaddress.ip_network(subnet).hosts()))
+
+
+_core_configs = {}
+
+
+def _load_core_config(function):
+    """A fresh copy of the stock export/5g-configs file for a network function."""
+    filename = 'upf1.yaml' if function == 'UPF' else f"{function.lower()}.yaml"
+    if filename not in _core_configs:
+        path = os.path.join(CONFIG_DIR, filename)
+        try:
+            with open(path, 'r') as f:
+                _core_configs[filename] = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            warning_print(f"Could not read {path}, generating an empty {function} config: {e}")
+            _core_configs[filename] = {}
+    return copy.deepcopy(_core_configs[filename])
+
+
+def generate_topology(**parameters):
+    """Generate a topology dictionary; see TopologyGenerator for the parameters."""
+    return TopologyGenerator(**parameters).generate()
+
+
+def write_topology(topology, path, pretty=False):
+    """
+    Write a generated topology as .nf5g JSON.
+
+    Files saved by the editor are indented; generated files are written compact
+    unless pretty is set, which keeps 10k-node files about a quarter smaller.
+    """
+    # json.dumps encodes in one C call; json.dump streams chunks through Python
+    text = json.dumps(topology, indent=2 if pretty else None, ensure_ascii=False)
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def summarize(topology):
+    counts = topology['metadata']['component_counts']
+    return (f"{len(topology['nodes'])} nodes (" + ', '.join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+            + f"), {len(topology['links'])} links")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a NetFlux5G topology (.nf5g) from parameters")
+    parser.add_argument('output', help="Topology file to write (.nf5g)")
+    parser.add_argument('--gnbs', type=int, default=7, help="Number of gNBs")
+    parser.add_argument('--ues', type=int, default=100, help="Number of UEs (expected number for poisson)")
+    parser.add_argument('--layout', choices=LAYOUTS, default='hex', help="gNB site layout")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform', help="UE distribution")
+    parser.add_argument('--hotspots', type=int, help="Hotspot count for the hotspot distribution")
+    parser.add_argument('--apn-mix', default=DEFAULT_APN_MIX, help="APN weights, e.g. internet=3,web1=1")
+    parser.add_argument('--slice-mix', default=DEFAULT_SLICE_MIX, help="Slice weights, e.g. 1:0xffffff=3,2:000001=1")
+    parser.add_argument('--switches', type=int, help=f"Aggregation switches (default: one per {GNBS_PER_SWITCH} gNBs)")
+    parser.add_argument('--upfs', type=int, default=1, help="UPFs in the core; APNs are shared out between them")
+    parser.add_argument('--gnb-power', type=float, default=DEFAULT_GNB_POWER, help="gNB transmit power (dBm)")
+    parser.add_argument('--frequency', type=float, help="gNB frequency (GHz, default 3.5)")
+    parser.add_argument('--no-controller', action='store_true', help="Leave out the SDN controller")
+    parser.add_argument('--mobility', choices=[m for m in MOBILITY_MODELS if m != 'waypoints'], default='static',
+                        help="Mobility model of every UE")
+    parser.add_argument('--speed', help="UE speed in m/s, a value or min-max (default 1-2)")
+    parser.add_argument('--seed', type=int, help="Random seed (recorded in the file's metadata)")
+    parser.add_argument('--pretty', action='store_true', help="Indent the JSON like files saved by the editor")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        topology = generate_topology(
+            gnbs=args.gnbs, ues=args.ues, layout=args.layout, distribution=args.distribution,
+            apn_mix=args.apn_mix, slice_mix=args.slice_mix, switches=args.switches, upfs=args.upfs,
+            gnb_power=args.gnb_power, frequency=args.frequency, hotspots=args.hotspots,
+            controller=not args.no_controller, seed=args.seed, mobility=args.mobility, speed=args.speed)
+        write_topology(topology, args.output, args.pretty)
+    except GeneratorError as e:
+        error_print(f"Invalid generator parameters: {e}")
+        return 2
+    except OSError as e:
+        error_print(f"Could not write {args.output}: {e}")
+        return 1
+    print(f"Wrote {args.output}: {summarize(topology)} in {time.perf_counter() - start:.2f}s "
+          f"(seed {topology['metadata']['generator_parameters']['seed']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""
+Topology validator for NetFlux5G Editor
+Finds problems that would otherwise only show up at Mininet runtime, in one pass over a .nf5g topology
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print
+from utils.handover import CellIndex
+from utils.mobility import wireless_cells
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# rule: (severity, what it finds)
+RULES = {
+    'missing-name': (ERROR, "Node without a name"),
+    'duplicate-name': (ERROR, "Nodes sharing a name"),
+    'name-collision': (ERROR, "Different names that export to the same script name"),
+    'link-missing-node': (ERROR, "Link to a node that does not exist"),
+    'self-link': (WARNING, "Link from a node to itself"),
+    'duplicate-link': (WARNING, "More than one link between the same nodes"),
+    'interface-name-too-long': (ERROR, "Interface name longer than Linux allows"),
+    'unknown-amf': (ERROR, "gNB pointing at an AMF that is not in the topology"),
+    'unknown-gnb': (WARNING, "UE pointing at a gNB that is not in the topology"),
+    'ue-out-of-coverage': (WARNING, "UE outside the range of every AP and gNB"),
+    'unlinked-node': (WARNING, "Wired node without any link"),
+}
+
+# Link endpoints that name no node get a partial-match fallback scan over all node names
+# (as FileManager does on load); past this many scans they are reported without the hint
+MAX_FALLBACK_SCANS = 200
+
+# Linux interface names (IFNAMSIZ) hold 15 characters
+MAX_INTERFACE_NAME = 15
+
+# Node types that are only reachable through links
+WIRED_TYPES = ('Host', 'DockerHost', 'Switch', 'Router', 'GNB', 'VGcore')
+WIRELESS_STATION_TYPES = ('UE', 'STA')
+
+# Switch ports (and so their ethN interfaces) are numbered from 1, other nodes' from 0
+SWITCH_TYPES = ('Switch', 'Router', 'AP')
+
+# Links the exporter does not turn into interfaces of the node itself: controllers
+# are reached over TCP, and a VGcore's links go to its core components
+NO_INTERFACE_TYPES = ('Controller', 'VGcore')
+
+# As the exporter's extract_5g_components_by_type: core rows without a configuration are left out
+AMF_CONFIG_KEY = 'AMF_configs'
+
+# Name lists in messages are cut to this many entries
+MESSAGE_NAMES = 5
+
+_UNSAFE_CHARACTERS = re.compile(r'[^a-zA-Z0-9_]')
+
+
+def script_name(name):
+    """Name of a node in exported scripts, as MininetExporter.sanitize_variable_name makes it."""
+    clean_name = _UNSAFE_CHARACTERS.sub('_', str(name))
+    if clean_name and clean_name[0].isdigit():
+        clean_name = '_' + clean_name
+    return clean_name or 'node'
+
+
+def _names(names):
+    names = list(names)
+    shown = ', '.join(repr(name) for name in names[:MESSAGE_NAMES])
+    return shown + (f" and {len(names) - MESSAGE_NAMES} more" if len(names) > MESSAGE_NAMES else '')
+
+
+class ValidationIssue:
+    """One problem found by a rule, with the names of the nodes it concerns."""
+
+    __slots__ = ('rule', 'message', 'nodes')
+
+    def __init__(self, rule, message, nodes=()):
+        self.rule = rule
+        self.message = message
+        self.nodes = tuple(nodes)
+
+    @property
+    def severity(self):
+        return RULES[self.rule][0]
+
+    def to_dict(self):
+        return {'severity': self.severity, 'rule': self.rule, 'message': self.message, 'nodes': list(self.nodes)}
+
+    def __str__(self):
+        return f"{self.severity}: [{self.rule}] {self.message}"
+
+
+class ValidationReport:
+    """Issues found in a topology, errors first."""
+
+    def __init__(self, issues, node_count, link_count, elapsed):
+        order = {ERROR: 0, WARNING: 1}
+        self.issues = sorted(issues, key=lambda issue: order[issue.severity])
+        self.node_count = node_count
+        self.link_count = link_count
+        self.elapsed = elapsed
+
+    @property
+    def errors(self):
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self):
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    def summary(self):
+        errors, warnings = len(self.errors), len(self.warnings)
+        if not errors and not warnings:
+            return "no problems found"
+        return f"{errors} error(s), {warnings} warning(s)"
+
+    def to_dict(self):
+        return {
+            'nodes': self.node_count,
+            'links': self.link_count,
+            'errors': len(self.errors),
+            'warnings': len(self.warnings),
+            'elapsed': round(self.elapsed, 4),
+            'issues': [issue.to_dict() for issue in self.issues],
+        }
+
+
+class TopologyValidator:
+    """
+    Checks a topology in its .nf5g form (nodes and links as saved).
+
+    One pass over the nodes builds the name maps and collects the cells, AMFs
+    and gNB hostnames; one pass over the links resolves endpoints through the
+    name map and counts interfaces. The remaining rules then only look up
+    those indexes, and UE coverage is checked against a grid of the cells'
+    coverage discs, so the whole run stays linear in the topology size.
+    """
+
+    def __init__(self, nodes, links):
+        self.nodes = nodes
+        self.links = links
+
+    def validate(self):
+        start = time.perf_counter()
+        self.issues = []
+        self._check_nodes()
+        self._check_links()
+        self._check_interfaces()
+        self._check_core()
+        self._check_coverage()
+        report = ValidationReport(self.issues, len(self.nodes), len(self.links), time.perf_counter() - start)
+        debug_print(f"DEBUG: Validated {report.node_count} nodes and {report.link_count} links "
+                    f"in {report.elapsed * 1000:.1f} ms: {report.summary()}")
+        return report
+
+    def _issue(self, rule, message, nodes=()):
+        self.issues.append(ValidationIssue(rule, message, nodes))
+
+    def _check_nodes(self):
+        self.by_name = {}
+        self.by_lower_name = {}
+        self.script_names = {}
+        self.by_script_name = {}
+        self.amf_names = set()
+        self.gnb_hostnames = set()
+        self.gnbs = []
+        self.ues = []
+        self.wireless = []
+        duplicates = {}
+
+        for node in self.nodes:
+            name = node.get('name')
+            node_type = node.get('type')
+            properties = node.get('properties', {})
+            if not name:
+                self._issue('missing-name', f"A {node_type or 'untyped'} node has no name")
+                continue
+            if name in self.by_name:
+                duplicates.setdefault(name, 1)
+                duplicates[name] += 1
+                continue
+            exported = script_name(name)
+            self.by_name[name] = node
+            self.by_lower_name.setdefault(name.lower(), name)
+            self.script_names[name] = exported
+            self.by_script_name.setdefault(exported, []).append(name)
+
+            if node_type == 'GNB':
+                self.gnbs.append(node)
+                self.gnb_hostnames.add(exported)
+                if properties.get('GNB_GNBHostName'):
+                    self.gnb_hostnames.add(properties['GNB_GNBHostName'])
+            elif node_type == 'UE':
+                self.ues.append(node)
+            elif node_type == 'VGcore':
+                for row in properties.get(AMF_CONFIG_KEY) or []:
+                    if isinstance(row, dict) and str(row.get('name') or '').strip() and (
+                            row.get('config_file_path') or row.get('config_content') or row.get('imported')):
+                        self.amf_names.add(str(row['name']).strip())
+                        self.amf_names.add(script_name(str(row['name']).strip()))
+            if node_type in ('AP', 'GNB'):
+                self.wireless.append(node)
+
+        for name, count in duplicates.items():
+            self._issue('duplicate-name', f"{count} nodes are named {name!r}; links and exports only see one of them",
+                        [name])
+        for exported, names in self.by_script_name.items():
+            if len(names) > 1:
+                self._issue('name-collision', f"{_names(names)} all export as {exported!r}", names)
+
+    def _resolve(self, name):
+        """The node a link endpoint names, and the one loading would fall back to when it names none."""
+        if name in self.by_name:
+            return name, None
+        if not name:
+            return None, None
+        # As FileManager.findComponentByAlternativeName: case-insensitive, then partial matches
+        fallback = self.by_lower_name.get(name.lower())
+        if fallback is None and name in self.fallbacks:
+            fallback = self.fallbacks[name]
+        elif fallback is None and len(self.fallbacks) < MAX_FALLBACK_SCANS:
+            fallback = self.fallbacks[name] = next(
+                (other for other in self.by_name if name in other or other in name), None)
+        return None, fallback
+
+    def _check_links(self):
+        self.fallbacks = {}
+        self.interfaces = dict.fromkeys(self.by_name, 0)
+        self.links_per_node = dict.fromkeys(self.by_name, 0)
+        pairs = {}
+        for index, link in enumerate(self.links):
+            label = link.get('name') or f"#{index + 1}"
+            ends = []
+            for role, name in (('source', link.get('source')),
+                               ('destination', link.get('destination') or link.get('dest'))):
+                node, fallback = self._resolve(name)
+                if node is None:
+                    hint = f"; loading attaches it to {fallback!r} instead" if fallback else ""
+                    self._issue('link-missing-node',
+                                f"Link {label}: {role} {name!r} is not a node in the topology{hint}",
+                                [fallback] if fallback else [])
+                ends.append(node)
+            source, destination = ends
+            if source is None or destination is None:
+                continue
+            if source == destination:
+                self._issue('self-link', f"Link {label} connects {source!r} to itself", [source])
+                continue
+            self.links_per_node[source] += 1
+            self.links_per_node[destination] += 1
+            if 'Controller' not in (self.by_name[source].get('type'), self.by_name[destination].get('type')):
+                self.interfaces[source] += 1
+                self.interfaces[destination] += 1
+            key = (source, destination) if source < destination else (destination, source)
+            pairs[key] = pairs.get(key, 0) + 1
+
+        for (first, second), count in pairs.items():
+            if count > 1:
+                self._issue('duplicate-link', f"{count} links connect {first!r} and {second!r}", [first, second])
+
+    def _check_interfaces(self):
+        for name, count in self.interfaces.items():
+            node_type = self.by_name[name].get('type')
+            if not self.links_per_node[name] and node_type in WIRED_TYPES:
+                self._issue('unlinked-node', f"{node_type} {name!r} has no links", [name])
+            if node_type in NO_INTERFACE_TYPES:
+                continue
+            exported = self.script_names[name]
+            interfaces = []
+            if count:
+                last_port = count if node_type in SWITCH_TYPES else count - 1
+                interfaces.append(f"{exported}-eth{last_port}")
+            if node_type in WIRELESS_STATION_TYPES or node_type == 'AP':
+                interfaces.append(f"{exported}-wlan0")
+            longest = max(interfaces, key=len, default='')
+            if len(longest) > MAX_INTERFACE_NAME:
+                self._issue('interface-name-too-long',
+                            f"{name!r} gets interface {longest!r} ({len(longest)} characters, "
+                            f"at most {MAX_INTERFACE_NAME}); shorten the node name", [name])
+
+    def _check_core(self):
+        for gnb in self.gnbs:
+            properties = gnb.get('properties', {})
+            if properties.get('GNB_AMF_IP'):
+                continue
+            amf = properties.get('GNB_AMFHostName') or 'amf'
+            if amf not in self.amf_names:
+                known = f"AMFs in the topology: {_names(sorted(self.amf_names))}" if self.amf_names \
+                    else "the topology has no AMF"
+                self._issue('unknown-amf', f"gNB {gnb['name']!r} uses AMF {amf!r}, but {known}", [gnb['name']])
+
+        for ue in self.ues:
+            gnb = ue.get('properties', {}).get('UE_GNBHostName')
+            if gnb and gnb not in self.gnb_hostnames:
+                self._issue('unknown-gnb', f"UE {ue['name']!r} looks for gNB {gnb!r}, which no gNB in the "
+                            f"topology is named or uses as hostname", [ue['name']])
+
+    def _check_coverage(self):
+        if not self.ues:
+            return
+        cells = wireless_cells(self.wireless)
+        if not cells:
+            self._issue('ue-out-of-coverage', f"{len(self.ues)} UE(s) but no AP or gNB in the topology",
+                        [ue['name'] for ue in self.ues])
+            return
+        index = CellIndex(cells)
+        for ue in self.ues:
+            x, y = float(ue.get('x') or 0), float(ue.get('y') or 0)
+            if not any(math.hypot(x - cells[cell][1], y - cells[cell][2]) <= cells[cell][3]
+                       for cell in index.at(x, y)):
+                self._issue('ue-out-of-coverage',
+                            f"UE {ue['name']!r} at ({x:.0f}, {y:.0f}) is outside the range of every AP and gNB",
+                            [ue['name']])
+
+
+def validate_topology(nodes, links):
+    """ValidationReport for a topology's nodes and links (.nf5g form)."""
+    return TopologyValidator(nodes, links).validate()
+
+
+def load_topology(path):
+    """(nodes, links) of a .nf5g file."""
+    with open(path) as f:
+        data = json.load(f)
+    return data.get('nodes', []), data.get('links', [])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a NetFlux5G topology (.nf5g) before exporting or running it")
+    parser.add_argument('topology', nargs='?', help="Topology file to check (.nf5g)")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--strict', action='store_true', help="Fail on warnings as well as errors")
+    parser.add_argument('--list-rules', action='store_true', help="List the rules and exit")
+    args = parser.parse_args(argv)
+
+    if args.list_rules:
+        for rule, (severity, description) in RULES.items():
+            print(f"{rule:26} {severity:8} {description}")
+        return 0
+    if not args.topology:
+        parser.error("the topology file is required unless --list-rules is given")
+
+    try:
+        nodes, links = load_topology(args.topology)
+    except (OSError, ValueError) as e:
+        error_print(f"Could not read {args.topology}: {e}")
+        return 2
+
+    report = validate_topology(nodes, links)
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        for issue in report.issues:
+            print(issue)
+        print(f"{args.topology}: {report.summary()} in {report.node_count} nodes and {report.link_count} links "
+              f"({report.elapsed * 1000:.0f} ms)")
+    if report.errors or (args.strict and report.warnings):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Traffic generation engine for NetFlux5G Editor
+Builds iperf3 load tests from the topology's UE/APN/UPF mapping and collects structured JSON results
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import sys
+import time
+import yaml
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.configmap import ConfigurationMapper
+from utils.debug import debug_print, error_print, warning_print
+from utils.docker_async import AsyncDockerEngine
+
+IPERF_BASE_PORT = 5201
+UE_TUNNEL_IFACE = 'uesimtun0'
+
+# iperf3 client flags per test type
+TEST_TYPES = {
+    'tcp-up': [],
+    'tcp-down': ['-R'],
+    'udp': ['-u'],
+}
+
+# Load profiles (carried over from the former capture-packet-*.sh scripts)
+LOAD_PROFILES = {
+    'baseline': {'duration': 15, 'bandwidth': '138M', 'parallel': 1, 'tests': ['tcp-up', 'tcp-down']},
+    'optimized': {'duration': 45, 'bandwidth': '500M', 'parallel': 2, 'tests': ['tcp-up', 'tcp-down', 'udp']},
+    'high-load': {'duration': 45, 'bandwidth': '1000M', 'parallel': 4, 'tests': ['tcp-up', 'tcp-down', 'udp']},
+    'max-load': {'duration': 60, 'bandwidth': '2000M', 'parallel': 2, 'tests': ['tcp-up', 'tcp-down', 'udp']},
+}
+
+# APN subnets used by the generated topology when a UPF config does not list its sessions
+DEFAULT_APN_ROUTES = {
+    'internet': '10.100.0.0/16',
+    'internet2': '10.200.0.0/16',
+    'web1': '10.51.0.0/16',
+    'web2': '10.52.0.0/16'
+}
+
+
+def _load_upf_config(component):
+    """Return the parsed UPF YAML for a core component row, or {}."""
+    content = component.get('config_content')
+    if isinstance(content, dict):
+        return content
+    try:
+        if isinstance(content, str) and content.strip():
+            return yaml.safe_load(content) or {}
+        path = component.get('config_file_path') or component.get('config_path')
+        if path and os.path.isfile(path):
+            with open(path, 'r') as f:
+                return yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        warning_print(f"Could not parse UPF config for {component.get('name')}: {e}")
+    return {}
+
+
+def _session_gateway(session):
+    """Gateway address of an Open5GS UPF session entry (explicit or first host of the subnet)."""
+    if session.get('gateway'):
+        return str(session['gateway'])
+    network = ipaddress.ip_network(str(session['subnet']), strict=False)
+    return str(next(network.hosts()))
+
+
+def build_traffic_plan(categorized_nodes, sanitize):
+    """
+    Build the UE -> APN -> UPF gateway mapping for a topology.
+
+    Args:
+        categorized_nodes (dict): Output of MininetExporter.categorize_nodes
+        sanitize (callable): Name sanitizer used by the exporter for node names
+
+    Returns:
+        dict: { 'gateways': {apn: {upf, gateway, dev}}, 'clients': [...], 'skipped': [...] }
+    """
+    gateways = {}
+    upfs = categorized_nodes.get('core5g_components', {}).get('UPF', [])
+    for i, component in enumerate(upfs):
+        upf = f"mn.{sanitize(component.get('name', f'upf{i + 1}'))}"
+        sessions = (_load_upf_config(component).get('upf') or {}).get('session') or []
+        for session in sessions:
+            try:
+                if session.get('dnn') and session.get('subnet') and ':' not in str(session['subnet']):
+                    gateways.setdefault(session['dnn'], {
+                        'upf': upf, 'gateway': _session_gateway(session), 'dev': session.get('dev', 'ogstun')
+                    })
+            except ValueError as e:
+                warning_print(f"Ignoring UPF session {session} on {upf}: {e}")
+
+    # Fall back to the APN routes the generated script installs on each UE
+    if upfs:
+        first_upf = f"mn.{sanitize(upfs[0].get('name', 'upf1'))}"
+        for apn, route in DEFAULT_APN_ROUTES.items():
+            if apn not in gateways:
+                gateways[apn] = {'upf': first_upf, 'gateway': _session_gateway({'subnet': route}), 'dev': 'ogstun'}
+
+    clients = []
+    skipped = []
+    for ue in categorized_nodes.get('ues', []):
+        ue_config = ConfigurationMapper.map_ue_config(ue.get('properties', {}))
+        container = f"mn.{sanitize(ue['name'])}"
+        apn = ue_config.get('apn', 'internet')
+        target = gateways.get(apn)
+        if not target:
+            skipped.append({'ue': container, 'apn': apn, 'reason': 'No UPF serves this APN'})
+            continue
+        clients.append({
+            'ue': container,
+            'apn': apn,
+            'slice': f"{ue_config.get('sst', '1')}-{ue_config.get('sd', '0xffffff')}",
+            'upf': target['upf'],
+            'gateway': target['gateway']
+        })
+    return {'gateways': gateways, 'clients': clients, 'skipped': skipped}
+
+
+def summarize_iperf_result(data):
+    """Reduce an iperf3 -J document to the fields used for comparison."""
+    if 'error' in data:
+        return {'error': data['error']}
+    end = data.get('end', {})
+    if 'sum_sent' in end:
+        # Linux reports the smoothed TCP RTT per stream in microseconds
+        rtts = [stream['sender']['mean_rtt'] for stream in end.get('streams', [])
+                if 'mean_rtt' in stream.get('sender', {})]
+        return {
+            'sent_bps': end['sum_sent'].get('bits_per_second', 0.0),
+            'received_bps': end.get('sum_received', {}).get('bits_per_second', 0.0),
+            'retransmits': end['sum_sent'].get('retransmits', 0),
+            'mean_rtt_ms': sum(rtts) / len(rtts) / 1000.0 if rtts else None
+        }
+    udp = end.get('sum', {})
+    return {
+        'sent_bps': udp.get('bits_per_second', 0.0),
+        'received_bps': udp.get('bits_per_second', 0.0) * (1 - udp.get('lost_percent', 0.0) / 100.0),
+        'jitter_ms': udp.get('jitter_ms', 0.0),
+        'lost_percent': udp.get('lost_percent', 0.0)
+    }
+
+
+class TrafficEngine:
+    """Run iperf3 servers on the UPFs and clients on every UE in parallel."""
+
+    def __init__(self, plan, profile='optimized', results_dir=None, base_port=IPERF_BASE_PORT,
+                 max_concurrency=None, event_callback=None, **overrides):
+        if profile not in LOAD_PROFILES:
+            raise ValueError(f"Unknown load profile '{profile}' (available: {', '.join(LOAD_PROFILES)})")
+        self.plan = plan
+        self.profile = profile
+        self.settings = dict(LOAD_PROFILES[profile], **{k: v for k, v in overrides.items() if v is not None})
+        self.results_dir = results_dir or os.getcwd()
+        self.base_port = base_port
+        # All clients must run at once to produce the requested aggregate load
+        self.max_concurrency = max_concurrency or max(1, len(plan['clients']) * len(self.settings['tests']))
+        self.event_callback = event_callback
+        self.engine = None
+
+    def _report(self, message):
+        debug_print(message)
+        if self.event_callback:
+            self.event_callback({'type': 'status', 'message': message})
+
+    def _build_runs(self, addresses):
+        """Give every (UE, test) pair its own server port; iperf3 servers serve one client at a time."""
+        runs = []
+        skipped = list(self.plan['skipped'])
+        port = self.base_port
+        for client in self.plan['clients']:
+            ue_ip = addresses.get(client['ue'])
+            if not ue_ip:
+                skipped.append({'ue': client['ue'], 'apn': client['apn'], 'reason': f'No {UE_TUNNEL_IFACE} address'})
+                continue
+            for test in self.settings['tests']:
+                runs.append(dict(client, ue_ip=ue_ip, test=test, port=port))
+                port += 1
+        return runs, skipped
+
+    def _client_command(self, run):
+        settings = self.settings
+        return (['docker', 'exec', run['ue'], 'iperf3', '-c', run['gateway'], '-B', run['ue_ip'],
+                 '-p', str(run['port']), '-t', str(settings['duration']), '-b', str(settings['bandwidth']),
+                 '-P', str(settings['parallel']), '-J'] + TEST_TYPES[run['test']])
+
+    async def _run_client(self, run):
+        started = time.monotonic()
+        result = await self.engine.run_command(self._client_command(run), timeout=self.settings['duration'] + 30)
+        try:
+            summary = summarize_iperf_result(json.loads(result['stdout']))
+        except (json.JSONDecodeError, TypeError):
+            summary = {'error': (result['stderr'] or result['stdout']).strip() or 'No iperf3 output'}
+        summary['success'] = result['returncode'] == 0 and 'error' not in summary
+        summary['elapsed'] = time.monotonic() - started
+        self._report(f"{run['ue']} {run['test']}: "
+                     f"{'ok' if summary['success'] else 'failed'} ({summary.get('received_bps', 0) / 1e6:.1f} Mbit/s)")
+        return dict(run, **summary)
+
+    async def _run(self):
+        engine = self.engine
+        ues = [client['ue'] for client in self.plan['clients']]
+        self._report(f"Resolving {UE_TUNNEL_IFACE} addresses on {len(ues)} UE(s)...")
+        addresses = await engine.interface_addresses(ues, UE_TUNNEL_IFACE)
+
+        runs, skipped = self._build_runs(addresses)
+        if not runs:
+            return [], skipped
+
+        # One-off daemonised servers: each exits after serving its single client
+        server_commands = {}
+        for run in runs:
+            server_commands.setdefault(run['upf'], []).append(
+                ['iperf3', '-s', '-D', '-1', '-B', run['gateway'], '-p', str(run['port'])])
+        self._report(f"Starting {len(runs)} iperf3 server(s) on {len(server_commands)} UPF(s)...")
+        server_results = await engine.exec_batch(server_commands)
+        failed_servers = {(upf, cmd['command']) for upf, results in server_results.items()
+                          for cmd in results if cmd['returncode'] != 0}
+        if failed_servers:
+            warning_print(f"{len(failed_servers)} iperf3 server(s) failed to start")
+        await asyncio.sleep(1)
+
+        self._report(f"Running {len(runs)} iperf3 client(s) for {self.settings['duration']}s "
+                     f"({self.profile} profile)...")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(run):
+            async with semaphore:
+                return await self._run_client(run)
+
+        return await asyncio.gather(*(bounded(run) for run in runs)), skipped
+
+    def run(self):
+        """
+        Run the load test and write the JSON report.
+
+        Returns:
+            dict: The report (also written to results_dir)
+        """
+        started = time.time()
+        self.engine = AsyncDockerEngine(max_concurrency=self.max_concurrency)
+        runs, skipped = self.engine.run_sync(self._run())
+        report = {
+            'profile': self.profile,
+            'settings': self.settings,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+            'elapsed': time.time() - started,
+            'summary': self._summarize(runs),
+            'runs': runs,
+            'skipped': skipped
+        }
+        os.makedirs(self.results_dir, exist_ok=True)
+        report['path'] = os.path.join(
+            self.results_dir, f"traffic-{self.profile}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}.json")
+        with open(report['path'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self._report(f"Traffic results written to {report['path']}")
+        return report
+
+    @staticmethod
+    def _summarize(runs):
+        """Aggregate throughput per test type, APN and UPF."""
+        summary = {'runs': len(runs), 'succeeded': 0, 'total_bps': 0.0, 'by_test': {}, 'by_apn': {}, 'by_upf': {}}
+        for run in runs:
+            bps = run.get('received_bps', 0.0) if run['success'] else 0.0
+            summary['succeeded'] += 1 if run['success'] else 0
+            summary['total_bps'] += bps
+            for key, group in (('test', 'by_test'), ('apn', 'by_apn'), ('upf', 'by_upf')):
+                entry = summary[group].setdefault(run[key], {'runs': 0, 'succeeded': 0, 'bps': 0.0})
+                entry['runs'] += 1
+                entry['succeeded'] += 1 if run['success'] else 0
+                entry['bps'] += bps
+        return summary
+
+
+def plan_from_topology_file(path):
+    """Build a traffic plan from a saved .nf5g/.json topology file."""
+    from export.mininet_export import MininetExporter
+    with open(path, 'r') as f:
+        topology = json.load(f)
+    exporter = MininetExporter(None)
+    return build_traffic_plan(exporter.categorize_nodes(topology.get('nodes', [])), exporter.sanitize_variable_name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run iperf3 load tests against a running NetFlux5G topology")
+    parser.add_argument('topology', help="Topology file (.nf5g) the running network was started from")
+    parser.add_argument('--profile', default='optimized', choices=sorted(LOAD_PROFILES))
+    parser.add_argument('--duration', type=int, help="Override test duration (seconds)")
+    parser.add_argument('--bandwidth', help="Override per-stream bandwidth (e.g. 200M)")
+    parser.add_argument('--parallel', type=int, help="Override parallel streams per client")
+    parser.add_argument('--results-dir', default=os.getcwd())
+    parser.add_argument('--dry-run', action='store_true', help="Print the UE/APN/UPF plan and exit")
+    args = parser.parse_args(argv)
+
+    plan = plan_from_topology_file(args.topology)
+    if args.dry_run:
+        print(json.dumps(plan, indent=2))
+        return 0
+
+    engine = TrafficEngine(plan, args.profile, results_dir=args.results_dir, duration=args.duration,
+                           bandwidth=args.bandwidth, parallel=args.parallel,
+                           event_callback=lambda event: print(event['message']))
+    try:
+        report = engine.run()
+    except Exception as e:
+        error_print(f"Traffic test failed: {e}")
+        return 1
+    summary = report['summary']
+    print(f"{summary['succeeded']}/{summary['runs']} runs succeeded, "
+          f"aggregate {summary['total_bps'] / 1e6:.1f} Mbit/s")
+    return 0 if summary['succeeded'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
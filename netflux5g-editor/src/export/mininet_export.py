@@ -14,19 +14,26 @@ The generated scripts follow mininet-wifi best practices and are compatible with
 the mininet-wifi examples structure.
 """
 
+import ipaddress
+import math
 import os
 import re
 import traceback
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from PyQt5.QtCore import QDateTime
+from automation.export_cache import CAPTURES_DIR_ENV, captures_dir_override
 from utils.configmap import ConfigurationMapper
 from utils.debug import debug_print, error_print, warning_print
+from utils.mobility import MobilityScenario, MobilityError, is_mobile, trajectory_table, wireless_cells
+from utils.handover import HandoverTimeline
 
 class MininetExporter:
     """Handler for exporting network topology to Mininet scripts with Level 2 features."""
     
     def __init__(self, main_window):
         self.main_window = main_window
+        # Compact mode writes data tables plus generic loops instead of one statement per node
+        self.compact_mode = False
         
     def export_to_mininet(self, skip_save_check=False):
         """Export the current topology to a Mininet script.
@@ -42,19 +49,35 @@ class MininetExporter:
         # Check for unsaved changes or unsaved file (unless skipped)
         if not skip_save_check and not self._check_save_status():
             return  # User cancelled or chose not to proceed
+
+        # Catch problems that would otherwise only show up at Mininet runtime
+        if hasattr(self.main_window, 'validation_manager'):
+            nodes, links = self.main_window.extractTopology()
+            if not self.main_window.validation_manager.confirmTopology(nodes, links, "Export"):
+                return
         
-        filename, _ = QFileDialog.getSaveFileName(
+        filename, selected_filter = QFileDialog.getSaveFileName(
             self.main_window, 
             "Export to Mininet Script", 
             "", 
-            "Python Files (*.py);;All Files (*)"
+            "Python Files (*.py);;Compact Python Files (*.py);;All Files (*)"
         )
         if filename:
-            self.export_to_mininet_script(filename)
+            self.export_to_mininet_script(filename, compact=selected_filter.startswith("Compact"))
 
-    def export_to_mininet_script(self, filename):
-        """Export the current topology to a working Mininet-WiFi Python script."""
-        nodes, links = self.main_window.extractTopology()
+    def export_to_mininet_script(self, filename, compact=None, topology=None):
+        """Export the current topology to a working Mininet-WiFi Python script.
+        
+        Args:
+            filename (str): Output script path
+            compact (bool): Write data tables plus loops instead of unrolled
+                            per-node code. Defaults to self.compact_mode.
+            topology (tuple): Already extracted (nodes, links); extracted from
+                              the canvas when not given.
+        """
+        if compact is not None:
+            self.compact_mode = compact
+        nodes, links = topology if topology is not None else self.main_window.extractTopology()
         
         if not nodes:
             self.main_window.status_manager.showCanvasStatus("No components found to export!")
@@ -100,6 +123,8 @@ class MininetExporter:
 
     def write_mininet_script(self, f, nodes, links, categorized_nodes):
         """Write the complete Mininet-WiFi script following best practices."""
+        categorized_nodes['mobility'] = self.build_mobility(nodes, categorized_nodes)
+        
         # Write script header
         self.write_script_header(f)
         
@@ -108,6 +133,10 @@ class MininetExporter:
         
         # Write utility functions
         self.write_utility_functions(f)
+        if categorized_nodes['ues']:
+            self.write_ue_metrics_exporter(f)
+        if categorized_nodes['mobility']:
+            self.write_mobility_replay(f)
         
         # Write topology function
         self.write_topology_function(f, nodes, links, categorized_nodes)
@@ -158,7 +187,11 @@ class MininetExporter:
         """Write necessary imports based on component types following fixed_topology-upf.py pattern."""
         f.write('import sys\n')
         f.write('import os\n')
-        
+        f.write('import threading\n')
+        f.write('import json\n')
+        f.write('import signal\n')
+        f.write('import time\n')
+
         # Check if we need wireless functionality
         has_wireless = (categorized_nodes['aps'] or categorized_nodes['stas'] or 
                        categorized_nodes['ues'] or categorized_nodes['gnbs'])
@@ -189,6 +222,9 @@ class MininetExporter:
             f.write('from mininet.cli import CLI\n')
         
         f.write('from subprocess import call\n')
+        if categorized_nodes['ues']:
+            f.write('import re\n')
+            f.write('from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler\n')
         f.write('\n\n')
 
     def write_utility_functions(self, f):
@@ -342,7 +378,482 @@ class MininetExporter:
         f.write('\n')
 
         # Add working directory variable
-        f.write(f'export_dir = os.path.dirname(os.path.abspath(__file__))  # Current Working Directory\n\n')
+        f.write(f'export_dir = os.path.dirname(os.path.abspath(__file__))  # Current Working Directory\n')
+        # The export may be a cache entry shared by many runs, so each run's logs go to its own directory
+        f.write('run_dir = os.environ.get("NETFLUX5G_RUN_DIR", export_dir)  # Logs of this run\n\n')
+
+        # Shared bind mounts are computed once instead of per node
+        f.write('# Shared volume specs used by every 5G container\n')
+        f.write('MODULES_VOLUME = "/lib/modules:/lib/modules:ro"\n')
+        f.write('LOG_VOLUME = run_dir + "/log/:/logging/"\n')
+        # Exports may be cache entries shared between checkouts, so the captures folder is passed
+        # in at run time; only an explicit override is embedded
+        captures_dir = captures_dir_override()
+        if captures_dir:
+            f.write(f'CAPTURES_DIR = os.environ.get("{CAPTURES_DIR_ENV}", {captures_dir!r})\n')
+        else:
+            f.write(f'CAPTURES_DIR = os.environ.get("{CAPTURES_DIR_ENV}") or os.path.join(run_dir, "captures")\n')
+        f.write('CAPTURES_VOLUME = CAPTURES_DIR + "/:/captures/"\n')
+        f.write('SHARED_VOLUMES = [LOG_VOLUME, CAPTURES_VOLUME]\n\n')
+
+        self.write_progress_events(f)
+        self.write_log_collector(f)
+
+    # Marks structured progress lines in the script output (parsed by automation/mininet_supervisor.py)
+    EVENT_PREFIX = "@@NF5G "
+
+    def write_progress_events(self, f):
+        """Write the progress event helpers used when the editor supervises the script."""
+        f.write('# Structured progress events for the NetFlux5G supervisor (NETFLUX5G_EVENTS=1)\n')
+        f.write(f'EVENT_PREFIX = {self.EVENT_PREFIX!r}\n')
+        f.write('EVENTS_ENABLED = os.environ.get("NETFLUX5G_EVENTS") == "1"\n')
+        f.write('# Supervised runs have no terminal, so they wait for SIGTERM/SIGINT instead of the CLI\n')
+        f.write('HEADLESS = os.environ.get("NETFLUX5G_HEADLESS") == "1"\n')
+        f.write('EVENT_CLOCK = time.monotonic()\n')
+        f.write('EVENT_LOCK = threading.Lock()\n\n')
+
+        f.write('def emit_event(event, **fields):\n')
+        f.write('    """Write one progress event as a prefixed JSON line on stdout."""\n')
+        f.write('    if not EVENTS_ENABLED:\n')
+        f.write('        return\n')
+        f.write('    fields.update(event=event, t=round(time.monotonic() - EVENT_CLOCK, 3))\n')
+        f.write('    line = EVENT_PREFIX + json.dumps(fields, default=str) + "\\n"\n')
+        f.write('    with EVENT_LOCK:\n')
+        f.write('        sys.__stdout__.write(line)\n')
+        f.write('        sys.__stdout__.flush()\n\n')
+
+        f.write('def track_node_creation(net):\n')
+        f.write('    """Report every node added to the network as a node_created event."""\n')
+        f.write('    if not EVENTS_ENABLED:\n')
+        f.write('        return\n')
+        f.write('    for method in ("addDocker", "addHost", "addStation", "addAccessPoint", "addSwitch", "addController"):\n')
+        f.write('        add_node = getattr(net, method, None)\n')
+        f.write('        if add_node is None:\n')
+        f.write('            continue\n')
+        f.write('        def tracked(name, *args, _add_node=add_node, _kind=method[3:], **kwargs):\n')
+        f.write('            node = _add_node(name, *args, **kwargs)\n')
+        f.write('            emit_event("node_created", node=str(name), kind=_kind)\n')
+        f.write('            return node\n')
+        f.write('        setattr(net, method, tracked)\n\n')
+
+        f.write('def wait_for_ue_registration(ue_list, timeout=20, interval=1.0):\n')
+        f.write('    """Wait until every UE has its PDU session tunnel, reporting each one as it comes up."""\n')
+        f.write('    pending = list(ue_list)\n')
+        f.write('    deadline = time.monotonic() + timeout\n')
+        f.write('    while pending:\n')
+        f.write('        for ue_node in list(pending):\n')
+        f.write('            if "uesimtun0" in ue_node.cmd("ip -o link show uesimtun0 2>/dev/null"):\n')
+        f.write('                pending.remove(ue_node)\n')
+        f.write('                emit_event("ue_registered", node=ue_node.name)\n')
+        f.write('        if not pending or time.monotonic() >= deadline:\n')
+        f.write('            break\n')
+        f.write('        time.sleep(interval)\n')
+        f.write('    for ue_node in pending:\n')
+        f.write('        info(f"*** {ue_node.name} has no PDU session after {timeout}s\\n")\n')
+        f.write('        emit_event("ue_registration_timeout", node=ue_node.name, timeout=timeout)\n')
+        f.write('    return not pending\n\n')
+
+        f.write('def wait_for_shutdown():\n')
+        f.write('    """Block until SIGTERM or SIGINT (headless replacement for the CLI)."""\n')
+        f.write('    stop = threading.Event()\n')
+        f.write('    for sig in (signal.SIGINT, signal.SIGTERM):\n')
+        f.write('        signal.signal(sig, lambda *_: stop.set())\n')
+        f.write('    while not stop.wait(1.0):\n')
+        f.write('        pass\n\n')
+
+    def write_log_collector(self, f):
+        """Write the optional host-side collector that aggregates all container logs."""
+        f.write('# The per-node logs are always kept; the merged copy is opt-in (NETFLUX5G_AGGREGATE_LOGS=1)\n')
+        f.write('AGGREGATE_LOGS = os.environ.get("NETFLUX5G_AGGREGATE_LOGS") == "1"\n\n')
+        f.write('class LogCollector(threading.Thread):\n')
+        f.write('    """Follow every <node>.log in the shared log directory and append to one aggregate file."""\n')
+        f.write('\n')
+        f.write('    def __init__(self, log_dir, aggregate_name="netflux5g-all.log", interval=1.0):\n')
+        f.write('        super().__init__(daemon=True)\n')
+        f.write('        self.log_dir = log_dir\n')
+        f.write('        self.aggregate_path = os.path.join(log_dir, aggregate_name)\n')
+        f.write('        self.interval = interval\n')
+        f.write('        self.offsets = {}\n')
+        f.write('        self.stop_event = threading.Event()\n')
+        f.write('\n')
+        f.write('    def collect_once(self):\n')
+        f.write('        if not os.path.isdir(self.log_dir):\n')
+        f.write('            return\n')
+        f.write('        with open(self.aggregate_path, "a") as aggregate:\n')
+        f.write('            for entry in sorted(os.listdir(self.log_dir)):\n')
+        f.write('                path = os.path.join(self.log_dir, entry)\n')
+        f.write('                if not entry.endswith(".log") or path == self.aggregate_path:\n')
+        f.write('                    continue\n')
+        f.write('                try:\n')
+        f.write('                    with open(path, "rb") as source:\n')
+        f.write('                        source.seek(self.offsets.get(entry, 0))\n')
+        f.write('                        data = source.read()\n')
+        f.write('                except OSError:\n')
+        f.write('                    continue\n')
+        f.write('                # Keep partial lines for the next pass\n')
+        f.write('                complete = data[:data.rfind(b"\\n") + 1]\n')
+        f.write('                self.offsets[entry] = self.offsets.get(entry, 0) + len(complete)\n')
+        f.write('                node = entry[:-4]\n')
+        f.write('                for line in complete.decode(errors="replace").splitlines():\n')
+        f.write('                    aggregate.write(f"[{node}] {line}\\n")\n')
+        f.write('\n')
+        f.write('    def run(self):\n')
+        f.write('        while not self.stop_event.wait(self.interval):\n')
+        f.write('            self.collect_once()\n')
+        f.write('\n')
+        f.write('    def stop(self):\n')
+        f.write('        self.stop_event.set()\n')
+        f.write('        self.collect_once()\n\n')
+
+    def write_ue_metrics_exporter(self, f):
+        """Write the host-side exporter serving per-UE throughput and latency metrics."""
+        f.write('class UEMetricsExporter(threading.Thread):\n')
+        f.write('    """Serve UE tunnel, UPF tunnel and RTT statistics as Prometheus metrics.\n')
+        f.write('\n')
+        f.write('    Interface counters come from /proc/<pid>/net/dev of each container, read on the\n')
+        f.write('    host, and RTT from one looping ping per UE, so sampling needs no docker exec.\n')
+        f.write('    """\n')
+        f.write('\n')
+        f.write('    METRICS = (\n')
+        f.write('        ("netflux5g_ue_tunnel_up", "gauge", "Whether the UE PDU session tunnel interface exists"),\n')
+        f.write('        ("netflux5g_ue_tunnel_receive_bytes_total", "counter", "Bytes received on the UE tunnel interface"),\n')
+        f.write('        ("netflux5g_ue_tunnel_receive_packets_total", "counter", "Packets received on the UE tunnel interface"),\n')
+        f.write('        ("netflux5g_ue_tunnel_transmit_bytes_total", "counter", "Bytes sent on the UE tunnel interface"),\n')
+        f.write('        ("netflux5g_ue_tunnel_transmit_packets_total", "counter", "Packets sent on the UE tunnel interface"),\n')
+        f.write('        ("netflux5g_ue_rtt_seconds", "gauge", "Last ICMP round-trip time from the UE through its PDU session"),\n')
+        f.write('        ("netflux5g_upf_tunnel_receive_bytes_total", "counter", "Bytes received on the UPF ogstun interface"),\n')
+        f.write('        ("netflux5g_upf_tunnel_receive_packets_total", "counter", "Packets received on the UPF ogstun interface"),\n')
+        f.write('        ("netflux5g_upf_tunnel_transmit_bytes_total", "counter", "Bytes sent on the UPF ogstun interface"),\n')
+        f.write('        ("netflux5g_upf_tunnel_transmit_packets_total", "counter", "Packets sent on the UPF ogstun interface"),\n')
+        f.write('    )\n')
+        f.write('    COUNTERS = ("receive_bytes", "receive_packets", "transmit_bytes", "transmit_packets")\n')
+        f.write('    RTT_PATTERN = re.compile(r"time=([0-9.]+) ms")\n')
+        f.write('\n')
+        f.write('    def __init__(self, log_dir, port=9105, interval=5.0):\n')
+        f.write('        super().__init__(daemon=True)\n')
+        f.write('        self.log_dir = log_dir\n')
+        f.write('        self.port = port\n')
+        f.write('        self.interval = interval\n')
+        f.write('        self.ues = []\n')
+        f.write('        self.upfs = []\n')
+        f.write('        self.rtt = {}\n')
+        f.write('        self.rtt_offsets = {}\n')
+        f.write('        self.metrics = ""\n')
+        f.write('        self.server = None\n')
+        f.write('        self.stop_event = threading.Event()\n')
+        f.write('\n')
+        f.write('    def add_ue(self, node, gnb, apn, slice_id, rtt_target=None, iface="uesimtun0"):\n')
+        f.write('        labels = f\'ue="{node.name}",gnb="{gnb}",apn="{apn}",slice="{slice_id}"\'\n')
+        f.write('        self.ues.append((node, iface, labels))\n')
+        f.write('        if rtt_target:\n')
+        f.write('            # One background ping per UE, restarted whenever it exits (e.g. before the tunnel is up);\n')
+        f.write('            # its output lands in the shared log directory\n')
+        f.write('            ping = f"ping -n -i {self.interval} -I {iface} {rtt_target}"\n')
+        f.write('            node.cmd(f"setsid nohup sh -c \'while true; do {ping}; sleep {self.interval}; done\' "\n')
+        f.write('                     f"> /logging/{node.name}.rtt 2>&1 &")\n')
+        f.write('\n')
+        f.write('    def add_upf(self, node):\n')
+        f.write('        self.upfs.append(node)\n')
+        f.write('\n')
+        f.write('    @staticmethod\n')
+        f.write('    def read_net_dev(node):\n')
+        f.write('        """Return {iface: (rx_bytes, rx_packets, tx_bytes, tx_packets)} for the node network namespace."""\n')
+        f.write('        counters = {}\n')
+        f.write('        try:\n')
+        f.write('            with open(f"/proc/{node.pid}/net/dev") as dev:\n')
+        f.write('                lines = dev.readlines()[2:]\n')
+        f.write('        except (OSError, AttributeError):\n')
+        f.write('            return counters\n')
+        f.write('        for line in lines:\n')
+        f.write('            iface, _, data = line.partition(":")\n')
+        f.write('            fields = data.split()\n')
+        f.write('            if len(fields) >= 10:\n')
+        f.write('                counters[iface.strip()] = (int(fields[0]), int(fields[1]), int(fields[8]), int(fields[9]))\n')
+        f.write('        return counters\n')
+        f.write('\n')
+        f.write('    def read_rtt(self, name):\n')
+        f.write('        path = os.path.join(self.log_dir, name + ".rtt")\n')
+        f.write('        try:\n')
+        f.write('            with open(path, "rb") as source:\n')
+        f.write('                source.seek(self.rtt_offsets.get(name, 0))\n')
+        f.write('                data = source.read()\n')
+        f.write('        except OSError:\n')
+        f.write('            return self.rtt.get(name)\n')
+        f.write('        complete = data[:data.rfind(b"\\n") + 1]\n')
+        f.write('        self.rtt_offsets[name] = self.rtt_offsets.get(name, 0) + len(complete)\n')
+        f.write('        matches = self.RTT_PATTERN.findall(complete.decode(errors="replace"))\n')
+        f.write('        if matches:\n')
+        f.write('            self.rtt[name] = float(matches[-1]) / 1000.0\n')
+        f.write('        return self.rtt.get(name)\n')
+        f.write('\n')
+        f.write('    def sample(self):\n')
+        f.write('        series = {name: [] for name, _, _ in self.METRICS}\n')
+        f.write('        for node, iface, labels in self.ues:\n')
+        f.write('            counters = self.read_net_dev(node).get(iface)\n')
+        f.write('            series["netflux5g_ue_tunnel_up"].append((labels, 1 if counters else 0))\n')
+        f.write('            for counter, value in zip(self.COUNTERS, counters or ()):\n')
+        f.write('                series[f"netflux5g_ue_tunnel_{counter}_total"].append((labels, value))\n')
+        f.write('            rtt = self.read_rtt(node.name)\n')
+        f.write('            if rtt is not None:\n')
+        f.write('                series["netflux5g_ue_rtt_seconds"].append((labels, rtt))\n')
+        f.write('        for node in self.upfs:\n')
+        f.write('            for iface, counters in self.read_net_dev(node).items():\n')
+        f.write('                if not iface.startswith("ogstun"):\n')
+        f.write('                    continue\n')
+        f.write('                labels = f\'upf="{node.name}",interface="{iface}"\'\n')
+        f.write('                for counter, value in zip(self.COUNTERS, counters):\n')
+        f.write('                    series[f"netflux5g_upf_tunnel_{counter}_total"].append((labels, value))\n')
+        f.write('        lines = []\n')
+        f.write('        for name, kind, help_text in self.METRICS:\n')
+        f.write('            lines.append(f"# HELP {name} {help_text}")\n')
+        f.write('            lines.append(f"# TYPE {name} {kind}")\n')
+        f.write('            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in series[name])\n')
+        f.write('        self.metrics = "\\n".join(lines) + "\\n"\n')
+        f.write('\n')
+        f.write('    def serve(self):\n')
+        f.write('        exporter = self\n')
+        f.write('\n')
+        f.write('        class MetricsHandler(BaseHTTPRequestHandler):\n')
+        f.write('            def do_GET(self):\n')
+        f.write('                body = exporter.metrics.encode()\n')
+        f.write('                self.send_response(200)\n')
+        f.write('                self.send_header("Content-Type", "text/plain; version=0.0.4")\n')
+        f.write('                self.send_header("Content-Length", str(len(body)))\n')
+        f.write('                self.end_headers()\n')
+        f.write('                self.wfile.write(body)\n')
+        f.write('\n')
+        f.write('            def log_message(self, *args):\n')
+        f.write('                pass\n')
+        f.write('\n')
+        f.write('        self.server = ThreadingHTTPServer(("0.0.0.0", self.port), MetricsHandler)\n')
+        f.write('        threading.Thread(target=self.server.serve_forever, daemon=True).start()\n')
+        f.write('\n')
+        f.write('    def run(self):\n')
+        f.write('        try:\n')
+        f.write('            self.sample()\n')
+        f.write('            self.serve()\n')
+        f.write('        except OSError as e:\n')
+        f.write('            info(f"*** UE metrics exporter disabled: {e}\\n")\n')
+        f.write('            return\n')
+        f.write('        while not self.stop_event.wait(self.interval):\n')
+        f.write('            self.sample()\n')
+        f.write('\n')
+        f.write('    def stop(self):\n')
+        f.write('        self.stop_event.set()\n')
+        f.write('        if self.server:\n')
+        f.write('            self.server.shutdown()\n\n')
+
+    # Host port of the per-UE metrics exporter (scraped by the "ue-metrics" Prometheus job)
+    UE_METRICS_PORT = 9105
+
+    def _ue_metric_labels(self, ue):
+        """Return (gnb, apn, slice, rtt target) labels for a UE node."""
+        ue_config = ConfigurationMapper.map_ue_config(ue.get('properties', {}))
+        gnb = str(ue_config.get('gnb_hostname', 'gnb'))
+        if gnb.startswith('mn.'):
+            gnb = gnb[3:]
+        apn = ue_config.get('apn', 'internet')
+        slice_id = f"{ue_config.get('sst', '1')}-{ue_config.get('sd', '0xffffff')}"
+        route = self.APN_ROUTES.get(apn)
+        # The UPF holds the first address of each APN subnet on its ogstun interface
+        rtt_target = str(next(ipaddress.ip_network(route).hosts())) if route else None
+        return gnb, apn, slice_id, rtt_target
+
+    def write_ue_metrics_startup(self, f, categorized_nodes):
+        """Write the exporter startup: register UPFs and UEs, then start sampling."""
+        if not categorized_nodes['ues']:
+            return
+        f.write(f'    info("*** Starting per-UE metrics exporter on port {self.UE_METRICS_PORT}\\n")\n')
+        f.write(f'    ue_metrics = UEMetricsExporter(os.path.join(run_dir, "log"), port={self.UE_METRICS_PORT})\n')
+        for instance in categorized_nodes.get('core5g_components', {}).get('UPF', []):
+            upf_name = self.sanitize_variable_name(instance.get('name', 'upf1'))
+            f.write(f'    ue_metrics.add_upf({upf_name})\n')
+        if self.compact_mode:
+            ue_labels = {
+                self.sanitize_variable_name(ue['name']): self._ue_metric_labels(ue)
+                for ue in categorized_nodes['ues']
+            }
+            f.write(f'    UE_METRIC_LABELS = {ue_labels!r}\n')
+            f.write('    for ue_node in ue_nodes:\n')
+            f.write('        ue_metrics.add_ue(ue_node, *UE_METRIC_LABELS[ue_node.name])\n')
+        else:
+            for ue in categorized_nodes['ues']:
+                ue_name = self.sanitize_variable_name(ue['name'])
+                gnb, apn, slice_id, rtt_target = self._ue_metric_labels(ue)
+                f.write(f'    ue_metrics.add_ue({ue_name}, gnb={gnb!r}, apn={apn!r}, slice_id={slice_id!r}, rtt_target={rtt_target!r})\n')
+        f.write('    ue_metrics.start()\n\n')
+
+    def build_mobility(self, nodes, categorized_nodes):
+        """
+        Trajectories of the mobile UEs, keyed by script names.
+
+        Returns None when no UE moves. A UE whose mobility properties are
+        invalid is exported static, with a warning.
+        """
+        scenario = MobilityScenario(nodes)
+        trajectories = {}
+        for ue in categorized_nodes['ues']:
+            if not is_mobile(ue):
+                continue
+            try:
+                trajectory = scenario.trajectory(ue)
+            except MobilityError as e:
+                warning_print(f"WARNING: Exporting {ue['name']} without mobility: {e}")
+                continue
+            if trajectory is not None:
+                trajectories[self.sanitize_variable_name(ue['name'])] = trajectory
+        return trajectories or None
+
+    def build_mobility_cells(self, categorized_nodes):
+        """
+        [(name, ssid, x, y, range)] of the cells mobile UEs move between.
+
+        These are the access points UEs connect to, with the same ranges as
+        the static assignment; without any, the APs and gNBs with ranges from
+        their power, which only report handovers (ssid None).
+        """
+        access_points = self.get_access_points(categorized_nodes)
+        if access_points:
+            return [(self.sanitize_variable_name(ap['name']), self.get_ap_ssid(ap),
+                     float(ap.get('x', 0)), float(ap.get('y', 0)), float(self.get_coverage_range(ap)))
+                    for ap in access_points]
+        return [(self.sanitize_variable_name(name), None, x, y, cell_range)
+                for name, x, y, cell_range in wireless_cells(categorized_nodes['aps'] + categorized_nodes['gnbs'])]
+
+    def write_mobility_replay(self, f):
+        """Write the scheduler thread that moves the mobile UEs and replays their reassociations."""
+        f.write('class MobilityReplay(threading.Thread):\n')
+        f.write('    """Move stations along their trajectories and reassociate them on schedule, from one thread.\n')
+        f.write('\n')
+        f.write('    Each trajectory is a flat (t0, x0, y0, t1, x1, y1, ...) row; positions are\n')
+        f.write('    interpolated every interval seconds and only changed positions are applied.\n')
+        f.write('    The schedule lists (time, station, cell index or None) in time order, with\n')
+        f.write('    every station\'s first cell at time 0; cells are (name, ssid) and stations\n')
+        f.write('    connect to the ssid, when there is one, as each entry comes due.\n')
+        f.write('\n')
+        f.write('    iw runs through pexec (its own mnexec process), never node.cmd: the main\n')
+        f.write('    thread owns the stations\' shells while the CLI is up.\n')
+        f.write('    """\n')
+        f.write('\n')
+        f.write('    def __init__(self, net, trajectories, cells=(), schedule=(), interval=0.5):\n')
+        f.write('        super().__init__(daemon=True)\n')
+        f.write('        # [node, times, xs, ys, current vertex, last applied position]\n')
+        f.write('        self.tracks = [[net.get(name), row[0::3], row[1::3], row[2::3], 0, None]\n')
+        f.write('                       for name, row in trajectories.items()]\n')
+        f.write('        self.nodes = {track[0].name: track[0] for track in self.tracks}\n')
+        f.write('        self.cells = list(cells)\n')
+        f.write('        self.schedule = list(schedule)\n')
+        f.write('        self.serving = {}\n')
+        f.write('        self.interval = interval\n')
+        f.write('        self.stop_event = threading.Event()\n')
+        f.write('\n')
+        f.write('    def step(self, now):\n')
+        f.write('        """Apply the positions at now; returns whether any station is still moving."""\n')
+        f.write('        moving = False\n')
+        f.write('        for track in self.tracks:\n')
+        f.write('            node, times, xs, ys, index, last = track\n')
+        f.write('            while index + 1 < len(times) and times[index + 1] <= now:\n')
+        f.write('                index += 1\n')
+        f.write('            track[4] = index\n')
+        f.write('            if index + 1 < len(times):\n')
+        f.write('                moving = True\n')
+        f.write('                share = (now - times[index]) / (times[index + 1] - times[index])\n')
+        f.write('                x = xs[index] + (xs[index + 1] - xs[index]) * share\n')
+        f.write('                y = ys[index] + (ys[index + 1] - ys[index]) * share\n')
+        f.write('            else:\n')
+        f.write('                x, y = xs[-1], ys[-1]\n')
+        f.write('            position = f"{x:.1f},{y:.1f},0"\n')
+        f.write('            if position != last:\n')
+        f.write('                try:\n')
+        f.write('                    node.setPosition(position)\n')
+        f.write('                except Exception as e:\n')
+        f.write('                    emit_event("position_failed", node=node.name, position=position, error=str(e))\n')
+        f.write('                track[5] = position\n')
+        f.write('        return moving\n')
+        f.write('\n')
+        f.write('    def associate(self, at, name, cell):\n')
+        f.write('        """Move station name to cell index cell (None: out of coverage)."""\n')
+        f.write('        first = name not in self.serving\n')
+        f.write('        source = self.serving.get(name)\n')
+        f.write('        self.serving[name] = cell\n')
+        f.write('        target_name, ssid = self.cells[cell] if cell is not None else (None, None)\n')
+        f.write('        if first:\n')
+        f.write('            emit_event("associated", node=name, cell=target_name, at=at)\n')
+        f.write('        else:\n')
+        f.write('            emit_event("handover", node=name, source=self.cells[source][0] if source is not None else None,\n')
+        f.write('                       target=target_name, at=at)\n')
+        f.write('        node = self.nodes.get(name)\n')
+        f.write('        if node is None:\n')
+        f.write('            return\n')
+        if_name = "{name}-wlan0"
+        f.write('        if ssid:\n')
+        f.write(f'            command = ("iw", "dev", f"{if_name}", "connect", ssid)\n')
+        f.write('        elif cell is None and not first:\n')
+        f.write(f'            command = ("iw", "dev", f"{if_name}", "disconnect")\n')
+        f.write('        else:\n')
+        f.write('            return\n')
+        f.write('        _, err, code = node.pexec(*command)\n')
+        f.write('        if code:\n')
+        f.write('            emit_event("handover_failed", node=name, cell=target_name, at=at, error=err.strip())\n')
+        f.write('\n')
+        f.write('    def run(self):\n')
+        f.write('        start = time.monotonic()\n')
+        f.write('        pending = 0\n')
+        f.write('        emit_event("mobility_started", stations=len(self.tracks), changes=len(self.schedule))\n')
+        f.write('        while not self.stop_event.is_set():\n')
+        f.write('            now = time.monotonic() - start\n')
+        f.write('            moving = self.step(now)\n')
+        f.write('            while pending < len(self.schedule) and self.schedule[pending][0] <= now:\n')
+        f.write('                at, name, cell = self.schedule[pending]\n')
+        f.write('                pending += 1\n')
+        f.write('                try:\n')
+        f.write('                    self.associate(at, name, cell)\n')
+        f.write('                except Exception as e:\n')
+        f.write('                    # One failed entry must not stop the later ones\n')
+        f.write('                    emit_event("handover_failed", node=name, cell=self.cells[cell][0] if cell is not None else None,\n')
+        f.write('                               at=at, error=str(e))\n')
+        f.write('            if not moving and pending >= len(self.schedule):\n')
+        f.write('                break\n')
+        f.write('            wait = self.interval\n')
+        f.write('            if pending < len(self.schedule):\n')
+        f.write('                wait = min(wait, max(self.schedule[pending][0] - (time.monotonic() - start), 0))\n')
+        f.write('            self.stop_event.wait(wait)\n')
+        f.write('        emit_event("mobility_stopped")\n')
+        f.write('\n')
+        f.write('    def stop(self):\n')
+        f.write('        self.stop_event.set()\n\n')
+
+    def write_mobility_startup(self, f, categorized_nodes):
+        """Write the trajectory, cell and reassociation tables and start their replay once the UEs are up."""
+        trajectories = categorized_nodes.get('mobility')
+        if not trajectories:
+            return
+        cells = self.build_mobility_cells(categorized_nodes)
+        schedule = HandoverTimeline([(name, x, y, cell_range) for name, _, x, y, cell_range in cells]).schedule(trajectories)
+        # As the static assignment does, a UE outside every cell at t=0 still connects to the closest access point
+        connectable = [index for index, cell in enumerate(cells) if cell[1]]
+        for position, (at, name, cell) in enumerate(schedule):
+            if at == 0 and cell is None and connectable:
+                x, y = trajectories[name].xs[0], trajectories[name].ys[0]
+                closest = min(connectable, key=lambda index: math.hypot(cells[index][2] - x, cells[index][3] - y))
+                schedule[position] = (at, name, closest)
+        changes = len(schedule) - len(trajectories)
+        debug_print(f"DEBUG: Mobility of {len(trajectories)} UE(s) over {len(cells)} cell(s): {changes} reassociation(s)")
+
+        f.write(f'    info("*** Starting mobility of {len(trajectories)} UE(s), {changes} reassociation(s)\\n")\n')
+        f.write('    MOBILITY_TRAJECTORIES = {\n')
+        for name, row in trajectory_table(trajectories).items():
+            f.write(f'        {name!r}: {row!r},\n')
+        f.write('    }\n')
+        f.write('    # (name, ssid); a None ssid only reports the serving cell\n')
+        f.write(f'    MOBILITY_CELLS = {[(name, ssid) for name, ssid, _, _, _ in cells]!r}\n')
+        f.write('    # (time, UE, index in MOBILITY_CELLS); None is outside every cell\n')
+        f.write('    MOBILITY_SCHEDULE = [\n')
+        for entry in schedule:
+            f.write(f'        {entry!r},\n')
+        f.write('    ]\n')
+        f.write('    mobility = MobilityReplay(net, MOBILITY_TRAJECTORIES, MOBILITY_CELLS, MOBILITY_SCHEDULE)\n')
+        f.write('    mobility.start()\n\n')
 
     def write_topology_function(self, f, nodes, links, categorized_nodes):
         """Write the main topology function following mininet-wifi patterns.
@@ -379,12 +890,16 @@ class MininetExporter:
         
         # Initialize network
         self.write_network_initialization(f, categorized_nodes)
+        f.write('    track_node_creation(net)\n')
+        f.write(f'    emit_event("plan", nodes={self._expected_node_count(categorized_nodes)}, '
+                f'nfs={self._expected_nf_count(categorized_nodes)}, ues={len(categorized_nodes["ues"])})\n\n')
         
         # Add controllers
         self.write_controllers(f, categorized_nodes)
         
         # Add network components
         f.write('    info("*** Creating nodes\\n")\n')
+        f.write('    emit_event("stage", stage="create_nodes", message="Creating nodes")\n')
         self.write_access_points(f, categorized_nodes)
         self.write_stations(f, categorized_nodes)
         self.write_hosts(f, categorized_nodes)
@@ -415,6 +930,7 @@ class MininetExporter:
         
         # Start network
         f.write('    info("*** Starting network\\n")\n')
+        f.write('    emit_event("stage", stage="build", message="Building network")\n')
         f.write('    net.build()\n')
         self.write_controller_startup(f, categorized_nodes)
         self.write_ap_startup(f, categorized_nodes)
@@ -422,14 +938,46 @@ class MininetExporter:
                 
         f.write(f'    update_hosts(net)\n\n')  # Update hostname dns after each link to ensure connectivity
 
+        # One collector aggregates all container logs instead of a tee per node
+        f.write('    log_collector = None\n')
+        f.write('    if AGGREGATE_LOGS:\n')
+        f.write('        log_collector = LogCollector(os.path.join(run_dir, "log"))\n')
+        f.write('        log_collector.start()\n\n')
+
         # Start 5G components
         self.write_5g_startup(f, categorized_nodes)
+        self.write_ue_metrics_startup(f, categorized_nodes)
+        self.write_mobility_startup(f, categorized_nodes)
         
         # CLI and cleanup
-        f.write('    info("*** Running CLI\\n")\n')
-        f.write('    CLI(net)\n\n')
+        f.write('    emit_event("ready")\n')
+        f.write('    if HEADLESS:\n')
+        f.write('        info("*** Running headless, send SIGTERM to stop\\n")\n')
+        f.write('        wait_for_shutdown()\n')
+        f.write('    else:\n')
+        f.write('        info("*** Running CLI\\n")\n')
+        f.write('        CLI(net)\n\n')
+        f.write('    emit_event("stage", stage="stop", message="Stopping network")\n')
+        if categorized_nodes['mobility']:
+            f.write('    mobility.stop()\n')
+        f.write('    if log_collector:\n')
+        f.write('        log_collector.stop()\n')
+        if categorized_nodes['ues']:
+            f.write('    ue_metrics.stop()\n')
         f.write('    info("*** Stopping network\\n")\n')
-        f.write('    net.stop()\n\n')
+        f.write('    net.stop()\n')
+        f.write('    emit_event("stopped")\n\n')
+
+    def _expected_node_count(self, categorized_nodes):
+        """Number of nodes the script adds to the network (progress total for node_created events)."""
+        count = sum(len(categorized_nodes[key]) for key in
+                    ('hosts', 'stas', 'ues', 'gnbs', 'aps', 'switches', 'docker_hosts'))
+        # A default controller is added when the canvas has none; gNB access points are not counted
+        count += max(1, len(categorized_nodes['controllers']))
+        return count + self._expected_nf_count(categorized_nodes)
+
+    def _expected_nf_count(self, categorized_nodes):
+        return sum(len(instances) for instances in categorized_nodes.get('core5g_components', {}).values())
 
     def write_network_initialization(self, f, categorized_nodes):
         """Write network initialization code following fixed_topology-upf.py pattern."""
@@ -512,6 +1060,7 @@ class MininetExporter:
         if not categorized_nodes['stas']:
             return
             
+        sta_rows = []
         for sta in categorized_nodes['stas']:
             props = sta.get('properties', {})
             sta_name = self.sanitize_variable_name(sta['name'])
@@ -528,7 +1077,18 @@ class MininetExporter:
             sta_opts = ConfigurationMapper.map_sta_config(props)
             sta_params.extend(sta_opts)
             
-            f.write(f'    {sta_name} = net.addStation({", ".join(sta_params)})\n')
+            if self.compact_mode:
+                sta_rows.append((sta_name, sta_params[1:]))
+            else:
+                f.write(f'    {sta_name} = net.addStation({", ".join(sta_params)})\n')
+        
+        if self.compact_mode:
+            f.write('    STATION_TABLE = [\n')
+            for sta_name, sta_opts in sta_rows:
+                f.write(f'        ({sta_name!r}, {self._kwargs_literal(sta_opts)}),\n')
+            f.write('    ]\n')
+            f.write('    sta_nodes = [net.addStation(sta_name, **sta_opts) for sta_name, sta_opts in STATION_TABLE]\n')
+            self._write_table_bindings(f, [name for name, _ in sta_rows], 'sta_nodes')
         f.write('\n')
 
     def write_hosts(self, f, categorized_nodes):
@@ -665,12 +1225,7 @@ class MininetExporter:
                 gnb_params.append("dimage='adaptive/ueransim:latest'")
                 
                 # Add volumes for host hardware access and OVS functionality
-                volumes = [
-                    f'"/lib/modules:/lib/modules:ro"',
-                    f'export_dir + "/log/:/logging/"',
-                    f'os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(export_dir))), "automation", "webshark") + "/captures/:/captures/"'
-                ]
-                gnb_params.append(f'volumes=[{", ".join(volumes)}]')
+                gnb_params.append('volumes=[MODULES_VOLUME, LOG_VOLUME, CAPTURES_VOLUME]')
                 
                 # Add position
                 position = f"{gnb.get('x', 0):.1f},{gnb.get('y', 0):.1f},0"
@@ -776,106 +1331,142 @@ class MininetExporter:
         # Write UEs with enhanced UERANSIM configuration
         if categorized_nodes['ues']:
             f.write('    info("*** Adding enhanced UERANSIM UE hosts\\n")\n')
-            for i, ue in enumerate(categorized_nodes['ues'], 1):
-                props = ue.get('properties', {})
-                ue_name = self.sanitize_variable_name(ue['name'])
-                
-                # Build UE parameters following the enhanced pattern
-                ue_params = [f"'{ue_name}'"]
-                
-                # Essential Docker parameters for UERANSIM UE
-                ue_params.append('devices=["/dev/net/tun"]')
-                ue_params.append('cap_add=["net_admin"]')
-                ue_params.append('network_mode=NETWORK_MODE')
-                ue_params.append('dcmd="/bin/bash"')
-                ue_params.append("cls=DockerSta")
-                ue_params.append("dimage='adaptive/ueransim:latest'")
-
-                # Add volumes for host hardware access and OVS functionality
-                volumes = [
-                    f'export_dir + "/log/:/logging/"',
-                    f'os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(export_dir))), "automation", "webshark") + "/captures/:/captures/"'
-                ]
-                ue_params.append(f'volumes=[{", ".join(volumes)}]')
-
-                # Add power-based configuration (remove explicit range)
-                from utils.configmap import ConfigurationMapper
-                ue_config = ConfigurationMapper.map_ue_config(props)
-                
-                # Add txpower - let mininet-wifi calculate range from power
-                if 'txpower' in ue_config:
-                    ue_params.append(f"txpower={ue_config['txpower']}")
-                
-                # Add position
-                position = f"{ue.get('x', 0):.1f},{ue.get('y', 0):.1f},0"
-                ue_params.append(f"position='{position}'")
-                
-                # Enhanced UE environment variables with all new configuration options
-                gnb_hostname = ue_config.get('gnb_hostname', 'localhost')
-                
-                # Build comprehensive environment dictionary matching UERANSIM Dockerfile
-                env_dict = {
-                    # Core 5G Configuration
-                    "GNB_HOSTNAME": gnb_hostname,
-                    "APN": ue_config.get('apn', 'internet'),
-                    "MSISDN": ue_config.get('msisdn', f'000000000{i:01d}'),
-                    "MCC": ue_config.get('mcc', '999'),
-                    "MNC": ue_config.get('mnc', '70'),
-                    "SST": ue_config.get('sst', '1'),
-                    "SD": ue_config.get('sd', '0xffffff'),
-                    "TAC": ue_config.get('tac', '1'),
-                    
-                    # Authentication Configuration
-                    "KEY": ue_config.get('key', '465B5CE8B199B49FAA5F0A2EE238A6BC'),
-                    "OP_TYPE": ue_config.get('op_type', 'OPC'),
-                    "OP": ue_config.get('op', 'E8ED289DEBA952E4283B54E88E6183CA'),
-                    
-                    # Device Identifiers
-                    "IMEI": ue_config.get('imei', '356938035643803'),
-                    "IMEISV": ue_config.get('imeisv', '4370816125816151'),
-                    
-                    # Network Configuration
-                    "TUNNEL_IFACE": ue_config.get('tunnel_iface', 'uesimtun0'),
-                    "RADIO_IFACE": ue_config.get('radio_iface', 'eth0'),
-                    "SESSION_TYPE": ue_config.get('session_type', 'IPv4'),
-                    "PDU_SESSIONS": str(ue_config.get('pdu_sessions', 1)),
+            ue_specs = [self._build_ue_spec(ue, i) for i, ue in enumerate(categorized_nodes['ues'], 1)]
+            if self.compact_mode:
+                self.write_ue_table(f, ue_specs)
+            else:
+                for ue_name, ue_opts, env_dict in ue_specs:
+                    # Essential Docker parameters for UERANSIM UE, then power/position options
+                    ue_params = [f"'{ue_name}'"] + self.UE_STATION_PARAMS + ue_opts
                     
-                    # Mobility Configuration
-                    "MOBILITY_ENABLED": 'true' if ue_config.get('mobility', False) else 'false',
+                    # Format environment
+                    env_str = str(env_dict).replace("'", '"')
+                    ue_params.append(f"environment={env_str}")
                     
-                    # UERANSIM component type
-                    "UERANSIM_COMPONENT": "ue"
-                }
-                
-                # Add gNB IP if specified
-                if 'gnb_ip' in ue_config:
-                    env_dict["GNB_IP"] = ue_config['gnb_ip']
-                
-                # Add OVS configuration if enabled for UE (less common but possible)
-                if 'ovs_config' in ue_config:
-                    ovs_config = ue_config['ovs_config']
-                    if ovs_config.get('OVS_ENABLED') == 'true':
-                        env_dict.update(ovs_config)
-                        env_dict["OVS_BRIDGE_NAME"] = ovs_config.get('OVS_BRIDGE_NAME', 'br-ue')
-                    else:
-                        env_dict["OVS_ENABLED"] = "false"
-                else:
-                    env_dict["OVS_ENABLED"] = "false"
-                
-                # Format environment
-                env_str = str(env_dict).replace("'", '"')
-                ue_params.append(f"environment={env_str}")
-                
-                # Join parameters and replace network_mode placeholder with actual variable reference
-                params_str = ", ".join(ue_params)
-                params_str = params_str.replace("'network_mode=NETWORK_MODE'", "network_mode=NETWORK_MODE")
-                
-                f.write(f'    {ue_name} = net.addStation({params_str})\n')
+                    f.write(f'    {ue_name} = net.addStation({", ".join(ue_params)})\n')
             f.write('\n')
         
         if categorized_nodes['gnbs'] or categorized_nodes['ues'] or categorized_nodes['core5g']:
             f.write('\n')
 
+    # Docker parameters shared by every UERANSIM UE station
+    UE_STATION_PARAMS = [
+        'devices=["/dev/net/tun"]',
+        'cap_add=["net_admin"]',
+        'network_mode=NETWORK_MODE',
+        'dcmd="/bin/bash"',
+        "cls=DockerSta",
+        "dimage='adaptive/ueransim:latest'",
+        # Add volumes for host hardware access and OVS functionality
+        'volumes=SHARED_VOLUMES'
+    ]
+
+    def _build_ue_spec(self, ue, i):
+        """Return (name, per-UE keyword options, environment dict) for a UE node."""
+        props = ue.get('properties', {})
+        ue_name = self.sanitize_variable_name(ue['name'])
+        ue_opts = []
+
+        # Add power-based configuration (remove explicit range)
+        ue_config = ConfigurationMapper.map_ue_config(props)
+        
+        # Add txpower - let mininet-wifi calculate range from power
+        if 'txpower' in ue_config:
+            ue_opts.append(f"txpower={ue_config['txpower']}")
+        
+        # Add position
+        position = f"{ue.get('x', 0):.1f},{ue.get('y', 0):.1f},0"
+        ue_opts.append(f"position='{position}'")
+        
+        # Enhanced UE environment variables with all new configuration options
+        gnb_hostname = ue_config.get('gnb_hostname', 'localhost')
+        
+        # Build comprehensive environment dictionary matching UERANSIM Dockerfile
+        env_dict = {
+            # Core 5G Configuration
+            "GNB_HOSTNAME": gnb_hostname,
+            "APN": ue_config.get('apn', 'internet'),
+            "MSISDN": ue_config.get('msisdn', f'000000000{i:01d}'),
+            "MCC": ue_config.get('mcc', '999'),
+            "MNC": ue_config.get('mnc', '70'),
+            "SST": ue_config.get('sst', '1'),
+            "SD": ue_config.get('sd', '0xffffff'),
+            "TAC": ue_config.get('tac', '1'),
+            
+            # Authentication Configuration
+            "KEY": ue_config.get('key', '465B5CE8B199B49FAA5F0A2EE238A6BC'),
+            "OP_TYPE": ue_config.get('op_type', 'OPC'),
+            "OP": ue_config.get('op', 'E8ED289DEBA952E4283B54E88E6183CA'),
+            
+            # Device Identifiers
+            "IMEI": ue_config.get('imei', '356938035643803'),
+            "IMEISV": ue_config.get('imeisv', '4370816125816151'),
+            
+            # Network Configuration
+            "TUNNEL_IFACE": ue_config.get('tunnel_iface', 'uesimtun0'),
+            "RADIO_IFACE": ue_config.get('radio_iface', 'eth0'),
+            "SESSION_TYPE": ue_config.get('session_type', 'IPv4'),
+            "PDU_SESSIONS": str(ue_config.get('pdu_sessions', 1)),
+            
+            # Mobility Configuration
+            "MOBILITY_ENABLED": 'true' if ue_config.get('mobility', False) else 'false',
+            
+            # UERANSIM component type
+            "UERANSIM_COMPONENT": "ue"
+        }
+        
+        # Add gNB IP if specified
+        if 'gnb_ip' in ue_config:
+            env_dict["GNB_IP"] = ue_config['gnb_ip']
+        
+        # Add OVS configuration if enabled for UE (less common but possible)
+        if 'ovs_config' in ue_config:
+            ovs_config = ue_config['ovs_config']
+            if ovs_config.get('OVS_ENABLED') == 'true':
+                env_dict.update(ovs_config)
+                env_dict["OVS_BRIDGE_NAME"] = ovs_config.get('OVS_BRIDGE_NAME', 'br-ue')
+            else:
+                env_dict["OVS_ENABLED"] = "false"
+        else:
+            env_dict["OVS_ENABLED"] = "false"
+        
+        return ue_name, ue_opts, env_dict
+
+    def _kwargs_literal(self, params):
+        """Turn ["k=v", ...] keyword source fragments into a dict literal source string."""
+        items = []
+        for param in params:
+            key, value = param.split('=', 1)
+            items.append(f"{key.strip()!r}: {value.strip()}")
+        return '{' + ', '.join(items) + '}'
+
+    def _write_table_bindings(self, f, names, nodes_var):
+        """Bind table-created nodes to the variable names the rest of the script uses."""
+        if not names:
+            return
+        f.write(f'    {", ".join(names)}, = {nodes_var}\n')
+
+    def write_ue_table(self, f, ue_specs):
+        """Write UEs as a data table plus one generic creation loop (compact mode)."""
+        # Environment entries shared by every UE are written once
+        first_env = ue_specs[0][2]
+        env_defaults = {
+            key: value for key, value in first_env.items()
+            if all(env.get(key) == value for _, _, env in ue_specs)
+        }
+        f.write(f'    UE_ENV_DEFAULTS = {env_defaults!r}\n')
+        f.write('    UE_TABLE = [\n')
+        for ue_name, ue_opts, env_dict in ue_specs:
+            env_diff = {key: value for key, value in env_dict.items()
+                        if key not in env_defaults}
+            f.write(f'        ({ue_name!r}, {self._kwargs_literal(ue_opts)}, {env_diff!r}),\n')
+        f.write('    ]\n')
+        f.write('    ue_nodes = []\n')
+        f.write('    for ue_name, ue_opts, ue_env in UE_TABLE:\n')
+        f.write(f'        ue_nodes.append(net.addStation(ue_name, {", ".join(self.UE_STATION_PARAMS)},\n')
+        f.write('                                       environment=dict(UE_ENV_DEFAULTS, **ue_env), **ue_opts))\n')
+        self._write_table_bindings(f, [spec[0] for spec in ue_specs], 'ue_nodes')
+
     def write_5g_core_components(self, f, categorized_nodes):
         """
         Write 5G Core components with enhanced Open5GS integration and dynamic configuration.
@@ -1137,7 +1728,7 @@ class MininetExporter:
                     # Debug output for config file mapping
                     f.write(f'    info("      Config file: {config_filename}\\n")\n')
                     
-                    comp_params.append(f'volumes=[export_dir + "/5g-configs/{config_filename}:/opt/open5gs/etc/open5gs/{comp_type.lower()}.yaml", export_dir + "/log/:/logging/", os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(export_dir))), "automation", "webshark") + "/captures/:/captures/"]')
+                    comp_params.append(f'volumes=[export_dir + "/5g-configs/{config_filename}:/opt/open5gs/etc/open5gs/{comp_type.lower()}.yaml"] + SHARED_VOLUMES')
 
                     # Add environment variables for configuration
                     if 'env_vars' in config and config['env_vars']:
@@ -1170,10 +1761,12 @@ class MininetExporter:
         for comp_type in startup_order:
             if comp_type in core_components:
                 f.write(f'    info("*** Starting {comp_type} components\\n")\n')
+                f.write(f'    emit_event("stage", stage="start_{comp_type.lower()}", message="Starting {comp_type}")\n')
                 for instance in core_components[comp_type]:
                     instance_name = self.sanitize_variable_name(instance.get('name', f'{comp_type.lower()}1'))
                     cmd = f'open5gs-{comp_type.lower()}d'
-                    f.write(f'    {instance_name}.cmd("setsid nohup /opt/open5gs/etc/open5gs/entrypoint.sh {cmd} 2>&1 | tee -a /logging/{instance_name}.log  &")\n')
+                    f.write(f'    {instance_name}.cmd("setsid nohup /opt/open5gs/etc/open5gs/entrypoint.sh {cmd} >> /logging/{instance_name}.log 2>&1 &")\n')
+                    f.write(f'    emit_event("nf_started", node={instance_name!r}, nf={comp_type!r})\n')
                 f.write('\n')
         
         f.write('    CLI.do_sh(net, "sleep 10")\n\n')
@@ -1181,6 +1774,7 @@ class MininetExporter:
         # Start gNBs with enhanced OVS and AP configuration
         if categorized_nodes['gnbs']:
             f.write('    info("*** Starting enhanced UERANSIM gNB with OVS/AP support\\n")\n')
+            f.write('    emit_event("stage", stage="start_gnbs", message="Starting gNBs")\n')
             for gnb in categorized_nodes['gnbs']:
                 gnb_name = self.sanitize_variable_name(gnb['name'])
                 props = gnb.get('properties', {})
@@ -1197,13 +1791,17 @@ class MininetExporter:
                     # based on environment variables we've already set
                     f.write(f'    # OVS_ENABLED environment variable will trigger setup in entrypoint\\n")\n')
 
-                f.write(f'    {gnb_name}.cmd("setsid nohup /entrypoint.sh gnb 2>&1 | tee -a /logging/{gnb_name}.log &")\n')
+                f.write(f'    {gnb_name}.cmd("setsid nohup /entrypoint.sh gnb >> /logging/{gnb_name}.log 2>&1 &")\n')
+                f.write(f'    emit_event("gnb_started", node={gnb_name!r})\n')
             f.write('\n')
             f.write('    CLI.do_sh(net, "sleep 15")  # Allow time for gNB and OVS setup\n\n')
         
         # Start UEs with enhanced configuration
-        if categorized_nodes['ues']:
+        if categorized_nodes['ues'] and self.compact_mode:
+            self.write_ue_startup_loop(f, categorized_nodes)
+        elif categorized_nodes['ues']:
             f.write('    info("*** Starting enhanced UERANSIM UE nodes\\n")\n')
+            f.write('    emit_event("stage", stage="start_ues", message="Starting UEs")\n')
             for ue in categorized_nodes['ues']:
                 ue_name = self.sanitize_variable_name(ue['name'])
                 props = ue.get('properties', {})
@@ -1217,9 +1815,10 @@ class MininetExporter:
                     f.write(f'    info("*** Pre-configuring OVS for UE {ue_name}\\n")\n')
                     f.write(f'    # OVS_ENABLED environment variable will trigger setup in entrypoint\\n')
                 
-                f.write(f'    {ue_name}.cmd("setsid nohup /entrypoint.sh ue 2>&1 | tee -a /logging/{ue_name}.log &")\n')
+                f.write(f'    {ue_name}.cmd("setsid nohup /entrypoint.sh ue >> /logging/{ue_name}.log 2>&1 &")\n')
             f.write('\n')
-            f.write('    CLI.do_sh(net, "sleep 20")  # Allow time for UE registration and OVS setup\n\n')
+            ue_names = ', '.join(self.sanitize_variable_name(ue['name']) for ue in categorized_nodes['ues'])
+            f.write(f'    wait_for_ue_registration([{ue_names}], timeout=20)  # Allow time for UE registration and OVS setup\n\n')
             
             # Add UE routing configuration
             f.write('    info("*** Route traffic on UE for End-to-End and End-to-Edge Connection\\n")\n')
@@ -1280,6 +1879,49 @@ class MininetExporter:
                     f.write(f'    makeTerm2({ue_name}, cmd="ovs-vsctl show || echo \\"OVS not ready for {ue_name}\\"")\n')
             f.write('\n')
 
+    # Route added on each UE per APN (End-to-End and End-to-Edge connection)
+    APN_ROUTES = {
+        'internet': '10.100.0.0/16',
+        'internet2': '10.200.0.0/16',
+        'web1': '10.51.0.0/16',
+        'web2': '10.52.0.0/16'
+    }
+
+    def write_ue_startup_loop(self, f, categorized_nodes):
+        """Write UE startup and APN routing as loops over the UE table (compact mode)."""
+        ue_apns = {
+            self.sanitize_variable_name(ue['name']): ue.get('properties', {}).get('UE_APN', 'internet')
+            for ue in categorized_nodes['ues']
+        }
+        ovs_ues = [
+            self.sanitize_variable_name(ue['name']) for ue in categorized_nodes['ues']
+            if (ue.get('properties', {}).get('UE_OVS_Enabled') or
+                ue.get('properties', {}).get('ovs_ovs_enabled', 'false') == 'true' or
+                ue.get('properties', {}).get('ovs_ovs_enabled') is True)
+        ]
+        f.write('    info("*** Starting enhanced UERANSIM UE nodes\\n")\n')
+        f.write('    emit_event("stage", stage="start_ues", message="Starting UEs")\n')
+        if ovs_ues:
+            f.write(f'    UE_OVS = {{{", ".join(repr(name) for name in sorted(ovs_ues))}}}\n')
+        f.write('    for ue_node in ue_nodes:\n')
+        if ovs_ues:
+            f.write('        if ue_node.name in UE_OVS:\n')
+            f.write('            # OVS_ENABLED environment variable will trigger setup in entrypoint\n')
+            f.write('            info(f"*** Pre-configuring OVS for UE {ue_node.name}\\n")\n')
+        f.write('        ue_node.cmd(f"setsid nohup /entrypoint.sh ue >> /logging/{ue_node.name}.log 2>&1 &")\n')
+        f.write('\n')
+        f.write('    wait_for_ue_registration(ue_nodes, timeout=20)  # Allow time for UE registration and OVS setup\n\n')
+        f.write('    info("*** Route traffic on UE for End-to-End and End-to-Edge Connection\\n")\n')
+        f.write(f'    APN_ROUTES = {self.APN_ROUTES!r}\n')
+        f.write(f'    UE_APNS = {ue_apns!r}\n')
+        f.write('    for ue_node in ue_nodes:\n')
+        f.write('        route = APN_ROUTES.get(UE_APNS.get(ue_node.name))\n')
+        f.write('        if route:\n')
+        f.write('            ue_node.cmd(f"ip route add {route} dev uesimtun0")\n')
+        f.write('        else:\n')
+        f.write('            info(f"*** {ue_node.name} APN does not exist, please check your configuration\\n")\n')
+        f.write('\n')
+
     def extract_5g_components_by_type(self, core5g_components):
         """Extract 5G components organized by type from VGcore configurations."""
         components_by_type = {
@@ -1389,6 +2031,9 @@ class MininetExporter:
 
         # Track interface counts for each host/node for proper interface naming
         interface_counts = {}
+        # Compact mode collects links into a table and applies IPs after the loop
+        link_rows = []
+        ip_lines = []
         
         # Initialize interface counts for all nodes
         for node_category in ['hosts', 'stas', 'ues', 'gnbs', 'controllers', 'switches', 'docker_hosts']:
@@ -1512,7 +2157,10 @@ class MininetExporter:
             gnb_pattern = re.compile(r'^GNB__\d+$', re.IGNORECASE)
             ap_pattern = re.compile(r'^ap\d+$', re.IGNORECASE)
 
-            f.write(f'    net.addLink({", ".join(link_params)})\n')
+            if self.compact_mode:
+                link_rows.append(link_params)
+            else:
+                f.write(f'    net.addLink({", ".join(link_params)})\n')
             
             # Configure IP addresses for link endpoints if specified
             ip_config = ConfigurationMapper.get_link_ip_config(link_props)
@@ -1525,9 +2173,12 @@ class MininetExporter:
                 dest_intf = f'{dest_name}-eth{interface_counts.get(dest_name, 0)}'
                 
                 if source_ip:
-                    f.write(f'    {source_name}.setIP(\'{source_ip}\', intf=\'{source_intf}\')\n')
+                    ip_lines.append(f'    {source_name}.setIP(\'{source_ip}\', intf=\'{source_intf}\')\n')
                 if dest_ip:
-                    f.write(f'    {dest_name}.setIP(\'{dest_ip}\', intf=\'{dest_intf}\')\n')
+                    ip_lines.append(f'    {dest_name}.setIP(\'{dest_ip}\', intf=\'{dest_intf}\')\n')
+                if not self.compact_mode:
+                    f.writelines(ip_lines)
+                    ip_lines = []
             
             # Increment interface counts for both nodes
             if source_name in interface_counts:
@@ -1554,7 +2205,10 @@ class MininetExporter:
                     extra_params.extend(extra_config_params)
 
                 # Write the extra link and increment interface counters
-                f.write(f'    net.addLink({", ".join(extra_params)})\n')
+                if self.compact_mode:
+                    link_rows.append(extra_params)
+                else:
+                    f.write(f'    net.addLink({", ".join(extra_params)})\n')
                 # Initialize interface counts if not already present
                 if extra_source not in interface_counts:
                     interface_counts[extra_source] = 0
@@ -1563,6 +2217,14 @@ class MininetExporter:
                 interface_counts[extra_source] += 1
                 interface_counts[extra_dest] += 1
         
+        if self.compact_mode and link_rows:
+            f.write('    LINK_TABLE = [\n')
+            for link_params in link_rows:
+                f.write(f'        ({link_params[0]!r}, {link_params[1]!r}, {self._kwargs_literal(link_params[2:])}),\n')
+            f.write('    ]\n')
+            f.write('    for link_source, link_dest, link_opts in LINK_TABLE:\n')
+            f.write('        net.addLink(net.get(link_source), net.get(link_dest), **link_opts)\n')
+            f.writelines(ip_lines)
         f.write('\n')
 
     def write_plot_graph(self, f, categorized_nodes):
@@ -1752,117 +2414,8 @@ class MininetExporter:
             ap_x, ap_y = ap.get('x', 0), ap.get('y', 0)
             return math.sqrt((ue_x - ap_x)**2 + (ue_y - ap_y)**2)
         
-        def get_coverage_range(ap):
-            """Get the coverage range of an AP from its properties."""
-            props = ap.get('properties', {})
-            
-            # For gNBs, extract range from wireless configuration
-            if ap.get('type') == 'GNB':
-                range_fields = ['GNB_Range', 'wireless_range', 'range', 'lineEdit_6', 'spinBox_3']
-                for field in range_fields:
-                    range_val = props.get(field)
-                    if range_val:
-                        try:
-                            return float(range_val)
-                        except (ValueError, TypeError):
-                            continue
-                return 300  # Default gNB range
-            
-            # For APs, extract range from properties
-            range_fields = ['AP_Range', 'range', 'lineEdit_6', 'spinBox_3']
-            for field in range_fields:
-                range_val = props.get(field)
-                if range_val:
-                    try:
-                        return float(range_val)
-                    except (ValueError, TypeError):
-                        continue
-            return 116  # Default AP range
-        
-        def is_gnb_ap_enabled(gnb):
-            """Check if a gNB has AP functionality enabled."""
-            props = gnb.get('properties', {})
-            env = props.get('environment', {})
-            
-            # Check if it's a gNB first
-            if gnb.get('type') != 'GNB':
-                return False
-            
-            # Check if AP is enabled in environment (Docker containers)
-            if isinstance(env, dict):
-                ap_enabled = (env.get('AP_ENABLED') == 'true' or 
-                            env.get('AP_ENABLED') == True)
-                if ap_enabled:
-                    return True
-            
-            # Check if AP is enabled directly in properties  
-            if not ap_enabled:
-                ap_enabled_fields = [
-                    'GNB_APEnabled', 'AP_ENABLED', 'checkBox_ap_enable',
-                    'checkBox', 'ap_enabled', 'enable_ap', 'apEnabled'
-                ]
-                for field in ap_enabled_fields:
-                    if props.get(field):
-                        ap_enabled = True
-                        break
-            
-            # Check alternative property names
-            if not ap_enabled:
-                for key, value in props.items():
-                    if 'ap' in key.lower() and 'enable' in key.lower():
-                        ap_enabled = True
-                        break
-            
-            debug_print(f"DEBUG: gNB {gnb.get('name', 'unknown')} AP enabled: {ap_enabled}")
-            return ap_enabled
-        
-        def get_ap_ssid(ap):
-            """Get the SSID/AP name that UEs should connect to."""
-            props = ap.get('properties', {})
-            
-            # For gNB APs, check if we have a generated AP and use its SSID
-            if ap.get('type') == 'GNB' and '_generated_ap' in ap:
-                return ap['_generated_ap']['ssid']
-            
-            # For gNB APs without generated AP, extract SSID from AP configuration
-            if ap.get('type') == 'GNB':
-                env = props.get('environment', {})
-                if isinstance(env, dict):
-                    ap_ssid = env.get('AP_SSID')
-                    if ap_ssid:
-                        return ap_ssid
-                
-                # Check direct properties
-                gnb_ap_ssid = (props.get('GNB_AP_SSID') or 
-                              props.get('ap_ap_ssid') or 
-                              props.get('lineEdit_ap_ssid'))
-                if gnb_ap_ssid:
-                    return gnb_ap_ssid
-                
-                # Default gNB AP SSID
-                return 'gnb-hotspot'
-            
-            # For traditional APs
-            ap_ssid = props.get('AP_SSID', props.get('lineEdit_5'))
-            if ap_ssid:
-                return ap_ssid
-            
-            # Default AP SSID format: ap-name + "-ssid"
-            ap_name = self.sanitize_variable_name(ap.get('name', 'ap'))
-            return f"{ap_name}-ssid"
-        
         # Collect all access points (traditional APs + gNB-APs)
-        access_points = []
-        
-        # Add traditional APs
-        for ap in categorized_nodes.get('aps', []):
-            access_points.append(ap)
-        
-        # Add gNBs that have AP functionality enabled
-        for gnb in categorized_nodes.get('gnbs', []):
-            if is_gnb_ap_enabled(gnb):
-                access_points.append(gnb)
-                debug_print(f"DEBUG: Added gNB {gnb.get('name')} as access point")
+        access_points = self.get_access_points(categorized_nodes)
         
         if not access_points:
             f.write('    # No access points (traditional APs or gNB-APs) found\n')
@@ -1873,22 +2426,29 @@ class MininetExporter:
         
         # Process each UE and find the best access point
         ue_assignments = {}
+        coverage_ranges = [self.get_coverage_range(ap) for ap in access_points]
+        
+        # Mobile UEs connect as MobilityReplay reaches their schedule entries
+        mobile = categorized_nodes.get('mobility') or {}
         
         for ue in categorized_nodes.get('ues', []):
             ue_name = self.sanitize_variable_name(ue['name'])
+            if ue_name in mobile:
+                continue
             best_ap = None
             best_distance = float('inf')
             
-            f.write(f'    # Finding best access point for {ue_name} at position ({ue.get("x", 0):.1f}, {ue.get("y", 0):.1f})\n')
+            # Compact mode keeps only the resulting assignment table, not the per-AP reasoning
+            trace = (lambda line: None) if self.compact_mode else f.write
+            trace(f'    # Finding best access point for {ue_name} at position ({ue.get("x", 0):.1f}, {ue.get("y", 0):.1f})\n')
             
             # Check each access point
-            for ap in access_points:
+            for ap, coverage_range in zip(access_points, coverage_ranges):
                 distance = calculate_distance(ue, ap)
-                coverage_range = get_coverage_range(ap)
                 ap_name = ap.get('name', 'unknown')
                 ap_type = ap.get('type', 'AP')
                 
-                f.write(f'    # {ap_name} ({ap_type}) at ({ap.get("x", 0):.1f}, {ap.get("y", 0):.1f}): distance={distance:.1f}m, range={coverage_range}m\n')
+                trace(f'    # {ap_name} ({ap_type}) at ({ap.get("x", 0):.1f}, {ap.get("y", 0):.1f}): distance={distance:.1f}m, range={coverage_range}m\n')
                 
                 # Check if UE is within coverage and find the closest one
                 if distance <= coverage_range and distance < best_distance:
@@ -1896,18 +2456,18 @@ class MininetExporter:
                     best_distance = distance
             
             if best_ap:
-                ap_ssid = get_ap_ssid(best_ap)
+                ap_ssid = self.get_ap_ssid(best_ap)
                 ue_assignments[ue_name] = {
                     'ssid': ap_ssid,
                     'ap_name': best_ap.get('name', 'unknown'),
                     'ap_type': best_ap.get('type', 'AP'),
                     'distance': best_distance
                 }
-                f.write(f'    # {ue_name} -> {best_ap.get("name")} (SSID: {ap_ssid}, distance: {best_distance:.1f}m)\n')
+                trace(f'    # {ue_name} -> {best_ap.get("name")} (SSID: {ap_ssid}, distance: {best_distance:.1f}m)\n')
             else:
                 # No AP in range, connect to the closest one anyway
                 closest_ap = min(access_points, key=lambda ap: calculate_distance(ue, ap))
-                ap_ssid = get_ap_ssid(closest_ap)
+                ap_ssid = self.get_ap_ssid(closest_ap)
                 closest_distance = calculate_distance(ue, closest_ap)
                 ue_assignments[ue_name] = {
                     'ssid': ap_ssid,
@@ -1915,8 +2475,16 @@ class MininetExporter:
                     'ap_type': closest_ap.get('type', 'AP'),
                     'distance': closest_distance
                 }
-                f.write(f'    # {ue_name} -> {closest_ap.get("name")} (SSID: {ap_ssid}, distance: {closest_distance:.1f}m) [OUT OF RANGE - connecting to closest]\n')
+                trace(f'    # {ue_name} -> {closest_ap.get("name")} (SSID: {ap_ssid}, distance: {closest_distance:.1f}m) [OUT OF RANGE - connecting to closest]\n')
         
+        if self.compact_mode:
+            ue_ssids = {ue_name: assignment['ssid'] for ue_name, assignment in ue_assignments.items()}
+            f.write(f'    UE_SSIDS = {ue_ssids!r}\n')
+            f.write('    for ue_name, ue_ssid in UE_SSIDS.items():\n')
+            f.write('        net.get(ue_name).cmd(f"iw dev {ue_name}-wlan0 connect {ue_ssid}")\n')
+            f.write('\n')
+            return
+
         f.write('\n')
         
         # Generate the connection commands
@@ -1925,6 +2493,115 @@ class MininetExporter:
         
         f.write('\n')
 
+    def get_access_points(self, categorized_nodes):
+        """Traditional APs and the gNBs that have AP functionality enabled."""
+        access_points = list(categorized_nodes.get('aps', []))
+        for gnb in categorized_nodes.get('gnbs', []):
+            if self.is_gnb_ap_enabled(gnb):
+                access_points.append(gnb)
+                debug_print(f"DEBUG: Added gNB {gnb.get('name')} as access point")
+        return access_points
+
+    def get_coverage_range(self, ap):
+        """Get the coverage range of an AP from its properties."""
+        props = ap.get('properties', {})
+
+        # For gNBs, extract range from wireless configuration
+        if ap.get('type') == 'GNB':
+            range_fields = ['GNB_Range', 'wireless_range', 'range', 'lineEdit_6', 'spinBox_3']
+            for field in range_fields:
+                range_val = props.get(field)
+                if range_val:
+                    try:
+                        return float(range_val)
+                    except (ValueError, TypeError):
+                        continue
+            return 300  # Default gNB range
+
+        # For APs, extract range from properties
+        range_fields = ['AP_Range', 'range', 'lineEdit_6', 'spinBox_3']
+        for field in range_fields:
+            range_val = props.get(field)
+            if range_val:
+                try:
+                    return float(range_val)
+                except (ValueError, TypeError):
+                    continue
+        return 116  # Default AP range
+
+    def is_gnb_ap_enabled(self, gnb):
+        """Check if a gNB has AP functionality enabled."""
+        props = gnb.get('properties', {})
+        env = props.get('environment', {})
+
+        # Check if it's a gNB first
+        if gnb.get('type') != 'GNB':
+            return False
+
+        # Check if AP is enabled in environment (Docker containers)
+        ap_enabled = False
+        if isinstance(env, dict):
+            ap_enabled = (env.get('AP_ENABLED') == 'true' or 
+                        env.get('AP_ENABLED') == True)
+            if ap_enabled:
+                return True
+
+        # Check if AP is enabled directly in properties  
+        if not ap_enabled:
+            ap_enabled_fields = [
+                'GNB_APEnabled', 'AP_ENABLED', 'checkBox_ap_enable',
+                'checkBox', 'ap_enabled', 'enable_ap', 'apEnabled'
+            ]
+            for field in ap_enabled_fields:
+                if props.get(field):
+                    ap_enabled = True
+                    break
+
+        # Check alternative property names
+        if not ap_enabled:
+            for key, value in props.items():
+                if 'ap' in key.lower() and 'enable' in key.lower():
+                    ap_enabled = True
+                    break
+
+        debug_print(f"DEBUG: gNB {gnb.get('name', 'unknown')} AP enabled: {ap_enabled}")
+        return ap_enabled
+
+    def get_ap_ssid(self, ap):
+        """Get the SSID/AP name that UEs should connect to."""
+        props = ap.get('properties', {})
+
+        # For gNB APs, check if we have a generated AP and use its SSID
+        if ap.get('type') == 'GNB' and '_generated_ap' in ap:
+            return ap['_generated_ap']['ssid']
+
+        # For gNB APs without generated AP, extract SSID from AP configuration
+        if ap.get('type') == 'GNB':
+            env = props.get('environment', {})
+            if isinstance(env, dict):
+                ap_ssid = env.get('AP_SSID')
+                if ap_ssid:
+                    return ap_ssid
+
+            # Check direct properties
+            gnb_ap_ssid = (props.get('GNB_AP_SSID') or 
+                          props.get('ap_ap_ssid') or 
+                          props.get('lineEdit_ap_ssid'))
+            if gnb_ap_ssid:
+                return gnb_ap_ssid
+
+            # Default gNB AP SSID
+            return 'gnb-hotspot'
+
+        # For traditional APs
+        ap_ssid = props.get('AP_SSID', props.get('lineEdit_5'))
+        if ap_ssid:
+            return ap_ssid
+
+        # Default AP SSID format: ap-name + "-ssid"
+        ap_name = self.sanitize_variable_name(ap.get('name', 'ap'))
+        return f"{ap_name}-ssid"
+
     def write_ap_gnb_links(self, f, categorized_nodes):
         """Write direct links between APs and their corresponding gNBs."""
         gnbs_with_ap = []
@@ -1,7 +1,7 @@
 import os
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QLabel, QGraphicsSceneContextMenuEvent, QMenu, QGraphicsItem
 from PyQt5.QtCore import Qt, QPoint, QRectF, QTimer
-from PyQt5.QtGui import QPen, QCursor
+from PyQt5.QtGui import QPen, QCursor, QPainter
 from .widgets.Dialog import *
 from .components import NetworkComponent
 from utils.debug import debug_print, error_print, warning_print
@@ -21,6 +21,13 @@ class Canvas(QGraphicsView):
         self.setAcceptDrops(True)
 
         self.show_grid = False
+        # Coverage heatmap overlay: a cached image and the scene rectangle it covers
+        self.heatmap_image = None
+        self.heatmap_rect = None
+        # UE trajectory overlay: [(QPainterPath, QColor)] in scene coordinates
+        self.trajectory_paths = []
+        # Object taking canvas clicks as points (pickPoint/finishPicking), e.g. while drawing waypoints
+        self.point_picker = None
         self.zoom_level = 1.0
         self.link_mode = False
         
@@ -85,8 +92,35 @@ class Canvas(QGraphicsView):
         self.show_grid = show
         self.viewport().update()
 
+    def setHeatmap(self, image, rect=None):
+        """Show image stretched over the scene rectangle rect under the components; None hides it."""
+        self.heatmap_image = image
+        self.heatmap_rect = rect
+        self.viewport().update()
+
+    def setTrajectories(self, paths):
+        """Show [(QPainterPath, QColor)] under the components; an empty list hides them."""
+        self.trajectory_paths = paths
+        self.viewport().update()
+
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
+        if self.heatmap_image is not None and self.heatmap_rect is not None and rect.intersects(self.heatmap_rect):
+            painter.save()
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(self.heatmap_rect, self.heatmap_image)
+            painter.restore()
+        if self.trajectory_paths:
+            painter.save()
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(Qt.NoBrush)
+            for path, color in self.trajectory_paths:
+                if path.controlPointRect().intersects(rect):
+                    pen = QPen(color, 2, Qt.DashLine)
+                    pen.setCosmetic(True)
+                    painter.setPen(pen)
+                    painter.drawPath(path)
+            painter.restore()
         if self.show_grid:
             pen = QPen(Qt.lightGray)
             pen.setWidth(0)
@@ -127,6 +161,13 @@ class Canvas(QGraphicsView):
                 self.app_instance.exitPlacementMode()
                 return  # Do not propagate event further
 
+        # Left clicks go to the point picker; its right click finishes in contextMenuEvent
+        if self.point_picker is not None and event.button() in (Qt.LeftButton, Qt.RightButton):
+            if event.button() == Qt.LeftButton:
+                self.point_picker.pickPoint(self.mapToScene(event.pos()))
+            event.accept()
+            return
+
         if event.button() == Qt.MiddleButton:
             self.is_panning = True
             self.pan_start_point = event.pos()
@@ -139,7 +180,7 @@ class Canvas(QGraphicsView):
         if self.app_instance.current_tool == "delete":
             item = self.itemAt(event.pos())
             if item:
-                self.scene.removeItem(item)
+                self.app_instance.undo_manager.deleteItems([item])
                 self.app_instance.showCanvasStatus("Item deleted")
                 self.cleanupBrokenLinks()
 
@@ -186,6 +227,10 @@ class Canvas(QGraphicsView):
 
         super().mousePressEvent(event)
 
+        # Selection is settled now; remember where a possible drag starts
+        if event.button() == Qt.LeftButton and not self.link_mode:
+            self.app_instance.undo_manager.beginMove()
+
     def mouseMoveEvent(self, event):
         if self.is_panning and event.buttons() & Qt.MiddleButton:
             delta = event.pos() - self.last_pan_point
@@ -223,6 +268,9 @@ class Canvas(QGraphicsView):
             
         super().mouseReleaseEvent(event)
 
+        if event.button() == Qt.LeftButton:
+            self.app_instance.undo_manager.endMove()
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasText():
             event.acceptProposedAction()
@@ -257,6 +305,7 @@ class Canvas(QGraphicsView):
                 component.setPosition(position.x(), position.y())
                 
                 self.scene.addItem(component)
+                self.app_instance.undo_manager.recordAdded([component])
                 self.scene.update()
                 self.viewport().update()
                 
@@ -318,28 +367,15 @@ class Canvas(QGraphicsView):
             error_print(f"ERROR: Failed to cleanup broken links: {e}")
 
     def keyPressEvent(self, event):
+        if self.point_picker is not None and event.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Escape):
+            self.point_picker.finishPicking(event.key() != Qt.Key_Escape)
+            event.accept()
+            return
         if event.key() == Qt.Key_Delete:
             selected_items = self.scene.selectedItems()
             if selected_items:
-                for item in selected_items:
-                    # Remove any connected links first if this is a NetworkComponent
-                    if hasattr(item, 'connected_links') and item.connected_links:
-                        links_to_remove = item.connected_links.copy()
-                        for link in links_to_remove:
-                            if hasattr(link, 'source_node') and hasattr(link.source_node, 'connected_links'):
-                                if link in link.source_node.connected_links:
-                                    link.source_node.connected_links.remove(link)
-                            if hasattr(link, 'dest_node') and hasattr(link.dest_node, 'connected_links'):
-                                if link in link.dest_node.connected_links:
-                                    link.dest_node.connected_links.remove(link)
-                            if link.scene():
-                                self.scene.removeItem(link)
-                    # If it's a NetworkComponent, use its cleanup method
-                    from .components import NetworkComponent
-                    if isinstance(item, NetworkComponent):
-                        item._delete_and_cleanup()
-                    else:
-                        self.scene.removeItem(item)
+                # Components are removed with their links, as one undoable step
+                self.app_instance.undo_manager.deleteItems(selected_items)
                 self.cleanupBrokenLinks()
                 if hasattr(self, 'app_instance') and self.app_instance:
                     num_items = len(selected_items)
@@ -362,6 +398,7 @@ class Canvas(QGraphicsView):
         component = NetworkComponent(component_type, icon_path, main_window=self.app_instance)
         component.setPos(pos)
         self.scene.addItem(component)
+        self.app_instance.undo_manager.recordAdded([component])
         debug_print(f"Placed component '{component_type}' at position: x={pos.x()}, y={pos.y()}")
         
         # Mark topology as modified
@@ -370,6 +407,11 @@ class Canvas(QGraphicsView):
 
     def contextMenuEvent(self, event):
         """Handle right-click context menu on canvas."""
+        if self.point_picker is not None:
+            self.point_picker.finishPicking(True)
+            event.accept()
+            return
+
         # Check if we clicked on an empty area (no items under the cursor)
         item_at_pos = self.itemAt(event.pos())
         
@@ -1,9 +1,10 @@
 from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QMenu, QGraphicsSceneContextMenuEvent
 from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPixmap, QPen, QColor
+from PyQt5.QtGui import QPen, QColor
 from .widgets.Dialog import *
 from utils.debug import debug_print, error_print, warning_print
 from utils.power_range_calculator import PowerRangeCalculator
+from utils.icon_cache import scaled_pixmap
 
 
 class NetworkComponent(QGraphicsPixmapItem):
@@ -32,6 +33,9 @@ class NetworkComponent(QGraphicsPixmapItem):
         "AP": set(), "VGcore": set(), "Controller": set(), "Router": set(), "Switch": set(),
     }
     copied_properties = None  # Class-level clipboard for properties
+
+    # Properties that change the coverage radius of wireless components
+    POWER_FIELDS = ("AP_Power", "GNB_Power", "UE_Power", "AP_SignalRange", "GNB_Range", "range", "lineEdit_range")
     
     def __init__(self, component_type, icon_path, parent=None, main_window=None):
         super().__init__(parent)
@@ -71,8 +75,7 @@ class NetworkComponent(QGraphicsPixmapItem):
             self.properties["UE_Power"] = 20  # Default UE power in dBm
     
         # Set the pixmap for the item (increase icon size to 80x80)
-        pixmap = QPixmap(self.icon_path).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.setPixmap(pixmap)
+        self.setPixmap(scaled_pixmap(self.icon_path, 80))
     
         # Make the item draggable and selectable
         self.setFlag(QGraphicsPixmapItem.ItemIsMovable)
@@ -115,8 +118,7 @@ class NetworkComponent(QGraphicsPixmapItem):
             self.setPos(properties_dict["x"], properties_dict["y"])
         
         # Update coverage radius if power-related properties changed
-        power_fields = ["AP_Power", "GNB_Power", "UE_Power", "AP_SignalRange", "GNB_Range", "range", "lineEdit_range"]
-        if any(field in properties_dict for field in power_fields):
+        if any(field in properties_dict for field in self.POWER_FIELDS):
             self.updateCoverageRadius()
 
     def getProperties(self):
@@ -332,6 +334,15 @@ class NetworkComponent(QGraphicsPixmapItem):
             paste_props_action.setEnabled(NetworkComponent.copied_properties is not None and (NetworkComponent.copied_properties.get('type') == self.component_type))
             copy_props_action.triggered.connect(self.copy_properties)
             paste_props_action.triggered.connect(self.paste_properties)
+
+            if self.component_type == "UE" and self.main_window is not None:
+                menu.addSeparator()
+                mobility_menu = menu.addMenu("Mobility")
+                mobility_menu.addAction("Set Model...", lambda: self.main_window.mobility_manager.showModelDialog(
+                    self._mobilityTargets()))
+                mobility_menu.addAction("Draw Waypoints", lambda: self.main_window.mobility_manager.editWaypoints(self))
+                mobility_menu.addAction("Clear", lambda: self.main_window.mobility_manager.clearMobility(
+                    self._mobilityTargets()))
         menu.exec_(event.screenPos())
         event.accept()  # Prevent further propagation and duplicate menu
         # After menu closes, ensure dragging state and offset are reset
@@ -348,6 +359,13 @@ class NetworkComponent(QGraphicsPixmapItem):
             pass
         # Do NOT call super().contextMenuEvent(event) here to avoid duplicate menu
 
+    def _mobilityTargets(self):
+        """The selection when this UE is part of it, otherwise just this UE."""
+        scene = self.scene()
+        if self.isSelected() and scene is not None:
+            return scene.selectedItems()
+        return [self]
+
     def copy_properties(self):
         # Copy all properties except position and name/number
         props = self.getProperties().copy()
@@ -368,10 +386,14 @@ class NetworkComponent(QGraphicsPixmapItem):
         # Only paste if types match
         props = NetworkComponent.copied_properties
         if props and props.get('type') == self.component_type:
+            before = dict(self.properties)
             # Don't overwrite name/number/position
             for k, v in props.items():
                 if k not in ["x", "y", "name", "type"]:
                     self.properties[k] = v
+            undo_manager = getattr(self.main_window, 'undo_manager', None)
+            if undo_manager is not None:
+                undo_manager.recordPropertyChange(self, before, f"Paste properties to {self.display_name}")
             # Optionally, update dialog if open
             if hasattr(self, 'dialog') and self.dialog is not None:
                 self.dialog.loadProperties()
@@ -422,6 +444,14 @@ class NetworkComponent(QGraphicsPixmapItem):
                 view.app_instance.component_operations_manager.pasteComponent(paste_pos)
 
     def _delete_and_cleanup(self):
+        # Delete through the undo stack when the editor has one
+        undo_manager = getattr(self.main_window, 'undo_manager', None)
+        if undo_manager is not None and self.scene():
+            num_links = len(self.connected_links) if getattr(self, 'connected_links', None) else 0
+            undo_manager.deleteItems([self])
+            undo_manager.main_window.showCanvasStatus(f"Deleted component and {num_links} connected link(s)")
+            return
+
         # Remove any connected links first (same as before)
         scene = self.scene()
         if hasattr(self, 'connected_links') and self.connected_links:
@@ -468,9 +498,8 @@ class NetworkComponent(QGraphicsPixmapItem):
         """Open the properties dialog for the component."""
         dialog_class = self.PROPERTIES_MAP.get(self.component_type)
         if dialog_class:
-            # Pass the component reference to the dialog
-            dialog = dialog_class(label_text=self.display_name, parent=self.scene().views()[0], component=self)
-            dialog.show()
+            # Reuse the pooled dialog of this type, bound to this component
+            dialog_class.openFor(self, self.display_name, parent=self.scene().views()[0])
             # After dialog closes, always reset dragging state and offset
             self.dragging = False
             self._drag_start_pos = None
@@ -561,6 +590,10 @@ class NetworkComponent(QGraphicsPixmapItem):
             else:
                 return 30.0
 
+    def coverageCenter(self):
+        """Scene position of the coverage circle's centre (the middle of the 80x80 icon)."""
+        return self.mapToScene(QPointF(40, 40))
+
     def updateCoverageRadius(self):
         """Update the coverage radius and trigger a repaint."""
         if self.component_type in ["AP", "GNB"]:
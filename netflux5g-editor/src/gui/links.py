@@ -344,13 +344,8 @@ class NetworkLink(QGraphicsItem):
         if scene and scene.views():
             view = scene.views()[0]
             if hasattr(view, 'app_instance') and view.app_instance.current_tool == "delete":
-                # Remove this link from connected nodes
-                if hasattr(self.source_node, 'connected_links') and self in self.source_node.connected_links:
-                    self.source_node.connected_links.remove(self)
-                if hasattr(self.dest_node, 'connected_links') and self in self.dest_node.connected_links:
-                    self.dest_node.connected_links.remove(self)
                 # Delete this link
-                scene.removeItem(self)
+                self.deleteLink()
                 return
                 
         # If not in delete mode, call the parent handler
@@ -382,13 +377,12 @@ class NetworkLink(QGraphicsItem):
         try:
             from .widgets.Dialog import LinkPropertiesWindow
             
-            # Create and show the properties dialog
-            properties_dialog = LinkPropertiesWindow(
+            # Show the pooled properties dialog for this link
+            LinkPropertiesWindow.openFor(
+                self,
                 self.name,
-                parent=self.scene().views()[0] if self.scene() and self.scene().views() else None,
-                component=self
+                parent=self.scene().views()[0] if self.scene() and self.scene().views() else None
             )
-            properties_dialog.show()
             
         except Exception as e:
             error_print(f"ERROR: Failed to open link properties dialog: {e}")
@@ -396,7 +390,11 @@ class NetworkLink(QGraphicsItem):
     def deleteLink(self):
         """Delete this link."""
         scene = self.scene()
-        if scene:
+        undo_manager = getattr(self.main_window, 'undo_manager', None)
+        if scene and undo_manager is not None:
+            undo_manager.deleteItems([self])
+            debug_print(f"DEBUG: Link {self.name} deleted")
+        elif scene:
             # Remove this link from connected nodes
             if hasattr(self.source_node, 'connected_links') and self in self.source_node.connected_links:
                 self.source_node.connected_links.remove(self)
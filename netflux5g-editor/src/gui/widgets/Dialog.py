@@ -1,22 +1,40 @@
 import os
-from PyQt5.QtWidgets import QMainWindow, QLineEdit, QComboBox, QCheckBox, QTableWidget, QTableWidgetItem, QSpinBox, QDoubleSpinBox, QTextEdit, QPlainTextEdit, QPushButton, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QMainWindow, QWidget, QLineEdit, QComboBox, QCheckBox, QTableWidget, QTableWidgetItem, QSpinBox, QDoubleSpinBox, QTextEdit, QPlainTextEdit, QPushButton, QTabWidget, QFileDialog, QMessageBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
-from PyQt5 import uic
+from PyQt5 import sip
 from utils.debug import debug_print, error_print, warning_print
+from utils.ui_loader import load_ui
 
 class BasePropertiesWindow(QMainWindow):
     """Base class for all properties windows that automatically sets the icon."""
+
+    # Window title, followed by the component name
+    title = "Properties"
+
+    # Widget types whose values are loaded from and saved to the component properties
+    FIELD_TYPES = (QLineEdit, QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox, QTextEdit, QPlainTextEdit)
+
+    _icon = None
+    # One window per dialog class, rebound to whichever component is being edited
+    _pool = {}
     
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(parent)
         # Store the component name and reference
         self.component_name = label_text
         self.component = component  # Reference to the actual component object
+        self._snapshot = self._snapshotProperties()
+        self._fields = None
+        self._defaults = None
+        # Form state right after the component's properties were loaded, to detect unsaved edits
+        self._loaded_state = None
 
-        # Set the window icon
-        icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Icon", "logoSquare.png")
-        self.setWindowIcon(QIcon(icon_path))
+        # Set the window icon (decoded once for all windows)
+        if BasePropertiesWindow._icon is None:
+            icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Icon", "logoSquare.png")
+            BasePropertiesWindow._icon = QIcon(icon_path)
+        self.setWindowIcon(BasePropertiesWindow._icon)
         
         # Center the dialog on the parent widget
         if parent:
@@ -26,6 +44,169 @@ class BasePropertiesWindow(QMainWindow):
                 parent_geometry.y() + (parent_geometry.height() - self.height()) // 2
             )
 
+    @classmethod
+    def openFor(cls, component, label_text, parent=None):
+        """
+        Show the properties window of this class for component.
+
+        The window is built once per class (and parent) and reused: opening it for
+        another component restores the form defaults and loads that component's
+        properties instead of parsing the .ui file again.
+        """
+        window = cls._pool.get(cls)
+        if window is None or sip.isdeleted(window) or window.parent() is not parent:
+            window = cls(label_text, parent=parent, component=component)
+            cls._pool[cls] = window
+            window._loaded_state = window._formState()
+        else:
+            window.bind(component, label_text)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
+    def bind(self, component, label_text):
+        """
+        Point the window at component.
+
+        If the window is still open for another component with unsaved edits, the
+        user chooses to apply them (an undoable change, as OK and close would make),
+        discard them, or keep editing the previous component.
+        """
+        if self.isVisible():
+            if self.component is component or not self._settleOpenEdits():
+                return
+        self.component = component
+        self.component_name = label_text
+        self._snapshot = self._snapshotProperties()
+        self.setWindowTitle(f"{self.title} - {label_text}")
+        self.restoreDefaults()
+        self.loadProperties()
+        self._loaded_state = self._formState()
+
+    def _settleOpenEdits(self):
+        """Apply or discard the open component's edits; False if the user keeps editing it."""
+        if self.component is not None and self._loaded_state is not None and self._formState() != self._loaded_state:
+            reply = QMessageBox.question(
+                self,
+                "Unsaved Changes",
+                f"Apply the changes made to {self.component_name} before editing another component?",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+                QMessageBox.Yes
+            )
+            if reply == QMessageBox.Cancel:
+                return False
+            if reply == QMessageBox.Yes:
+                # OK saves and closes, and closing records the undoable change
+                self.onOK()
+                return not self.isVisible()
+        self._recordPropertyChange()
+        return True
+
+    @classmethod
+    def reloadOpenWindows(cls, components):
+        """Reload pooled windows that are showing one of components after it was changed elsewhere."""
+        components = set(map(id, components))
+        for window in cls._pool.values():
+            if not sip.isdeleted(window) and window.isVisible() and id(window.component) in components:
+                window._snapshot = window._snapshotProperties()
+                window.restoreDefaults()
+                window.loadProperties()
+                window._loaded_state = window._formState()
+
+    def _snapshotProperties(self):
+        properties = getattr(self.component, 'properties', None)
+        return dict(properties) if properties is not None else None
+
+    def _recordPropertyChange(self):
+        """Make whatever OK wrote to the component one undoable change."""
+        main_window = getattr(self.component, 'main_window', None)
+        undo_manager = getattr(main_window, 'undo_manager', None)
+        if undo_manager is not None and self._snapshot is not None:
+            undo_manager.recordPropertyChange(self.component, self._snapshot, f"Edit {self.component_name}")
+        self._snapshot = None
+
+    def closeEvent(self, event):
+        self._recordPropertyChange()
+        self._loaded_state = None
+        # Pooled windows outlive the component they were showing
+        self.component = None
+        super().closeEvent(event)
+
+    def fieldWidgets(self):
+        """Named field widgets by type, collected in a single pass over the window's children."""
+        if self._fields is None:
+            self._fields = {field_type: [] for field_type in self.FIELD_TYPES}
+            self._tables = []
+            self._tabs = []
+            for widget in self.findChildren(QWidget):
+                if isinstance(widget, QTableWidget):
+                    self._tables.append(widget)
+                elif isinstance(widget, QTabWidget):
+                    self._tabs.append(widget)
+                elif widget.objectName():
+                    for field_type in self.FIELD_TYPES:
+                        if isinstance(widget, field_type):
+                            self._fields[field_type].append(widget)
+                            break
+        return self._fields
+
+    def _captureDefaults(self):
+        """Remember the initial form state so a pooled window can be reset between components."""
+        self._defaults = self._fieldStates()
+
+    def _formState(self):
+        """Comparable snapshot of every field and table cell, to tell whether the form was edited."""
+        # Switching tabs is navigation, not an edit
+        state = [value for widget, value in self._fieldStates() if not isinstance(widget, QTabWidget)]
+        for table in self._tables:
+            state.append([[table.item(row, column).text() if table.item(row, column) else ''
+                           for column in range(table.columnCount())] for row in range(table.rowCount())])
+        return state
+
+    def _fieldStates(self):
+        """(widget, value) pairs of the fields, tables and tabs, as restoreDefaults applies them."""
+        fields = self.fieldWidgets()
+        states = []
+        for widget in fields[QLineEdit]:
+            states.append((widget, widget.text()))
+        for widget in fields[QComboBox]:
+            states.append((widget, (widget.count(), widget.currentIndex(), widget.currentText())))
+        for widget in fields[QCheckBox]:
+            states.append((widget, widget.isChecked()))
+        for widget in fields[QSpinBox] + fields[QDoubleSpinBox]:
+            states.append((widget, widget.value()))
+        for widget in fields[QTextEdit] + fields[QPlainTextEdit]:
+            states.append((widget, widget.toPlainText()))
+        states.extend((widget, widget.rowCount()) for widget in self._tables)
+        states.extend((widget, widget.currentIndex()) for widget in self._tabs)
+        return states
+
+    def restoreDefaults(self):
+        """Put every field back to the state it had when the window was first built."""
+        for widget, value in self._defaults or []:
+            if isinstance(widget, QLineEdit):
+                widget.setText(value)
+            elif isinstance(widget, QComboBox):
+                count, index, text = value
+                # loadProperties appends values missing from the list
+                while widget.count() > count:
+                    widget.removeItem(count)
+                widget.setCurrentIndex(index)
+                if widget.isEditable():
+                    widget.setEditText(text)
+            elif isinstance(widget, QCheckBox):
+                widget.setChecked(value)
+            elif isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                widget.setValue(value)
+            elif isinstance(widget, (QTextEdit, QPlainTextEdit)):
+                widget.setPlainText(value)
+            elif isinstance(widget, QTableWidget):
+                widget.setRowCount(0)
+                widget.setRowCount(value)
+            elif isinstance(widget, QTabWidget):
+                widget.setCurrentIndex(value)
+
     def setupConnections(self):
         """Setup connections for OK and Cancel buttons - to be implemented by subclasses"""
         pass
@@ -37,9 +218,10 @@ class BasePropertiesWindow(QMainWindow):
             return
             
         properties = {}
+        fields = self.fieldWidgets()
         
         # Automatically collect all QLineEdit values
-        for widget in self.findChildren(QLineEdit):
+        for widget in fields[QLineEdit]:
             name = widget.objectName()
             if name:  # Only save if the widget has a name
                 value = widget.text().strip()
@@ -47,7 +229,7 @@ class BasePropertiesWindow(QMainWindow):
                     properties[name] = value
                 
         # Collect all QComboBox values
-        for widget in self.findChildren(QComboBox):
+        for widget in fields[QComboBox]:
             name = widget.objectName()
             if name:
                 value = widget.currentText().strip()
@@ -55,13 +237,13 @@ class BasePropertiesWindow(QMainWindow):
                     properties[name] = value
                 
         # Collect all QCheckBox values
-        for widget in self.findChildren(QCheckBox):
+        for widget in fields[QCheckBox]:
             name = widget.objectName()
             if name:
                 properties[name] = widget.isChecked()
 
         # Collect all QSpinBox values
-        for widget in self.findChildren(QSpinBox):
+        for widget in fields[QSpinBox]:
             name = widget.objectName()
             if name:
                 value = widget.value()
@@ -69,7 +251,7 @@ class BasePropertiesWindow(QMainWindow):
                     properties[name] = value
 
         # Collect all QDoubleSpinBox values
-        for widget in self.findChildren(QDoubleSpinBox):
+        for widget in fields[QDoubleSpinBox]:
             name = widget.objectName()
             if name:
                 value = widget.value()
@@ -77,7 +259,7 @@ class BasePropertiesWindow(QMainWindow):
                     properties[name] = value
                 
         # Collect all QTextEdit values
-        for widget in self.findChildren(QTextEdit):
+        for widget in fields[QTextEdit]:
             name = widget.objectName()
             if name:
                 value = widget.toPlainText().strip()
@@ -85,7 +267,7 @@ class BasePropertiesWindow(QMainWindow):
                     properties[name] = value
                 
         # Collect all QPlainTextEdit values
-        for widget in self.findChildren(QPlainTextEdit):
+        for widget in fields[QPlainTextEdit]:
             name = widget.objectName()
             if name:
                 value = widget.toPlainText().strip()
@@ -205,6 +387,8 @@ class BasePropertiesWindow(QMainWindow):
 
     def loadProperties(self):
         """Load component properties into UI widgets with validation and error handling."""
+        if self._defaults is None:
+            self._captureDefaults()
         if not self.component:
             warning_print("WARNING: No component reference to load properties from")
             return
@@ -213,9 +397,10 @@ class BasePropertiesWindow(QMainWindow):
         if not properties:
             debug_print("DEBUG: No properties to load")
             return
+        fields = self.fieldWidgets()
         
         # Load values into QLineEdit widgets
-        for widget in self.findChildren(QLineEdit):
+        for widget in fields[QLineEdit]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -224,7 +409,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load LineEdit {name}: {e}")
                 
         # Load values into QComboBox widgets
-        for widget in self.findChildren(QComboBox):
+        for widget in fields[QComboBox]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -240,7 +425,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load ComboBox {name}: {e}")
                     
         # Load values into QCheckBox widgets
-        for widget in self.findChildren(QCheckBox):
+        for widget in fields[QCheckBox]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -249,7 +434,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load CheckBox {name}: {e}")
 
         # Load values into QSpinBox widgets
-        for widget in self.findChildren(QSpinBox):
+        for widget in fields[QSpinBox]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -267,7 +452,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load SpinBox {name}: {e}")
 
         # Load values into QDoubleSpinBox widgets
-        for widget in self.findChildren(QDoubleSpinBox):
+        for widget in fields[QDoubleSpinBox]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -284,7 +469,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load DoubleSpinBox {name}: {e}")
                     
         # Load values into QTextEdit widgets
-        for widget in self.findChildren(QTextEdit):
+        for widget in fields[QTextEdit]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -293,7 +478,7 @@ class BasePropertiesWindow(QMainWindow):
                     warning_print(f"WARNING: Failed to load TextEdit {name}: {e}")
                 
         # Load values into QPlainTextEdit widgets
-        for widget in self.findChildren(QPlainTextEdit):
+        for widget in fields[QPlainTextEdit]:
             name = widget.objectName()
             if name in properties:
                 try:
@@ -381,11 +566,13 @@ class BasePropertiesWindow(QMainWindow):
             debug_print(f"DEBUG: Loaded {len(table_data)} {component_type} configurations into table")
 
 class HostPropertiesWindow(BasePropertiesWindow):
+    title = "Host Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Host_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Host Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.loadProperties()
@@ -403,11 +590,13 @@ class HostPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class STAPropertiesWindow(BasePropertiesWindow):
+    title = "STA Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "STA_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"STA Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.loadProperties()
@@ -425,11 +614,13 @@ class STAPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class APPropertiesWindow(BasePropertiesWindow):
+    title = "AP Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "AP_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"AP Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.loadProperties()
@@ -470,11 +661,13 @@ class APPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class ControllerPropertiesWindow(BasePropertiesWindow):
+    title = "Controller Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Controller_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Controller Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.loadProperties()
@@ -492,11 +685,13 @@ class ControllerPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class DockerHostPropertiesWindow(BasePropertiesWindow):
+    title = "Docker Host Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "DockerHost_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Docker Host Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.loadProperties()
@@ -516,6 +711,8 @@ class DockerHostPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class GNBPropertiesWindow(BasePropertiesWindow):
+    title = "gNB Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -523,13 +720,13 @@ class GNBPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "GNB_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced gNB UI with AP functionality")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic gNB UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"gNB Properties - {label_text}")
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.setupDefaultValues()
@@ -772,6 +969,8 @@ class GNBPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class UEPropertiesWindow(BasePropertiesWindow):
+    title = "UE Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -779,13 +978,13 @@ class UEPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "UE_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced UE UI with wireless and network functionality")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic UE UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"UE Properties - {label_text}")
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.setupDefaultValues()
@@ -1023,6 +1222,8 @@ class UEPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class Component5GPropertiesWindow(BasePropertiesWindow):
+    title = "5G Core Properties"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -1030,13 +1231,13 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Component5G_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced 5G Core UI with Open5GS configuration")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic 5G Core UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"5G Core Properties - {label_text}")
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setWindowFlags(Qt.Window)
         
         self.setupConnections()
@@ -1933,6 +2134,8 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
 
 class LinkPropertiesWindow(BasePropertiesWindow):
     """Properties window for network links with bandwidth, delay, and loss settings."""
+
+    title = "Link Properties"
     
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
@@ -1940,14 +2143,14 @@ class LinkPropertiesWindow(BasePropertiesWindow):
         # Load the UI file
         ui_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ui", "Link_properties.ui")
         if os.path.exists(ui_file):
-            uic.loadUi(ui_file, self)
+            load_ui(ui_file, self)
             debug_print(f"DEBUG: Loaded Link properties UI from {ui_file}")
         else:
             error_print(f"ERROR: Link properties UI file not found: {ui_file}")
             return
             
         # Set window properties
-        self.setWindowTitle(f"Link Properties - {label_text}")
+        self.setWindowTitle(f"{self.title} - {label_text}")
         self.setFixedSize(450, 470)  # Increased height for IP configuration
         
         # Load existing properties
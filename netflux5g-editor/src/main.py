@@ -1,7 +1,12 @@
 import os
 import sys
+import time
 import traceback
-from PyQt5.QtWidgets import QApplication, QMainWindow, QSplitter, QMenuBar, QMenu, QAction, QMessageBox
+
+# Startup benchmark reference point, taken before the Qt and manager imports
+_STARTUP_T0 = time.perf_counter()
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QSplitter, QMenuBar, QMenu, QAction, QActionGroup, QMessageBox
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QKeySequence, QPixmap, QCursor
 from PyQt5 import uic
@@ -16,30 +21,48 @@ from manager.canvas import CanvasManager
 from manager.automation import AutomationManager
 from manager.keyboard import KeyboardManager
 from manager.component_operations import ComponentOperationsManager
+from manager.undo import UndoManager
 from utils.debug import debug_print, error_print, warning_print, set_debug_enabled, is_debug_enabled
 from manager.welcome import WelcomeScreenManager
-from manager.docker_network import DockerNetworkManager
-from manager.database import DatabaseManager
-from manager.monitoring import MonitoringManager
-from manager.controller import ControllerManager
-from manager.packet_analyzer import PacketAnalyzerManager
-from utils.template_updater import TemplateUpdater
+from utils.lazy_loader import LazyManager, lazy_slot
+from utils.ui_loader import load_ui
 
 # Import existing modules
 from gui.canvas import Canvas
 from gui.toolbar import ToolbarFunctions
-from export.mininet_export import MininetExporter
-from automation.automation_runner import AutomationRunner
 
 # Load the UI file
 UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui", "ui", "Main_Window.ui")
 
 class NetFlux5GApp(QMainWindow):
-    def __init__(self, show_welcome=True):
+    # Managers that are only needed once the user deploys something are imported
+    # and built on first use (see --eager-startup for the old behaviour)
+    docker_network_manager = LazyManager('manager.docker_network', 'DockerNetworkManager')
+    database_manager = LazyManager('manager.database', 'DatabaseManager')
+    monitoring_manager = LazyManager('manager.monitoring', 'MonitoringManager')
+    controller_manager = LazyManager('manager.controller', 'ControllerManager')
+    packet_analyzer_manager = LazyManager('manager.packet_analyzer', 'PacketAnalyzerManager')
+    template_updater = LazyManager('utils.template_updater', 'TemplateUpdater')
+    mininet_exporter = LazyManager('export.mininet_export', 'MininetExporter')
+    automation_runner = LazyManager('automation.automation_runner', 'AutomationRunner')
+    bulk_edit_manager = LazyManager('manager.bulk_edit', 'BulkEditManager')
+    topology_generator_manager = LazyManager('manager.topology_generator', 'TopologyGeneratorManager')
+    coverage_heatmap_manager = LazyManager('manager.coverage', 'CoverageHeatmapManager')
+    mobility_manager = LazyManager('manager.mobility', 'MobilityManager')
+    validation_manager = LazyManager('manager.validation', 'ValidationManager')
+
+    def __init__(self, show_welcome=True, eager_startup=False):
         super().__init__()
+        self.startup_timings = {}
+        self._startup_clock = _STARTUP_T0
+        self.markStartupPhase('imports')
         
-        # Load the UI file
-        uic.loadUi(UI_FILE, self)
+        # Load the UI (precompiled module; --eager-startup parses the .ui file at runtime)
+        if eager_startup:
+            uic.loadUi(UI_FILE, self)
+        else:
+            load_ui(UI_FILE, self)
+        self.markStartupPhase('load_ui')
 
         # Initialize component mapping for icons FIRST
         self.setupComponentIconMap()
@@ -54,18 +77,15 @@ class NetFlux5GApp(QMainWindow):
         self.automation_manager = AutomationManager(self)
         self.keyboard_manager = KeyboardManager(self)
         self.component_operations_manager = ComponentOperationsManager(self)
+        self.undo_manager = UndoManager(self)
         self.welcome_manager = WelcomeScreenManager(self)
-        self.docker_network_manager = DockerNetworkManager(self)
-        self.database_manager = DatabaseManager(self)
-        self.monitoring_manager = MonitoringManager(self)
-        self.controller_manager = ControllerManager(self)
-        self.packet_analyzer_manager = PacketAnalyzerManager(self)
-        self.template_updater = TemplateUpdater(self)
+        if eager_startup:
+            for name in LazyManager.lazy_names(type(self)):
+                getattr(self, name)
         
         # Initialize other components
         self.toolbar_functions = ToolbarFunctions(self)
-        self.mininet_exporter = MininetExporter(self)
-        self.automation_runner = AutomationRunner(self)
+        self.markStartupPhase('managers')
 
         # Initialize grid attribute
         self.show_grid = False
@@ -80,6 +100,7 @@ class NetFlux5GApp(QMainWindow):
         self.setupCanvas()
         self.component_panel_manager.setupComponentPanel()
         self.component_panel_manager.setupComponentPanelToggle()
+        self.markStartupPhase('canvas')
         
         # Initialize attributes
         self.current_link_source = None
@@ -101,12 +122,18 @@ class NetFlux5GApp(QMainWindow):
         # Debug menu actions
         self.debugMenuActions()
 
-        # Update template files with correct config paths
-        debug_print("Updating template configuration paths...")
-        if self.template_updater.update_all_templates():
-            debug_print("Template configuration paths updated successfully")
+        self.markStartupPhase('connections')
+
+        # Update template files with correct config paths; templates are also fixed
+        # when opened, so the full pass runs off the startup path
+        if eager_startup:
+            debug_print("Updating template configuration paths...")
+            if self.template_updater.update_all_templates(force=True):
+                debug_print("Template configuration paths updated successfully")
+            else:
+                warning_print("Failed to update some template configuration paths")
         else:
-            warning_print("Failed to update some template configuration paths")
+            QTimer.singleShot(2000, lambda: self.template_updater.update_in_background())
 
         # Initialize window title
         self.updateWindowTitle()
@@ -121,6 +148,27 @@ class NetFlux5GApp(QMainWindow):
         
         # Force initial geometry update
         QTimer.singleShot(100, self.window_manager.updateCanvasGeometry)
+        self.markStartupPhase('init_done')
+
+    def markStartupPhase(self, phase):
+        """Record the time spent since the previous startup phase."""
+        now = time.perf_counter()
+        self.startup_timings[phase] = now - self._startup_clock
+        self._startup_clock = now
+
+    def reportStartupBenchmark(self):
+        """Print startup timings as one JSON line once the canvas is interactive, then quit."""
+        import json
+        # Flush the pending show/paint events before taking the time
+        QApplication.processEvents()
+        self.markStartupPhase('first_paint')
+        print("NF5G_STARTUP " + json.dumps({
+            'phases': {phase: round(seconds, 4) for phase, seconds in self.startup_timings.items()},
+            'total': round(time.perf_counter() - _STARTUP_T0, 4),
+            'lazy_loaded': [name for name in LazyManager.lazy_names(type(self))
+                            if LazyManager.is_loaded(self, name)]
+        }), flush=True)
+        QApplication.instance().quit()
 
     def setupComponentIconMap(self):
         """Initialize component icon mapping."""
@@ -198,6 +246,28 @@ class NetFlux5GApp(QMainWindow):
             if hasattr(self, 'actionExport_to_Level_2_Script'):
                 self.actionExport_to_Level_2_Script.triggered.connect(self.automation_manager.exportToMininet)
 
+            # Procedural topology generation, after Open
+            if hasattr(self, 'menuFile'):
+                self.actionGenerate_Topology = QAction('Generate Topology...', self)
+                self.actionGenerate_Topology.triggered.connect(
+                    lazy_slot(self, 'topology_generator_manager', 'showGeneratorDialog'))
+                before = getattr(self, 'actionSave', None)
+                if before is not None and before in self.menuFile.actions():
+                    self.menuFile.insertAction(before, self.actionGenerate_Topology)
+                else:
+                    self.menuFile.addAction(self.actionGenerate_Topology)
+
+            # Edit menu - Undo/Redo from the undo stack, ahead of Cut, Copy, Paste
+            if hasattr(self, 'menuEdit'):
+                first_action = self.menuEdit.actions()[0] if self.menuEdit.actions() else None
+                self.actionUndo = self.undo_manager.stack.createUndoAction(self, "Undo")
+                self.actionUndo.setShortcut(QKeySequence.Undo)
+                self.actionRedo = self.undo_manager.stack.createRedoAction(self, "Redo")
+                self.actionRedo.setShortcuts([QKeySequence.Redo, QKeySequence('Ctrl+Y')])
+                self.menuEdit.insertAction(first_action, self.actionUndo)
+                self.menuEdit.insertAction(first_action, self.actionRedo)
+                self.menuEdit.insertSeparator(first_action)
+
             # Edit menu connections - Cut, Copy, Paste
             if hasattr(self, 'actionCut'):
                 self.actionCut.triggered.connect(self.component_operations_manager.cutComponent)
@@ -206,6 +276,45 @@ class NetFlux5GApp(QMainWindow):
             if hasattr(self, 'actionPaste'):
                 self.actionPaste.triggered.connect(self.component_operations_manager.pasteComponent)
 
+            # Bulk property editing of the selection or of a query
+            if hasattr(self, 'menuEdit'):
+                self.menuEdit.addSeparator()
+                self.actionBulk_Edit = self.menuEdit.addAction('Bulk Edit Properties...')
+                self.actionBulk_Edit.setShortcut(QKeySequence('Ctrl+Shift+E'))
+                self.actionBulk_Edit.triggered.connect(lazy_slot(self, 'bulk_edit_manager', 'showBulkEditDialog'))
+
+            # View menu - coverage heatmap overlay modes
+            if hasattr(self, 'menubar') and self.menubar is not None:
+                self.menuView = QMenu('View', self)
+                if hasattr(self, 'menuRun'):
+                    self.menubar.insertMenu(self.menuRun.menuAction(), self.menuView)
+                else:
+                    self.menubar.addMenu(self.menuView)
+                heatmap_menu = self.menuView.addMenu('Coverage Heatmap')
+                heatmap_group = QActionGroup(self)
+                self.heatmap_actions = {}
+                for mode, text in [(None, 'Off'), ('signal', 'Signal Strength'), ('server', 'Best Server'),
+                                   ('sinr', 'SINR'), ('overlap', 'Overlapping Coverage')]:
+                    action = heatmap_menu.addAction(text)
+                    action.setCheckable(True)
+                    action.setChecked(mode is None)
+                    heatmap_group.addAction(action)
+                    action.triggered.connect(lambda checked, mode=mode: self.coverage_heatmap_manager.setMode(mode))
+                    self.heatmap_actions[mode] = action
+
+                # UE mobility trajectories over the canvas
+                self.actionShow_Trajectories = self.menuView.addAction('Show UE Trajectories')
+                self.actionShow_Trajectories.setCheckable(True)
+                self.actionShow_Trajectories.triggered.connect(
+                    lambda checked: self.mobility_manager.setTrajectoriesVisible(checked))
+
+            # UE mobility of the selection
+            if hasattr(self, 'menuEdit'):
+                self.actionUE_Mobility = self.menuEdit.addAction('UE Mobility...')
+                self.actionUE_Mobility.triggered.connect(lazy_slot(self, 'mobility_manager', 'showModelDialog'))
+                self.actionDraw_Waypoints = self.menuEdit.addAction('Draw UE Waypoints')
+                self.actionDraw_Waypoints.triggered.connect(lazy_slot(self, 'mobility_manager', 'editWaypoints'))
+
             # Tool connections
             if hasattr(self, 'actionPickTool'):
                 self.actionPickTool.triggered.connect(self.tool_manager.enablePickTool)
@@ -232,51 +341,78 @@ class NetFlux5GApp(QMainWindow):
             if hasattr(self, 'actionStop'):
                 self.actionStop.triggered.connect(self.automation_manager.stopTopology)
 
+            if hasattr(self, 'actionGenerate_Load_Traffic'):
+                self.actionGenerate_Load_Traffic.triggered.connect(self.automation_manager.runTrafficTest)
+
+            # Headless supervised Mininet runs instead of the interactive CLI in a terminal
+            if hasattr(self, 'menuRun'):
+                self.actionSupervise_Mininet = self.menuRun.addAction('Supervise Mininet Headless')
+                self.actionSupervise_Mininet.setCheckable(True)
+                self.actionSupervise_Mininet.toggled.connect(
+                    lambda checked: setattr(self.automation_runner, 'supervised', checked))
+
+            # Topology validation, ahead of Run All
+            if hasattr(self, 'menuRun'):
+                self.actionValidate_Topology = QAction('Validate Topology...', self)
+                self.actionValidate_Topology.setShortcut(QKeySequence('F7'))
+                self.actionValidate_Topology.triggered.connect(lazy_slot(self, 'validation_manager', 'showReport'))
+                before = getattr(self, 'actionRun_All', None)
+                if before is not None and before in self.menuRun.actions():
+                    self.menuRun.insertAction(before, self.actionValidate_Topology)
+                else:
+                    self.menuRun.addAction(self.actionValidate_Topology)
+
             # Docker network connections
             if hasattr(self, 'actionCreate_Docker_Network'):
-                self.actionCreate_Docker_Network.triggered.connect(self.docker_network_manager.create_docker_network)
+                self.actionCreate_Docker_Network.triggered.connect(lazy_slot(self, 'docker_network_manager', 'create_docker_network'))
             if hasattr(self, 'actionDelete_Docker_Network'):
-                self.actionDelete_Docker_Network.triggered.connect(self.docker_network_manager.delete_docker_network)
+                self.actionDelete_Docker_Network.triggered.connect(lazy_slot(self, 'docker_network_manager', 'delete_docker_network'))
 
             # Database connections
             if hasattr(self, 'actionDeploy_Database'):
-                self.actionDeploy_Database.triggered.connect(self.database_manager.deployDatabase)
+                self.actionDeploy_Database.triggered.connect(lazy_slot(self, 'database_manager', 'deployDatabase'))
             if hasattr(self, 'actionStop_Database'):
-                self.actionStop_Database.triggered.connect(self.database_manager.stopDatabase)
+                self.actionStop_Database.triggered.connect(lazy_slot(self, 'database_manager', 'stopDatabase'))
 
             # Web UI connections
             if hasattr(self, 'actionDeploy_User_Manager'):
-                self.actionDeploy_User_Manager.triggered.connect(self.database_manager.deployWebUI)
+                self.actionDeploy_User_Manager.triggered.connect(lazy_slot(self, 'database_manager', 'deployWebUI'))
             if hasattr(self, 'actionStop_User_Manager'):
-                self.actionStop_User_Manager.triggered.connect(self.database_manager.stopWebUI)
+                self.actionStop_User_Manager.triggered.connect(lazy_slot(self, 'database_manager', 'stopWebUI'))
 
             # Monitoring connections
             if hasattr(self, 'actionDeploy_Monitoring'):
-                self.actionDeploy_Monitoring.triggered.connect(self.monitoring_manager.deployMonitoring)
+                self.actionDeploy_Monitoring.triggered.connect(lazy_slot(self, 'monitoring_manager', 'deployMonitoring'))
             if hasattr(self, 'actionStop_Monitoring'):
-                self.actionStop_Monitoring.triggered.connect(self.monitoring_manager.stopMonitoring)
+                self.actionStop_Monitoring.triggered.connect(lazy_slot(self, 'monitoring_manager', 'stopMonitoring'))
 
             # Packet Analyzer connections
             if hasattr(self, 'actionDeploy_Packet_Analyzer'):
-                self.actionDeploy_Packet_Analyzer.triggered.connect(self.packet_analyzer_manager.deployPacketAnalyzer)
+                self.actionDeploy_Packet_Analyzer.triggered.connect(lazy_slot(self, 'packet_analyzer_manager', 'deployPacketAnalyzer'))
             if hasattr(self, 'actionStop_Packet_Analyzer'):
-                self.actionStop_Packet_Analyzer.triggered.connect(self.packet_analyzer_manager.stopPacketAnalyzer)
+                self.actionStop_Packet_Analyzer.triggered.connect(lazy_slot(self, 'packet_analyzer_manager', 'stopPacketAnalyzer'))
+            if hasattr(self, 'actionStart_Packet_Capture'):
+                self.actionStart_Packet_Capture.triggered.connect(lazy_slot(self, 'packet_analyzer_manager', 'startPacketCapture'))
+            if hasattr(self, 'actionStop_Packet_Capture'):
+                self.actionStop_Packet_Capture.triggered.connect(lazy_slot(self, 'packet_analyzer_manager', 'stopPacketCapture'))
+            if hasattr(self, 'actionSummarize_Packet_Capture'):
+                self.actionSummarize_Packet_Capture.triggered.connect(lazy_slot(self, 'packet_analyzer_manager', 'summarizePacketCapture'))
 
             # Ryu Controller connections
             if hasattr(self, 'actionDeploy_Ryu_Controller'):
-                self.actionDeploy_Ryu_Controller.triggered.connect(self.controller_manager.deployRyuController)
+                self.actionDeploy_Ryu_Controller.triggered.connect(lazy_slot(self, 'controller_manager', 'deployRyuController'))
             if hasattr(self, 'actionStop_Ryu_Controller'):
-                self.actionStop_Ryu_Controller.triggered.connect(self.controller_manager.stopRyuController)
+                self.actionStop_Ryu_Controller.triggered.connect(lazy_slot(self, 'controller_manager', 'stopRyuController'))
             
             # ONOS Controller connections
             if hasattr(self, 'actionDeploy_ONOS_Controller'):
-                self.actionDeploy_ONOS_Controller.triggered.connect(self.controller_manager.deployOnosController)
+                self.actionDeploy_ONOS_Controller.triggered.connect(lazy_slot(self, 'controller_manager', 'deployOnosController'))
             if hasattr(self, 'actionStop_ONOS_Controller'):
-                self.actionStop_ONOS_Controller.triggered.connect(self.controller_manager.stopOnosController)
+                self.actionStop_ONOS_Controller.triggered.connect(lazy_slot(self, 'controller_manager', 'stopOnosController'))
 
             # Clear MongoDB data
             if hasattr(self, 'actionClear_DB_Data'):
-                self.actionClear_DB_Data.triggered.connect(self.database_manager.cleanupDatabase)
+                self.actionClear_DB_Data.triggered.connect(lazy_slot(self, 'database_manager', 'cleanupDatabase'))
 
             # Component button connections
             if hasattr(self.component_panel_manager, 'component_widgets'):
@@ -710,21 +846,30 @@ if __name__ == "__main__":
     # Check for command line arguments
     show_welcome = "--no-welcome" not in sys.argv
     update_templates_only = "--update-templates" in sys.argv
+    # Load everything up front like older releases (used as the startup benchmark baseline)
+    eager_startup = "--eager-startup" in sys.argv
+    # Print startup timings once the canvas is interactive and exit (automation/startup_benchmark.py)
+    startup_benchmark = "--startup-benchmark" in sys.argv
     
     # If only updating templates, do that and exit
     if update_templates_only:
+        from utils.template_updater import TemplateUpdater
         debug_print("Running template update only...")
         updater = TemplateUpdater()
-        if updater.update_all_templates():
+        if updater.update_all_templates(force=True):
             print("Template configuration paths updated successfully")
             sys.exit(0)
         else:
             print("Failed to update template configuration paths")
             sys.exit(1)
     
-    window = NetFlux5GApp(show_welcome)
+    window = NetFlux5GApp(show_welcome and not startup_benchmark, eager_startup=eager_startup)
     
-    if show_welcome:
+    if startup_benchmark:
+        window.show()
+        # Runs after the first event loop pass has painted the window
+        QTimer.singleShot(0, window.reportStartupBenchmark)
+    elif show_welcome:
         # Show welcome screen first
         if not window.welcome_manager.showWelcomeScreen():
             # If welcome screen fails, show main window directly
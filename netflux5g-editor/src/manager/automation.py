@@ -27,10 +27,40 @@ class AutomationManager:
                 return "ryu"
         return None
 
+    def _confirmTopology(self, action):
+        """
+        Extract the canvas topology and validate it before anything is deployed.
+
+        Returns (nodes, links), or None if the user cancelled on validation errors.
+        """
+        nodes, links = self.main_window.extractTopology()
+        if (nodes and hasattr(self.main_window, 'validation_manager') and
+                not self.main_window.validation_manager.confirmTopology(nodes, links, action)):
+            debug_print(f"DEBUG: {action} cancelled after topology validation")
+            return None
+        return nodes, links
+
+    def runTrafficTest(self):
+        """Prompt for a load profile and run the iperf3 traffic test on the running topology."""
+        from automation.traffic_engine import LOAD_PROFILES
+        profiles = list(LOAD_PROFILES)
+        profile, ok = QInputDialog.getItem(
+            self.main_window,
+            "Generate Load Traffic",
+            "Choose the load profile for all UEs:",
+            profiles,
+            profiles.index('optimized'),
+            False
+        )
+        if ok:
+            self.main_window.automation_runner.run_traffic_test(profile)
+
     def runAllComponents(self):
-        """Run All - Deploy and start all components including controller, database, monitoring, and topology, with stepwise waiting."""
-        from PyQt5.QtCore import QEventLoop
+        """Run All - Deploy and start all components including controller, database, monitoring, and topology."""
         debug_print("DEBUG: RunAll triggered - comprehensive deployment")
+        topology = self._confirmTopology("Run")
+        if topology is None:
+            return
         # Prompt for controller type
         controller_type = self.promptControllerChoice()
         if not controller_type:
@@ -43,17 +73,6 @@ class AutomationManager:
         if hasattr(self.main_window, 'actionRunAll'):
             self.main_window.actionRunAll.setEnabled(False)
 
-        def wait_for_worker(manager, worker_attr='current_worker'):
-            """Wait for a manager's worker to finish using QEventLoop."""
-            if hasattr(manager, worker_attr):
-                worker = getattr(manager, worker_attr)
-                if worker and worker.isRunning():
-                    loop = QEventLoop()
-                    def on_finished(*_):
-                        loop.quit()
-                    worker.operation_finished.connect(on_finished)
-                    loop.exec_()
-
         try:
             self.main_window.status_manager.showCanvasStatus("Starting comprehensive deployment...")
             # Step 1: Ensure Docker network exists
@@ -63,59 +82,50 @@ class AutomationManager:
                 self.main_window.docker_network_manager.create_netflux5g_network_if_needed()
                 # No worker, so no wait needed
 
-            # Step 2: Deploy Controller (Ryu or ONOS)
-            debug_print(f"DEBUG: Step 2 - Deploying {controller_type.upper()} controller")
-            self.main_window.status_manager.showCanvasStatus(f"Deploying {controller_type.upper()} controller...")
-            if hasattr(self.main_window, 'controller_manager'):
-                if controller_type == 'onos':
-                    self.main_window.controller_manager.deployOnosController()
-                else:
-                    self.main_window.controller_manager.deployController()
-                wait_for_worker(self.main_window.controller_manager, 'deployment_worker')
-
-            # Step 3: Deploy Database (MongoDB)
-            debug_print("DEBUG: Step 3 - Deploying MongoDB database")
-            self.main_window.status_manager.showCanvasStatus("Deploying MongoDB database...")
-            if hasattr(self.main_window, 'database_manager'):
-                self.main_window.database_manager.deployDatabase()
-                wait_for_worker(self.main_window.database_manager)
-
-            # Step 4: Deploy WebUI (User Manager)
-            debug_print("DEBUG: Step 4 - Deploying WebUI User Manager")
-            self.main_window.status_manager.showCanvasStatus("Deploying WebUI User Manager...")
-            if hasattr(self.main_window, 'database_manager'):
-                self.main_window.database_manager.deployWebUI()
-                wait_for_worker(self.main_window.database_manager)
-
-            # Step 5: Deploy Monitoring Stack
-            debug_print("DEBUG: Step 5 - Deploying Monitoring stack")
-            self.main_window.status_manager.showCanvasStatus("Deploying Monitoring stack...")
-            if hasattr(self.main_window, 'monitoring_manager'):
-                self.main_window.monitoring_manager.deployMonitoring()
-                wait_for_worker(self.main_window.monitoring_manager)
-
-            # Step 6: Deploy Packet Analyzer (Webshark)
-            debug_print("DEBUG: Step 6 - Deploying Packet Analyzer")
-            self.main_window.status_manager.showCanvasStatus("Deploying Packet Analyzer...")
-            if hasattr(self.main_window, 'packet_analyzer_manager'):
-                self.main_window.packet_analyzer_manager.deployPacketAnalyzer()
-                wait_for_worker(self.main_window.packet_analyzer_manager)
+            # Steps 2-6: Deploy controller, database, WebUI, monitoring and packet analyzer concurrently
+            debug_print(f"DEBUG: Steps 2-6 - Deploying {controller_type.upper()} controller and services concurrently")
+            self.main_window.status_manager.showCanvasStatus("Deploying controller, database, monitoring and packet analyzer...")
+            success, message, cancelled = self._deployServicesConcurrently(controller_type)
+            if cancelled:
+                debug_print("DEBUG: Run All cancelled during service deployment")
+                self.main_window.status_manager.showCanvasStatus("Deployment cancelled; topology not started")
+                # Services that did come up can still be removed with Stop All
+                for action_name in ('actionRun_All', 'actionRunAll', 'actionStop_All', 'actionStopAll'):
+                    if hasattr(self.main_window, action_name):
+                        getattr(self.main_window, action_name).setEnabled(True)
+                return
+            if not success:
+                warning_print(f"WARNING: Some services failed to deploy: {message}")
+                QMessageBox.warning(
+                    self.main_window,
+                    "Partial Deployment",
+                    f"Some services could not be deployed:\n\n{message}\n\nThe topology will still be started."
+                )
 
             # Step 7: Run Topology
             debug_print("DEBUG: Step 7 - Running topology")
             self.main_window.status_manager.showCanvasStatus("Starting topology...")
+            topology_started = False
             if hasattr(self.main_window, 'automation_runner'):
-                self.main_window.automation_runner.run_topology_only()
+                topology_started = self.main_window.automation_runner.run_topology_only(*topology)
 
             # Update UI state after successful deployment
             if hasattr(self.main_window, 'actionStop_All'):
                 self.main_window.actionStop_All.setEnabled(True)
             if hasattr(self.main_window, 'actionStopAll'):
                 self.main_window.actionStopAll.setEnabled(True)
-            if hasattr(self.main_window, 'actionStop'):
+            if topology_started and hasattr(self.main_window, 'actionStop'):
                 self.main_window.actionStop.setEnabled(True)
 
-            self.main_window.status_manager.showCanvasStatus("All services deployed successfully!")
+            if not success:
+                # The partial deployment warning above already listed the failed services
+                self.main_window.status_manager.showCanvasStatus(
+                    "Partial deployment; topology started" if topology_started
+                    else "Partial deployment; topology not started")
+                return
+
+            self.main_window.status_manager.showCanvasStatus(
+                "All services deployed successfully!" if topology_started else "Services deployed; topology not started")
 
             QMessageBox.information(
                 self.main_window,
@@ -126,7 +136,7 @@ class AutomationManager:
                 "- WebUI User Manager\n" +
                 "- Monitoring Stack (with Blackbox Monitoring)\n" +
                 "- Packet Analyzer\n" +
-                "- Network Topology\n\n" +
+                ("- Network Topology\n\n" if topology_started else "\nThe network topology was not started.\n\n") +
                 "Access points:\n" +
                 "- Grafana: http://localhost:3000 (admin/admin)\n" +
                 "- Prometheus: http://localhost:9090\n" +
@@ -150,6 +160,98 @@ class AutomationManager:
                 f"Failed to start deployment:\n{str(e)}"
             )
     
+    def _buildServiceDeployOperations(self, controller_type):
+        """Build the deploy operations for Run All; only WebUI depends on another service."""
+        from functools import partial
+        from utils.docker_async import DockerOperation
+        from manager.controller import deploy_controller
+        from manager.database import deploy_database, deploy_webui
+        from manager.monitoring import deploy_monitoring
+        from manager.packet_analyzer import deploy_packet_analyzer
+
+        controller_name = f"netflux5g-{controller_type}-controller"
+        captures_path = None
+        if hasattr(self.main_window, 'packet_analyzer_manager'):
+            captures_path = self.main_window.packet_analyzer_manager._get_captures_path()
+        # Prometheus mounts the topology-generated config, so write it before the container is created
+        if hasattr(self.main_window, 'monitoring_manager'):
+            self.main_window.monitoring_manager._generate_prometheus_config()
+
+        return [
+            DockerOperation(
+                'controller',
+                partial(deploy_controller, container_name=controller_name, controller_type=controller_type),
+                description=f"{controller_type.upper()} Controller"),
+            DockerOperation(
+                'mongodb',
+                partial(deploy_database, container_name="netflux5g-mongodb", volume_name="netflux5g-mongodb-data"),
+                description="MongoDB Database"),
+            DockerOperation(
+                'webui',
+                partial(deploy_webui, container_name="netflux5g-webui"),
+                depends_on=['mongodb'],
+                description="WebUI User Manager"),
+            DockerOperation(
+                'monitoring',
+                partial(deploy_monitoring, container_prefix="netflux5g"),
+                description="Monitoring Stack"),
+            DockerOperation(
+                'packet_analyzer',
+                partial(deploy_packet_analyzer, container_name="netflux5g-webshark", captures_path=captures_path),
+                description="Packet Analyzer"),
+        ]
+
+    def _deployServicesConcurrently(self, controller_type):
+        """
+        Run all service deployments on the async operations engine and wait for them.
+
+        Returns:
+            tuple: (success: bool, message: str, cancelled: bool)
+        """
+        from PyQt5.QtCore import QEventLoop
+        from utils.docker_async import DockerOperationsWorker
+        from utils.docker_utils import DockerUtils
+
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
+            return False, "Docker is not available", False
+
+        self.progress_dialog = QProgressDialog(
+            "Deploying NetFlux5G services...",
+            "Cancel",
+            0,
+            100,
+            self.main_window
+        )
+        self.progress_dialog.setWindowTitle("NetFlux5G Run All Progress")
+        self.progress_dialog.setModal(True)
+        self.progress_dialog.show()
+
+        self.services_worker = DockerOperationsWorker(self._buildServiceDeployOperations(controller_type))
+        self.services_worker.progress_updated.connect(self.progress_dialog.setValue)
+        self.services_worker.status_updated.connect(self.progress_dialog.setLabelText)
+        self.services_worker.status_updated.connect(self.main_window.status_manager.showCanvasStatus)
+        self.progress_dialog.canceled.connect(self.services_worker.request_cancel)
+
+        outcome = {'success': False, 'message': ''}
+        loop = QEventLoop()
+
+        def on_finished(success, message):
+            outcome['success'] = success
+            outcome['message'] = message
+            loop.quit()
+
+        self.services_worker.operation_finished.connect(on_finished)
+        self.services_worker.start()
+        loop.exec_()
+
+        cancelled = False
+        for name, result in self.services_worker.results.items():
+            debug_print(f"DEBUG: {name} {result['status']} in {result['elapsed']:.1f}s")
+            cancelled = cancelled or result['status'] == 'cancelled'
+        self.progress_dialog.close()
+        self.progress_dialog = None
+        return outcome['success'], outcome['message'], cancelled
+
     def stopAllComponents(self):
         """Stop All - Stop all running services including controller, database, monitoring, and clean mininet"""
         debug_print("DEBUG: StopAll triggered - comprehensive cleanup")
@@ -169,8 +271,10 @@ class AutomationManager:
             self._performComprehensiveStopAll(controller_type=controller_type)
 
     def _performComprehensiveStopAll(self, controller_type='ryu'):
-        """Perform cleanup for all services, using the selected controller type, with stepwise waiting."""
+        """Stop Mininet and all service containers concurrently on the teardown engine."""
         from PyQt5.QtCore import QEventLoop
+        from utils.docker_async import DockerOperationsWorker
+        from utils.teardown import build_teardown_operations, log_teardown_timing
         debug_print("DEBUG: Performing comprehensive stop of all services")
 
         # Show progress dialog for stopping services
@@ -184,45 +288,39 @@ class AutomationManager:
         self.progress_dialog.setWindowTitle("NetFlux5G Stop All Progress")
         self.progress_dialog.setModal(True)
         self.progress_dialog.show()
-        progress = 0
-        self.progress_dialog.setValue(progress)
-
-        def wait_for_worker(manager, worker_attr='current_worker'):
-            """Wait for a manager's worker to finish using QEventLoop."""
-            if hasattr(manager, worker_attr):
-                worker = getattr(manager, worker_attr)
-                if worker and worker.isRunning():
-                    loop = QEventLoop()
-                    def on_finished(*_):
-                        loop.quit()
-                    worker.operation_finished.connect(on_finished)
-                    loop.exec_()
+        self.progress_dialog.setValue(0)
 
         try:
-            # 1. Stop Mininet first (if running)
-            if self.main_window.automation_runner.is_deployment_running():
-                self.main_window.status_manager.showCanvasStatus("Stopping Mininet and cleaning up...")
-                self.progress_dialog.setLabelText("Stopping Mininet and cleaning up...")
-                self.progress_dialog.setValue(10)
-                self.main_window.automation_runner.stop_topology()
-                wait_for_worker(self.main_window.automation_runner, 'current_worker')
-            else:
-                self.main_window.status_manager.showCanvasStatus("Cleaning up Mininet...")
-                self.progress_dialog.setLabelText("Cleaning up Mininet...")
-                self.progress_dialog.setValue(20)
-                self._cleanupMininet()
-
-            # 2. Stop all NetFlux5G Docker containers comprehensively
-            self.main_window.status_manager.showCanvasStatus("Stopping all NetFlux5G containers...")
-            self.progress_dialog.setLabelText("Stopping all NetFlux5G containers...")
-            self.progress_dialog.setValue(60)
-            self._stop_all_netflux5g_containers()
+            self.main_window.status_manager.showCanvasStatus("Stopping Mininet and all NetFlux5G containers...")
+            runner = self.main_window.automation_runner
+            self.teardown_worker = DockerOperationsWorker(
+                build_teardown_operations(runner.mininet_process), max_concurrency=12)
+            self.teardown_worker.progress_updated.connect(self.progress_dialog.setValue)
+            self.teardown_worker.status_updated.connect(self.progress_dialog.setLabelText)
+            self.progress_dialog.canceled.connect(self.teardown_worker.request_cancel)
+
+            loop = QEventLoop()
+            self.teardown_worker.operation_finished.connect(lambda *_: loop.quit())
+            self.teardown_worker.start()
+            loop.exec_()
+
+            results = self.teardown_worker.results
+            log_teardown_timing(results)
+            runner.mininet_process = None
+            runner.is_running = False
+            runner.last_teardown_results = results
 
             # Reset all UI states after stopping
-            self.progress_dialog.setValue(90)
             self._resetAllUIStates()
-            self.main_window.status_manager.showCanvasStatus("All services stopped successfully")
-            self.progress_dialog.setLabelText("All services stopped successfully!")
+            failed = [name for name, result in results.items() if not result['success']]
+            if failed:
+                self.main_window.status_manager.showCanvasStatus(f"Services stopped; failed: {', '.join(failed)}")
+                self.progress_dialog.setLabelText(f"Stopped with errors: {', '.join(failed)}")
+            else:
+                slowest = max(results.values(), key=lambda result: result['elapsed'], default=None)
+                elapsed = slowest['elapsed'] if slowest else 0.0
+                self.main_window.status_manager.showCanvasStatus(f"All services stopped successfully ({elapsed:.1f}s)")
+                self.progress_dialog.setLabelText("All services stopped successfully!")
             self.progress_dialog.setValue(100)
             QTimer.singleShot(1000, self.progress_dialog.close)
 
@@ -323,8 +421,13 @@ class AutomationManager:
                 QTimer.singleShot(2000, self.runTopology)
             return
         
+        topology = self._confirmTopology("Run")
+        if topology is None:
+            return
+
         # Start the topology
-        self.main_window.automation_runner.run_topology_only()
+        if not self.main_window.automation_runner.run_topology_only(*topology):
+            return
         
         # Update UI state
         if hasattr(self.main_window, 'actionRun_All'):
@@ -341,36 +444,12 @@ class AutomationManager:
             self.main_window.actionStop.setEnabled(True)
     
     def _stop_all_netflux5g_containers(self):
-        """Stop all NetFlux5G containers systematically, including the new monitoring containers."""
+        """Stop all NetFlux5G service containers concurrently."""
         try:
             debug_print("DEBUG: Stopping all NetFlux5G containers")
-            
-            # List of all possible NetFlux5G container names (including new monitoring containers)
-            container_names = [
-                "netflux5g-ryu-controller",
-                "netflux5g-onos-controller", 
-                "netflux5g-mongodb",
-                "netflux5g-webui",
-                "netflux5g-cadvisor",
-                "netflux5g-grafana",
-                "netflux5g-prometheus",
-                "netflux5g-node-exporter",
-                "netflux5g-blackbox-exporter",  # New blackbox exporter
-                "netflux5g-alertmanager",       # New alertmanager
-                "netflux5g-webshark"
-            ]
-            
-            # Use DockerUtils to stop containers
-            from utils.docker_utils import DockerUtils
-            
-            for container_name in container_names:
-                if DockerUtils.is_container_running(container_name):
-                    self.main_window.status_manager.showCanvasStatus(f"Stopping container: {container_name}")
-                    debug_print(f"DEBUG: Stopping container: {container_name}")
-                    DockerUtils.stop_container(container_name)
-                    
+            from utils.teardown import build_container_teardown_operations, run_teardown
+            run_teardown(build_container_teardown_operations())
             debug_print("DEBUG: All NetFlux5G containers stopped")
-            
         except Exception as e:
             error_print(f"ERROR: Failed to stop all containers: {e}")
 
@@ -0,0 +1,113 @@
+"""
+Bulk Edit Manager
+Applies one property patch to many components and links as a single change
+"""
+from PyQt5.QtWidgets import QInputDialog, QMessageBox, QLineEdit
+from gui.components import NetworkComponent
+from gui.links import NetworkLink
+from manager.undo import PropertyCommand
+from utils.bulk_edit import QueryError, parse_query, parse_patch, compute_delta
+from utils.debug import debug_print, error_print
+
+
+def item_kind(item):
+    """Kind used by queries: the component type, or 'Link' for links."""
+    return item.component_type if isinstance(item, NetworkComponent) else 'Link'
+
+
+class BulkEditManager:
+    """Selects components/links by selection or query and edits their properties in one transaction."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+
+    def allItems(self):
+        return [item for item in self.main_window.canvas_view.scene.items()
+                if isinstance(item, (NetworkComponent, NetworkLink))]
+
+    def selectedItems(self):
+        return [item for item in self.main_window.canvas_view.scene.selectedItems()
+                if isinstance(item, (NetworkComponent, NetworkLink))]
+
+    def findItems(self, query):
+        """Components and links matching query (see utils.bulk_edit.parse_query)."""
+        predicate = parse_query(query)
+        return [item for item in self.allItems() if predicate(item_kind(item), item.properties)]
+
+    def applyPatch(self, patch, items=None, query=None, description=None):
+        """
+        Apply patch ({key: value} or 'key=value; ...') to items, the items matching
+        query, or the current selection.
+
+        All items are updated before the canvas is repainted and the topology is
+        marked as modified, once, and the whole edit is a single undo step. Returns
+        the pushed PropertyCommand, or None if nothing changed.
+        """
+        if isinstance(patch, str):
+            patch = parse_patch(patch)
+        if items is None:
+            items = self.findItems(query) if query is not None else self.selectedItems()
+
+        deltas = []
+        for item in items:
+            if isinstance(item, NetworkComponent):
+                item.updatePositionProperties()
+            delta = compute_delta(item_kind(item), item.properties, patch)
+            if delta:
+                deltas.append((item, delta))
+        if not deltas:
+            return None
+
+        keys = ", ".join(patch)
+        undo_manager = self.main_window.undo_manager
+        edit = undo_manager.push(PropertyCommand(
+            undo_manager, deltas, description or f"Set {keys} on {len(deltas)} item(s)"))
+        debug_print(f"Bulk edit: {edit.text()}")
+        return edit
+
+    def showBulkEditDialog(self):
+        """Ask for the target items and the properties to set, then apply them."""
+        selected = self.selectedItems()
+        hint = (f"Leave empty to edit the {len(selected)} selected item(s), or enter a query"
+                if selected else "Query for the items to edit")
+        query, ok = QInputDialog.getText(
+            self.main_window,
+            "Bulk Edit Properties",
+            f"{hint}\n(e.g. type == UE and APN == internet):",
+            QLineEdit.Normal,
+            "" if selected else "type == UE"
+        )
+        if not ok:
+            return
+
+        try:
+            items = self.findItems(query) if query.strip() else selected
+        except QueryError as e:
+            QMessageBox.warning(self.main_window, "Bulk Edit Properties", str(e))
+            return
+        if not items:
+            self.main_window.showCanvasStatus("No components match the bulk edit target", 3000)
+            return
+
+        text, ok = QInputDialog.getText(
+            self.main_window,
+            "Bulk Edit Properties",
+            f"Properties to set on {len(items)} item(s)\n(key=value; key2=value2, e.g. APN=iot; Power=23):",
+        )
+        if not ok or not text.strip():
+            return
+
+        try:
+            edit = self.applyPatch(text, items=items)
+        except QueryError as e:
+            QMessageBox.warning(self.main_window, "Bulk Edit Properties", str(e))
+            return
+        except Exception as e:
+            error_print(f"Bulk edit failed: {e}")
+            QMessageBox.critical(self.main_window, "Bulk Edit Properties", f"Bulk edit failed: {e}")
+            return
+
+        if edit is None:
+            self.main_window.showCanvasStatus(f"No changes: {len(items)} item(s) already have these values", 3000)
+        else:
+            self.main_window.showCanvasStatus(edit.text(), 3000)
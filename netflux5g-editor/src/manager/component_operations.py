@@ -111,16 +111,24 @@ class ComponentOperationsManager:
             from PyQt5.QtCore import QPointF
             position = QPointF(0, 0)
         
-        # For cut operations, delete the original component FIRST to make its number available
-        cut_component_number = None
-        if self.clipboard_component['operation'] == 'cut' and self.cut_component:
-            cut_component_number = getattr(self.cut_component, 'component_number', None)
-            debug_print(f"About to delete cut component #{cut_component_number} to free up the number")
-            self._deleteOriginalCutComponent()
-            debug_print(f"Available numbers after deletion: {NetworkComponent.available_numbers[self.clipboard_component['type']]}")
-            
-        # Create new component (will reuse the number if it was just freed)
-        new_component = self._createComponentFromClipboard(position, cut_component_number)
+        # Deleting the cut original and creating the copy is a single undo step
+        undo_manager = self.main_window.undo_manager
+        undo_manager.beginMacro(f"Paste {self.clipboard_component['type']}")
+        try:
+            # For cut operations, delete the original component FIRST to make its number available
+            cut_component_number = None
+            if self.clipboard_component['operation'] == 'cut' and self.cut_component:
+                cut_component_number = getattr(self.cut_component, 'component_number', None)
+                debug_print(f"About to delete cut component #{cut_component_number} to free up the number")
+                self._deleteOriginalCutComponent()
+                debug_print(f"Available numbers after deletion: {NetworkComponent.available_numbers[self.clipboard_component['type']]}")
+
+            # Create new component (will reuse the number if it was just freed)
+            new_component = self._createComponentFromClipboard(position, cut_component_number)
+            if new_component:
+                undo_manager.recordAdded([new_component])
+        finally:
+            undo_manager.endMacro()
         
         if new_component:
             # Handle cut vs copy behavior
@@ -208,21 +216,12 @@ class ComponentOperationsManager:
         """Delete the original component that was cut."""
         if self.cut_component and hasattr(self.cut_component, 'scene') and self.cut_component.scene():
             try:
-                # Make the number available for reuse using the component's stored number
-                component_type = self.cut_component.component_type
-                if hasattr(self.cut_component, 'component_number'):
-                    NetworkComponent.available_numbers[component_type].add(self.cut_component.component_number)
-                    debug_print(f"Made component number {self.cut_component.component_number} available for reuse")
-                
-                # Clean up any connected links
-                if hasattr(self.cut_component, 'connected_links'):
-                    for link in list(self.cut_component.connected_links):
-                        if link.scene():
-                            link.scene().removeItem(link)
-                
-                # Remove from scene
+                # Undoing the paste brings the original back, so it must not stay dimmed
+                self.cut_component.setOpacity(1.0)
+
+                # Remove it with its links; this also makes its number available for reuse
                 debug_print(f"Deleting cut component: {self.cut_component.display_name}")
-                self.cut_component.scene().removeItem(self.cut_component)
+                self.main_window.undo_manager.deleteItems([self.cut_component])
                 
             except Exception as e:
                 error_print(f"Failed to delete cut component: {e}")
@@ -2,8 +2,9 @@ from PyQt5.QtWidgets import (QWidget, QGridLayout, QVBoxLayout,
                            QLabel, QSizePolicy, QToolButton, QFrame,
                            QHBoxLayout, QScrollArea, QGraphicsDropShadowEffect)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QPixmap, QFont, QColor
+from PyQt5.QtGui import QFont, QColor
 from utils.debug import debug_print, error_print
+from utils.icon_cache import scaled_pixmap
 import os
 
 class ModernComponentWidget(QFrame):
@@ -52,9 +53,7 @@ class ModernComponentWidget(QFrame):
         
         # Set icon
         if self.icon_path and os.path.exists(self.icon_path):
-            pixmap = QPixmap(self.icon_path)
-            scaled_pixmap = pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.icon_label.setPixmap(scaled_pixmap)
+            self.icon_label.setPixmap(scaled_pixmap(self.icon_path, 32))
         
         # Text label
         self.text_label = QLabel(self.display_text)
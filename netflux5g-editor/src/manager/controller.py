@@ -4,10 +4,11 @@ Handles Ryu controller container creation and removal with automatic image build
 """
 
 import os
-import time
+import asyncio
+from functools import partial
 from PyQt5.QtWidgets import QMessageBox, QProgressDialog
-from PyQt5.QtCore import pyqtSignal, QThread, QMutex
 from utils.debug import debug_print, error_print, warning_print
+from utils.docker_async import DockerTaskWorker, stop_service
 from utils.docker_utils import DockerUtils, DockerContainerBuilder
 
 def _find_onos_controller_dockerfile():
@@ -54,13 +55,74 @@ def _find_ryu_controller_dockerfile():
     
     return None
 
-class ControllerDeploymentWorker(QThread):
+# Image, Dockerfile lookup and published ports per controller type
+CONTROLLERS = {
+    'ryu': {
+        'label': 'Ryu',
+        'image': 'adaptive/ryu:latest',
+        'find_dockerfile': _find_ryu_controller_dockerfile,
+        'ports': ['6633:6633', '6653:6653'],
+        'port_info': "6633, 6653 (OpenFlow)",
+    },
+    'onos': {
+        'label': 'ONOS',
+        'image': 'adaptive/onos:latest',
+        'find_dockerfile': _find_onos_controller_dockerfile,
+        'ports': ['6653:6653', '6640:6640', '8181:8181', '8101:8101', '9876:9876'],
+        'port_info': "6653 (OpenFlow), 6640 (OVSDB), 8181 (GUI), 8101 (CLI), 9876 (Cluster)",
+    },
+}
+
+
+async def deploy_controller(engine, report, container_name, controller_type="ryu", network_name="netflux5g"):
+    """Deploy (or restart) a Ryu or ONOS controller container on the async Docker engine."""
+    controller = CONTROLLERS[controller_type]
+    label = controller['label']
+    report(f"Checking if {label} container already exists...", 10)
+    if await engine.container_exists(container_name):
+        if await engine.is_container_running(container_name):
+            return True, f"{label} controller '{container_name}' is already running"
+        report(f"Starting existing {label} container...", 50)
+        success, message = await engine.start_container(container_name)
+        if not success:
+            return False, message
+        return True, f"{label} controller '{container_name}' started successfully"
+
+    report(f"Checking {label} controller image...", 20)
+    image_name = controller['image']
+    if not await engine.image_exists(image_name):
+        report(f"Building {label} controller image...", 30)
+        controller_dir = controller['find_dockerfile']()
+        if not controller_dir:
+            return False, f"{label} Controller Dockerfile not found in expected locations"
+        success, message = await engine.build_image(image_name, controller_dir)
+        if not success:
+            return False, message
+
+    report("Checking network...", 70)
+    if not await engine.network_exists(network_name):
+        await engine.create_network(network_name)
+
+    report(f"Creating {label} controller container...", 80)
+    builder = DockerContainerBuilder(image=image_name, container_name=container_name)
+    builder.set_network(network_name)
+    for port in controller['ports']:
+        builder.add_port(port)
+    success, message = await engine.run_container(builder)
+    if not success:
+        return False, message
+    report(f"Waiting for {label} controller to start...", 90)
+    await asyncio.sleep(5)
+    if not await engine.is_container_running(container_name):
+        return False, "Container started but is not running"
+    ip = await engine.container_ip(container_name)
+    return True, (f"{label} controller '{container_name}' deployed successfully\n"
+                  f"Container IP: {ip}\nPorts: {controller['port_info']}")
+
+
+class ControllerDeploymentWorker(DockerTaskWorker):
     """Worker thread for controller operations to avoid blocking the UI."""
-    
-    progress_updated = pyqtSignal(int)
-    status_updated = pyqtSignal(str)
-    operation_finished = pyqtSignal(bool, str)  # success, message
-    
+
     def __init__(self, operation, container_name, controller_type="ryu", network_name=None):
         super().__init__()
         self.operation = operation  # 'deploy' or 'stop'
@@ -68,144 +130,13 @@ class ControllerDeploymentWorker(QThread):
         self.controller_type = controller_type  # 'ryu' or 'onos'
         # Use netflux5g network for service deployments
         self.network_name = "netflux5g"
-        self.mutex = QMutex()
-        self._cancel_requested = False
-
-    def request_cancel(self):
-        self._cancel_requested = True
-        
-    def run(self):
-        """Execute the controller operation in background thread."""
-        try:
-            if self._cancel_requested:
-                self.operation_finished.emit(False, "Operation canceled.")
-                return
-            if self.operation == 'deploy':
-                if self.controller_type == 'ryu':
-                    self._deploy_ryu_controller()
-                elif self.controller_type == 'onos':
-                    self._deploy_onos_controller()
-            elif self.operation == 'stop':
-                self._stop_controller()
-        except Exception as e:
-            error_print(f"Controller operation failed: {e}")
-            self.operation_finished.emit(False, str(e))
-    
-    def _deploy_ryu_controller(self):
-        """Deploy Ryu controller container using DockerUtils and DockerContainerBuilder, following ONOS logic."""
-        try:
-            self.status_updated.emit("Checking if Ryu container already exists...")
-            self.progress_updated.emit(10)
-            if DockerUtils.container_exists(self.container_name):
-                if DockerUtils.is_container_running(self.container_name):
-                    self.operation_finished.emit(True, f"Ryu controller '{self.container_name}' is already running")
-                    return
-                else:
-                    self.status_updated.emit("Starting existing Ryu container...")
-                    self.progress_updated.emit(50)
-                    DockerUtils.start_container(self.container_name)
-                    self.progress_updated.emit(100)
-                    self.operation_finished.emit(True, f"Ryu controller '{self.container_name}' started successfully")
-                    return
-            self.status_updated.emit("Checking Ryu controller image...")
-            self.progress_updated.emit(20)
-            image_name = 'adaptive/ryu:latest'
-            if not DockerUtils.image_exists(image_name):
-                self.status_updated.emit("Building Ryu controller image...")
-                self.progress_updated.emit(30)
-                controller_dir = _find_ryu_controller_dockerfile()
-                if not controller_dir:
-                    raise Exception("Ryu Controller Dockerfile not found in expected locations")
-                DockerUtils.build_image(image_name, controller_dir)
-                self.progress_updated.emit(60)
-            else:
-                self.progress_updated.emit(60)
-            self.status_updated.emit("Checking network...")
-            self.progress_updated.emit(70)
-            if not DockerUtils.network_exists(self.network_name):
-                DockerUtils.create_network(self.network_name)
-            self.status_updated.emit("Creating Ryu controller container...")
-            self.progress_updated.emit(80)
-            builder = DockerContainerBuilder(image=image_name, container_name=self.container_name)
-            builder.set_network(self.network_name)
-            builder.add_port('6633:6633')
-            builder.add_port('6653:6653')
-            builder.run()
-            self.progress_updated.emit(90)
-            time.sleep(5)
-            if not DockerUtils.is_container_running(self.container_name):
-                raise Exception("Container started but is not running")
-            self.progress_updated.emit(100)
-            ip = DockerUtils.get_container_ip(self.container_name)
-            self.operation_finished.emit(True, f"Ryu controller '{self.container_name}' deployed successfully\nContainer IP: {ip}\nPorts: 6633, 6653 (OpenFlow)")
-        except Exception as e:
-            error_print(f"Failed to deploy Ryu controller: {e}")
-            self.operation_finished.emit(False, str(e))
-    
-    def _deploy_onos_controller(self):
-        """Deploy ONOS controller container using DockerUtils and DockerContainerBuilder."""
-        try:
-            self.status_updated.emit("Checking if ONOS container already exists...")
-            self.progress_updated.emit(10)
-            if DockerUtils.container_exists(self.container_name):
-                if DockerUtils.is_container_running(self.container_name):
-                    self.operation_finished.emit(True, f"ONOS controller '{self.container_name}' is already running")
-                    return
-                else:
-                    self.status_updated.emit("Starting existing ONOS container...")
-                    self.progress_updated.emit(50)
-                    DockerUtils.start_container(self.container_name)
-                    self.progress_updated.emit(100)
-                    self.operation_finished.emit(True, f"ONOS controller '{self.container_name}' started successfully")
-                    return
-            self.status_updated.emit("Checking ONOS controller image...")
-            self.progress_updated.emit(20)
-            image_name = 'adaptive/onos:latest'
-            if not DockerUtils.image_exists(image_name):
-                self.status_updated.emit("Building ONOS controller image...")
-                self.progress_updated.emit(30)
-                controller_dir = _find_onos_controller_dockerfile()
-                if not controller_dir:
-                    raise Exception("ONOS Controller Dockerfile not found in expected locations")
-                DockerUtils.build_image(image_name, controller_dir)
-                self.progress_updated.emit(60)
-            else:
-                self.progress_updated.emit(60)
-            self.status_updated.emit("Checking network...")
-            self.progress_updated.emit(70)
-            if not DockerUtils.network_exists(self.network_name):
-                DockerUtils.create_network(self.network_name)
-            self.status_updated.emit("Creating ONOS controller container...")
-            self.progress_updated.emit(80)
-            builder = DockerContainerBuilder(image=image_name, container_name=self.container_name)
-            builder.set_network(self.network_name)
-            builder.add_port('6653:6653')
-            builder.add_port('6640:6640')
-            builder.add_port('8181:8181')
-            builder.add_port('8101:8101')
-            builder.add_port('9876:9876')
-            builder.run()
-            self.progress_updated.emit(90)
-            time.sleep(5)
-            if not DockerUtils.is_container_running(self.container_name):
-                raise Exception("Container started but is not running")
-            self.progress_updated.emit(100)
-            ip = DockerUtils.get_container_ip(self.container_name)
-            self.operation_finished.emit(True, f"ONOS controller '{self.container_name}' deployed successfully\nContainer IP: {ip}\nPorts: 6653 (OpenFlow), 6640 (OVSDB), 8181 (GUI), 8101 (CLI), 9876 (Cluster)")
-        except Exception as e:
-            error_print(f"Unexpected error: {e}")
-            self.operation_finished.emit(False, str(e))
-
-    def _stop_controller(self):
-        """Stop controller using DockerUtils."""
-        try:
-            self.status_updated.emit(f"Stopping {self.controller_type} controller container...")
-            self.progress_updated.emit(30)
-            DockerUtils.stop_container(self.container_name)
-            self.operation_finished.emit(True, "Controller stopped and removed successfully.")
-        except Exception as e:
-            error_print(f"Failed to stop controller: {e}")
-            self.operation_finished.emit(False, str(e))
+        if operation == 'deploy':
+            self.action = partial(deploy_controller, container_name=container_name,
+                                  controller_type=controller_type, network_name=self.network_name)
+        elif operation == 'stop':
+            self.action = partial(stop_service, container_names=[container_name])
+        else:
+            raise ValueError(f"Unknown controller operation: {operation}")
 
 
 class ControllerManager:
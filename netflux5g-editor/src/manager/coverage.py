@@ -0,0 +1,161 @@
+"""
+Coverage Heatmap Manager
+Keeps the canvas coverage heatmap in step with the APs and gNBs on the scene
+"""
+from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtCore import QTimer, QRectF
+from PyQt5.QtGui import QImage
+from gui.components import NetworkComponent
+from utils.coverage_heatmap import CoverageHeatmap, MODES, numpy_available
+from utils.power_range_calculator import PowerRangeCalculator
+from utils.debug import debug_print, error_print
+
+WIRELESS_TYPES = ('AP', 'GNB')
+
+# Scene changes are gathered for this long before the heatmap follows them,
+# so a drag updates it about 20 times per second
+UPDATE_INTERVAL_MS = 50
+
+# Room around the cells' coverage, as a share of the largest range, so that
+# small moves update the existing grid instead of building a new one
+BOUNDS_MARGIN = 0.5
+
+
+class CoverageHeatmapManager:
+    """Shows signal strength, best server, SINR or overlap under the components."""
+
+    MODE_NAMES = {
+        'signal': 'Signal Strength',
+        'server': 'Best Server',
+        'sinr': 'SINR',
+        'overlap': 'Overlapping Coverage',
+    }
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.mode = None
+        self.heatmap = None
+        self._rendered_mode = None
+        self._connected = False
+        self._timer = QTimer(main_window)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    @property
+    def canvas(self):
+        return self.main_window.canvas_view
+
+    def setMode(self, mode):
+        """Show the heatmap for mode (one of MODES), or hide it for None."""
+        if mode not in MODES:
+            mode = None
+        if mode and not numpy_available():
+            QMessageBox.warning(self.main_window, "Coverage Heatmap",
+                                "The coverage heatmap needs numpy.\n\nInstall it with: pip install numpy")
+            mode = None
+        self.mode = mode
+        self._syncActions()
+
+        if mode is None:
+            self._connect(False)
+            self._timer.stop()
+            self.heatmap = None
+            self._rendered_mode = None
+            self.canvas.setHeatmap(None)
+            self.main_window.showCanvasStatus("Coverage heatmap hidden", 2000)
+            return
+
+        self._connect(True)
+        self.refresh()
+        if self.heatmap is not None:
+            stats = self.heatmap.statistics()
+            self.main_window.showCanvasStatus(
+                f"{self.MODE_NAMES[mode]} heatmap: {stats['cells']} cell(s), {stats['covered']:.0%} of the area "
+                f"covered, {stats['overlap']:.0%} by more than one cell", 5000)
+        else:
+            self.main_window.showCanvasStatus("No APs or gNBs to show coverage for", 3000)
+
+    def _syncActions(self):
+        actions = getattr(self.main_window, 'heatmap_actions', {})
+        for mode, action in actions.items():
+            action.setChecked(mode == self.mode)
+
+    def _connect(self, enabled):
+        if enabled == self._connected:
+            return
+        scene = self.canvas.scene
+        if enabled:
+            scene.changed.connect(self._scheduleRefresh)
+        else:
+            scene.changed.disconnect(self._scheduleRefresh)
+        self._connected = enabled
+
+    def _scheduleRefresh(self, *args):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    @staticmethod
+    def cellParameters(item):
+        """(x, y, txpower, frequency) of a wireless component, as the coverage circle uses them."""
+        center = item.coverageCenter()
+        return (center.x(), center.y(),
+                PowerRangeCalculator.get_component_txpower(item.component_type, item.properties),
+                PowerRangeCalculator.get_component_frequency(item.component_type, item.properties))
+
+    def cells(self):
+        return {item: self.cellParameters(item) for item in self.canvas.scene.items()
+                if isinstance(item, NetworkComponent) and item.component_type in WIRELESS_TYPES}
+
+    def refresh(self):
+        """Bring the heatmap up to date with the scene, recomputing only the cells that changed."""
+        if self.mode is None:
+            return
+        try:
+            cells = self.cells()
+            if not cells:
+                self.heatmap = None
+                self._rendered_mode = None
+                self.canvas.setHeatmap(None)
+                return
+
+            ranges = dict(zip(cells, PowerRangeCalculator.calculate_ranges(
+                [params[2] for params in cells.values()], [params[3] for params in cells.values()]).tolist()))
+            changed = False
+            if self.heatmap is None or not all(self.heatmap.contains(params[0], params[1], ranges[key])
+                                               for key, params in cells.items()):
+                self.heatmap = CoverageHeatmap(self._bounds(cells, ranges))
+                changed = True
+                debug_print(f"Coverage heatmap grid {self.heatmap.width}x{self.heatmap.height} "
+                            f"at {self.heatmap.resolution:.1f} m per sample")
+            for key in set(self.heatmap.keys()) - cells.keys():
+                changed = self.heatmap.remove_cell(key) is not None or changed
+            changed = self.heatmap.set_cells(cells) is not None or changed
+
+            if changed or self._rendered_mode != self.mode:
+                self._render()
+        except Exception as e:
+            error_print(f"Failed to update coverage heatmap: {e}")
+
+    @staticmethod
+    def _bounds(cells, ranges):
+        margin = max(ranges.values()) * BOUNDS_MARGIN
+        return (min(params[0] - ranges[key] for key, params in cells.items()) - margin,
+                min(params[1] - ranges[key] for key, params in cells.items()) - margin,
+                max(params[0] + ranges[key] for key, params in cells.items()) + margin,
+                max(params[1] + ranges[key] for key, params in cells.items()) + margin)
+
+    def _render(self):
+        heatmap = self.heatmap
+        pixels = heatmap.argb(self.mode)
+        image = QImage(pixels.data, heatmap.width, heatmap.height, heatmap.width * 4,
+                       QImage.Format_ARGB32_Premultiplied).copy()
+        x0, y0, x1, y1 = heatmap.bounds
+        self.canvas.setHeatmap(image, QRectF(x0, y0, x1 - x0, y1 - y0))
+        self._rendered_mode = self.mode
+
+    def sampleAt(self, scene_pos):
+        """Heatmap values at a scene position (see CoverageHeatmap.sample), or None."""
+        if self.heatmap is None:
+            return None
+        return self.heatmap.sample(scene_pos.x(), scene_pos.y())
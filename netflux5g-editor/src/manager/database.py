@@ -3,154 +3,114 @@ Database deployment manager for NetFlux5G Editor
 Handles MongoDB container creation and removal based on webui-db.yaml configuration
 """
 
-import os
-import time
+import asyncio
+from functools import partial
 from PyQt5.QtWidgets import QMessageBox, QProgressDialog
-from PyQt5.QtCore import pyqtSignal, QThread, QMutex
-from utils.debug import debug_print, error_print, warning_print
+from utils.debug import debug_print, warning_print
+from utils.docker_async import DockerTaskWorker, stop_service
 from utils.docker_utils import DockerUtils, DockerContainerBuilder
 
-class DatabaseDeploymentWorker(QThread):
+MONGO_IMAGE = "mongo:latest"
+WEBUI_IMAGE = 'gradiant/open5gs-webui:2.7.5'
+
+
+async def deploy_database(engine, report, container_name, volume_name, network_name="netflux5g"):
+    """Deploy (or restart) the MongoDB container on the async Docker engine."""
+    report("Checking if MongoDB container already exists...", 5)
+    if await engine.container_exists(container_name):
+        if await engine.is_container_running(container_name):
+            return True, f"MongoDB container '{container_name}' is already running"
+        report("Starting existing MongoDB container...", 50)
+        success, message = await engine.start_container(container_name)
+        if not success:
+            return False, message
+        return True, f"MongoDB container '{container_name}' started successfully"
+    report("Checking if MongoDB image exists...", 10)
+    if not await engine.image_exists(MONGO_IMAGE):
+        report("Pulling MongoDB image...", 40)
+        success, message = await engine.ensure_image_available(MONGO_IMAGE)
+        if not success:
+            return False, message
+    builder = DockerContainerBuilder(image=MONGO_IMAGE, container_name=container_name)
+    builder.set_network(network_name)
+    builder.add_volume(f'{volume_name}:/data/db')
+    builder.add_env('MONGO_INITDB_DATABASE=open5gs')
+    report("Creating MongoDB container...", 70)
+    success, message = await engine.run_container(builder)
+    if not success:
+        return False, message
+    return True, f"MongoDB container '{container_name}' deployed successfully."
+
+
+async def cleanup_database(engine, report, container_name, volume_name=None):
+    """Remove the container and, if given, its volume with all data."""
+    report("Stopping and removing container...", 30)
+    success, message = await engine.stop_container(container_name)
+    if not success:
+        return False, message
+    if volume_name and await engine.volume_exists(volume_name):
+        report("Removing volume and all data...", 70)
+        success, message = await engine.remove_volume(volume_name)
+        if not success:
+            return False, message
+    return True, "Complete cleanup finished: container and volume removed"
+
+
+async def deploy_webui(engine, report, container_name, network_name="netflux5g"):
+    """Deploy (or restart) the Open5GS Web UI container on the async Docker engine."""
+    report("Checking if Web UI container already exists...", 10)
+    if await engine.container_exists(container_name):
+        if await engine.is_container_running(container_name):
+            return True, f"Web UI container '{container_name}' is already running"
+        report("Starting existing Web UI container...", 50)
+        success, message = await engine.start_container(container_name)
+        if not success:
+            return False, message
+        return True, f"Web UI container '{container_name}' started successfully"
+    report("Checking Web UI image...", 30)
+    success, message = await engine.ensure_image_available(WEBUI_IMAGE, timeout=120)
+    if not success:
+        return False, message
+    report("Creating Web UI container...", 60)
+    mongo_container_name = "netflux5g-mongodb"
+    builder = DockerContainerBuilder(image=WEBUI_IMAGE, container_name=container_name)
+    builder.set_network(network_name)
+    builder.add_port('9999:9999')
+    builder.add_env(f'DB_URI=mongodb://{mongo_container_name}:27017/open5gs')
+    builder.add_env('NODE_ENV=dev')
+    success, message = await engine.run_container(builder)
+    if not success:
+        return False, message
+    report("Waiting for Web UI to be ready...", 80)
+    for _ in range(10):
+        if await engine.is_container_running(container_name):
+            break
+        await asyncio.sleep(1)
+    return True, f"Web UI container '{container_name}' deployed successfully"
+
+
+class DatabaseDeploymentWorker(DockerTaskWorker):
     """Worker thread for database operations to avoid blocking the UI."""
-    
-    progress_updated = pyqtSignal(int)
-    status_updated = pyqtSignal(str)
-    operation_finished = pyqtSignal(bool, str)  # success, message
-    
+
     def __init__(self, operation, container_name, volume_name=None, network_name=None):
         super().__init__()
-        self.operation = operation  # 'deploy', 'stop', or 'cleanup'
+        self.operation = operation  # 'deploy', 'stop', 'cleanup' or their '_webui' variants
         self.container_name = container_name
         self.volume_name = volume_name
         # Use netflux5g network for service deployments
         self.network_name = "netflux5g"
-        self.mutex = QMutex()
-        self._cancel_requested = False
-
-    def request_cancel(self):
-        self._cancel_requested = True
-        
-    def run(self):
-        """Execute the database operation in background thread."""
-        try:
-            if self._cancel_requested:
-                self.operation_finished.emit(False, "Operation canceled.")
-                return
-            if self.operation == 'deploy':
-                self._deploy_database()
-            elif self.operation == 'stop':
-                self._stop_database()
-            elif self.operation == 'cleanup':
-                self._cleanup_database()
-            elif self.operation == 'deploy_webui':
-                self._deploy_webui()
-            elif self.operation == 'stop_webui':
-                self._stop_database()  # Same logic as stop database
-            elif self.operation == 'cleanup_webui':
-                self._cleanup_database()  # Same logic as cleanup database
-        except Exception as e:
-            error_print(f"Database operation failed: {e}")
-            self.operation_finished.emit(False, str(e))
-    
-    def _deploy_database(self):
-        """Deploy MongoDB container with DockerUtils and DockerContainerBuilder."""
-        try:
-            self.status_updated.emit("Checking if MongoDB image exists...")
-            self.progress_updated.emit(10)
-            image_name = "mongo:latest"
-            if not DockerUtils.image_exists(image_name):
-                self.status_updated.emit("Pulling MongoDB image...")
-                self.progress_updated.emit(40)
-                DockerUtils.pull_image(image_name)
-            builder = DockerContainerBuilder(image=image_name, container_name=self.container_name)
-            builder.set_network(self.network_name)
-            # Add volumes, ports as needed
-            builder.add_volume(f'{self.volume_name}:/data/db')
-            builder.add_env('MONGO_INITDB_DATABASE=open5gs')
-            self.status_updated.emit("Creating MongoDB container...")
-            self.progress_updated.emit(70)
-            builder.run()
-            self.operation_finished.emit(True, f"MongoDB container '{self.container_name}' deployed successfully.")
-        except Exception as e:
-            error_print(f"Failed to deploy MongoDB: {e}")
-            self.operation_finished.emit(False, str(e))
-
-    def _stop_database(self):
-        """Stop MongoDB container using DockerUtils."""
-        try:
-            self.status_updated.emit("Stopping MongoDB container...")
-            self.progress_updated.emit(50)
-            DockerUtils.stop_container(self.container_name)
-            self.operation_finished.emit(True, f"MongoDB container '{self.container_name}' stopped successfully.")
-        except Exception as e:
-            error_print(f"Failed to stop MongoDB: {e}")
-            self.operation_finished.emit(False, str(e))
-    
-    def _cleanup_database(self):
-        """Completely remove MongoDB container and volume using DockerUtils."""
-        try:
-            self.status_updated.emit("Starting complete cleanup...")
-            self.progress_updated.emit(10)
-            if DockerUtils.container_exists(self.container_name):
-                self.status_updated.emit("Stopping container...")
-                self.progress_updated.emit(30)
-                DockerUtils.stop_container(self.container_name)
-                self.status_updated.emit("Removing container...")
-                self.progress_updated.emit(50)
-                DockerUtils.stop_container(self.container_name)
-            if self.volume_name and DockerUtils.volume_exists(self.volume_name):
-                self.status_updated.emit("Removing volume and all data...")
-                self.progress_updated.emit(70)
-                DockerUtils.remove_volume(self.volume_name)
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, f"Complete cleanup finished: container and volume removed")
-        except Exception as e:
-            self.operation_finished.emit(False, f"Unexpected error during cleanup: {str(e)}")
+        if operation == 'deploy':
+            self.action = partial(deploy_database, container_name=container_name,
+                                  volume_name=volume_name, network_name=self.network_name)
+        elif operation == 'deploy_webui':
+            self.action = partial(deploy_webui, container_name=container_name, network_name=self.network_name)
+        elif operation in ('stop', 'stop_webui'):
+            self.action = partial(stop_service, container_names=[container_name])
+        elif operation in ('cleanup', 'cleanup_webui'):
+            self.action = partial(cleanup_database, container_name=container_name, volume_name=volume_name)
+        else:
+            raise ValueError(f"Unknown database operation: {operation}")
 
-    def _deploy_webui(self):
-        """Deploy Web UI container using DockerUtils and DockerContainerBuilder."""
-        try:
-            self.status_updated.emit("Checking if Web UI container already exists...")
-            self.progress_updated.emit(10)
-            if DockerUtils.container_exists(self.container_name):
-                if DockerUtils.is_container_running(self.container_name):
-                    self.operation_finished.emit(True, f"Web UI container '{self.container_name}' is already running")
-                    return
-                else:
-                    self.status_updated.emit("Starting existing Web UI container...")
-                    self.progress_updated.emit(50)
-                    DockerUtils.start_container(self.container_name)
-                    self.progress_updated.emit(100)
-                    self.operation_finished.emit(True, f"Web UI container '{self.container_name}' started successfully")
-                    return
-            self.status_updated.emit("Checking Web UI image...")
-            self.progress_updated.emit(30)
-            webui_image = 'gradiant/open5gs-webui:2.7.5'
-            if not DockerUtils.image_exists(webui_image):
-                self.status_updated.emit("Pulling Web UI image...")
-                self.progress_updated.emit(35)
-                DockerUtils.pull_image(webui_image, timeout=120)
-            self.progress_updated.emit(50)
-            self.status_updated.emit("Creating Web UI container...")
-            self.progress_updated.emit(60)
-            mongo_container_name = "netflux5g-mongodb"
-            builder = DockerContainerBuilder(image=webui_image, container_name=self.container_name)
-            builder.set_network(self.network_name)
-            builder.add_port('9999:9999')
-            builder.add_env(f'DB_URI=mongodb://{mongo_container_name}:27017/open5gs')
-            builder.add_env('NODE_ENV=dev')
-            builder.run()
-            self.status_updated.emit("Waiting for Web UI to be ready...")
-            self.progress_updated.emit(80)
-            for i in range(10):
-                if DockerUtils.is_container_running(self.container_name):
-                    break
-                time.sleep(1)
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, f"Web UI container '{self.container_name}' deployed successfully")
-        except Exception as e:
-            self.operation_finished.emit(False, f"Unexpected error: {str(e)}")
-        
 
 class DatabaseManager:
     """Manager for database deployment operations."""
@@ -169,7 +129,7 @@ class DatabaseManager:
         volume_name = "netflux5g-mongodb-data"
         
         # Check if Docker is available
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
         
         # Check if netflux5g network exists, prompt to create if not
@@ -226,7 +186,7 @@ class DatabaseManager:
         volume_name = "netflux5g-mongodb-data"
         
         # Check if Docker is available
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
         
         # Check if container exists
@@ -273,7 +233,7 @@ class DatabaseManager:
             return
         
         # Check if Docker is available
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
         
         # Check if container or volume exists
@@ -317,7 +277,7 @@ class DatabaseManager:
         mongo_container_name = "netflux5g-mongodb"
         
         # Check if Docker is available
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
         
         # Check if netflux5g network exists, prompt to create if not
@@ -428,7 +388,7 @@ class DatabaseManager:
         container_name = "netflux5g-webui"
         
         # Check if Docker is available
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
         
         # Check if container exists
@@ -493,10 +453,6 @@ class DatabaseManager:
         except Exception:
             return "Docker not available"
     
-    def _check_docker_available(self):
-        """Check if Docker is available using DockerUtils."""
-        return DockerUtils.check_docker_available(self.main_window, show_error=True)
-    
     def _is_container_running(self, container_name):
         """Check if container is currently running using DockerUtils."""
         return DockerUtils.is_container_running(container_name)
@@ -12,6 +12,9 @@ class FileManager:
         
     def newTopology(self):
         """Create a new topology."""
+        # The undo history refers to items of the topology being closed
+        if hasattr(self.main_window, 'undo_manager'):
+            self.main_window.undo_manager.clear()
         if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
             self.main_window.canvas_view.scene.clear()
         
@@ -93,7 +96,16 @@ class FileManager:
                 # Fallback for older versions
                 if hasattr(self.main_window, 'setWindowTitle'):
                     self.main_window.setWindowTitle(f"NetFlux5G Editor - {os.path.basename(filename)}")
-            self.main_window.status_manager.showCanvasStatus(f"Topology saved as {os.path.basename(filename)}")
+            status = f"Topology saved as {os.path.basename(filename)}"
+            # Problems that would only show up at Mininet runtime are reported on every save
+            if hasattr(self.main_window, 'validation_manager'):
+                try:
+                    report = self.main_window.validation_manager.validate(nodes, links)
+                    if report.issues:
+                        status += f" - {report.summary()} (Run > Validate Topology)"
+                except Exception as e:
+                    warning_print(f"WARNING: Topology validation failed: {e}")
+            self.main_window.status_manager.showCanvasStatus(status)
             debug_print(f"DEBUG: Topology saved successfully to {filename}")
             debug_print(f"DEBUG: Saved {len(nodes)} nodes and {len(links)} links")
         except Exception as e:
@@ -168,6 +180,10 @@ class FileManager:
             progress.show()
             QApplication.processEvents()
             
+            # Example templates get their config paths fixed on first use
+            if hasattr(self.main_window, 'template_updater'):
+                self.main_window.template_updater.ensure_template(filename)
+            
             # Determine file type and load accordingly
             file_ext = os.path.splitext(filename)[1].lower()
             
@@ -186,7 +202,9 @@ class FileManager:
             if not self.validateTopologyFile(topology_data):
                 raise ValueError("Invalid topology file format")
             
-            # Clear current canvas
+            # Clear current canvas and its undo history
+            if hasattr(self.main_window, 'undo_manager'):
+                self.main_window.undo_manager.clear()
             if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
                 self.main_window.canvas_view.scene.clear()
             
@@ -0,0 +1,223 @@
+"""
+Mobility Manager
+Sets UE mobility models, draws waypoints on the canvas and shows the resulting trajectories
+"""
+from PyQt5.QtWidgets import QInputDialog, QMessageBox, QLineEdit
+from PyQt5.QtCore import QTimer, QPointF
+from PyQt5.QtGui import QPainterPath, QColor
+from gui.components import NetworkComponent
+from manager.undo import PropertyCommand
+from utils.bulk_edit import MISSING
+from utils.mobility import (
+    MODELS, MOBILITY_FIELDS, DEFAULT_SPEED, MobilityScenario, MobilityError, parse_speed, is_mobile
+)
+from utils.debug import debug_print, warning_print
+
+# Trajectories follow the scene as it changes, at most this often
+UPDATE_INTERVAL_MS = 200
+
+# Node positions are the icons' top-left corners; trajectories are drawn through their centres
+ICON_CENTER = QPointF(40, 40)
+
+TRAJECTORY_COLOR = QColor(30, 110, 220, 170)
+EDIT_COLOR = QColor(230, 120, 0, 230)
+MARKER_RADIUS = 4
+
+
+class MobilityManager:
+    """Edits the mobility of UEs as undoable property changes and draws their trajectories."""
+
+    MODEL_NAMES = {
+        'static': 'Static',
+        'waypoints': 'Waypoints',
+        'random_waypoint': 'Random Waypoint',
+        'manhattan': 'Manhattan Grid',
+    }
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.visible = False
+        self.editing = None
+        self.edit_points = []
+        self._connected = False
+        self._timer = QTimer(main_window)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(UPDATE_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    @property
+    def canvas(self):
+        return self.main_window.canvas_view
+
+    def ues(self, items=None):
+        """UE components among items, or among the current selection."""
+        if items is None:
+            items = self.canvas.scene.selectedItems()
+        return [item for item in items if isinstance(item, NetworkComponent) and item.component_type == 'UE']
+
+    def _apply(self, items, patch, text):
+        """Set patch on items as one undo step; None values remove the key."""
+        deltas = []
+        for item in items:
+            delta = {}
+            for key, value in patch.items():
+                old = item.properties.get(key, MISSING)
+                new = MISSING if value is None else value
+                if old != new:
+                    delta[key] = (old, new)
+            if delta:
+                deltas.append((item, delta))
+        if not deltas:
+            return None
+        undo_manager = self.main_window.undo_manager
+        command = undo_manager.push(PropertyCommand(undo_manager, deltas, text))
+        debug_print(f"Mobility: {command.text()}")
+        self._scheduleRefresh()
+        return command
+
+    # Models
+
+    def showModelDialog(self, items=None):
+        """Ask for a mobility model and speed and set them on the given or selected UEs."""
+        ues = self.ues(items)
+        title = "UE Mobility"
+        if not ues:
+            QMessageBox.information(self.main_window, title, "Select one or more UEs first.")
+            return
+
+        current = ues[0].properties.get('UE_Mobility') or 'static'
+        names = [self.MODEL_NAMES[model] for model in MODELS]
+        name, ok = QInputDialog.getItem(self.main_window, title, f"Mobility model for {len(ues)} UE(s):",
+                                        names, MODELS.index(current) if current in MODELS else 0, False)
+        if not ok:
+            return
+        model = MODELS[names.index(name)]
+        if model == 'static':
+            self.clearMobility(ues)
+            return
+
+        speed = ues[0].properties.get('UE_Speed') or '-'.join(f'{value:g}' for value in DEFAULT_SPEED)
+        speed, ok = QInputDialog.getText(self.main_window, title, "Speed in m/s (value or min-max):",
+                                         QLineEdit.Normal, str(speed))
+        if not ok:
+            return
+        try:
+            parse_speed(speed)
+        except MobilityError as e:
+            QMessageBox.warning(self.main_window, title, str(e))
+            return
+
+        self._apply(ues, {'UE_Mobility': model, 'UE_Speed': speed.strip()},
+                    f"Set {self.MODEL_NAMES[model]} mobility on {len(ues)} UE(s)")
+        if model == 'waypoints' and len(ues) == 1 and not ues[0].properties.get('UE_Waypoints'):
+            self.editWaypoints(ues[0])
+        else:
+            self.setTrajectoriesVisible(True)
+
+    def clearMobility(self, items=None):
+        """Make the given or selected UEs static again."""
+        ues = self.ues(items)
+        self._apply(ues, {field: None for field in MOBILITY_FIELDS}, f"Clear mobility of {len(ues)} UE(s)")
+
+    # Waypoints
+
+    def editWaypoints(self, item=None):
+        """Draw a UE's waypoints with left clicks; right click or Enter keeps them, Escape cancels."""
+        ues = self.ues([item] if item is not None else None)
+        if len(ues) != 1:
+            QMessageBox.information(self.main_window, "Draw Waypoints", "Select exactly one UE first.")
+            return
+        self.finishPicking(False)
+        self.editing = ues[0]
+        self.edit_points = []
+        self.canvas.point_picker = self
+        self.setTrajectoriesVisible(True)
+        self.main_window.showCanvasStatus(
+            f"Click waypoints for {self.editing.display_name}; right click or Enter to finish, Escape to cancel", 10000)
+
+    def pickPoint(self, scene_pos):
+        point = scene_pos - ICON_CENTER
+        self.edit_points.append([round(point.x(), 1), round(point.y(), 1)])
+        self.refresh()
+        self.main_window.showCanvasStatus(f"{len(self.edit_points)} waypoint(s)", 3000)
+
+    def finishPicking(self, accept):
+        item, points = self.editing, self.edit_points
+        if item is None:
+            return
+        self.editing = None
+        self.edit_points = []
+        self.canvas.point_picker = None
+        if accept and points:
+            self._apply([item], {'UE_Mobility': 'waypoints', 'UE_Waypoints': points},
+                        f"Set {len(points)} waypoint(s) on {item.display_name}")
+            self.main_window.showCanvasStatus(f"{item.display_name} follows {len(points)} waypoint(s)", 3000)
+        else:
+            self.main_window.showCanvasStatus("Waypoint drawing cancelled", 2000)
+        self.refresh()
+
+    # Trajectory overlay
+
+    def setTrajectoriesVisible(self, visible):
+        self.visible = visible
+        action = getattr(self.main_window, 'actionShow_Trajectories', None)
+        if action is not None:
+            action.setChecked(visible)
+        self._connect(visible)
+        self.refresh()
+
+    def _connect(self, enabled):
+        if enabled == self._connected:
+            return
+        if enabled:
+            self.canvas.scene.changed.connect(self._scheduleRefresh)
+        else:
+            self.canvas.scene.changed.disconnect(self._scheduleRefresh)
+        self._connected = enabled
+
+    def _scheduleRefresh(self, *args):
+        if self.visible and not self._timer.isActive():
+            self._timer.start()
+
+    def nodes(self):
+        """The canvas components in .nf5g node form, as far as trajectories need them."""
+        return [{'name': item.display_name, 'type': item.component_type,
+                 'x': item.x(), 'y': item.y(), 'properties': item.properties, 'item': item}
+                for item in self.canvas.scene.items() if isinstance(item, NetworkComponent)]
+
+    def refresh(self):
+        """Redraw the trajectories of all mobile UEs, and the waypoints being drawn."""
+        if not self.visible and self.editing is None:
+            self.canvas.setTrajectories([])
+            return
+        paths = []
+        nodes = self.nodes()
+        scenario = MobilityScenario(nodes)
+        for node in nodes:
+            if node['item'] is self.editing or not is_mobile(node):
+                continue
+            try:
+                trajectory = scenario.trajectory(node)
+            except MobilityError as e:
+                warning_print(f"WARNING: No trajectory for {node['name']}: {e}")
+                continue
+            if trajectory is not None:
+                paths.append((self._path(zip(trajectory.xs, trajectory.ys)), TRAJECTORY_COLOR))
+        if self.editing is not None:
+            start = (self.editing.x(), self.editing.y())
+            paths.append((self._path([start] + self.edit_points, markers=True), EDIT_COLOR))
+        self.canvas.setTrajectories(paths)
+
+    @staticmethod
+    def _path(points, markers=False):
+        path = QPainterPath()
+        for index, (x, y) in enumerate(points):
+            point = QPointF(x, y) + ICON_CENTER
+            if index == 0:
+                path.moveTo(point)
+            else:
+                path.lineTo(point)
+            if markers and index > 0:
+                path.addEllipse(point, MARKER_RADIUS, MARKER_RADIUS)
+                path.moveTo(point)
+        return path
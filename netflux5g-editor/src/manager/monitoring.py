@@ -4,253 +4,177 @@ Handles Prometheus, Grafana, Blackbox Exporter, and other monitoring container c
 """
 
 import os
-import time
+import asyncio
+from functools import partial
 from PyQt5.QtWidgets import QMessageBox, QProgressDialog
-from PyQt5.QtCore import pyqtSignal, QThread, QMutex
-from utils.debug import debug_print, error_print, warning_print
+from utils.debug import debug_print, warning_print
+from utils.docker_async import DockerTaskWorker, stop_service
 from utils.docker_utils import DockerUtils, DockerContainerBuilder
+from utils.prometheus_config import TEMPLATE_PATH, prometheus_config_path, update_prometheus_targets
 
 cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-class MonitoringDeploymentWorker(QThread):
+MONITORING_CONTAINERS = {
+    'prometheus': {
+        'image': 'prom/prometheus',
+        'ports': ['9090:9090'],
+        'add_hosts': ['host.docker.internal:host-gateway'],  # reach the per-UE exporter on the host
+        'volumes': [
+            cwd + '/automation/monitoring/prometheus/prometheus.yml:/etc/prometheus/prometheus.yml',
+            cwd + '/automation/monitoring/prometheus/alert_rules.yml:/etc/prometheus/alert_rules.yml'
+        ],
+        'extra_args': [
+            '--config.file=/etc/prometheus/prometheus.yml',
+            '--storage.tsdb.path=/prometheus',
+            '--web.console.libraries=/etc/prometheus/console_libraries',
+            '--web.console.templates=/etc/prometheus/consoles',
+            '--storage.tsdb.retention.time=200h',
+            '--web.enable-lifecycle'
+        ]
+    },
+    'grafana': {
+        'image': 'grafana/grafana',
+        'ports': ['3000:3000'],
+        'volumes': [
+            cwd + '/automation/monitoring/grafana/datasources.yml:/etc/grafana/provisioning/datasources/datasources.yml',
+            cwd + '/automation/monitoring/grafana/dashboard.json:/var/lib/grafana/dashboards/dashboard.json',
+            cwd + '/automation/monitoring/grafana/default.yaml:/etc/grafana/provisioning/dashboards/default.yaml'
+        ],
+        'env': [
+            'GF_PATHS_PROVISIONING=/etc/grafana/provisioning',
+            'DS_PROMETHEUS=prometheus',
+            'GF_SECURITY_ADMIN_PASSWORD=admin'
+        ]
+    },
+    'node-exporter': {
+        'image': 'prom/node-exporter:latest',
+        'ports': ['9100:9100'],
+        'volumes': ['/:/host:ro,rslave'],
+        'extra_args': ['--path.rootfs=/host'],
+        'pid_mode': 'host'
+    },
+    'cadvisor': {
+        'image': 'gcr.io/cadvisor/cadvisor:latest',
+        'ports': ['8080:8080'],
+        'volumes': [
+            '/:/rootfs:ro',
+            '/var/run:/var/run:ro', 
+            '/sys:/sys:ro',
+            '/var/lib/docker/:/var/lib/docker:ro',
+            '/dev/disk/:/dev/disk:ro'
+        ],
+        'privileged': True
+    },
+    'blackbox-exporter': {
+        'image': 'prom/blackbox-exporter:latest',
+        'ports': ['9115:9115'],
+        'volumes': [
+            cwd + '/automation/monitoring/blackbox/config.yml:/etc/blackbox_exporter/config.yml'
+        ],
+        'extra_args': [
+            '--config.file=/etc/blackbox_exporter/config.yml'
+        ]
+    },
+    'alertmanager': {
+        'image': 'prom/alertmanager:latest',
+        'ports': ['9093:9093'],
+        'volumes': [
+            cwd + '/automation/monitoring/prometheus/alertmanager.yml:/etc/alertmanager/alertmanager.yml'
+        ],
+        'extra_args': [
+            '--config.file=/etc/alertmanager/alertmanager.yml',
+            '--storage.path=/alertmanager',
+            '--web.external-url=http://localhost:9093'
+        ]
+    }
+}
+
+
+def _build_monitoring_container(name, config, container_prefix, network_name):
+    builder = DockerContainerBuilder(image=config['image'], container_name=f"{container_prefix}-{name}")
+    builder.set_network(network_name)
+    for port in config.get('ports', []):
+        builder.add_port(port)
+    # Prometheus mounts the topology-generated config when available
+    for volume in config.get('volumes', []):
+        builder.add_volume(volume.replace(TEMPLATE_PATH + ':', prometheus_config_path() + ':'))
+    for env in config.get('env', []):
+        builder.add_env(env)
+    if config.get('privileged', False):
+        builder.add_extra_arg('--privileged')
+    # Map extra hostnames (e.g. the Docker host)
+    for host in config.get('add_hosts', []):
+        builder.add_extra_arg(f'--add-host={host}')
+    if config.get('pid_mode'):
+        builder.add_extra_arg(f'--pid={config["pid_mode"]}')
+    for arg in config.get('extra_args', []):
+        builder.add_command_arg(arg)
+    return builder
+
+
+async def deploy_monitoring(engine, report, container_prefix="netflux5g", network_name="netflux5g"):
+    """Deploy the monitoring stack on the async Docker engine, all containers concurrently."""
+    report("Starting monitoring deployment...", 10)
+
+    async def deploy_one(name, config):
+        full_container_name = f"{container_prefix}-{name}"
+        await engine.stop_container(full_container_name)
+        success, message = await engine.ensure_image_available(config['image'])
+        if not success:
+            return False, message
+        report(f"Deploying {name}...")
+        return await engine.run_container(_build_monitoring_container(name, config, container_prefix, network_name))
+
+    results = await asyncio.gather(*(deploy_one(name, config) for name, config in MONITORING_CONTAINERS.items()))
+    for success, message in results:
+        if not success:
+            warning_print(message)
+
+    report("Waiting for containers to be ready...", 90)
+    await asyncio.sleep(5)  # Give containers time to start up
+    failed_containers = [name for name in MONITORING_CONTAINERS
+                         if not await engine.is_container_running(f"{container_prefix}-{name}")]
+    if len(failed_containers) == len(MONITORING_CONTAINERS):
+        return False, "No monitoring container is running:\n" + "\n".join(
+            message for success, message in results if not success)
+    if failed_containers:
+        warning_print(f"Some containers failed to start: {failed_containers}")
+
+    return True, (
+        f"Monitoring stack deployed successfully!\n\n"
+        f"📊 Access URLs:\n"
+        f"• Grafana: http://localhost:3000 (admin/admin)\n"
+        f"• Prometheus: http://localhost:9090\n"
+        f"• Alertmanager: http://localhost:9093\n"
+        f"• cAdvisor: http://localhost:8080\n"
+        f"• Node Exporter: http://localhost:9100/metrics\n"
+        f"• Blackbox Exporter: http://localhost:9115\n\n"
+        f"🔍 Features enabled:\n"
+        f"• Network connectivity monitoring\n"
+        f"• HTTP/HTTPS endpoint probing\n"
+        f"• ICMP ping monitoring\n"
+        f"• TCP port connectivity checks\n"
+        f"• System and container metrics\n"
+        f"• Alert management\n\n"
+        f"⚠️ Failed containers: {', '.join(failed_containers) if failed_containers else 'None'}")
+
+
+class MonitoringDeploymentWorker(DockerTaskWorker):
     """Worker thread for monitoring operations to avoid blocking the UI."""
-    
-    progress_updated = pyqtSignal(int)
-    status_updated = pyqtSignal(str)
-    operation_finished = pyqtSignal(bool, str)  # success, message
-    
+
     def __init__(self, operation, container_prefix=None, network_name=None):
         super().__init__()
         self.operation = operation  # 'deploy', 'stop', or 'cleanup'
         self.container_prefix = "netflux5g"  # Fixed prefix for all deployments
         self.network_name = "netflux5g"
-        self.mutex = QMutex()
-        
-    def run(self):
-        try:
-            if self.operation == 'deploy':
-                self._deploy_monitoring()
-            elif self.operation == 'stop':
-                self._stop_monitoring()
-            elif self.operation == 'cleanup':
-                self._cleanup_monitoring()
-        except Exception as e:
-            error_print(f"Monitoring operation failed: {e}")
-            self.operation_finished.emit(False, str(e))
-
-    monitoring_containers = {
-        'prometheus': {
-            'image': 'prom/prometheus',
-            'ports': ['9090:9090'],
-            'volumes': [
-                cwd + '/automation/monitoring/prometheus/prometheus.yml:/etc/prometheus/prometheus.yml',
-                cwd + '/automation/monitoring/prometheus/alert_rules.yml:/etc/prometheus/alert_rules.yml'
-            ],
-            'extra_args': [
-                '--config.file=/etc/prometheus/prometheus.yml',
-                '--storage.tsdb.path=/prometheus',
-                '--web.console.libraries=/etc/prometheus/console_libraries',
-                '--web.console.templates=/etc/prometheus/consoles',
-                '--storage.tsdb.retention.time=200h',
-                '--web.enable-lifecycle'
-            ]
-        },
-        'grafana': {
-            'image': 'grafana/grafana',
-            'ports': ['3000:3000'],
-            'volumes': [
-                cwd + '/automation/monitoring/grafana/datasources.yml:/etc/grafana/provisioning/datasources/datasources.yml',
-                cwd + '/automation/monitoring/grafana/dashboard.json:/var/lib/grafana/dashboards/dashboard.json',
-                cwd + '/automation/monitoring/grafana/default.yaml:/etc/grafana/provisioning/dashboards/default.yaml'
-            ],
-            'env': [
-                'GF_PATHS_PROVISIONING=/etc/grafana/provisioning',
-                'DS_PROMETHEUS=prometheus',
-                'GF_SECURITY_ADMIN_PASSWORD=admin'
-            ]
-        },
-        'node-exporter': {
-            'image': 'prom/node-exporter:latest',
-            'ports': ['9100:9100'],
-            'volumes': ['/:/host:ro,rslave'],
-            'extra_args': ['--path.rootfs=/host'],
-            'pid_mode': 'host'
-        },
-        'cadvisor': {
-            'image': 'gcr.io/cadvisor/cadvisor:latest',
-            'ports': ['8080:8080'],
-            'volumes': [
-                '/:/rootfs:ro',
-                '/var/run:/var/run:ro', 
-                '/sys:/sys:ro',
-                '/var/lib/docker/:/var/lib/docker:ro',
-                '/dev/disk/:/dev/disk:ro'
-            ],
-            'privileged': True
-        },
-        'blackbox-exporter': {
-            'image': 'prom/blackbox-exporter:latest',
-            'ports': ['9115:9115'],
-            'volumes': [
-                cwd + '/automation/monitoring/blackbox/config.yml:/etc/blackbox_exporter/config.yml'
-            ],
-            'extra_args': [
-                '--config.file=/etc/blackbox_exporter/config.yml'
-            ]
-        },
-        'alertmanager': {
-            'image': 'prom/alertmanager:latest',
-            'ports': ['9093:9093'],
-            'volumes': [
-                cwd + '/automation/monitoring/prometheus/alertmanager.yml:/etc/alertmanager/alertmanager.yml'
-            ],
-            'extra_args': [
-                '--config.file=/etc/alertmanager/alertmanager.yml',
-                '--storage.path=/alertmanager',
-                '--web.external-url=http://localhost:9093'
-            ]
-        }
-    }
-
-    def _deploy_monitoring(self):
-        try:
-            self.status_updated.emit("Starting monitoring deployment...")
-            self.progress_updated.emit(10)
-            total_containers = len(self.monitoring_containers)
-            progress_step = 80 // total_containers
-            current_progress = 10
-            
-            for container_name, config in self.monitoring_containers.items():
-                full_container_name = f"{self.container_prefix}-{container_name}"
-                
-                self.progress_updated.emit(current_progress)
-                self.status_updated.emit(f"Checking if {container_name} container exists...")
-                
-                # Stop existing container if running
-                if DockerUtils.container_exists(full_container_name):
-                    self.status_updated.emit(f"Stopping existing {container_name} container...")
-                    DockerUtils.stop_container(full_container_name)
-                
-                # Pull image if not exists
-                if not DockerUtils.image_exists(config['image']):
-                    self.progress_updated.emit(current_progress)
-                    self.status_updated.emit(f"Pulling image {config['image']}...")
-                    DockerUtils.pull_image(config['image'])
-                
-                # Build and run container
-                builder = DockerContainerBuilder(image=config['image'], container_name=full_container_name)
-                builder.set_network(self.network_name)
-                
-                # Add ports
-                for port in config.get('ports', []):
-                    builder.add_port(port)
-                
-                # Add volumes
-                for volume in config.get('volumes', []):
-                    builder.add_volume(volume)
-                
-                # Add environment variables
-                for env in config.get('env', []):
-                    builder.add_env(env)
-                
-                # Handle privileged mode
-                if config.get('privileged', False):
-                    builder.add_extra_arg('--privileged')
-                
-                # Handle PID mode
-                if 'pid_mode' in config and config['pid_mode']:
-                    builder.add_extra_arg(f'--pid={config["pid_mode"]}')
-                
-                # Handle extra args and command args
-                if container_name == 'node-exporter':
-                    for arg in config.get('extra_args', []):
-                        builder.add_command_arg(arg)
-                else:
-                    for arg in config.get('extra_args', []):
-                        builder.add_command_arg(arg)
-                
-                self.status_updated.emit(f"Deploying {container_name}...")
-                builder.run()
-                current_progress += progress_step
-            
-            self.status_updated.emit("Waiting for containers to be ready...")
-            self.progress_updated.emit(90)
-            time.sleep(5)  # Give containers time to start up
-            
-            # Verify containers are running
-            failed_containers = []
-            for container_name in self.monitoring_containers:
-                full_container_name = f"{self.container_prefix}-{container_name}"
-                if not DockerUtils.is_container_running(full_container_name):
-                    failed_containers.append(container_name)
-            
-            if failed_containers:
-                warning_print(f"Some containers failed to start: {failed_containers}")
-            
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, 
-                f"Monitoring stack deployed successfully!\n\n"
-                f"📊 Access URLs:\n"
-                f"• Grafana: http://localhost:3000 (admin/admin)\n"
-                f"• Prometheus: http://localhost:9090\n"
-                f"• Alertmanager: http://localhost:9093\n"
-                f"• cAdvisor: http://localhost:8080\n"
-                f"• Node Exporter: http://localhost:9100/metrics\n"
-                f"• Blackbox Exporter: http://localhost:9115\n\n"
-                f"🔍 Features enabled:\n"
-                f"• Network connectivity monitoring\n"
-                f"• HTTP/HTTPS endpoint probing\n"
-                f"• ICMP ping monitoring\n"
-                f"• TCP port connectivity checks\n"
-                f"• System and container metrics\n"
-                f"• Alert management\n\n"
-                f"⚠️ Failed containers: {', '.join(failed_containers) if failed_containers else 'None'}")
-                
-        except Exception as e:
-            error_print(f"Deployment failed: {e}")
-            self.operation_finished.emit(False, f"Deployment failed: {str(e)}")
-
-    def _stop_monitoring(self):
-        try:
-            total_containers = len(self.monitoring_containers)
-            current_progress = 10
-            
-            for container_name in self.monitoring_containers:
-                full_container_name = f"{self.container_prefix}-{container_name}"
-                progress_step = 80 // total_containers
-                current_progress += progress_step
-                
-                self.status_updated.emit(f"Stopping {container_name}...")
-                self.progress_updated.emit(current_progress)
-                
-                if DockerUtils.container_exists(full_container_name):
-                    DockerUtils.stop_container(full_container_name)
-                    
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, "All monitoring containers stopped successfully.")
-            
-        except Exception as e:
-            error_print(f"Failed to stop monitoring: {e}")
-            self.operation_finished.emit(False, str(e))
-
-    def _cleanup_monitoring(self):
-        try:
-            self.status_updated.emit("Cleaning up monitoring containers...")
-            
-            for container_name in self.monitoring_containers:
-                full_container_name = f"{self.container_prefix}-{container_name}"
-                
-                self.status_updated.emit(f"Removing {container_name}...")
-                
-                if DockerUtils.container_exists(full_container_name):
-                    DockerUtils.stop_container(full_container_name)
-                    
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, "Monitoring stack completely removed")
-            
-        except Exception as e:
-            error_print(f"Cleanup failed: {e}")
-            self.operation_finished.emit(False, f"Cleanup failed: {str(e)}")
+        if operation == 'deploy':
+            self.action = partial(deploy_monitoring, container_prefix=self.container_prefix,
+                                  network_name=self.network_name)
+        elif operation in ('stop', 'cleanup'):
+            self.action = partial(stop_service, container_names=[f"{self.container_prefix}-{name}"
+                                                                 for name in MONITORING_CONTAINERS])
+        else:
+            raise ValueError(f"Unknown monitoring operation: {operation}")
 
 class MonitoringManager:
     """Manager for monitoring deployment operations."""
@@ -262,7 +186,7 @@ class MonitoringManager:
         
     def deployMonitoring(self):
         container_prefix = "netflux5g"
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
             
         if hasattr(self.main_window, 'docker_network_manager'):
@@ -318,12 +242,25 @@ class MonitoringManager:
         if reply == QMessageBox.No:
             return
             
+        self._generate_prometheus_config()
         self._start_operation('deploy', container_prefix, "netflux5g")
     
+    def _generate_prometheus_config(self):
+        """Generate Prometheus scrape/probe targets from the current topology before deploying."""
+        if not hasattr(self.main_window, 'mininet_exporter'):
+            return
+        try:
+            nodes, _ = self.main_window.extractTopology()
+            success, message = update_prometheus_targets(nodes, self.main_window.mininet_exporter, reload=False)
+            if success:
+                debug_print(message)
+        except Exception as e:
+            warning_print(f"Could not generate Prometheus config from topology, using template: {e}")
+
     def stopMonitoring(self):
         debug_print("Stop Monitoring triggered")
         container_prefix = "netflux5g"
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=True):
             return
             
         existing_containers = self._get_existing_monitoring_containers(container_prefix)
@@ -351,9 +288,6 @@ class MonitoringManager:
             
         self._start_operation('stop', container_prefix, None)
 
-    def _check_docker_available(self):
-        return DockerUtils.check_docker_available(self.main_window, show_error=True)
-    
     def _get_running_monitoring_containers(self, container_prefix):
         running_containers = []
         monitoring_types = ['prometheus', 'grafana', 'node-exporter', 'cadvisor', 'blackbox-exporter', 'alertmanager']
@@ -400,7 +334,7 @@ class MonitoringManager:
 
     def _on_operation_canceled(self):
         if self.current_worker:
-            self.current_worker.terminate()
+            self.current_worker.request_cancel()
             self.current_worker.wait(3000)
         if self.progress_dialog:
             self.progress_dialog.close()
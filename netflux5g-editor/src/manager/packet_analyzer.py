@@ -1,189 +1,184 @@
 """
 Packet Analyzer (Webshark) deployment manager for NetFlux5G Editor
-Handles Webshark container creation and removal with bind mount to captures folder
+Handles Webshark container creation and removal with bind mount to captures folder,
+and ring-buffer packet captures on topology nodes written into the shared captures volume
 """
 
 import os
+import json
+import shlex
 import time
-from PyQt5.QtWidgets import QMessageBox, QProgressDialog
+import asyncio
+from functools import partial
+from PyQt5.QtWidgets import QMessageBox, QProgressDialog, QInputDialog
 from PyQt5.QtCore import pyqtSignal, QThread, QMutex, QMutexLocker
 from utils.debug import debug_print, error_print, warning_print
+from utils.docker_async import AsyncDockerEngine, DockerTaskWorker, stop_service
 from utils.docker_utils import DockerUtils, DockerContainerBuilder
 
-class PacketAnalyzerDeploymentWorker(QThread):
+# BPF capture filter presets
+CAPTURE_FILTERS = {
+    'all': '',
+    'gtpu': 'udp port 2152',
+    'ngap': 'sctp port 38412',
+    'pfcp': 'udp port 8805',
+    'control': 'sctp port 38412 or udp port 8805',
+    'icmp': 'icmp',
+}
+
+# Interfaces captured per node type when no explicit interfaces are given.
+# UEs only carry user traffic on their PDU session tunnel; gNB and core NFs
+# are captured on all interfaces so N2/N3/N4 are seen regardless of link naming.
+DEFAULT_CAPTURE_INTERFACES = {
+    'UE': ['uesimtun0'],
+    'GNB': ['any'],
+    'UPF': ['any'],
+    'AMF': ['any'],
+    'SMF': ['any'],
+}
+
+# Presets that only match N2/N3/N4 traffic. A UE's uesimtun tunnel carries the
+# decapsulated user IP, never GTP-U, NGAP or PFCP, so UE tunnels are captured unfiltered.
+CORE_ONLY_FILTERS = {CAPTURE_FILTERS[name] for name in ('gtpu', 'ngap', 'pfcp', 'control')}
+UE_TUNNEL_PREFIX = 'uesimtun'
+
+
+def interface_filter(bpf_filter, interface):
+    """The capture filter to apply on one interface for the session filter bpf_filter."""
+    if interface.startswith(UE_TUNNEL_PREFIX) and bpf_filter in CORE_ONLY_FILTERS:
+        return ''
+    return bpf_filter
+
+
+# Path of the shared captures volume inside topology containers (CAPTURES_VOLUME in exported scripts)
+CONTAINER_CAPTURES_DIR = "/captures"
+CAPTURE_MANIFEST = "capture-session.json"
+
+
+def build_capture_command(interface, output_file, bpf_filter='', snaplen=256, ring_file_size_mb=100,
+                          ring_files=10, duration=None):
+    """
+    Build the shell command that starts one detached tshark ring-buffer capture.
+
+    The capture writes size-rotated pcapng files into the captures volume and is
+    detached from the exec session (setsid/nohup). The command prints the capture
+    PID, or fails with the tail of the tshark log if the capture did not start.
+    """
+    args = ['tshark', '-q', '-n', '-i', interface, '-s', str(int(snaplen)), '-F', 'pcapng',
+            '-b', f'filesize:{int(ring_file_size_mb * 1000)}', '-b', f'files:{int(ring_files)}',
+            '-w', output_file]
+    if bpf_filter:
+        args += ['-f', bpf_filter]
+    if duration:
+        args += ['-a', f'duration:{int(duration)}']
+    log_file = shlex.quote(f"{os.path.splitext(output_file)[0]}.log")
+    return (f"mkdir -p {shlex.quote(os.path.dirname(output_file))} && "
+            f"setsid nohup {shlex.join(args)} >{log_file} 2>&1 & "
+            f"pid=$!; sleep 1; "
+            f"if kill -0 $pid 2>/dev/null; then echo $pid; else tail -n 5 {log_file} >&2; false; fi")
+
+WEBSHARK_IMAGE = "adaptive/netflux5g-webshark:latest"
+
+
+def get_webshark_path():
+    """Path to the webshark directory containing the Dockerfile, or None."""
+    webshark_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "automation", "webshark")
+    if os.path.isfile(os.path.join(webshark_path, "Dockerfile")):
+        return os.path.abspath(webshark_path)
+    error_print(f"Webshark directory not found. Tried: {webshark_path}")
+    return None
+
+
+async def deploy_packet_analyzer(engine, report, container_name, captures_path=None, network_name="netflux5g"):
+    """Deploy the Webshark container on the async Docker engine, building its image if needed."""
+    report("Checking if Webshark image exists...", 10)
+    if not await engine.image_exists(WEBSHARK_IMAGE):
+        webshark_path = get_webshark_path()
+        if not webshark_path:
+            return False, "Webshark directory not found"
+        report("Building Webshark image...", 20)
+        success, message = await engine.build_image(WEBSHARK_IMAGE, webshark_path)
+        if not success:
+            return False, message
+
+    report("Removing existing container...", 30)
+    await engine.stop_container(container_name)
+
+    builder = DockerContainerBuilder(image=WEBSHARK_IMAGE, container_name=container_name)
+    builder.set_network(network_name)
+    builder.add_port('8085:8085')
+    # Mount captures directory - ensure absolute path
+    if captures_path and os.path.exists(captures_path):
+        abs_captures_path = os.path.abspath(captures_path)
+        builder.add_volume(f"{abs_captures_path}:/captures")
+        debug_print(f"Mounting captures: {abs_captures_path} -> /captures")
+    else:
+        warning_print("Captures path not found, container will use internal directory")
+    # Environment variables matching the entrypoint expectations
+    builder.add_env('SHARKD_SOCKET=/captures/sharkd.sock')
+    builder.add_env('CAPTURES_PATH=/captures/')
+
+    report("Deploying Webshark container...", 50)
+    success, message = await engine.run_container(builder)
+    if not success:
+        return False, f"Failed to deploy container: {message}"
+
+    report("Verifying container is running...", 90)
+    await asyncio.sleep(2)  # Give container time to start
+    if not await engine.is_container_running(container_name):
+        logs = await engine.container_logs(container_name)
+        return False, f"Container started but is not running properly.\nLogs: {logs[:500]}..."
+    return True, (f"Webshark container '{container_name}' deployed successfully.\n"
+                  f"Access at: http://localhost:8085/webshark/")
+
+
+class PacketAnalyzerDeploymentWorker(DockerTaskWorker):
     """Worker thread for packet analyzer operations to avoid blocking the UI."""
-    
-    progress_updated = pyqtSignal(int)
-    status_updated = pyqtSignal(str)
-    operation_finished = pyqtSignal(bool, str)  # success, message
-    
+
     def __init__(self, operation, container_name, captures_path=None, network_name=None):
         super().__init__()
         self.operation = operation  # 'deploy' or 'stop'
         self.container_name = container_name
         self.captures_path = captures_path
         self.network_name = network_name or "netflux5g"
-        self.mutex = QMutex()
-        self._cancelled = False
-        
+        if operation == 'deploy':
+            self.action = partial(deploy_packet_analyzer, container_name=container_name,
+                                  captures_path=captures_path, network_name=self.network_name)
+        elif operation == 'stop':
+            self.action = partial(stop_service, container_names=[container_name])
+        else:
+            raise ValueError(f"Unknown packet analyzer operation: {operation}")
+
+
+class PacketCaptureWorker(QThread):
+    """Worker thread that starts or stops topology packet captures."""
+
+    status_updated = pyqtSignal(str)
+    operation_finished = pyqtSignal(bool, str)  # success, message
+
+    def __init__(self, manager, operation, **kwargs):
+        super().__init__()
+        self.manager = manager
+        self.operation = operation  # 'start', 'stop' or 'summarize'
+        self.kwargs = kwargs
+
     def run(self):
-        debug_print(f"DEBUG: Worker thread starting operation: {self.operation}")
         try:
-            with QMutexLocker(self.mutex):
-                if self._cancelled:
-                    return
-                    
-            if self.operation == 'deploy':
-                self._deploy_packet_analyzer()
-            elif self.operation == 'stop':
-                self._stop_packet_analyzer()
-        except Exception as e:
-            error_print(f"Packet analyzer operation failed: {e}")
-            debug_print(f"DEBUG: Worker emitting failure signal due to exception: {e}")
-            self.operation_finished.emit(False, str(e))
-        debug_print("DEBUG: Worker thread ending")
-    
-    def cancel_operation(self):
-        """Cancel the current operation."""
-        with QMutexLocker(self.mutex):
-            self._cancelled = True
-    
-    def _check_cancelled(self):
-        """Check if operation has been cancelled."""
-        with QMutexLocker(self.mutex):
-            return self._cancelled
-    
-    def _deploy_packet_analyzer(self):
-        try:
-            if self._check_cancelled():
-                return
-                
-            self.status_updated.emit("Checking if Webshark image exists...")
-            self.progress_updated.emit(10)
-            
-            # Use consistent image name matching your Dockerfile
-            image_name = "adaptive/netflux5g-webshark:latest"
-            
-            # Build image if not exists
-            if not DockerUtils.image_exists(image_name):
-                webshark_path = self._get_webshark_path()
-                if not webshark_path:
-                    raise Exception("Webshark directory not found")
-                    
-                if self._check_cancelled():
-                    return
-                    
-
-            
-            if self._check_cancelled():
-                return
-                
-            # Remove existing container if exists
-            if DockerUtils.container_exists(self.container_name):
-                self.status_updated.emit("Removing existing container...")
-                self.progress_updated.emit(30)
-                DockerUtils.stop_container(self.container_name)
-            
-            if self._check_cancelled():
-                return
-                
-            builder = DockerContainerBuilder(image=image_name, container_name=self.container_name)
-            builder.set_network(self.network_name)
-            builder.add_port('8085:8085')
-            
-            # Mount captures directory - ensure absolute path
-            if self.captures_path and os.path.exists(self.captures_path):
-                abs_captures_path = os.path.abspath(self.captures_path)
-                builder.add_volume(f"{abs_captures_path}:/captures")
-                debug_print(f"Mounting captures: {abs_captures_path} -> /captures")
+            if self.operation == 'start':
+                self.status_updated.emit("Starting packet captures...")
+                success, message, _ = self.manager.start_captures(**self.kwargs)
+            elif self.operation == 'summarize':
+                self.status_updated.emit("Summarizing packet captures...")
+                success, message = self.manager.summarize_captures(
+                    progress_callback=self.status_updated.emit, **self.kwargs)
             else:
-                warning_print("Captures path not found, container will use internal directory")
-            
-            # Environment variables matching your entrypoint expectations
-            builder.add_env('SHARKD_SOCKET=/captures/sharkd.sock')
-            builder.add_env('CAPTURES_PATH=/captures/')
-            
-            self.status_updated.emit("Deploying Webshark container...")
-            self.progress_updated.emit(50)
-            
-            if self._check_cancelled():
-                return
-                
-            success, msg = builder.run()
-            
-            if self._check_cancelled():
-                return
-                
-            if success:
-                self.progress_updated.emit(90)
-                self.status_updated.emit("Verifying container is running...")
-                time.sleep(2)  # Give container time to start
-                
-                if DockerUtils.is_container_running(self.container_name):
-                    self.progress_updated.emit(100)
-                    self.operation_finished.emit(True, f"Webshark container '{self.container_name}' deployed successfully.\nAccess at: http://localhost:8085/webshark/")
-                else:
-                    # Try to get container logs for debugging
-                    try:
-                        logs = DockerUtils.get_container_logs(self.container_name)
-                        self.operation_finished.emit(False, f"Container started but is not running properly.\nLogs: {logs[:500]}...")
-                    except:
-                        self.operation_finished.emit(False, "Container started but is not running properly. Check Docker logs manually.")
-            else:
-                self.operation_finished.emit(False, f"Failed to deploy container: {msg}")
-                
+                self.status_updated.emit("Stopping packet captures...")
+                success, message = self.manager.stop_captures(**self.kwargs)
+            self.operation_finished.emit(success, message)
         except Exception as e:
-            error_print(f"Failed to deploy Webshark: {e}")
+            error_print(f"Packet capture operation failed: {e}")
             self.operation_finished.emit(False, str(e))
 
-    def _stop_packet_analyzer(self):
-        try:
-            if self._check_cancelled():
-                return
-                
-            self.status_updated.emit("Stopping Webshark container...")
-            self.progress_updated.emit(10)
-            
-            if not DockerUtils.is_container_running(self.container_name):
-                self.operation_finished.emit(True, "Webshark container is not running.")
-                return
-            
-            if self._check_cancelled():
-                return
-                
-            self.progress_updated.emit(50)
-            DockerUtils.stop_container(self.container_name)
-            
-            self.progress_updated.emit(90)
-            self.status_updated.emit("Verifying container is stopped...")
-            time.sleep(1)
-            
-            if self._check_cancelled():
-                return
-                
-            self.progress_updated.emit(100)
-            self.operation_finished.emit(True, f"Webshark container '{self.container_name}' stopped successfully.")
-            
-        except Exception as e:
-            error_print(f"Failed to stop Webshark: {e}")
-            self.operation_finished.emit(False, str(e))
-    
-    def _get_webshark_path(self):
-        """Get the path to the webshark directory containing Dockerfile."""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            webshark_path = os.path.join(os.path.dirname(current_dir), "automation", "webshark")
-            
-            if os.path.exists(webshark_path) and os.path.isfile(os.path.join(webshark_path, "Dockerfile")):
-                return os.path.abspath(webshark_path)
-                
-            error_print(f"Webshark directory not found. Tried: {webshark_path}")
-            return None
-            
-        except Exception as e:
-            error_print(f"Error getting webshark path: {e}")
-            return None
-
 
 class PacketAnalyzerManager:
     """Manager for Webshark packet analyzer deployment operations."""
@@ -191,8 +186,10 @@ class PacketAnalyzerManager:
     def __init__(self, main_window):
         self.main_window = main_window
         self.deployment_worker = None
+        self.capture_worker = None
         self.progress_dialog = None
         self.operation_mutex = QMutex()
+        self.active_capture_session = None
         
     def deployPacketAnalyzer(self):
         """Deploy Webshark packet analyzer with UI feedback."""
@@ -226,7 +223,7 @@ class PacketAnalyzerManager:
             )
             return
         
-        if not self._check_docker_available():
+        if not DockerUtils.check_docker_available(self.main_window, show_error=False):
             QMessageBox.warning(
                 self.main_window,
                 "Docker Not Available",
@@ -307,47 +304,312 @@ class PacketAnalyzerManager:
             error_print("Could not find webshark captures directory")
             return False
         
-        try:
-            # Use consistent image name
-            image_name = "adaptive/netflux5g-webshark:latest"
-            
-            # Build image if not exists
-            if not DockerUtils.image_exists(image_name):
-                webshark_path = self._get_webshark_path()
-                if not webshark_path:
-                    error_print("Webshark directory not found")
-                    return False
-                DockerUtils.build_image(image_name, webshark_path)
-            
-            # Remove existing container if exists
-            if DockerUtils.container_exists(container_name):
-                DockerUtils.stop_container(container_name)
-            
-            builder = DockerContainerBuilder(image=image_name, container_name=container_name)
-            builder.set_network("netflux5g")
-            builder.add_port('8085:8085')
-            
-            # Mount captures directory with absolute path
-            abs_captures_path = os.path.abspath(captures_path)
-            builder.add_volume(f'{abs_captures_path}:/captures')
-            
-            # Environment variables matching your entrypoint expectations  
-            builder.add_env('SHARKD_SOCKET=/captures/sharkd.sock')
-            builder.add_env('CAPTURES_PATH=/captures/')
-            
-            success, msg = builder.run()
-            
-            if success:
-                time.sleep(2)  # Give container time to start
-                return DockerUtils.is_container_running(container_name)
-            else:
-                error_print(f"Failed to deploy Webshark: {msg}")
-                return False
-                
-        except Exception as e:
-            error_print(f"Exception during synchronous deployment: {e}")
-            return False
+        engine = AsyncDockerEngine()
+        success, message = engine.run_sync(engine.run_task(partial(
+            deploy_packet_analyzer, container_name=container_name, captures_path=captures_path)))
+        if not success:
+            error_print(f"Failed to deploy Webshark: {message}")
+        return success
     
+    def startPacketCapture(self):
+        """Start ring-buffer captures on all UEs, gNBs and core NFs with a chosen filter preset."""
+        if self.capture_worker and self.capture_worker.isRunning():
+            QMessageBox.warning(self.main_window, "Operation in Progress",
+                                "A packet capture operation is already in progress.")
+            return
+        if self.active_capture_session:
+            QMessageBox.information(self.main_window, "Capture Running",
+                                    f"Capture session '{self.active_capture_session}' is already running. "
+                                    "Stop it before starting a new one.")
+            return
+
+        targets = self.capture_targets_from_topology()
+        if not targets:
+            QMessageBox.information(self.main_window, "No Capture Targets",
+                                    "The topology has no UEs, gNBs or 5G core functions to capture on.")
+            return
+
+        presets = list(CAPTURE_FILTERS)
+        choice, ok = QInputDialog.getItem(
+            self.main_window,
+            "Start Packet Capture",
+            f"Capture filter for {len(targets)} node(s):",
+            [f"{name} ({CAPTURE_FILTERS[name] or 'no filter'})" for name in presets],
+            presets.index('gtpu'),
+            False
+        )
+        if not ok:
+            return
+        preset = presets[[f"{name} ({CAPTURE_FILTERS[name] or 'no filter'})" for name in presets].index(choice)]
+        self._start_capture_worker('start', targets=targets, bpf_filter=CAPTURE_FILTERS[preset])
+
+    def stopPacketCapture(self):
+        """Stop the running capture session."""
+        if self.capture_worker and self.capture_worker.isRunning():
+            QMessageBox.warning(self.main_window, "Operation in Progress",
+                                "A packet capture operation is already in progress.")
+            return
+        if not self.active_capture_session and not self._latest_capture_session():
+            QMessageBox.information(self.main_window, "No Capture Running", "No packet capture session found.")
+            return
+        self._start_capture_worker('stop')
+
+    def summarizePacketCapture(self):
+        """Summarize the most recent capture session (GTP-U, NGAP and PFCP per flow and per UE)."""
+        if self.capture_worker and self.capture_worker.isRunning():
+            QMessageBox.warning(self.main_window, "Operation in Progress",
+                                "A packet capture operation is already in progress.")
+            return
+        sessions = self._capture_sessions()
+        if not sessions:
+            QMessageBox.information(self.main_window, "No Captures", "No packet capture session found.")
+            return
+        session_name, ok = QInputDialog.getItem(
+            self.main_window,
+            "Summarize Packet Capture",
+            "Capture session:",
+            sessions,
+            0,
+            False
+        )
+        if ok:
+            self._start_capture_worker('summarize', session_name=session_name)
+
+    def _start_capture_worker(self, operation, **kwargs):
+        self.capture_worker = PacketCaptureWorker(self, operation, **kwargs)
+        if hasattr(self.main_window, 'status_manager'):
+            self.capture_worker.status_updated.connect(self.main_window.status_manager.showCanvasStatus)
+        self.capture_worker.operation_finished.connect(self._on_capture_finished)
+        self.capture_worker.start()
+
+    def _on_capture_finished(self, success, message):
+        if self.capture_worker:
+            self.capture_worker.wait(3000)
+            self.capture_worker = None
+        if success and len(message.splitlines()) > 5:
+            # Summaries are tables; show them in the details pane
+            box = QMessageBox(QMessageBox.Information, "Packet Capture Summary",
+                              message.splitlines()[0], QMessageBox.Ok, self.main_window)
+            box.setDetailedText(message)
+            box.exec_()
+        elif success:
+            QMessageBox.information(self.main_window, "Packet Capture", message)
+        else:
+            QMessageBox.warning(self.main_window, "Packet Capture Failed", message)
+        if hasattr(self.main_window, 'status_manager'):
+            self.main_window.status_manager.showCanvasStatus(message.splitlines()[0])
+
+    def capture_targets_from_topology(self, node_types=None):
+        """
+        Build capture targets for the current topology.
+
+        Args:
+            node_types (iterable): Node types to capture on (keys of DEFAULT_CAPTURE_INTERFACES);
+                                   defaults to all of them
+
+        Returns:
+            dict: Container name -> list of interfaces
+        """
+        exporter = getattr(self.main_window, 'mininet_exporter', None)
+        if exporter is None:
+            from export.mininet_export import MininetExporter
+            exporter = MininetExporter(self.main_window)
+        node_types = set(node_types or DEFAULT_CAPTURE_INTERFACES)
+
+        nodes, _ = self.main_window.extractTopology()
+        categorized = exporter.categorize_nodes(nodes)
+        named_nodes = [('UE', ue['name']) for ue in categorized['ues']]
+        named_nodes += [('GNB', gnb['name']) for gnb in categorized['gnbs']]
+        for nf_type, components in categorized.get('core5g_components', {}).items():
+            named_nodes += [(nf_type, comp.get('name', f'{nf_type.lower()}{i + 1}'))
+                            for i, comp in enumerate(components)]
+
+        targets = {}
+        for node_type, name in named_nodes:
+            if node_type in node_types and node_type in DEFAULT_CAPTURE_INTERFACES:
+                targets[f"mn.{exporter.sanitize_variable_name(name)}"] = list(DEFAULT_CAPTURE_INTERFACES[node_type])
+        return targets
+
+    def start_captures(self, targets, bpf_filter='', snaplen=256, ring_file_size_mb=100, ring_files=10,
+                       duration=None, session_name=None, max_concurrency=16):
+        """
+        Start ring-buffer captures on many topology containers concurrently.
+
+        Each (container, interface) pair gets its own size-rotated pcapng ring written
+        to <captures>/<session>/ through the shared captures volume, so container
+        filesystems never hold capture data and disk use is bounded by
+        ring_file_size_mb * ring_files per interface.
+
+        Args:
+            targets (dict): Container name -> list of interfaces (see capture_targets_from_topology)
+            bpf_filter (str): BPF capture filter, e.g. CAPTURE_FILTERS['gtpu']; UE tunnels
+                              get no filter for the core-only presets (see interface_filter)
+            snaplen (int): Bytes captured per packet (256 keeps GTP-U outer and inner headers)
+            ring_file_size_mb (int): Size at which a capture file is rotated
+            ring_files (int): Number of files kept per interface
+            duration (int): Optional auto-stop after this many seconds
+            session_name (str): Capture sub-directory; defaults to a timestamp
+
+        Returns:
+            tuple: (success: bool, message: str, manifest: dict)
+        """
+        captures_path = self._get_captures_path()
+        if not captures_path:
+            return False, "Could not find webshark captures directory", {}
+
+        session_name = session_name or time.strftime("capture-%Y%m%d-%H%M%S")
+        session_path = os.path.join(captures_path, session_name)
+        os.makedirs(session_path, exist_ok=True)
+
+        container_commands = {}
+        outputs = {}
+        filters = {}
+        for container, interfaces in targets.items():
+            node = container[3:] if container.startswith('mn.') else container
+            container_commands[container] = []
+            for interface in interfaces:
+                filename = f"{node}-{interface}.pcapng"
+                outputs[(container, interface)] = filename
+                filters[(container, interface)] = interface_filter(bpf_filter, interface)
+                container_commands[container].append(build_capture_command(
+                    interface, f"{CONTAINER_CAPTURES_DIR}/{session_name}/{filename}",
+                    filters[(container, interface)], snaplen, ring_file_size_mb, ring_files, duration))
+
+        debug_print(f"Starting {len(outputs)} capture(s) on {len(targets)} container(s) in session {session_name}")
+        results = DockerUtils.exec_batch(container_commands, timeout=15, max_concurrency=max_concurrency)
+
+        captures, failures = [], []
+        for container, interfaces in targets.items():
+            for interface, result in zip(interfaces, results.get(container, [])):
+                entry = {'container': container, 'interface': interface,
+                         'file': outputs[(container, interface)], 'filter': filters[(container, interface)]}
+                if result['returncode'] == 0 and result['stdout'].strip().isdigit():
+                    entry['pid'] = int(result['stdout'].strip())
+                    captures.append(entry)
+                else:
+                    entry['error'] = (result['stderr'] or result['stdout']).strip()
+                    failures.append(entry)
+                    warning_print(f"Capture on {container}:{interface} failed: {entry['error']}")
+
+        manifest = {
+            'session': session_name,
+            'started': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'filter': bpf_filter,
+            'snaplen': snaplen,
+            'ring_file_size_mb': ring_file_size_mb,
+            'ring_files': ring_files,
+            'duration': duration,
+            'captures': captures,
+            'failures': failures
+        }
+        with open(os.path.join(session_path, CAPTURE_MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        if captures:
+            self.active_capture_session = session_name
+        message = (f"Started {len(captures)} capture(s) in session '{session_name}'\n"
+                   f"Filter: {bpf_filter or 'none'}"
+                   f"{' (UE tunnels unfiltered)' if bpf_filter and any(not f for f in filters.values()) else ''}, "
+                   f"snaplen {snaplen}, "
+                   f"ring {ring_files} x {ring_file_size_mb} MB per interface\n"
+                   f"Files: {session_path}")
+        if failures:
+            message += f"\n{len(failures)} capture(s) failed: " + ", ".join(
+                f"{entry['container']}:{entry['interface']}" for entry in failures)
+        return bool(captures), message, manifest
+
+    def stop_captures(self, session_name=None, max_concurrency=16):
+        """
+        Stop all captures of a session (the active or most recent one by default).
+
+        tshark is interrupted with SIGINT so the current ring file is closed cleanly.
+
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        captures_path = self._get_captures_path()
+        session_name = session_name or self.active_capture_session or self._latest_capture_session()
+        if not captures_path or not session_name:
+            return False, "No capture session to stop"
+
+        manifest_path = os.path.join(captures_path, session_name, CAPTURE_MANIFEST)
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            return False, f"Could not read capture manifest {manifest_path}: {e}"
+
+        pattern = shlex.quote(f"{CONTAINER_CAPTURES_DIR}/{session_name}/")
+        container_commands = {}
+        for entry in manifest.get('captures', []):
+            container_commands.setdefault(entry['container'], []).append(entry['pid'])
+        # Fall back to matching the session path in case a PID is stale
+        container_commands = {
+            container: [f"kill -INT {' '.join(str(pid) for pid in pids)} 2>/dev/null || "
+                        f"pkill -INT -f {pattern}; true"]
+            for container, pids in container_commands.items()
+        }
+        DockerUtils.exec_batch(container_commands, timeout=15, max_concurrency=max_concurrency)
+
+        if session_name == self.active_capture_session:
+            self.active_capture_session = None
+        manifest['stopped'] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return True, (f"Stopped {len(manifest.get('captures', []))} capture(s) in session '{session_name}'\n"
+                      f"Files: {os.path.dirname(manifest_path)}")
+
+    def summarize_captures(self, session_name=None, workers=None, progress_callback=None):
+        """
+        Summarize a capture session offline and write capture-summary.json next to the captures.
+
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        from automation.pcap_summary import SUMMARY_FILENAME, format_summary, summarize_captures, write_summary
+
+        captures_path = self._get_captures_path()
+        sessions = self._capture_sessions()
+        session_name = session_name or (sessions[0] if sessions else None)
+        if not captures_path or not session_name:
+            return False, "No capture session to summarize"
+
+        session_path = os.path.join(captures_path, session_name)
+        summary = summarize_captures([session_path], workers=workers, progress_callback=progress_callback)
+        if not summary['files']:
+            return False, f"No capture files found in {session_path}"
+        summary_path = write_summary(summary, os.path.join(session_path, SUMMARY_FILENAME))
+        return True, f"{format_summary(summary, top=10)}\n\nFull summary: {summary_path}"
+
+    def _capture_sessions(self):
+        """Capture session names, newest first."""
+        captures_path = self._get_captures_path()
+        if not captures_path:
+            return []
+        sessions = [(os.path.getmtime(os.path.join(captures_path, name, CAPTURE_MANIFEST)), name)
+                    for name in os.listdir(captures_path)
+                    if os.path.isfile(os.path.join(captures_path, name, CAPTURE_MANIFEST))]
+        return [name for _, name in sorted(sessions, reverse=True)]
+
+    def _latest_capture_session(self):
+        """Most recent capture session that has not been stopped yet."""
+        captures_path = self._get_captures_path()
+        if not captures_path:
+            return None
+        sessions = []
+        for name in os.listdir(captures_path):
+            manifest_path = os.path.join(captures_path, name, CAPTURE_MANIFEST)
+            if not os.path.isfile(manifest_path):
+                continue
+            try:
+                with open(manifest_path, 'r') as f:
+                    if 'stopped' in json.load(f):
+                        continue
+            except (OSError, ValueError):
+                continue
+            sessions.append((os.path.getmtime(manifest_path), name))
+        return max(sessions)[1] if sessions else None
+
     def _get_captures_path(self):
         """Get the path to the captures directory."""
         try:
@@ -375,33 +637,6 @@ class PacketAnalyzerManager:
             error_print(f"Error getting captures path: {e}")
             return None
     
-    def _get_webshark_path(self):
-        """Get the path to the webshark directory containing Dockerfile."""
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            webshark_path = os.path.join(os.path.dirname(current_dir), "automation", "webshark")
-            
-            if os.path.exists(webshark_path) and os.path.isfile(os.path.join(webshark_path, "Dockerfile")):
-                return os.path.abspath(webshark_path)
-                
-            error_print(f"Webshark directory not found. Tried: {webshark_path}")
-            return None
-            
-        except Exception as e:
-            error_print(f"Error getting webshark path: {e}")
-            return None
-    
-    def _check_docker_available(self):
-        """Check if Docker is available and running."""
-        try:
-            result = DockerUtils.check_docker_available(self.main_window, show_error=False)
-            if not result:
-                debug_print("Docker is not available or not running")
-            return result
-        except Exception as e:
-            error_print(f"Error checking Docker availability: {e}")
-            return False
-    
     def _start_operation(self, operation, container_name, captures_path, network_name):
         """Start a background operation with progress dialog."""
         debug_print(f"DEBUG: Starting operation: {operation}")
@@ -468,8 +703,7 @@ class PacketAnalyzerManager:
         # Cancel the worker operation
         if self.deployment_worker and self.deployment_worker.isRunning():
             debug_print("DEBUG: Cancelling deployment worker")
-            self.deployment_worker.cancel_operation()
-            self.deployment_worker.terminate()
+            self.deployment_worker.request_cancel()
             self.deployment_worker.wait(3000)
             self.deployment_worker = None
         
@@ -3,6 +3,7 @@ from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QDrag, QPixmap, QCursor
 from gui.links import NetworkLink
 from utils.debug import debug_print, error_print, warning_print
+from utils.icon_cache import scaled_pixmap
 import os
 
 class ToolManager:
@@ -38,8 +39,7 @@ class ToolManager:
         icon_path = self.main_window.component_icon_map.get(component_type)
         if icon_path and os.path.exists(icon_path):
             # Always scale the pixmap to a small size for smooth dragging
-            pixmap = QPixmap(icon_path).scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            drag.setPixmap(pixmap)
+            drag.setPixmap(scaled_pixmap(icon_path, 48))
         else:
             # Use a default small pixmap if icon not found
             drag.setPixmap(QPixmap(48, 48))
@@ -81,6 +81,7 @@ class ToolManager:
         
         # Add the link to the scene
         self.main_window.canvas_view.scene.addItem(link)
+        self.main_window.undo_manager.recordAdded([link])
         
         # Update the status bar
         source_name = getattr(source, 'object_type', getattr(source, 'component_type', 'object'))
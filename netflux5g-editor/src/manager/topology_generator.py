@@ -0,0 +1,82 @@
+"""
+Topology Generator Manager
+Generates large topologies from a few parameters and opens them on the canvas
+"""
+import os
+from PyQt5.QtWidgets import QInputDialog, QMessageBox, QFileDialog, QApplication
+from PyQt5.QtCore import Qt
+from automation.topology_generator import (
+    LAYOUTS, DISTRIBUTIONS, DEFAULT_APN_MIX, GeneratorError, generate_topology, write_topology, summarize
+)
+from utils.debug import debug_print, error_print
+
+
+class TopologyGeneratorManager:
+    """Asks for generator parameters, writes the .nf5g file and loads it like File > Open."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+
+    def showGeneratorDialog(self):
+        """Prompt for the main parameters; the CLI (automation/topology_generator.py) exposes the rest."""
+        title = "Generate Topology"
+        if getattr(self.main_window, 'has_unsaved_changes', False):
+            reply = QMessageBox.question(
+                self.main_window, title,
+                "The generated topology replaces the current one, which has unsaved changes.\n\nContinue?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+
+        gnbs, ok = QInputDialog.getInt(self.main_window, title, "Number of gNBs:", 7, 1, 10000)
+        if not ok:
+            return
+        ues, ok = QInputDialog.getInt(self.main_window, title, "Number of UEs:", gnbs * 10, 0, 100000)
+        if not ok:
+            return
+        layout, ok = QInputDialog.getItem(self.main_window, title, "gNB layout:", list(LAYOUTS), 1, False)
+        if not ok:
+            return
+        distribution, ok = QInputDialog.getItem(
+            self.main_window, title, "UE distribution:", list(DISTRIBUTIONS), 0, False)
+        if not ok:
+            return
+        apn_mix, ok = QInputDialog.getText(
+            self.main_window, title, "APN mix (apn=weight, ...):", text=DEFAULT_APN_MIX)
+        if not ok:
+            return
+
+        filename, _ = QFileDialog.getSaveFileName(
+            self.main_window, "Save Generated Topology",
+            f"generated-{gnbs}-{ues}.nf5g",
+            "NetFlux5G Files (*.nf5g);;All Files (*)"
+        )
+        if not filename:
+            return
+        if not os.path.splitext(filename)[1]:
+            filename += '.nf5g'
+
+        self.generate(filename, gnbs=gnbs, ues=ues, layout=layout, distribution=distribution,
+                      apn_mix=apn_mix or DEFAULT_APN_MIX)
+
+    def generate(self, filename, **parameters):
+        """Generate a topology into filename and open it; returns True on success."""
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            topology = generate_topology(**parameters)
+            write_topology(topology, filename)
+        except GeneratorError as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self.main_window, "Generate Topology", str(e))
+            return False
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            error_print(f"Topology generation failed: {e}")
+            QMessageBox.critical(self.main_window, "Generate Topology", f"Topology generation failed: {e}")
+            return False
+        QApplication.restoreOverrideCursor()
+
+        debug_print(f"Generated {filename}: {summarize(topology)}")
+        self.main_window.file_manager.loadTopologyFromFile(filename)
+        self.main_window.showCanvasStatus(f"Generated {os.path.basename(filename)}: {summarize(topology)}", 5000)
+        return True
@@ -0,0 +1,265 @@
+"""
+Undo Manager
+Records canvas edits as QUndoStack commands that keep only what changed
+"""
+from PyQt5.QtWidgets import QUndoStack, QUndoCommand
+from gui.components import NetworkComponent
+from gui.links import NetworkLink
+from gui.widgets.Dialog import BasePropertiesWindow
+from utils.bulk_edit import apply_delta, diff_properties
+from utils.debug import debug_print
+
+# Older commands are dropped beyond this many; each command only holds item
+# references and changed values, never a copy of the topology
+UNDO_LIMIT = 1000
+
+# Position is recorded by move commands, not by property edits
+POSITION_KEYS = ('x', 'y')
+
+
+def describe_items(items, verb):
+    if len(items) == 1:
+        item = items[0]
+        name = getattr(item, 'display_name', None) or getattr(item, 'name', None) or 'item'
+        return f"{verb} {name}"
+    return f"{verb} {len(items)} items"
+
+
+class CanvasCommand(QUndoCommand):
+    """
+    Base for canvas commands; subclasses define apply() and revert().
+
+    Most edits are recorded after the canvas already shows them (a drag, a
+    dialog's OK); such commands are created with done=True so that pushing them
+    does not apply the change a second time.
+    """
+
+    def __init__(self, manager, text, done=False):
+        super().__init__(text)
+        self.manager = manager
+        self._done = done
+
+    def redo(self):
+        if self._done:
+            self._done = False
+            return
+        self.apply()
+        self.manager.changed()
+
+    def undo(self):
+        self.revert()
+        self.manager.changed()
+
+
+class MoveCommand(CanvasCommand):
+    """Items moved from one position to another: [(item, (x0, y0), (x1, y1))]."""
+
+    def __init__(self, manager, moves, done=True):
+        super().__init__(manager, describe_items([item for item, _, _ in moves], "Move"), done)
+        self.moves = moves
+
+    def apply(self):
+        for item, _, new in self.moves:
+            item.setPos(*new)
+
+    def revert(self):
+        for item, old, _ in self.moves:
+            item.setPos(*old)
+
+
+class AddItemsCommand(CanvasCommand):
+    """Components, links or other canvas items added to the scene."""
+
+    def __init__(self, manager, items, text=None, done=True):
+        super().__init__(manager, text or describe_items(items, "Add"), done)
+        self.items = manager.expandItems(items)
+
+    def apply(self):
+        self.manager.attachItems(self.items)
+
+    def revert(self):
+        self.manager.detachItems(self.items)
+
+
+class RemoveItemsCommand(AddItemsCommand):
+    """Items removed from the scene, together with the links of removed components."""
+
+    def __init__(self, manager, items, text=None, done=False):
+        super().__init__(manager, items, text or describe_items(items, "Delete"), done)
+
+    def apply(self):
+        self.manager.detachItems(self.items)
+
+    def revert(self):
+        self.manager.attachItems(self.items)
+
+
+class PropertyCommand(CanvasCommand):
+    """Property changes as per-item deltas: [(item, {key: (old, new)})]."""
+
+    def __init__(self, manager, deltas, text, done=False):
+        super().__init__(manager, text, done)
+        self.deltas = deltas
+
+    def __len__(self):
+        return len(self.deltas)
+
+    def items(self):
+        return [item for item, _ in self.deltas]
+
+    def apply(self):
+        self.manager.writeProperties(self.deltas)
+
+    def revert(self):
+        self.manager.writeProperties(self.deltas, revert=True)
+
+
+class UndoManager:
+    """Owns the editor's undo stack and the helpers its commands use to change the canvas."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.stack = QUndoStack(main_window)
+        self.stack.setUndoLimit(UNDO_LIMIT)
+        self._move_start = None
+
+    @property
+    def scene(self):
+        return self.main_window.canvas_view.scene
+
+    def push(self, command):
+        self.stack.push(command)
+        debug_print(f"Undo stack: {command.text()} ({self.stack.count()} commands)")
+        return command
+
+    def clear(self):
+        """Forget the history, e.g. when another topology is loaded."""
+        self.stack.clear()
+        self._move_start = None
+
+    def beginMacro(self, text):
+        self.stack.beginMacro(text)
+
+    def endMacro(self):
+        self.stack.endMacro()
+
+    def changed(self):
+        self.main_window.canvas_view.viewport().update()
+        if hasattr(self.main_window, 'onTopologyChanged'):
+            self.main_window.onTopologyChanged()
+
+    # Recording
+
+    def recordAdded(self, items, text=None):
+        """Record items that were just added to the scene."""
+        return self.push(AddItemsCommand(self, list(items), text, done=True))
+
+    def deleteItems(self, items, text=None):
+        """Remove items (and the links of removed components) as one undoable step."""
+        items = [item for item in items if item.scene() is self.scene]
+        if not items:
+            return None
+        return self.push(RemoveItemsCommand(self, items, text))
+
+    def beginMove(self):
+        """Remember the positions of the selected components before a drag."""
+        self._move_start = {item: (item.x(), item.y()) for item in self.scene.selectedItems()
+                            if isinstance(item, NetworkComponent)}
+
+    def endMove(self):
+        """Record the components that a drag started with beginMove actually moved."""
+        start, self._move_start = self._move_start, None
+        if not start:
+            return None
+        moves = [(item, old, (item.x(), item.y())) for item, old in start.items()
+                 if item.scene() is self.scene and (item.x(), item.y()) != old]
+        if not moves:
+            return None
+        return self.push(MoveCommand(self, moves))
+
+    def recordPropertyChange(self, item, before, text=None):
+        """Record the difference between before and the item's current properties."""
+        delta = diff_properties(before, item.properties, ignore=POSITION_KEYS)
+        if not delta:
+            return None
+        name = getattr(item, 'display_name', None) or getattr(item, 'name', 'item')
+        return self.push(PropertyCommand(self, [(item, delta)], text or f"Edit {name}", done=True))
+
+    # Canvas changes used by the commands
+
+    def expandItems(self, items):
+        """items plus the links attached to its components, links last."""
+        nodes, links = [], []
+        for item in items:
+            (links if isinstance(item, NetworkLink) else nodes).append(item)
+        for node in nodes:
+            for link in getattr(node, 'connected_links', None) or []:
+                if link not in links:
+                    links.append(link)
+        return nodes + links
+
+    def detachItems(self, items):
+        for item in items:
+            if isinstance(item, NetworkLink):
+                for node in (item.source_node, item.dest_node):
+                    links = getattr(node, 'connected_links', None)
+                    if links and item in links:
+                        links.remove(item)
+                if item.scene():
+                    item.scene().removeItem(item)
+        for item in items:
+            if isinstance(item, NetworkLink):
+                continue
+            if isinstance(item, NetworkComponent):
+                # Free the number for reuse, as a normal delete does
+                item.deleteComponent()
+            if item.scene():
+                item.scene().removeItem(item)
+
+    def attachItems(self, items):
+        for item in items:
+            if isinstance(item, NetworkLink):
+                continue
+            if isinstance(item, NetworkComponent):
+                NetworkComponent.available_numbers.setdefault(item.component_type, set()).discard(item.component_number)
+            if item.scene() is None:
+                self.scene.addItem(item)
+        for item in items:
+            if not isinstance(item, NetworkLink):
+                continue
+            for node in (item.source_node, item.dest_node):
+                if not hasattr(node, 'connected_links'):
+                    node.connected_links = []
+                if item not in node.connected_links:
+                    node.connected_links.append(item)
+            if item.scene() is None:
+                self.scene.addItem(item)
+            item.updatePosition()
+
+    def writeProperties(self, deltas, revert=False):
+        """Write property deltas with canvas updates suspended, refreshing each item once."""
+        view = self.main_window.canvas_view
+        view.setUpdatesEnabled(False)
+        try:
+            for item, delta in deltas:
+                apply_delta(item.properties, delta, revert)
+                self._refreshItem(item, delta)
+        finally:
+            view.setUpdatesEnabled(True)
+        self.scene.update()
+        BasePropertiesWindow.reloadOpenWindows([item for item, _ in deltas])
+
+    def _refreshItem(self, item, delta):
+        """Recompute the state derived from the changed properties."""
+        if isinstance(item, NetworkComponent):
+            if 'name' in delta and item.properties.get('name'):
+                item.display_name = item.properties['name']
+            if 'x' in delta or 'y' in delta:
+                item.setPos(item.properties.get('x', item.x()), item.properties.get('y', item.y()))
+            if any(key in NetworkComponent.POWER_FIELDS for key in delta):
+                item.updateCoverageRadius()
+        elif isinstance(item, NetworkLink):
+            if 'name' in delta and item.properties.get('name'):
+                item.name = item.properties['name']
+            item.updateTooltip()
+        item.update()
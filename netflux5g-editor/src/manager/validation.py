@@ -0,0 +1,132 @@
+"""
+Validation Manager
+Checks the topology before it is saved, exported or run, and lists the problems found
+"""
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QDialogButtonBox, QMessageBox, QHeaderView
+)
+from PyQt5.QtCore import Qt
+from gui.components import NetworkComponent
+from automation.topology_validator import ERROR, validate_topology
+from utils.debug import error_print, warning_print
+
+# Issues listed in the confirmation shown before an export or run
+CONFIRM_DETAILS = 50
+
+
+class ValidationManager:
+    """Runs automation.topology_validator on the canvas topology and reports its issues."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.report = None
+        self.dialog = None
+
+    def validate(self, nodes=None, links=None):
+        """ValidationReport of the given topology, or of the canvas; kept as self.report."""
+        if nodes is None:
+            nodes, links = self.main_window.extractTopology()
+        self.report = validate_topology(nodes, links)
+        return self.report
+
+    def showReport(self):
+        """Validate the canvas topology and list the issues; double click one to select its nodes."""
+        report = self.validate()
+        if not report.issues:
+            QMessageBox.information(self.main_window, "Validate Topology",
+                                    f"No problems found in {report.node_count} nodes and {report.link_count} links.")
+            return
+
+        self._showDialog(report)
+
+    def _showDialog(self, report):
+        if self.dialog is None:
+            self.dialog = self._createDialog()
+        self._fillDialog(report)
+        self.dialog.show()
+        self.dialog.raise_()
+        self.dialog.activateWindow()
+
+    def _createDialog(self):
+        dialog = QDialog(self.main_window)
+        dialog.setWindowTitle("Validate Topology")
+        dialog.resize(820, 420)
+        layout = QVBoxLayout(dialog)
+        dialog.summary_label = QLabel(dialog)
+        layout.addWidget(dialog.summary_label)
+        dialog.tree = QTreeWidget(dialog)
+        dialog.tree.setHeaderLabels(["Severity", "Rule", "Problem"])
+        dialog.tree.setRootIsDecorated(False)
+        dialog.tree.setUniformRowHeights(True)
+        dialog.tree.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        dialog.tree.itemDoubleClicked.connect(lambda item, column: self.selectNodes(item.data(0, Qt.UserRole)))
+        layout.addWidget(dialog.tree)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close, dialog)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        return dialog
+
+    def _fillDialog(self, report):
+        dialog = self.dialog
+        dialog.summary_label.setText(
+            f"{report.summary().capitalize()} in {report.node_count} nodes and {report.link_count} links "
+            f"({report.elapsed * 1000:.0f} ms). Double click a problem to select its nodes.")
+        tree = dialog.tree
+        tree.setUpdatesEnabled(False)
+        tree.clear()
+        rows = []
+        for issue in report.issues:
+            row = QTreeWidgetItem([issue.severity.capitalize(), issue.rule, issue.message])
+            row.setData(0, Qt.UserRole, list(issue.nodes))
+            if issue.severity == ERROR:
+                row.setForeground(0, Qt.red)
+            rows.append(row)
+        tree.addTopLevelItems(rows)
+        tree.resizeColumnToContents(0)
+        tree.resizeColumnToContents(1)
+        tree.setUpdatesEnabled(True)
+
+    def selectNodes(self, names):
+        """Select the named components and bring the first into view."""
+        names = set(names or ())
+        if not names:
+            return
+        scene = self.main_window.canvas_view.scene
+        scene.clearSelection()
+        found = [item for item in scene.items()
+                 if isinstance(item, NetworkComponent) and item.display_name in names]
+        for item in found:
+            item.setSelected(True)
+        if found:
+            self.main_window.canvas_view.centerOn(found[0])
+        self.main_window.showCanvasStatus(f"Selected {len(found)} of {len(names)} node(s)", 3000)
+
+    def confirmTopology(self, nodes, links, action="Export"):
+        """
+        Validate before an export or run; True to go ahead.
+
+        Warnings are only logged. With errors, the user chooses between going
+        ahead anyway, cancelling, and cancelling to see the full list.
+        """
+        try:
+            report = self.validate(nodes, links)
+        except Exception as e:
+            error_print(f"ERROR: Topology validation failed: {e}")
+            return True
+        for issue in report.warnings:
+            warning_print(f"WARNING: {issue.message}")
+        errors = report.errors
+        if not errors:
+            return True
+
+        box = QMessageBox(QMessageBox.Warning, f"{action} Topology",
+                          f"The topology has {len(errors)} error(s) that will likely make the Mininet run fail.\n\n"
+                          f"{errors[0].message}\n\n{action} anyway?", QMessageBox.NoButton, self.main_window)
+        box.setDetailedText('\n'.join(str(issue) for issue in report.issues[:CONFIRM_DETAILS]))
+        proceed = box.addButton(f"{action} Anyway", QMessageBox.AcceptRole)
+        show = box.addButton("Show Problems", QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Cancel)
+        box.exec_()
+        if box.clickedButton() is show:
+            self._showDialog(report)
+        return box.clickedButton() is proceed
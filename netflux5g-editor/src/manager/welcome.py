@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QMainWindow, QLabel, QVBoxLayout, QHBoxLayout, QWidget, QPushButton
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon, QCursor
-from PyQt5 import uic
+from utils.ui_loader import load_ui
 from utils.debug import debug_print, error_print, warning_print
 import os
 import webbrowser 
@@ -95,7 +95,7 @@ class WelcomeScreen(QMainWindow):
         )
         
         try:
-            uic.loadUi(ui_file, self)
+            load_ui(ui_file, self)
             self.setupWelcomeScreen()
         except Exception as e:
             error_print(f"Failed to load welcome screen UI: {e}")
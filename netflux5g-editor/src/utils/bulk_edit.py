@@ -0,0 +1,250 @@
+"""
+Bulk property editing for NetFlux5G Editor
+Selects topology items with simple queries and turns property changes into compact, revertible deltas
+"""
+import re
+
+# Property keys written by the properties dialogs start with a per-type prefix
+# (UE_APN, GNB_Power, VGCore_MCC); queries and patches may leave it out
+KEY_PREFIXES = {
+    'VGcore': ('VGCore', 'Component5G'),
+    'Host': (),
+    'Link': (),
+}
+
+# Values the exporter (ConfigurationMapper) uses when a property is not set, so
+# queries such as "APN == internet" also match items that never set it
+EXPORT_DEFAULTS = {
+    'UE': {
+        'UE_APN': 'internet', 'UE_GNBHostName': 'gnb', 'UE_MCC': '999', 'UE_MNC': '70', 'UE_SST': '1',
+        'UE_SD': '0xffffff', 'UE_MSISDN': '0000000001', 'UE_OPType': 'OPC', 'UE_PDUSessions': 1,
+        'UE_SessionType': 'IPv4', 'UE_TunnelInterface': 'uesimtun0', 'UE_RadioInterface': 'eth0',
+        'UE_AssociationMode': 'auto',
+    },
+    'GNB': {
+        'GNB_AMFHostName': 'amf', 'GNB_GNBHostName': 'gnb', 'GNB_MCC': '999', 'GNB_MNC': '70', 'GNB_SST': '1',
+        'GNB_SD': '0xffffff', 'GNB_TAC': '1', 'GNB_Radio_Interface': 'eth0', 'GNB_AP_SSID': 'gnb-hotspot',
+        'GNB_AP_Channel': '6', 'GNB_AP_Mode': 'g', 'GNB_OVS_BridgeName': 'br-gnb', 'GNB_OVS_FailMode': 'secure',
+        'GNB_OVS_Protocols': 'OpenFlow14', 'GNB_OVS_Datapath': 'kernel', 'GNB_Bridge_Priority': '32768',
+    },
+}
+_EXPORT_DEFAULTS_LOWER = {kind: {key.lower(): value for key, value in defaults.items()}
+                          for kind, defaults in EXPORT_DEFAULTS.items()}
+
+OPERATORS = ('==', '!=', '<=', '>=', '<', '>', '~=')
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:"([^"]*)"|\'([^\']*)\'|(==|!=|<=|>=|<|>|~=)|([^\s=!<>~"\']+))')
+
+# Stands for a property that did not exist before a patch was applied
+MISSING = object()
+
+
+class QueryError(ValueError):
+    """Raised for a query or patch that cannot be parsed."""
+
+
+def key_prefixes(kind):
+    return KEY_PREFIXES.get(kind, (kind,))
+
+
+def resolve_key(kind, properties, field):
+    """
+    Property key that field refers to on an item of the given kind.
+
+    An existing key matches exactly, then case-insensitively, then with the type
+    prefix added (APN -> UE_APN). A field that matches nothing gets the prefix the
+    properties dialog would use, so patches create the key the exporter reads.
+    """
+    if field in properties:
+        return field
+    lowered = {key.lower(): key for key in properties}
+    prefixes = key_prefixes(kind)
+    for candidate in [field] + [f"{prefix}_{field}" for prefix in prefixes]:
+        if candidate.lower() in lowered:
+            return lowered[candidate.lower()]
+    if prefixes and not any(field.lower().startswith(f"{prefix.lower()}_") for prefix in prefixes):
+        return f"{prefixes[0]}_{field}"
+    return field
+
+
+def field_value(kind, properties, field):
+    """
+    Value of field for a query; 'type' is the item kind (UE, GNB, Link...).
+
+    An unset property takes the exporter's default (EXPORT_DEFAULTS), if it has one.
+    """
+    if field.lower() == 'type':
+        return kind
+    key = resolve_key(kind, properties, field)
+    if key in properties:
+        return properties[key]
+    return _EXPORT_DEFAULTS_LOWER.get(kind, {}).get(key.lower(), MISSING)
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Cannot parse query near: {text[position:]!r}")
+        quoted = match.group(1) if match.group(1) is not None else match.group(2)
+        if quoted is not None:
+            tokens.append(('value', quoted))
+        elif match.group(3):
+            tokens.append(('op', match.group(3)))
+        else:
+            tokens.append(('word', match.group(4)))
+        position = match.end()
+    return tokens
+
+
+def _as_number(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compare(actual, op, expected):
+    if actual is MISSING:
+        return op == '!='
+    if op == '~=':
+        return expected.lower() in str(actual).lower()
+    actual_number, expected_number = _as_number(actual), _as_number(expected)
+    if actual_number is not None and expected_number is not None:
+        left, right = actual_number, expected_number
+    elif isinstance(actual, bool):
+        left, right = actual, expected.lower() in ('true', '1', 'yes')
+    else:
+        left, right = str(actual).lower(), expected.lower()
+    if op == '==':
+        return left == right
+    if op == '!=':
+        return left != right
+    try:
+        return {'<': left < right, '<=': left <= right, '>': left > right, '>=': left >= right}[op]
+    except TypeError:
+        return False
+
+
+def parse_query(text):
+    """
+    Compile a query into a predicate(kind, properties).
+
+    Conditions are 'field op value' with op one of == != < <= > >= and ~= (contains),
+    joined by 'and' / 'or' ('and' binds tighter). Numbers compare numerically and
+    strings case-insensitively. An empty query or '*' matches everything.
+
+        type == UE and APN == internet
+        type == GNB and Power >= 30 or name ~= edge
+    """
+    tokens = _tokenize(text or '')
+    if not tokens or tokens == [('word', '*')]:
+        return lambda kind, properties: True
+
+    groups = [[]]
+    index = 0
+    while index < len(tokens):
+        if len(tokens) - index < 3:
+            raise QueryError(f"Incomplete condition in query: {text!r}")
+        (field_kind, field), (op_kind, op), (value_kind, value) = tokens[index:index + 3]
+        if 'op' in (field_kind, value_kind) or op_kind != 'op':
+            raise QueryError(f"Expected 'field {'|'.join(OPERATORS)} value' in query: {text!r}")
+        groups[-1].append((field, op, value))
+        index += 3
+        if index < len(tokens):
+            joiner = tokens[index][1].lower()
+            if joiner == 'or':
+                groups.append([])
+            elif joiner != 'and':
+                raise QueryError(f"Expected 'and' or 'or' in query, got {tokens[index][1]!r}")
+            index += 1
+            if index == len(tokens):
+                raise QueryError(f"Query ends with {joiner!r}: {text!r}")
+
+    def predicate(kind, properties):
+        return any(all(_compare(field_value(kind, properties, field), op, value) for field, op, value in group)
+                   for group in groups)
+    return predicate
+
+
+def parse_patch(text):
+    """
+    Parse 'key=value; key2=value2' (or one assignment per line) into a dict.
+
+    Values are kept as text and converted per item by coerce_value.
+    """
+    patch = {}
+    for part in re.split(r'[;\n]', text or ''):
+        if not part.strip():
+            continue
+        if '=' not in part:
+            raise QueryError(f"Expected key=value, got {part.strip()!r}")
+        key, value = part.split('=', 1)
+        key, value = key.strip(), value.strip()
+        if not key:
+            raise QueryError(f"Missing property name in {part.strip()!r}")
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        patch[key] = value
+    if not patch:
+        raise QueryError("No properties to set")
+    return patch
+
+
+def coerce_value(value, current):
+    """Convert a patch value to the type of the value it replaces (int, float or bool)."""
+    if not isinstance(value, str) or current is MISSING or current is None:
+        return value
+    try:
+        if isinstance(current, bool):
+            return value.strip().lower() in ('true', '1', 'yes', 'on')
+        if isinstance(current, int):
+            return int(float(value))
+        if isinstance(current, float):
+            return float(value)
+    except ValueError:
+        pass
+    return value
+
+
+def compute_delta(kind, properties, patch):
+    """
+    Changes patch makes to one item's properties: {key: (old, new)}.
+
+    Keys whose value would not change are left out; old is MISSING for new keys.
+    """
+    delta = {}
+    for field, value in patch.items():
+        key = resolve_key(kind, properties, field)
+        old = properties.get(key, MISSING)
+        new = coerce_value(value, old)
+        if old is MISSING or old != new:
+            delta[key] = (old, new)
+    return delta
+
+
+def apply_delta(properties, delta, revert=False):
+    """Write a delta's new values into properties (or its old ones when revert is True)."""
+    for key, (old, new) in delta.items():
+        value = old if revert else new
+        if value is MISSING:
+            properties.pop(key, None)
+        else:
+            properties[key] = value
+
+
+def diff_properties(before, after, ignore=()):
+    """Delta {key: (old, new)} between two property dicts, leaving out keys in ignore."""
+    delta = {}
+    for key in before.keys() | after.keys():
+        if key in ignore:
+            continue
+        old, new = before.get(key, MISSING), after.get(key, MISSING)
+        if old is MISSING or new is MISSING or old != new:
+            delta[key] = (old, new)
+    return delta
@@ -0,0 +1,177 @@
+"""
+Content-addressed configuration cache for NetFlux5G Editor
+Stores 5G NF configuration files by content hash and syncs them into export directories,
+touching only the files whose source or embedded content changed
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import yaml
+from utils.debug import debug_print, warning_print
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export', 'cache', 'configs')
+
+# Per export directory record of filename -> content digest
+MANIFEST_NAME = '.config-manifest.json'
+
+
+class ConfigCache:
+    """
+    Content-addressed store for NF configuration files.
+
+    Objects are kept read-only under objects/<sha256>.yaml and hard-linked into
+    export directories, so an unchanged config costs a stat (file sources) or a
+    hash of the in-memory content (embedded configs) instead of a copy or a
+    yaml.dump. Source files are re-hashed only when their mtime or size changes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._index = self._load_json(self.index_path)
+        self._index_dirty = False
+        self.stats = {'unchanged': 0, 'linked': 0, 'copied': 0, 'stored': 0, 'removed': 0}
+
+    @staticmethod
+    def _load_json(path):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_json(path, data):
+        directory = os.path.dirname(path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, f"{digest}.yaml")
+
+    def _store(self, digest, write):
+        """Create the object for digest with write(file) unless it already exists."""
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return path
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.stats['stored'] += 1
+        return path
+
+    def add_file(self, source_path):
+        """Return the digest of a config file, hashing and storing it only if it changed on disk."""
+        source_path = os.path.abspath(source_path)
+        stat = os.stat(source_path)
+        entry = self._index.get(source_path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size \
+                and os.path.exists(self.object_path(entry[2])):
+            return entry[2]
+
+        sha = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        def write(out):
+            with open(source_path, 'rb') as src:
+                shutil.copyfileobj(src, out)
+        self._store(digest, write)
+        self._index[source_path] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._index_dirty = True
+        return digest
+
+    def add_content(self, content):
+        """
+        Return the digest of embedded config content, storing it if new.
+
+        Strings are stored verbatim. Structured content is hashed in its canonical
+        JSON form and only serialized to YAML when the object does not exist yet.
+        """
+        if isinstance(content, str):
+            data = content.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            self._store(digest, lambda out: out.write(data))
+            return digest
+
+        canonical = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha256(b'yaml:' + canonical.encode('utf-8')).hexdigest()
+        self._store(digest, lambda out: out.write(
+            yaml.dump(content, default_flow_style=False).encode('utf-8')))
+        return digest
+
+    def sync(self, entries, dest_dir):
+        """
+        Make dest_dir contain exactly the given configs.
+
+        Args:
+            entries (dict): filename -> digest
+            dest_dir (str): Export configs directory (e.g. <export>/5g-configs)
+
+        Returns:
+            dict: filename -> 'unchanged', 'linked' or 'copied'
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+        manifest = self._load_json(manifest_path)
+        results = {}
+
+        for filename, digest in entries.items():
+            dest_path = os.path.join(dest_dir, filename)
+            if manifest.get(filename) == digest and os.path.exists(dest_path):
+                results[filename] = 'unchanged'
+                continue
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+            try:
+                os.link(self.object_path(digest), dest_path)
+                results[filename] = 'linked'
+            except OSError:
+                # Cache on another filesystem (or no hard link support)
+                shutil.copyfile(self.object_path(digest), dest_path)
+                results[filename] = 'copied'
+
+        for filename in set(manifest) - set(entries):
+            stale_path = os.path.join(dest_dir, filename)
+            if os.path.lexists(stale_path):
+                os.remove(stale_path)
+                self.stats['removed'] += 1
+
+        for status in results.values():
+            self.stats[status] += 1
+        if manifest != entries:
+            self._write_json(manifest_path, entries)
+        self.save()
+        return results
+
+    def save(self):
+        """Persist the source file index if it changed."""
+        if not self._index_dirty:
+            return
+        try:
+            self._write_json(self.index_path, self._index)
+            self._index_dirty = False
+        except OSError as e:
+            warning_print(f"WARNING: Could not save config cache index: {e}")
+
+    def summary(self):
+        debug_print(f"Config cache: {self.stats}")
+        return dict(self.stats)
@@ -0,0 +1,395 @@
+"""
+Coverage heatmap for NetFlux5G Editor
+Evaluates the propagation models over a grid for all APs and gNBs at once and keeps best-server, SINR and overlap maps
+"""
+import math
+from utils.power_range_calculator import PowerRangeCalculator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MODES = ('signal', 'server', 'sinr', 'overlap')
+
+# A cell's samples are kept where it is received no more than this far below the
+# noise threshold (about 1.6x its coverage range with the default path-loss
+# exponent); each weaker signal adds under a quarter of the noise to the interference
+INFLUENCE_MARGIN_DB = 6.0
+
+# Side, in samples, of the buckets that index the cell windows for best-server updates
+BUCKET_SAMPLES = 32
+
+# Longest side of the grid in samples, and the finest sample spacing (canvas pixels = meters)
+MAX_SAMPLES = 512
+MIN_RESOLUTION = 2.0
+
+# Colour scale limits: signal above the noise threshold, and SINR
+SIGNAL_SPAN_DB = 60.0
+SINR_RANGE_DB = (-10.0, 30.0)
+
+OVERLAY_ALPHA = 130
+GAP_COLOR = (150, 150, 150, 70)
+
+
+def numpy_available():
+    return np is not None
+
+
+def received_power(distance, txpower, frequency, antenna_gain=PowerRangeCalculator.DEFAULT_ANTENNA_GAIN,
+                   system_loss=PowerRangeCalculator.DEFAULT_SYSTEM_LOSS,
+                   path_loss_exponent=PowerRangeCalculator.DEFAULT_PATH_LOSS_EXPONENT, model='logDistance'):
+    """
+    Received power (dBm) at distance (m, array) from a transmitter.
+
+    PowerRangeCalculator solves the same equations for the range, so the
+    noise-threshold contour of this map is the coverage circle the canvas draws.
+    """
+    return PowerRangeCalculator.calculate_received_power(
+        distance, txpower, frequency, antenna_gain, system_loss, path_loss_exponent, model)
+
+
+class _Cell:
+    """One transmitter and its samples: window (r0, r1, c0, c1) of the grid and linear power (mW) over it."""
+
+    __slots__ = ('slot', 'params', 'window', 'layer', 'covered')
+
+    def __init__(self, slot, params):
+        self.slot = slot
+        self.params = params
+        self.window = None
+        self.layer = None
+        self.covered = None
+
+
+class CoverageHeatmap:
+    """
+    Received power of every AP/gNB sampled on one grid.
+
+    Each cell keeps its own samples, limited to the window where it can still
+    matter (see INFLUENCE_MARGIN_DB), so moving or re-powering one cell only
+    recomputes that cell and the best server inside its old and new windows;
+    the interference sum and overlap count are updated by subtracting the old
+    samples and adding the new ones. The windows are filed in buckets of
+    BUCKET_SAMPLES, so the best-server update only visits the cells reaching
+    the changed region.
+    """
+
+    def __init__(self, bounds, resolution=None, model='logDistance',
+                 noise_threshold=PowerRangeCalculator.DEFAULT_NOISE_THRESHOLD,
+                 system_loss=PowerRangeCalculator.DEFAULT_SYSTEM_LOSS,
+                 path_loss_exponent=PowerRangeCalculator.DEFAULT_PATH_LOSS_EXPONENT):
+        if np is None:
+            raise RuntimeError("The coverage heatmap needs numpy (pip install numpy)")
+        x0, y0, x1, y1 = bounds
+        if resolution is None:
+            resolution = max(MIN_RESOLUTION, max(x1 - x0, y1 - y0) / MAX_SAMPLES)
+        self.resolution = float(resolution)
+        self.x0, self.y0 = float(x0), float(y0)
+        self.width = max(1, int(math.ceil((x1 - x0) / self.resolution)))
+        self.height = max(1, int(math.ceil((y1 - y0) / self.resolution)))
+        self.model = model
+        self.noise_threshold = noise_threshold
+        self.system_loss = system_loss
+        self.path_loss_exponent = path_loss_exponent
+        self.threshold_mw = 10 ** (noise_threshold / 10)
+
+        shape = (self.height, self.width)
+        self.total_mw = np.zeros(shape)
+        self.best_mw = np.zeros(shape)
+        self.best_slot = np.full(shape, -1, dtype=np.int32)
+        self.overlap = np.zeros(shape, dtype=np.int16)
+        # Sample centres along each axis
+        self._xs = self.x0 + (np.arange(self.width) + 0.5) * self.resolution
+        self._ys = self.y0 + (np.arange(self.height) + 0.5) * self.resolution
+
+        self.cells = {}
+        # (bucket row, bucket column) -> cells whose window overlaps the bucket
+        self._buckets = {}
+        self._free_slots = []
+        self._next_slot = 0
+
+    @property
+    def bounds(self):
+        return (self.x0, self.y0, self.x0 + self.width * self.resolution, self.y0 + self.height * self.resolution)
+
+    def influence_radius(self, txpower, frequency, antenna_gain=PowerRangeCalculator.DEFAULT_ANTENNA_GAIN):
+        """Distance beyond which a transmitter is left out of the maps."""
+        return PowerRangeCalculator.calculate_range_from_power(
+            txpower, frequency, antenna_gain, self.noise_threshold - INFLUENCE_MARGIN_DB,
+            self.system_loss, self.path_loss_exponent, self.model)
+
+    def contains(self, x, y, radius=0.0):
+        x0, y0, x1, y1 = self.bounds
+        return x0 <= x - radius and x + radius <= x1 and y0 <= y - radius and y + radius <= y1
+
+    # Cells
+
+    def set_cell(self, key, x, y, txpower, frequency, antenna_gain=PowerRangeCalculator.DEFAULT_ANTENNA_GAIN):
+        """
+        Add a transmitter or update its position/power; returns the changed grid region
+        (r0, r1, c0, c1), or None if nothing changed.
+        """
+        region = self._set(key, (float(x), float(y), float(txpower), float(frequency), float(antenna_gain)))
+        if region:
+            self._update_best(region)
+        return region
+
+    def set_cells(self, cells):
+        """
+        Add or update many transmitters {key: (x, y, txpower, frequency[, antenna_gain])},
+        computing the best server once over the union of the changed regions.
+        """
+        region = None
+        for key, params in cells.items():
+            params = tuple(float(value) for value in params)
+            if len(params) == 4:
+                params += (float(PowerRangeCalculator.DEFAULT_ANTENNA_GAIN),)
+            region = _union(region, self._set(key, params))
+        if region:
+            self._update_best(region)
+        return region
+
+    def _set(self, key, params):
+        cell = self.cells.get(key)
+        if cell is not None and cell.params == params:
+            return None
+        if cell is None:
+            slot = self._free_slots.pop() if self._free_slots else self._allocate_slot()
+            cell = self.cells[key] = _Cell(slot, params)
+            old_window = None
+        else:
+            old_window = self._unapply(cell)
+            cell.params = params
+        self._sample(cell)
+        self._apply(cell)
+        return _union(old_window, cell.window)
+
+    def remove_cell(self, key):
+        cell = self.cells.pop(key, None)
+        if cell is None:
+            return None
+        window = self._unapply(cell)
+        self._free_slots.append(cell.slot)
+        if window:
+            self._update_best(window)
+        return window
+
+    def keys(self):
+        return list(self.cells)
+
+    def key_of_slot(self, slot):
+        for key, cell in self.cells.items():
+            if cell.slot == slot:
+                return key
+        return None
+
+    def _allocate_slot(self):
+        slot = self._next_slot
+        self._next_slot += 1
+        return slot
+
+    def _sample(self, cell):
+        """Evaluate the model for one cell over its window only."""
+        x, y, txpower, frequency, antenna_gain = cell.params
+        radius = self.influence_radius(txpower, frequency, antenna_gain)
+        c0 = max(0, int(math.floor((x - radius - self.x0) / self.resolution)))
+        c1 = min(self.width, int(math.ceil((x + radius - self.x0) / self.resolution)))
+        r0 = max(0, int(math.floor((y - radius - self.y0) / self.resolution)))
+        r1 = min(self.height, int(math.ceil((y + radius - self.y0) / self.resolution)))
+        if c0 >= c1 or r0 >= r1:
+            cell.window = cell.layer = cell.covered = None
+            return
+        dx = self._xs[c0:c1] - x
+        dy = self._ys[r0:r1, None] - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        power_dbm = received_power(distance, txpower, frequency, antenna_gain, self.system_loss,
+                                   self.path_loss_exponent, self.model)
+        layer = np.power(10.0, power_dbm / 10)
+        layer[distance > radius] = 0.0
+        cell.window = (r0, r1, c0, c1)
+        cell.layer = layer
+        cell.covered = layer >= self.threshold_mw
+
+    @staticmethod
+    def _bucket_keys(region):
+        r0, r1, c0, c1 = region
+        for row in range(r0 // BUCKET_SAMPLES, (r1 - 1) // BUCKET_SAMPLES + 1):
+            for column in range(c0 // BUCKET_SAMPLES, (c1 - 1) // BUCKET_SAMPLES + 1):
+                yield row, column
+
+    def _apply(self, cell):
+        if cell.window is None:
+            return
+        r0, r1, c0, c1 = cell.window
+        self.total_mw[r0:r1, c0:c1] += cell.layer
+        self.overlap[r0:r1, c0:c1] += cell.covered
+        for key in self._bucket_keys(cell.window):
+            self._buckets.setdefault(key, set()).add(cell)
+
+    def _unapply(self, cell):
+        """Take a cell's samples out of the sums; returns its former window."""
+        window = cell.window
+        if window is not None:
+            r0, r1, c0, c1 = window
+            total = self.total_mw[r0:r1, c0:c1]
+            total -= cell.layer
+            # Subtraction leaves rounding residue where the cell was the only signal
+            np.maximum(total, 0.0, out=total)
+            self.overlap[r0:r1, c0:c1] -= cell.covered
+            for key in self._bucket_keys(window):
+                bucket = self._buckets[key]
+                bucket.discard(cell)
+                if not bucket:
+                    del self._buckets[key]
+        cell.window = cell.layer = cell.covered = None
+        return window
+
+    def _update_best(self, region):
+        """Recompute the best server over region from the cells whose windows reach it."""
+        r0, r1, c0, c1 = region
+        best_mw = self.best_mw[r0:r1, c0:c1]
+        best_slot = self.best_slot[r0:r1, c0:c1]
+        best_mw[...] = 0.0
+        best_slot[...] = -1
+        reaching = set()
+        for key in self._bucket_keys(region):
+            reaching.update(self._buckets.get(key, ()))
+        for cell in sorted(reaching, key=lambda cell: cell.slot):
+            wr0, wr1, wc0, wc1 = cell.window
+            ir0, ir1, ic0, ic1 = max(r0, wr0), min(r1, wr1), max(c0, wc0), min(c1, wc1)
+            if ir0 >= ir1 or ic0 >= ic1:
+                continue
+            samples = cell.layer[ir0 - wr0:ir1 - wr0, ic0 - wc0:ic1 - wc0]
+            target = (slice(ir0 - r0, ir1 - r0), slice(ic0 - c0, ic1 - c0))
+            stronger = samples > best_mw[target]
+            best_mw[target] = np.where(stronger, samples, best_mw[target])
+            best_slot[target] = np.where(stronger, cell.slot, best_slot[target])
+
+    # Maps
+
+    def best_dbm(self):
+        with np.errstate(divide='ignore'):
+            return 10 * np.log10(self.best_mw)
+
+    def sinr_db(self):
+        """Best server over the other cells plus the noise threshold, in dB."""
+        interference = np.maximum(self.total_mw - self.best_mw, 0.0) + self.threshold_mw
+        with np.errstate(divide='ignore'):
+            return 10 * np.log10(self.best_mw / interference)
+
+    def covered(self):
+        return self.best_mw >= self.threshold_mw
+
+    def sample(self, x, y):
+        """Values at a canvas position: best server key, signal (dBm), SINR (dB) and overlapping cells."""
+        column = int((x - self.x0) // self.resolution)
+        row = int((y - self.y0) // self.resolution)
+        if not (0 <= row < self.height and 0 <= column < self.width):
+            return None
+        best = self.best_mw[row, column]
+        interference = max(self.total_mw[row, column] - best, 0.0) + self.threshold_mw
+        return {
+            'server': self.key_of_slot(int(self.best_slot[row, column])) if best >= self.threshold_mw else None,
+            'signal_dbm': 10 * math.log10(best) if best > 0 else None,
+            'sinr_db': 10 * math.log10(best / interference) if best > 0 else None,
+            'overlap': int(self.overlap[row, column])
+        }
+
+    def argb(self, mode):
+        """
+        The map for mode as premultiplied ARGB32 pixels (height x width uint32).
+
+        Samples no cell covers are drawn in GAP_COLOR so that coverage gaps stand out.
+        """
+        covered = self.covered()
+        if mode == 'signal':
+            pixels = _SIGNAL_LUT()[_lut_index(self.best_dbm(), self.noise_threshold,
+                                               self.noise_threshold + SIGNAL_SPAN_DB)]
+        elif mode == 'sinr':
+            pixels = _SINR_LUT()[_lut_index(self.sinr_db(), *SINR_RANGE_DB)]
+        elif mode == 'server':
+            pixels = _server_colors(max(self._next_slot, 1))[np.maximum(self.best_slot, 0)]
+        elif mode == 'overlap':
+            pixels = _OVERLAP_COLORS()[np.minimum(self.overlap, 4).clip(0)]
+        else:
+            raise ValueError(f"Unknown heatmap mode {mode!r}, expected one of {', '.join(MODES)}")
+        return np.where(covered, pixels, _premultiplied([GAP_COLOR])[0]).astype(np.uint32)
+
+    def statistics(self):
+        """Share of the grid covered, and covered by more than one cell."""
+        samples = self.width * self.height
+        return {
+            'covered': float(np.count_nonzero(self.covered())) / samples,
+            'overlap': float(np.count_nonzero(self.overlap > 1)) / samples,
+            'cells': len(self.cells)
+        }
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3])
+
+
+def _premultiplied(colors):
+    """[(r, g, b, a)] -> uint32 array of premultiplied 0xAARRGGBB."""
+    rgba = np.asarray(colors, dtype=np.uint32)
+    alpha = rgba[:, 3]
+    red, green, blue = (rgba[:, i] * alpha // 255 for i in range(3))
+    return (alpha << 24) | (red << 16) | (green << 8) | blue
+
+
+def _gradient(stops, alpha=OVERLAY_ALPHA, size=256):
+    """256-entry colour table interpolated between evenly spaced RGB stops."""
+    stops = np.asarray(stops, dtype=float)
+    positions = np.linspace(0, 1, len(stops))
+    t = np.linspace(0, 1, size)
+    channels = [np.interp(t, positions, stops[:, i]) for i in range(3)]
+    colors = np.stack(channels + [np.full(size, alpha)], axis=1).round()
+    return _premultiplied(colors)
+
+
+def _lut_index(values, low, high):
+    scaled = (np.nan_to_num(values, nan=low, neginf=low, posinf=high) - low) * (255.0 / (high - low))
+    return np.clip(scaled, 0, 255).astype(np.intp)
+
+
+_tables = {}
+
+
+def _cached(name, build):
+    def table():
+        if name not in _tables:
+            _tables[name] = build()
+        return _tables[name]
+    return table
+
+
+# Weak to strong: blue, cyan, green, yellow, red
+_SIGNAL_LUT = _cached('signal', lambda: _gradient([(40, 70, 220), (0, 190, 220), (40, 200, 60),
+                                                   (250, 220, 0), (230, 40, 30)]))
+# Poor to good: red, yellow, green
+_SINR_LUT = _cached('sinr', lambda: _gradient([(220, 30, 30), (250, 210, 0), (30, 180, 60)]))
+# 1, 2, 3 and 4+ covering cells (index 0 is never shown: uncovered samples use GAP_COLOR)
+_OVERLAP_COLORS = _cached('overlap', lambda: _premultiplied([
+    (0, 0, 0, 0), (40, 180, 70, OVERLAY_ALPHA), (240, 210, 0, OVERLAY_ALPHA),
+    (250, 130, 0, OVERLAY_ALPHA), (220, 30, 30, OVERLAY_ALPHA)]))
+
+
+def _server_colors(count):
+    """Distinct colours per cell slot (golden-ratio hue steps)."""
+    colors = []
+    for slot in range(count):
+        hue = (slot * 0.618033988749895) % 1.0
+        colors.append(tuple(int(round(255 * c)) for c in _hsv_to_rgb(hue, 0.6, 0.95)) + (OVERLAY_ALPHA,))
+    return _premultiplied(colors)
+
+
+def _hsv_to_rgb(h, s, v):
+    i = int(h * 6) % 6
+    f = h * 6 - int(h * 6)
+    p, q, t = v * (1 - s), v * (1 - f * s), v * (1 - (1 - f) * s)
+    return [(v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q)][i]
@@ -0,0 +1,621 @@
+"""
+Asynchronous Docker operations engine for NetFlux5G Editor
+Runs many container operations concurrently on one asyncio loop and bridges progress to Qt
+"""
+import asyncio
+import re
+import shlex
+import time
+import uuid
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.debug import debug_print, error_print, warning_print
+
+
+class DockerOperation:
+    """A named unit of work for the operations engine."""
+
+    def __init__(self, name, action, depends_on=None, description=None):
+        """
+        Args:
+            name (str): Unique operation name (e.g. 'mongodb')
+            action (callable): Coroutine function ``async action(engine, report)`` or
+                blocking callable ``action(engine, report)``; both return (success, message).
+                ``report(message, progress=None)`` publishes a status line.
+            depends_on (list): Names of operations that must succeed first
+            description (str): Human readable label used in status messages
+        """
+        self.name = name
+        self.action = action
+        self.depends_on = list(depends_on or [])
+        self.description = description or name
+
+
+class AsyncDockerExecSession:
+    """One long-lived ``docker exec -i`` shell that runs many commands back to back."""
+
+    # Kill every descendant of a shell pid, deepest first, using only sh and /proc
+    KILL_TREE_SCRIPT = (
+        'tree() { for c in $(cat /proc/$1/task/*/children 2>/dev/null); do tree "$c"; echo "$c"; done; }; '
+        'pids=$(tree "$1"); [ -z "$pids" ] || kill -KILL $pids 2>/dev/null; true'
+    )
+
+    def __init__(self, container_name, shell='sh'):
+        self.container_name = container_name
+        self.shell = shell
+        self.process = None
+        self.shell_pid = None
+
+    async def open(self):
+        """Start the shell inside the container and learn its pid there."""
+        self.process = await asyncio.create_subprocess_exec(
+            'docker', 'exec', '-i', self.container_name, self.shell,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            self.process.stdin.write(b'echo $$\n')
+            await self.process.stdin.drain()
+            line = await asyncio.wait_for(self.process.stdout.readline(), timeout=10)
+            pid = line.decode(errors='replace').strip()
+            self.shell_pid = int(pid) if pid.isdigit() else None
+        except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+            self.shell_pid = None
+        return self
+
+    @property
+    def is_open(self):
+        return self.process is not None and self.process.returncode is None
+
+    async def close(self):
+        """Terminate the shell, killing it if it does not exit promptly."""
+        if not self.is_open:
+            return
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), timeout=2)
+        except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                # Exited during the grace period
+                pass
+            await self.process.wait()
+
+    async def _read_until(self, stream, marker):
+        lines = []
+        while True:
+            line = await stream.readline()
+            if not line:
+                raise ConnectionError(f"exec session for {self.container_name} closed unexpectedly")
+            text = line.decode(errors='replace')
+            if text.startswith(marker):
+                return ''.join(lines), text[len(marker):].strip()
+            lines.append(text)
+
+    async def _collect(self, marker):
+        return await asyncio.gather(self._read_until(self.process.stdout, marker),
+                                    self._read_until(self.process.stderr, marker))
+
+    async def _interrupt(self, marker):
+        """
+        Kill the command still running in the container after a timeout.
+
+        The session stays open if the shell reaches the end markers afterwards;
+        otherwise it is closed and the caller opens a new one.
+        """
+        killed = False
+        if self.shell_pid is not None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    'docker', 'exec', self.container_name, 'sh', '-c', self.KILL_TREE_SCRIPT, 'sh',
+                    str(self.shell_pid),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                killed = await asyncio.wait_for(process.wait(), timeout=10) == 0
+            except (asyncio.TimeoutError, FileNotFoundError) as e:
+                warning_print(f"Could not kill timed out command in {self.container_name}: {e}")
+        if killed:
+            try:
+                await asyncio.wait_for(self._collect(marker), timeout=5)
+                return
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+        await self.close()
+
+    async def execute(self, command, timeout=15):
+        """
+        Run one command in the session.
+
+        The command runs in a subshell, so ``exit`` or ``set -e`` only end the
+        command. On timeout its process tree in the container is killed before
+        TimeoutError is raised.
+
+        Args:
+            command (str or list): Shell string or argument list
+            timeout (int): Timeout in seconds for this command
+
+        Returns:
+            dict: { 'command': str, 'returncode': int, 'stdout': str, 'stderr': str }
+        """
+        if not isinstance(command, str):
+            command = shlex.join(command)
+        marker = f"__NF5G_{uuid.uuid4().hex}__"
+        # Commands never see our stdin, and the markers start on a fresh line
+        script = (
+            f"( {command}\n) </dev/null\n"
+            f"printf '\\n{marker} %s\\n' \"$?\"\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+
+        try:
+            (stdout, status), (stderr, _) = await asyncio.wait_for(self._collect(marker), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._interrupt(marker)
+            raise
+        return {
+            'command': command,
+            'returncode': int(status) if status.lstrip('-').isdigit() else -1,
+            'stdout': stdout[:-1] if stdout.endswith('\n') else stdout,
+            'stderr': stderr[:-1] if stderr.endswith('\n') else stderr
+        }
+
+
+class AsyncDockerEngine:
+    """Runs Docker CLI calls as asyncio subprocesses with cancellation and progress events."""
+
+    def __init__(self, max_concurrency=6, event_callback=None):
+        self.max_concurrency = max_concurrency
+        self.event_callback = event_callback
+        self.loop = None
+        self._main_task = None
+        self._cancelled = False
+
+    # ------------------------------------------------------------------
+    # Docker primitives
+    # ------------------------------------------------------------------
+    async def run_command(self, cmd, timeout=30):
+        """
+        Run a command without blocking the loop.
+
+        Returns:
+            dict: { 'returncode': int, 'stdout': str, 'stderr': str }
+        """
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError as e:
+            return {'returncode': 127, 'stdout': '', 'stderr': str(e)}
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return {'returncode': -1, 'stdout': '', 'stderr': f"Command timed out after {timeout}s: {' '.join(cmd)}"}
+
+        return {
+            'returncode': process.returncode,
+            'stdout': stdout.decode(errors='replace'),
+            'stderr': stderr.decode(errors='replace')
+        }
+
+    async def docker_available(self):
+        """Check if the Docker CLI is available."""
+        result = await self.run_command(['docker', '--version'], timeout=10)
+        return result['returncode'] == 0
+
+    async def is_container_running(self, container_name):
+        """Check if a specific container is currently running."""
+        result = await self.run_command(
+            ['docker', 'ps', '--filter', f'name={container_name}', '--format', '{{.Names}}'], timeout=10)
+        return container_name in result['stdout'].split()
+
+    async def container_exists(self, container_name):
+        """Check if a container exists (running or stopped)."""
+        result = await self.run_command(
+            ['docker', 'ps', '-a', '--filter', f'name={container_name}', '--format', '{{.Names}}'], timeout=10)
+        return container_name in result['stdout'].split()
+
+    async def image_exists(self, image_name):
+        """Check if a Docker image exists locally."""
+        result = await self.run_command(
+            ['docker', 'images', '--format', '{{.Repository}}:{{.Tag}}', image_name], timeout=10)
+        return bool(result['stdout'].strip())
+
+    async def ensure_image_available(self, image_name, timeout=300):
+        """Pull an image if it is not present locally."""
+        if await self.image_exists(image_name):
+            return True, f"Image {image_name} already available"
+        result = await self.run_command(['docker', 'pull', image_name], timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Image {image_name} pulled successfully"
+        return False, f"Failed to pull image {image_name}: {result['stderr']}"
+
+    async def start_container(self, container_name, timeout=30):
+        """Start an existing container."""
+        result = await self.run_command(['docker', 'start', container_name], timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Container {container_name} started successfully"
+        return False, f"Failed to start container {container_name}: {result['stderr']}"
+
+    async def run_container(self, builder, timeout=60):
+        """Run a container described by a DockerContainerBuilder."""
+        result = await self.run_command(builder.build_command(), timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Container {builder.container_name} started successfully"
+        return False, f"Failed to start container: {result['stderr']}"
+
+    async def stop_container(self, container_name, grace_period=10, timeout=30):
+        """
+        Stop and remove a container.
+
+        Args:
+            container_name (str): Name of the container
+            grace_period (int): Seconds Docker waits before killing the container
+            timeout (int): Timeout for each Docker CLI call
+
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        if not await self.container_exists(container_name):
+            return True, f"Container {container_name} does not exist"
+        stop_result = await self.run_command(
+            ['docker', 'stop', '-t', str(grace_period), container_name], timeout=timeout)
+        if stop_result['returncode'] != 0:
+            warning_print(f"docker stop failed for {container_name}, forcing removal: {stop_result['stderr'].strip()}")
+        remove_result = await self.run_command(['docker', 'rm', '-f', container_name], timeout=timeout)
+        if remove_result['returncode'] != 0:
+            return False, f"Failed to remove container: {remove_result['stderr']}"
+        return True, f"Container {container_name} stopped and removed successfully"
+
+    async def remove_volume(self, volume_name, timeout=30):
+        """Remove a Docker volume."""
+        result = await self.run_command(['docker', 'volume', 'rm', volume_name], timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Volume {volume_name} removed successfully"
+        return False, f"Failed to remove volume {volume_name}: {result['stderr']}"
+
+    async def stop_containers(self, container_names, grace_period=10, timeout=30):
+        """
+        Stop and remove several containers concurrently.
+
+        Returns:
+            tuple: (success: bool, message: str) - success only if every container is gone
+        """
+        results = await asyncio.gather(*(self.stop_container(name, grace_period, timeout)
+                                         for name in container_names))
+        failed = [message for success, message in results if not success]
+        if failed:
+            return False, "\n".join(failed)
+        return True, f"{len(results)} container(s) stopped and removed successfully"
+
+    async def volume_exists(self, volume_name):
+        """Check if a Docker volume exists."""
+        result = await self.run_command(
+            ['docker', 'volume', 'ls', '--filter', f'name={volume_name}', '--format', '{{.Name}}'], timeout=10)
+        return volume_name in result['stdout'].split()
+
+    async def network_exists(self, network_name):
+        """Check if a Docker network exists."""
+        result = await self.run_command(
+            ['docker', 'network', 'ls', '--filter', f'name={network_name}', '--format', '{{.Name}}'], timeout=10)
+        return network_name in result['stdout'].split()
+
+    async def create_network(self, network_name, timeout=30):
+        """Create a bridge network."""
+        result = await self.run_command(['docker', 'network', 'create', '--driver', 'bridge', network_name],
+                                        timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Network {network_name} created successfully"
+        return False, f"Failed to create network {network_name}: {result['stderr']}"
+
+    async def build_image(self, image_name, dockerfile_dir, timeout=600):
+        """Build an image from a directory containing a Dockerfile."""
+        result = await self.run_command(['docker', 'build', '-t', image_name, dockerfile_dir], timeout=timeout)
+        if result['returncode'] == 0:
+            return True, f"Image {image_name} built successfully"
+        return False, f"Failed to build image {image_name}: {result['stderr']}"
+
+    async def container_ip(self, container_name):
+        """IP address of a container on its networks, or '' if unknown."""
+        result = await self.run_command(
+            ['docker', 'inspect', '-f', '{{range .NetworkSettings.Networks}}{{.IPAddress}}{{end}}', container_name],
+            timeout=10)
+        return result['stdout'].strip() if result['returncode'] == 0 else ''
+
+    async def container_logs(self, container_name, tail=50):
+        """Last lines of a container's logs (stdout and stderr)."""
+        result = await self.run_command(['docker', 'logs', '--tail', str(tail), container_name], timeout=10)
+        return (result['stdout'] + result['stderr']).strip()
+
+    async def exec_batch(self, container_commands, timeout=15, shell='sh'):
+        """
+        Run many commands in many containers, one exec session per container.
+
+        Containers run in parallel (bounded by max_concurrency); commands within a
+        container run in order over the same session.
+
+        Args:
+            container_commands (dict): container name -> list of commands
+            timeout (int): Timeout in seconds for each command
+
+        Returns:
+            dict: container name -> list of result dicts (see AsyncDockerExecSession.execute)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_container(container_name, commands):
+            results = []
+            async with semaphore:
+                session = None
+                try:
+                    for command in commands:
+                        try:
+                            if session is None or not session.is_open:
+                                session = await AsyncDockerExecSession(container_name, shell).open()
+                            results.append(await session.execute(command, timeout=timeout))
+                        except asyncio.TimeoutError:
+                            # execute() killed the command and kept or closed the session
+                            results.append({'command': str(command), 'returncode': -1, 'stdout': '',
+                                            'stderr': f"Command timed out after {timeout}s"})
+                        except (ConnectionError, FileNotFoundError, BrokenPipeError) as e:
+                            results.append({'command': str(command), 'returncode': 1, 'stdout': '', 'stderr': str(e)})
+                            if session is not None:
+                                await session.close()
+                            session = None
+                    if session is not None:
+                        await session.close()
+                except Exception as e:
+                    # One container must not fail the whole batch
+                    error_print(f"Batched exec in {container_name} failed: {e}")
+                    results.extend({'command': str(command), 'returncode': 1, 'stdout': '', 'stderr': str(e)}
+                                   for command in commands[len(results):])
+            self._emit('exec_batch', container_name, f"{len(results)} command(s) executed")
+            return results
+
+        names = list(container_commands)
+        gathered = await asyncio.gather(*(run_container(name, container_commands[name]) for name in names))
+        return dict(zip(names, gathered))
+
+    async def interface_addresses(self, container_names, interface, timeout=15):
+        """
+        Collect the IPv4 address of an interface in many containers, one exec each.
+
+        Returns:
+            dict: container name -> IPv4 address, or None if the interface has no address
+        """
+        outputs = await self.exec_batch(
+            {name: [['ip', '-f', 'inet', 'addr', 'show', interface]] for name in container_names}, timeout=timeout)
+        addresses = {}
+        for name, results in outputs.items():
+            match = re.search(r'inet ([0-9.]+)', results[0]['stdout']) if results and results[0]['returncode'] == 0 else None
+            addresses[name] = match.group(1) if match else None
+        return addresses
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _emit(self, event_type, operation=None, message='', **extra):
+        event = {'type': event_type, 'operation': operation, 'message': message, 'time': time.time()}
+        event.update(extra)
+        if self.event_callback:
+            try:
+                self.event_callback(event)
+            except Exception as e:
+                error_print(f"Operation event callback failed: {e}")
+
+    async def run_operations(self, operations):
+        """
+        Run operations concurrently, honouring depends_on and the concurrency limit.
+
+        Returns:
+            dict: name -> { 'success': bool, 'message': str, 'elapsed': float, 'status': str }
+        """
+        self.loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        if self._cancelled:
+            self._main_task.cancel()
+
+        by_name = {op.name: op for op in operations}
+        for op in operations:
+            missing = [dep for dep in op.depends_on if dep not in by_name]
+            if missing:
+                raise ValueError(f"Operation '{op.name}' depends on unknown operations: {missing}")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = {}
+        results = {}
+        total = len(operations)
+
+        async def run_one(op):
+            for dep in op.depends_on:
+                await tasks[dep]
+            failed_deps = [dep for dep in op.depends_on if not results[dep]['success']]
+            if failed_deps:
+                message = f"Skipped because {', '.join(failed_deps)} failed"
+                results[op.name] = {'success': False, 'message': message, 'elapsed': 0.0, 'status': 'skipped'}
+                self._emit('skipped', op.name, message)
+                return
+
+            async with semaphore:
+                def report(message, progress=None):
+                    self.loop.call_soon_threadsafe(self._emit, 'status', op.name, message)
+
+                self._emit('started', op.name, f"{op.description}: starting")
+                start = time.monotonic()
+                try:
+                    if asyncio.iscoroutinefunction(op.action):
+                        success, message = await op.action(self, report)
+                    else:
+                        success, message = await self._run_blocking(op.action, report)
+                    status = 'succeeded' if success else 'failed'
+                except asyncio.CancelledError:
+                    success, message, status = False, "Operation canceled.", 'cancelled'
+                except Exception as e:
+                    error_print(f"Operation {op.name} failed: {e}")
+                    success, message, status = False, str(e), 'failed'
+                elapsed = time.monotonic() - start
+
+            results[op.name] = {'success': success, 'message': message, 'elapsed': elapsed, 'status': status}
+            done = len(results)
+            self._emit(status, op.name, message, elapsed=elapsed, progress=int(done * 100 / max(total, 1)))
+            debug_print(f"Operation {op.name} {status} in {elapsed:.1f}s: {message}")
+
+        for op in operations:
+            tasks[op.name] = asyncio.ensure_future(run_one(op))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            for op in operations:
+                results.setdefault(op.name, {'success': False, 'message': "Operation canceled.",
+                                             'elapsed': 0.0, 'status': 'cancelled'})
+            self._emit('cancelled', None, "Operations canceled")
+        return results
+
+    async def _run_blocking(self, action, report):
+        """
+        Run a blocking action on the executor.
+
+        A thread cannot be interrupted, so on cancellation the action is still
+        awaited before CancelledError propagates; nothing outlives the engine loop.
+        """
+        future = self.loop.run_in_executor(None, action, self, report)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    async def run_task(self, action, report=None):
+        """
+        Run one ``async action(engine, report)`` as the cancellable main task.
+
+        Returns:
+            tuple: (success: bool, message: str); ("Operation canceled.") after cancel()
+        """
+        self.loop = asyncio.get_running_loop()
+        self._main_task = asyncio.current_task()
+        report = report or (lambda message, progress=None: None)
+        try:
+            if self._cancelled:
+                raise asyncio.CancelledError()
+            return await action(self, report)
+        except asyncio.CancelledError:
+            return False, "Operation canceled."
+
+    def cancel(self):
+        """Cancel all running operations; safe to call from any thread."""
+        self._cancelled = True
+        if self.loop and self._main_task and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._main_task.cancel)
+
+    def run(self, operations):
+        """Run operations on a private event loop and block until they finish."""
+        return self.run_sync(self.run_operations(operations))
+
+    def run_sync(self, coroutine):
+        """Run a coroutine of this engine on a private event loop and return its result."""
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+
+async def stop_service(engine, report, container_names):
+    """Stop step shared by the service deployment workers: stop and remove the service containers."""
+    report(f"Stopping {', '.join(container_names)}...", 30)
+    return await engine.stop_containers(container_names)
+
+
+class DockerTaskWorker(QThread):
+    """
+    Base for the service deployment workers: runs one engine coroutine off the UI thread.
+
+    Subclasses set ``self.action`` to ``async action(engine, report)``. Cancelling
+    kills the Docker CLI calls in flight instead of waiting for the step to end.
+    """
+
+    progress_updated = pyqtSignal(int)
+    status_updated = pyqtSignal(str)
+    operation_finished = pyqtSignal(bool, str)  # success, message
+
+    def __init__(self, action=None):
+        super().__init__()
+        self.action = action
+        self.engine = AsyncDockerEngine()
+
+    def request_cancel(self):
+        self.engine.cancel()
+
+    def _report(self, message, progress=None):
+        self.status_updated.emit(message)
+        if progress is not None:
+            self.progress_updated.emit(progress)
+
+    def run(self):
+        """Execute the action on a dedicated asyncio loop."""
+        try:
+            success, message = self.engine.run_sync(self.engine.run_task(self.action, self._report))
+        except Exception as e:
+            error_print(f"{type(self).__name__} failed: {e}")
+            success, message = False, str(e)
+        if success:
+            self.progress_updated.emit(100)
+        self.operation_finished.emit(success, message)
+
+
+class DockerOperationsWorker(QThread):
+    """Qt bridge that drives an AsyncDockerEngine from a background thread."""
+
+    progress_updated = pyqtSignal(int)
+    status_updated = pyqtSignal(str)
+    operation_event = pyqtSignal(dict)
+    operation_finished = pyqtSignal(bool, str)  # success, message
+
+    def __init__(self, operations, max_concurrency=6):
+        super().__init__()
+        self.operations = operations
+        self.results = {}
+        self.engine = AsyncDockerEngine(max_concurrency=max_concurrency, event_callback=self._on_event)
+
+    def request_cancel(self):
+        self.engine.cancel()
+
+    def _on_event(self, event):
+        self.operation_event.emit(event)
+        if event.get('message'):
+            label = event['operation'] or 'all'
+            self.status_updated.emit(f"[{label}] {event['message']}")
+        if 'progress' in event:
+            self.progress_updated.emit(event['progress'])
+
+    def run(self):
+        """Execute all operations on a dedicated asyncio loop."""
+        try:
+            self.results = self.engine.run(self.operations)
+            failed = [name for name, result in self.results.items() if not result['success']]
+            if failed:
+                details = "\n".join(f"{name}: {self.results[name]['message']}" for name in failed)
+                self.operation_finished.emit(False, f"{len(failed)} operation(s) did not complete:\n{details}")
+            else:
+                self.operation_finished.emit(True, f"{len(self.results)} operation(s) completed successfully")
+        except Exception as e:
+            error_print(f"Docker operations failed: {e}")
+            self.operation_finished.emit(False, str(e))
@@ -512,7 +512,31 @@ class DockerUtils:
                 'stdout': '',
                 'stderr': str(e)
             }
-        
+
+    @staticmethod
+    def exec_batch(container_commands, timeout=15, max_concurrency=16):
+        """
+        Execute many commands across containers with one exec session per container.
+
+        Args:
+            container_commands (dict): Container name -> list of commands (str or list)
+            timeout (int): Timeout in seconds for each command
+            max_concurrency (int): Maximum number of containers handled in parallel
+
+        Returns:
+            dict: Container name -> list of { 'command', 'returncode', 'stdout', 'stderr' }
+        """
+        from utils.docker_async import AsyncDockerEngine
+        try:
+            engine = AsyncDockerEngine(max_concurrency=max_concurrency)
+            return engine.run_sync(engine.exec_batch(container_commands, timeout=timeout))
+        except Exception as e:
+            error_print(f"Batched exec failed: {e}")
+            return {
+                name: [{'command': str(cmd), 'returncode': 1, 'stdout': '', 'stderr': str(e)} for cmd in commands]
+                for name, commands in container_commands.items()
+            }
+
 
 class DockerContainerBuilder:
     """Helper class for building Docker run commands with consistent patterns."""
@@ -0,0 +1,147 @@
+"""
+Handover timeline for NetFlux5G Editor
+Finds every serving-cell change of moving UEs from their trajectories and the cells' positions and ranges
+"""
+import math
+from utils.power_range_calculator import PowerRangeCalculator
+
+# A UE changes cell only when another cell is this much stronger than its current one
+HYSTERESIS_DB = 3.0
+
+# Samples along a leg are at most this share of the smallest nearby range apart,
+# and each change is then located to within TIME_RESOLUTION seconds
+SAMPLE_SHARE = 0.25
+MIN_SAMPLE_SPACING = 1.0
+TIME_RESOLUTION = 0.05
+
+# Decimals of the schedule times (as in utils.mobility trajectory tables)
+TIME_DIGITS = 2
+
+
+class CellIndex:
+    """
+    Uniform grid over the cells' coverage discs.
+
+    Each cell is filed under every bucket its disc overlaps, so the cells that
+    can serve a leg are found from the buckets under the leg's bounding box
+    instead of by scanning every cell.
+    """
+
+    def __init__(self, cells, bucket_size=None):
+        self.cells = cells
+        if bucket_size is None:
+            ranges = sorted(cell[3] for cell in cells)
+            bucket_size = ranges[len(ranges) // 2] if ranges else 1.0
+        self.bucket_size = max(float(bucket_size), 1.0)
+        self.buckets = {}
+        for index, (_, x, y, cell_range) in enumerate(cells):
+            for key in self._keys(x - cell_range, y - cell_range, x + cell_range, y + cell_range):
+                self.buckets.setdefault(key, []).append(index)
+
+    def _keys(self, x0, y0, x1, y1):
+        size = self.bucket_size
+        for column in range(int(math.floor(x0 / size)), int(math.floor(x1 / size)) + 1):
+            for row in range(int(math.floor(y0 / size)), int(math.floor(y1 / size)) + 1):
+                yield column, row
+
+    def at(self, x, y):
+        """Indices of the cells whose coverage may reach the point (x, y)."""
+        size = self.bucket_size
+        return self.buckets.get((int(math.floor(x / size)), int(math.floor(y / size))), ())
+
+    def candidates(self, x0, y0, x1, y1):
+        """Indices of the cells whose coverage may reach the box (x0, y0)-(x1, y1), in ascending order."""
+        found = set()
+        for key in self._keys(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)):
+            found.update(self.buckets.get(key, ()))
+        return sorted(found)
+
+
+class HandoverTimeline:
+    """
+    Serving cell of each UE over time.
+
+    A cell's signal is 10 n log10(range / distance) dB above the noise
+    threshold (the path-loss model PowerRangeCalculator solves for the range),
+    so a UE is served by the strongest cell reaching it, and keeps its cell
+    until that cell is out of range or another is HYSTERESIS_DB stronger.
+    """
+
+    def __init__(self, cells, hysteresis_db=HYSTERESIS_DB,
+                 path_loss_exponent=PowerRangeCalculator.DEFAULT_PATH_LOSS_EXPONENT):
+        """cells: [(name, x, y, range)], ranges in the same units as the positions."""
+        self.cells = cells
+        self.index = CellIndex(cells)
+        self.hysteresis_db = hysteresis_db
+        self.scale = 10 * path_loss_exponent
+
+    def margin(self, cell, x, y):
+        """Signal of cell index cell above the noise threshold at (x, y), in dB."""
+        _, cx, cy, cell_range = self.cells[cell]
+        return self.scale * math.log10(cell_range / max(math.hypot(x - cx, y - cy), 1.0))
+
+    def decide(self, current, x, y, candidates):
+        """Cell index serving (x, y) for a UE now served by current (None outside every cell)."""
+        best, best_margin = None, 0.0
+        current_margin = -math.inf
+        for cell in candidates:
+            margin = self.margin(cell, x, y)
+            if cell == current:
+                current_margin = margin
+            if margin >= best_margin:
+                best, best_margin = cell, margin
+        if current is not None and current_margin >= 0 and best_margin < current_margin + self.hysteresis_db:
+            return current
+        return best
+
+    def ue_timeline(self, trajectory):
+        """[(t, cell index or None)] for one trajectory, starting with its initial cell at t = 0."""
+        times, xs, ys = trajectory.times, trajectory.xs, trajectory.ys
+        current = self.decide(None, xs[0], ys[0], self.index.candidates(xs[0], ys[0], xs[0], ys[0]))
+        timeline = [(0.0, current)]
+        for leg in range(len(times) - 1):
+            t0, t1 = times[leg], times[leg + 1]
+            x0, y0, x1, y1 = xs[leg], ys[leg], xs[leg + 1], ys[leg + 1]
+            length = math.hypot(x1 - x0, y1 - y0)
+            if length == 0 or t1 <= t0:
+                continue
+            candidates = self.index.candidates(x0, y0, x1, y1)
+            spacing = max(MIN_SAMPLE_SPACING,
+                          SAMPLE_SHARE * min((self.cells[cell][3] for cell in candidates), default=length))
+            samples = max(1, int(math.ceil(length / spacing)))
+
+            def position(t):
+                share = (t - t0) / (t1 - t0)
+                return x0 + (x1 - x0) * share, y0 + (y1 - y0) * share
+
+            previous = t0
+            for sample in range(1, samples + 1):
+                t = t0 + (t1 - t0) * sample / samples
+                cell = self.decide(current, *position(t), candidates)
+                while cell != current:
+                    # Locate the first moment the decision changes, then carry on from there
+                    low, high = previous, t
+                    while high - low > TIME_RESOLUTION:
+                        middle = (low + high) / 2
+                        if self.decide(current, *position(middle), candidates) == current:
+                            low = middle
+                        else:
+                            high = middle
+                    current = self.decide(current, *position(high), candidates)
+                    timeline.append((round(high, TIME_DIGITS), current))
+                    previous = high
+                    cell = self.decide(current, *position(t), candidates)
+                previous = t
+        return timeline
+
+    def schedule(self, trajectories):
+        """
+        [(t, ue, cell index or None)] for all trajectories ({ue: Trajectory}), in time order.
+
+        Every UE has an entry at t = 0 for its initial cell, then one per change.
+        """
+        rows = []
+        for name, trajectory in trajectories.items():
+            rows.extend((t, name, cell) for t, cell in self.ue_timeline(trajectory))
+        rows.sort(key=lambda row: (row[0], row[1]))
+        return rows
@@ -0,0 +1,52 @@
+"""
+Icon cache for NetFlux5G Editor
+Decodes the large component icons once per size and keeps small thumbnails on disk for later launches
+"""
+import os
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+from utils.debug import debug_print
+
+THUMBNAIL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'export', 'cache', 'icons')
+
+_pixmaps = {}
+
+
+def _thumbnail_path(icon_path, width, height):
+    stat = os.stat(icon_path)
+    name = os.path.splitext(os.path.basename(icon_path))[0].replace(' ', '_')
+    return os.path.join(THUMBNAIL_DIR, f"{name}-{width}x{height}-{stat.st_mtime_ns}.png")
+
+
+def scaled_pixmap(icon_path, width, height=None):
+    """
+    Return icon_path scaled to fit width x height (aspect ratio kept).
+
+    The component icons are ~1600px PNGs that take tens of milliseconds each to
+    decode; scaled copies are shared in memory and stored as thumbnails so later
+    launches never decode the originals.
+    """
+    height = height or width
+    key = (icon_path, width, height)
+    pixmap = _pixmaps.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    try:
+        thumbnail = _thumbnail_path(icon_path, width, height)
+    except OSError:
+        return QPixmap()
+    pixmap = QPixmap(thumbnail) if os.path.exists(thumbnail) else QPixmap()
+    if pixmap.isNull():
+        pixmap = QPixmap(icon_path)
+        if pixmap.isNull():
+            return pixmap
+        pixmap = pixmap.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            pixmap.save(thumbnail, 'PNG')
+        except OSError as e:
+            debug_print(f"Could not cache icon thumbnail {thumbnail}: {e}")
+    _pixmaps[key] = pixmap
+    return pixmap
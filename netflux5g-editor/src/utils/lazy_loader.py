@@ -0,0 +1,58 @@
+"""
+Lazy manager loading for NetFlux5G Editor
+Defers importing and building rarely used managers until their first use
+"""
+import importlib
+import time
+from utils.debug import debug_print
+
+
+class LazyManager:
+    """
+    Class attribute that imports and builds a manager on first access.
+
+    The manager class is constructed with the owning window, like the eagerly
+    created managers, and then stored on the instance so later accesses are
+    plain attribute lookups.
+    """
+
+    def __init__(self, module_name, class_name):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        start = time.perf_counter()
+        manager_class = getattr(importlib.import_module(self.module_name), self.class_name)
+        manager = manager_class(instance)
+        instance.__dict__[self.name] = manager
+        debug_print(f"Created {self.class_name} on first use in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return manager
+
+    @staticmethod
+    def is_loaded(instance, name):
+        """True if the lazy attribute name has already been built on instance."""
+        return name in instance.__dict__
+
+    @staticmethod
+    def lazy_names(owner):
+        """Names of all lazy manager attributes declared on owner and its bases."""
+        return [name for klass in owner.__mro__ for name, value in vars(klass).items()
+                if isinstance(value, LazyManager)]
+
+
+def lazy_slot(instance, name, method):
+    """
+    Slot that resolves instance.<name>.<method> only when it is triggered.
+
+    Connecting a bound method would build the manager while wiring the menus;
+    signal arguments (e.g. QAction's checked flag) are dropped.
+    """
+    def slot(*args):
+        return getattr(getattr(instance, name), method)()
+    return slot
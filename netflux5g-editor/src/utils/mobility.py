@@ -0,0 +1,337 @@
+"""
+Mobility scenarios for NetFlux5G Editor
+Turns per-UE waypoints and mobility models into compact piecewise-linear trajectory tables
+"""
+import bisect
+import math
+import random
+import zlib
+from utils.power_range_calculator import PowerRangeCalculator
+
+# 'static' UEs keep their canvas position; the others follow their trajectory
+MODELS = ('static', 'waypoints', 'random_waypoint', 'manhattan')
+
+# UE properties describing its mobility (all optional except UE_Mobility)
+MOBILITY_FIELDS = (
+    'UE_Mobility',          # one of MODELS
+    'UE_Waypoints',         # [[x, y], ...] canvas positions, for 'waypoints'
+    'UE_Speed',             # m/s, a value or a "min-max" range
+    'UE_Pause',             # seconds spent at each waypoint or destination
+    'UE_MobilityLoop',      # 'waypoints': go back to the start and repeat
+    'UE_MobilityArea',      # "x0,y0,x1,y1" for the random models
+    'UE_MobilityBlock',     # Manhattan grid block size in meters
+    'UE_MobilityDuration',  # seconds of trajectory to generate
+)
+
+DEFAULT_DURATION = 300.0
+DEFAULT_SPEED = (1.0, 2.0)  # pedestrian
+DEFAULT_BLOCK = 100.0
+
+# Default area of the random models: the nodes' bounding box grown by this much,
+# and never smaller than one block in either direction
+AREA_MARGIN = 100.0
+
+# Manhattan grid: chance to go straight at an intersection (the rest turn left or right)
+STRAIGHT_CHANCE = 0.5
+
+# Decimals kept in trajectory tables: centimetres for times, decimetres for positions
+TIME_DIGITS = 2
+POSITION_DIGITS = 1
+
+
+class MobilityError(ValueError):
+    """Raised for mobility properties that cannot produce a trajectory."""
+
+
+def parse_speed(value):
+    """(min, max) speed in m/s from a number or a "min-max" string."""
+    if value in (None, ''):
+        return DEFAULT_SPEED
+    try:
+        if isinstance(value, (int, float)):
+            low = high = float(value)
+        else:
+            parts = str(value).replace(' ', '').split('-')
+            low, high = float(parts[0]), float(parts[-1])
+    except (ValueError, IndexError):
+        raise MobilityError(f"Invalid speed {value!r}, expected m/s as 'value' or 'min-max'")
+    if low <= 0 or high < low:
+        raise MobilityError(f"Invalid speed {value!r}, expected 0 < min <= max")
+    return low, high
+
+
+def parse_area(value):
+    """(x0, y0, x1, y1) from "x0,y0,x1,y1" or a sequence, or None when not set."""
+    if value in (None, ''):
+        return None
+    try:
+        parts = value if isinstance(value, (list, tuple)) else str(value).split(',')
+        x0, y0, x1, y1 = (float(part) for part in parts)
+    except (ValueError, TypeError):
+        raise MobilityError(f"Invalid mobility area {value!r}, expected 'x0,y0,x1,y1'")
+    if x1 <= x0 or y1 <= y0:
+        raise MobilityError(f"Invalid mobility area {value!r}, expected x0 < x1 and y0 < y1")
+    return x0, y0, x1, y1
+
+
+def parse_waypoints(value):
+    """[(x, y), ...] from a list of pairs or an "x,y; x,y" string."""
+    if value in (None, ''):
+        return []
+    try:
+        if isinstance(value, str):
+            pairs = [pair.split(',') for pair in value.split(';') if pair.strip()]
+        else:
+            pairs = value
+        return [(float(x), float(y)) for x, y in pairs]
+    except (ValueError, TypeError):
+        raise MobilityError(f"Invalid waypoints {value!r}, expected 'x,y; x,y; ...'")
+
+
+def _number(properties, key, default):
+    value = properties.get(key)
+    if value in (None, ''):
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        raise MobilityError(f"Invalid {key} {value!r}, expected a number")
+
+
+def mobility_model(properties):
+    """The UE's mobility model, 'static' when none is set."""
+    model = properties.get('UE_Mobility') or 'static'
+    if model not in MODELS:
+        raise MobilityError(f"Unknown mobility model {model!r}, expected one of {', '.join(MODELS)}")
+    return model
+
+
+def is_mobile(node):
+    """Whether a node (in .nf5g form) is a UE with a mobility model."""
+    return node.get('type') == 'UE' and (node.get('properties', {}).get('UE_Mobility') or 'static') != 'static'
+
+
+class Trajectory:
+    """Piecewise-linear path: the position at times[i] is (xs[i], ys[i]), held after the last vertex."""
+
+    __slots__ = ('times', 'xs', 'ys')
+
+    def __init__(self, times, xs, ys):
+        self.times = times
+        self.xs = xs
+        self.ys = ys
+
+    @classmethod
+    def from_row(cls, row):
+        """Inverse of row()."""
+        return cls(list(row[0::3]), list(row[1::3]), list(row[2::3]))
+
+    @property
+    def duration(self):
+        return self.times[-1]
+
+    def position(self, t):
+        """(x, y) at time t."""
+        times = self.times
+        index = bisect.bisect_right(times, t) - 1
+        if index < 0:
+            return self.xs[0], self.ys[0]
+        if index >= len(times) - 1:
+            return self.xs[-1], self.ys[-1]
+        span = times[index + 1] - times[index]
+        share = (t - times[index]) / span if span > 0 else 1.0
+        return (self.xs[index] + (self.xs[index + 1] - self.xs[index]) * share,
+                self.ys[index] + (self.ys[index + 1] - self.ys[index]) * share)
+
+    def row(self):
+        """Flat (t0, x0, y0, t1, x1, y1, ...) tuple, rounded for compact tables."""
+        row = []
+        for t, x, y in zip(self.times, self.xs, self.ys):
+            row += [round(t, TIME_DIGITS), round(x, POSITION_DIGITS), round(y, POSITION_DIGITS)]
+        return tuple(row)
+
+
+class _TrajectoryBuilder:
+    """Appends legs and pauses to a trajectory until the scenario duration is reached."""
+
+    def __init__(self, x, y, duration):
+        self.times, self.xs, self.ys = [0.0], [x], [y]
+        self.duration = duration
+
+    @property
+    def done(self):
+        return self.times[-1] >= self.duration
+
+    @property
+    def position(self):
+        return self.xs[-1], self.ys[-1]
+
+    def move(self, x, y, speed):
+        x0, y0 = self.position
+        distance = math.hypot(x - x0, y - y0)
+        if distance == 0:
+            return
+        t0 = self.times[-1]
+        t1 = t0 + distance / speed
+        if t1 > self.duration:
+            # Stop part-way along the leg at the end of the scenario
+            share = (self.duration - t0) / (t1 - t0)
+            x, y, t1 = x0 + (x - x0) * share, y0 + (y - y0) * share, self.duration
+        self._append(t1, x, y)
+
+    def pause(self, seconds):
+        if seconds > 0:
+            x, y = self.position
+            self._append(min(self.times[-1] + seconds, self.duration), x, y)
+
+    def _append(self, t, x, y):
+        self.times.append(t)
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def trajectory(self):
+        return Trajectory(self.times, self.xs, self.ys)
+
+
+class MobilityScenario:
+    """
+    Trajectories of the mobile UEs of a topology.
+
+    Every UE has its own random generator seeded from its name and the
+    scenario seed, so a topology always exports the same trajectories and
+    editing one UE does not change the others.
+    """
+
+    def __init__(self, nodes, seed=0):
+        self.nodes = nodes
+        self.seed = seed
+        self.default_area = self._default_area(nodes)
+
+    @staticmethod
+    def _default_area(nodes):
+        if not nodes:
+            return (0.0, 0.0, DEFAULT_BLOCK, DEFAULT_BLOCK)
+        xs = [node.get('x', 0) for node in nodes]
+        ys = [node.get('y', 0) for node in nodes]
+        x0, x1 = min(xs) - AREA_MARGIN, max(xs) + AREA_MARGIN
+        y0, y1 = min(ys) - AREA_MARGIN, max(ys) + AREA_MARGIN
+        return (x0, y0, max(x1, x0 + DEFAULT_BLOCK), max(y1, y0 + DEFAULT_BLOCK))
+
+    def _random(self, node):
+        return random.Random(zlib.crc32(f"{self.seed}:{node['name']}".encode()))
+
+    def trajectory(self, node):
+        """Trajectory of one node, or None if it does not move."""
+        properties = node.get('properties', {})
+        if node.get('type') != 'UE':
+            return None
+        model = mobility_model(properties)
+        if model == 'static':
+            return None
+
+        builder = _TrajectoryBuilder(float(node.get('x', 0)), float(node.get('y', 0)),
+                                     _number(properties, 'UE_MobilityDuration', DEFAULT_DURATION))
+        speed = parse_speed(properties.get('UE_Speed'))
+        pause = _number(properties, 'UE_Pause', 0.0)
+        rng = self._random(node)
+
+        if model == 'waypoints':
+            self._waypoints(builder, rng, parse_waypoints(properties.get('UE_Waypoints')), speed, pause,
+                            bool(properties.get('UE_MobilityLoop')))
+        else:
+            area = parse_area(properties.get('UE_MobilityArea')) or self.default_area
+            if model == 'random_waypoint':
+                self._random_waypoint(builder, rng, area, speed, pause)
+            else:
+                self._manhattan(builder, rng, area, speed, pause,
+                                _number(properties, 'UE_MobilityBlock', DEFAULT_BLOCK))
+
+        if len(builder.times) < 2:
+            return None
+        return builder.trajectory()
+
+    def trajectories(self):
+        """{node name: Trajectory} for every mobile UE."""
+        result = {}
+        for node in self.nodes:
+            if is_mobile(node):
+                trajectory = self.trajectory(node)
+                if trajectory is not None:
+                    result[node['name']] = trajectory
+        return result
+
+    @staticmethod
+    def _waypoints(builder, rng, waypoints, speed, pause, loop):
+        if not waypoints:
+            return
+        route = list(waypoints)
+        if loop:
+            route.append(builder.position)
+        while not builder.done:
+            for x, y in route:
+                builder.move(x, y, rng.uniform(*speed))
+                builder.pause(pause)
+                if builder.done:
+                    return
+            if not loop:
+                return
+
+    @staticmethod
+    def _random_waypoint(builder, rng, area, speed, pause):
+        x0, y0, x1, y1 = area
+        while not builder.done:
+            builder.move(rng.uniform(x0, x1), rng.uniform(y0, y1), rng.uniform(*speed))
+            builder.pause(pause)
+
+    @staticmethod
+    def _manhattan(builder, rng, area, speed, pause, block):
+        """Walk the streets of a grid with block-sized blocks, turning at random intersections."""
+        if block <= 0:
+            raise MobilityError(f"Invalid UE_MobilityBlock {block}, expected a positive size")
+        x0, y0, x1, y1 = area
+        columns = max(1, int((x1 - x0) // block))
+        rows = max(1, int((y1 - y0) // block))
+
+        # Start at the intersection closest to the UE
+        x, y = builder.position
+        column = min(max(round((x - x0) / block), 0), columns)
+        row = min(max(round((y - y0) / block), 0), rows)
+        builder.move(x0 + column * block, y0 + row * block, rng.uniform(*speed))
+
+        directions = ((1, 0), (0, 1), (-1, 0), (0, -1))
+        heading = rng.randrange(4)
+        while not builder.done:
+            choice = rng.random()
+            if choice >= STRAIGHT_CHANCE:
+                heading = (heading + (1 if choice < (1 + STRAIGHT_CHANCE) / 2 else 3)) % 4
+            # Turn back into the grid at its edges
+            for turn in (0, 1, 3, 2):
+                dx, dy = directions[(heading + turn) % 4]
+                if 0 <= column + dx <= columns and 0 <= row + dy <= rows:
+                    heading = (heading + turn) % 4
+                    break
+            dx, dy = directions[heading]
+            column, row = column + dx, row + dy
+            builder.move(x0 + column * block, y0 + row * block, rng.uniform(*speed))
+            if pause and rng.random() < 0.1:
+                builder.pause(pause)
+
+
+def build_trajectories(nodes, seed=0):
+    """{node name: Trajectory} for the mobile UEs among nodes."""
+    return MobilityScenario(nodes, seed).trajectories()
+
+
+def trajectory_table(trajectories):
+    """{name: flat row} of trajectories, the form exported scripts replay."""
+    return {name: trajectory.row() for name, trajectory in trajectories.items()}
+
+
+def wireless_cells(nodes):
+    """[(name, x, y, range)] of the APs and gNBs among nodes, with ranges from their power."""
+    cells = [node for node in nodes if node.get('type') in ('AP', 'GNB')]
+    ranges = PowerRangeCalculator.get_component_ranges(
+        [(node['type'], node.get('properties', {})) for node in cells])
+    return [(node['name'], float(node.get('x') or 0), float(node.get('y') or 0), float(cell_range))
+            for node, cell_range in zip(cells, ranges)]
+
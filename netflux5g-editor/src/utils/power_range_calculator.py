@@ -5,7 +5,15 @@ following the same methodology as Mininet-WiFi propagation models.
 """
 
 import math
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
 
 class PowerRangeCalculator:
     """
@@ -23,6 +31,7 @@ class PowerRangeCalculator:
     DEFAULT_PATH_LOSS_EXPONENT = 3  # Log-distance model exponent
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_range_from_power(
         txpower: float,
         frequency: float = DEFAULT_FREQUENCY,
@@ -46,6 +55,8 @@ class PowerRangeCalculator:
             
         Returns:
             Range in meters
+            
+        Results are cached, since components recompute their range on every repaint.
         """
         
         if model == "friis":
@@ -66,6 +77,164 @@ class PowerRangeCalculator:
                 txpower, frequency, antenna_gain, noise_threshold, system_loss, path_loss_exponent
             )
     
+    @staticmethod
+    def _path_loss_exponents(model, path_loss_exponent):
+        """Exponent of the log-distance form of each model (Friis is exponent 2, two-ray ground 3.5)."""
+        if isinstance(model, str):
+            if model == "friis":
+                return 2.0
+            if model == "twoRayGround":
+                return 3.5
+            return path_loss_exponent
+        model = np.asarray(model)
+        return np.where(model == "friis", 2.0,
+                        np.where(model == "twoRayGround", 3.5, path_loss_exponent))
+    
+    @staticmethod
+    def _reference_path_loss(frequency, system_loss):
+        """Friis path loss (dB) at the 1 m reference distance."""
+        wavelength = SPEED_OF_LIGHT / (np.asarray(frequency, dtype=float) * 1e9)
+        return 10 * np.log10((4 * math.pi) ** 2 * np.asarray(system_loss, dtype=float) / wavelength ** 2)
+    
+    @staticmethod
+    def calculate_ranges(
+        txpower,
+        frequency=DEFAULT_FREQUENCY,
+        antenna_gain=DEFAULT_ANTENNA_GAIN,
+        noise_threshold=DEFAULT_NOISE_THRESHOLD,
+        system_loss=DEFAULT_SYSTEM_LOSS,
+        path_loss_exponent=DEFAULT_PATH_LOSS_EXPONENT,
+        model="logDistance"
+    ):
+        """
+        Batch version of calculate_range_from_power.
+        
+        Every argument may be a scalar or an array (model an array of model
+        names); they broadcast against each other and the ranges are computed
+        in one vectorized expression. All three models are the log-distance
+        equation with a model-specific exponent, so the result matches the
+        scalar calculation element for element.
+        
+        Returns:
+            Array of ranges in meters, or a list when numpy is not installed
+        """
+        if np is None:
+            return PowerRangeCalculator._scalar_batch(
+                PowerRangeCalculator.calculate_range_from_power,
+                txpower, frequency, antenna_gain, noise_threshold, system_loss, path_loss_exponent, model)
+        
+        exponent = PowerRangeCalculator._path_loss_exponents(model, path_loss_exponent)
+        margin = (np.asarray(txpower, dtype=float) + np.asarray(antenna_gain, dtype=float) * 2
+                  - noise_threshold - PowerRangeCalculator._reference_path_loss(frequency, system_loss))
+        return np.maximum(0.1, 10 ** (margin / (10 * np.asarray(exponent, dtype=float))))
+    
+    @staticmethod
+    def calculate_power_for_range(
+        range_meters: float,
+        frequency: float = DEFAULT_FREQUENCY,
+        antenna_gain: float = DEFAULT_ANTENNA_GAIN,
+        noise_threshold: float = DEFAULT_NOISE_THRESHOLD,
+        system_loss: float = DEFAULT_SYSTEM_LOSS,
+        path_loss_exponent: float = DEFAULT_PATH_LOSS_EXPONENT,
+        model: str = "logDistance"
+    ) -> float:
+        """
+        Transmission power (dBm) that gives the requested range; the inverse of calculate_range_from_power.
+        
+        Args:
+            range_meters: Target range in meters
+            (the other arguments are those of calculate_range_from_power)
+            
+        Returns:
+            Transmission power in dBm
+        """
+        exponent = PowerRangeCalculator._path_loss_exponents(model, path_loss_exponent)
+        wavelength = SPEED_OF_LIGHT / (frequency * 1e9)
+        pl_ref = 10 * math.log10((4 * math.pi) ** 2 * system_loss / wavelength ** 2)
+        return (noise_threshold + pl_ref + 10 * exponent * math.log10(max(0.1, range_meters))
+                - antenna_gain * 2)
+    
+    @staticmethod
+    def calculate_powers_for_ranges(
+        range_meters,
+        frequency=DEFAULT_FREQUENCY,
+        antenna_gain=DEFAULT_ANTENNA_GAIN,
+        noise_threshold=DEFAULT_NOISE_THRESHOLD,
+        system_loss=DEFAULT_SYSTEM_LOSS,
+        path_loss_exponent=DEFAULT_PATH_LOSS_EXPONENT,
+        model="logDistance"
+    ):
+        """
+        Batch version of calculate_power_for_range, broadcasting like calculate_ranges.
+        
+        Returns:
+            Array of transmission powers in dBm, or a list when numpy is not installed
+        """
+        if np is None:
+            return PowerRangeCalculator._scalar_batch(
+                PowerRangeCalculator.calculate_power_for_range,
+                range_meters, frequency, antenna_gain, noise_threshold, system_loss, path_loss_exponent, model)
+        
+        exponent = PowerRangeCalculator._path_loss_exponents(model, path_loss_exponent)
+        distance = np.maximum(0.1, np.asarray(range_meters, dtype=float))
+        return (noise_threshold + PowerRangeCalculator._reference_path_loss(frequency, system_loss)
+                + 10 * np.asarray(exponent, dtype=float) * np.log10(distance)
+                - np.asarray(antenna_gain, dtype=float) * 2)
+    
+    @staticmethod
+    def calculate_received_power(
+        distance,
+        txpower,
+        frequency=DEFAULT_FREQUENCY,
+        antenna_gain=DEFAULT_ANTENNA_GAIN,
+        system_loss=DEFAULT_SYSTEM_LOSS,
+        path_loss_exponent=DEFAULT_PATH_LOSS_EXPONENT,
+        model="logDistance"
+    ):
+        """
+        Received power (dBm) at distance (m) from a transmitter; needs numpy.
+        
+        These are the path-loss equations calculate_ranges solves for the range,
+        so the noise-threshold contour of the received power is the range.
+        Distances below the 1 m reference are clamped to it.
+        """
+        exponent = PowerRangeCalculator._path_loss_exponents(model, path_loss_exponent)
+        distance = np.maximum(distance, 1.0)
+        path_loss = (PowerRangeCalculator._reference_path_loss(frequency, system_loss)
+                     + 10 * np.asarray(exponent, dtype=float) * np.log10(distance))
+        return txpower + np.asarray(antenna_gain, dtype=float) * 2 - path_loss
+    
+    @staticmethod
+    def _scalar_batch(function, first, *arguments):
+        """Apply a scalar calculation element-wise; the fallback of the batch API without numpy."""
+        columns = [list(value) if isinstance(value, (list, tuple)) else None for value in (first,) + arguments]
+        lengths = {len(column) for column in columns if column is not None}
+        if len(lengths) > 1:
+            raise ValueError("Batch arguments must have the same length")
+        count = lengths.pop() if lengths else 1
+        rows = zip(*[column if column is not None else [value] * count
+                     for column, value in zip(columns, (first,) + arguments)])
+        return [function(*row) for row in rows]
+    
+    @staticmethod
+    def get_component_ranges(components: Iterable[Tuple[str, Dict[str, Any]]]):
+        """
+        Ranges of many components at once.
+        
+        Args:
+            components: (component_type, properties) pairs
+            
+        Returns:
+            Array of ranges in meters, in the order of components
+            (a list when numpy is not installed)
+        """
+        txpowers = []
+        frequencies = []
+        for component_type, properties in components:
+            txpowers.append(PowerRangeCalculator.get_component_txpower(component_type, properties))
+            frequencies.append(PowerRangeCalculator.get_component_frequency(component_type, properties))
+        return PowerRangeCalculator.calculate_ranges(txpowers, frequencies)
+    
     @staticmethod
     def get_component_range(component_type: str, properties: Dict[str, Any]) -> float:
         """
@@ -80,10 +249,33 @@ class PowerRangeCalculator:
         """
         
         # Get power value from properties
-        power_fields = PowerRangeCalculator._get_power_fields(component_type)
+        txpower = PowerRangeCalculator.get_component_txpower(component_type, properties)
+        
+        # Get frequency for the component
+        frequency = PowerRangeCalculator.get_component_frequency(component_type, properties)
+        
+        # Calculate range based on power
+        return PowerRangeCalculator.calculate_range_from_power(
+            txpower=txpower,
+            frequency=frequency,
+            model="logDistance"  # Use log-distance as default (matches Mininet-WiFi)
+        )
+    
+    @staticmethod
+    def get_component_txpower(component_type: str, properties: Dict[str, Any]) -> float:
+        """
+        Get the transmission power (dBm) configured for a component, or its type's default.
+        
+        Args:
+            component_type: Type of component ('AP', 'GNB', 'UE', 'STA')
+            properties: Component properties dictionary
+            
+        Returns:
+            Transmission power in dBm
+        """
         txpower = None
         
-        for field in power_fields:
+        for field in PowerRangeCalculator._get_power_fields(component_type):
             if properties.get(field):
                 try:
                     txpower = float(str(properties[field]).strip())
@@ -95,16 +287,7 @@ class PowerRangeCalculator:
         # Use default power if not specified
         if txpower is None:
             txpower = PowerRangeCalculator._get_default_power(component_type)
-        
-        # Get frequency for the component
-        frequency = PowerRangeCalculator._get_component_frequency(component_type, properties)
-        
-        # Calculate range based on power
-        return PowerRangeCalculator.calculate_range_from_power(
-            txpower=txpower,
-            frequency=frequency,
-            model="logDistance"  # Use log-distance as default (matches Mininet-WiFi)
-        )
+        return txpower
     
     @staticmethod
     def _get_power_fields(component_type: str) -> list:
@@ -132,8 +315,8 @@ class PowerRangeCalculator:
         return defaults.get(component_type, 20.0)
     
     @staticmethod
-    def _get_component_frequency(component_type: str, properties: Dict[str, Any]) -> float:
-        """Get operating frequency for a component type."""
+    def get_component_frequency(component_type: str, properties: Dict[str, Any]) -> float:
+        """Get operating frequency (GHz) for a component type."""
         
         # Check if frequency is explicitly set in properties
         freq_fields = []
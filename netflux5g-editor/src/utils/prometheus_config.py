@@ -0,0 +1,167 @@
+"""
+Prometheus configuration generator for NetFlux5G Editor
+Builds scrape and probe targets from the topology and hot-reloads the running Prometheus
+"""
+import os
+import urllib.request
+import urllib.error
+import yaml
+from utils.debug import debug_print, error_print, warning_print
+
+PROMETHEUS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'automation', 'monitoring', 'prometheus')
+TEMPLATE_PATH = os.path.join(PROMETHEUS_DIR, 'prometheus.yml')
+GENERATED_PATH = os.path.join(PROMETHEUS_DIR, 'prometheus.generated.yml')
+RELOAD_URL = 'http://localhost:9090/-/reload'
+
+# Open5GS NFs that expose a Prometheus endpoint (metrics.server in their YAML)
+OPEN5GS_METRICS_NFS = ('AMF', 'SMF', 'UPF', 'PCF')
+OPEN5GS_METRICS_PORT = 9090
+
+CORE_NF_TYPES = ('AMF', 'SMF', 'UPF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR')
+
+
+def _container(name):
+    """Containernet prefixes every Docker node with 'mn.'."""
+    return f"mn.{name}"
+
+
+def collect_topology_targets(categorized_nodes, sanitize):
+    """
+    Collect container names per role from categorized nodes.
+
+    Args:
+        categorized_nodes (dict): Output of MininetExporter.categorize_nodes
+        sanitize (callable): Name sanitizer used by the exporter for node names
+
+    Returns:
+        dict: { 'core': {NF: [container, ...]}, 'gnbs': [...], 'ues': [...] }
+    """
+    core = {}
+    components = categorized_nodes.get('core5g_components', {})
+    for nf_type in CORE_NF_TYPES:
+        names = [_container(sanitize(comp.get('name', f'{nf_type.lower()}{i + 1}')))
+                 for i, comp in enumerate(components.get(nf_type, []))]
+        if names:
+            core[nf_type] = names
+    return {
+        'core': core,
+        'gnbs': [_container(sanitize(gnb['name'])) for gnb in categorized_nodes.get('gnbs', [])],
+        'ues': [_container(sanitize(ue['name'])) for ue in categorized_nodes.get('ues', [])]
+    }
+
+
+def build_prometheus_config(targets, template_path=TEMPLATE_PATH):
+    """
+    Build a Prometheus config from the template with topology-derived targets.
+
+    The ICMP probe job keeps the template's non-topology targets (infrastructure
+    services, external hosts) and gets one labelled group per NF type, gNBs and UEs.
+    The 5G core metrics job only lists NFs with an Open5GS metrics endpoint.
+    """
+    with open(template_path, 'r') as f:
+        config = yaml.safe_load(f)
+
+    probe_groups = []
+    for nf_type, containers in targets['core'].items():
+        probe_groups.append({'targets': containers, 'labels': {'role': 'core', 'nf': nf_type.lower()}})
+    if targets['gnbs']:
+        probe_groups.append({'targets': targets['gnbs'], 'labels': {'role': 'gnb'}})
+    if targets['ues']:
+        probe_groups.append({'targets': targets['ues'], 'labels': {'role': 'ue'}})
+
+    metrics_groups = [
+        {'targets': [f"{container}:{OPEN5GS_METRICS_PORT}" for container in containers],
+         'labels': {'role': 'core', 'nf': nf_type.lower()}}
+        for nf_type, containers in targets['core'].items() if nf_type in OPEN5GS_METRICS_NFS
+    ]
+
+    scrape_configs = []
+    for job in config.get('scrape_configs', []):
+        name = job.get('job_name')
+        if name == 'icmp-probe':
+            static_targets = []
+            for group in job.get('static_configs', []):
+                static_targets.extend(t for t in group.get('targets', []) if not str(t).startswith('mn.'))
+            job['static_configs'] = probe_groups + ([{'targets': static_targets, 'labels': {'role': 'infrastructure'}}]
+                                                    if static_targets else [])
+        elif name == '5g-core-containers':
+            if not metrics_groups:
+                continue
+            job['static_configs'] = metrics_groups
+        elif name == 'ueransim-containers':
+            # UERANSIM exposes no metrics endpoint; gNBs and UEs are covered by the ICMP probe
+            continue
+        scrape_configs.append(job)
+    config['scrape_configs'] = scrape_configs
+    return config
+
+
+def write_prometheus_config(config, path=GENERATED_PATH):
+    """
+    Write the config in place.
+
+    The file is truncated rather than replaced so the inode bind-mounted into the
+    Prometheus container stays the same and a reload picks up the new content.
+    """
+    content = ("# Generated by NetFlux5G Editor from the current topology - do not edit\n" +
+               yaml.safe_dump(config, default_flow_style=False, sort_keys=False))
+    with open(path, 'a+') as f:
+        f.seek(0)
+        f.truncate()
+        f.write(content)
+    debug_print(f"Prometheus config written to {path}")
+    return path
+
+
+def prometheus_config_path():
+    """Path to mount as /etc/prometheus/prometheus.yml (generated config if present)."""
+    return GENERATED_PATH if os.path.exists(GENERATED_PATH) else TEMPLATE_PATH
+
+
+def reload_prometheus(url=RELOAD_URL, timeout=5):
+    """
+    Ask Prometheus to reload its configuration (requires --web.enable-lifecycle).
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    try:
+        request = urllib.request.Request(url, data=b'', method='POST')
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.status == 200:
+                return True, "Prometheus configuration reloaded"
+            return False, f"Prometheus reload returned HTTP {response.status}"
+    except urllib.error.HTTPError as e:
+        return False, f"Prometheus reload failed: HTTP {e.code} {e.read().decode(errors='replace').strip()}"
+    except (urllib.error.URLError, OSError) as e:
+        return False, f"Prometheus not reachable for reload: {e}"
+
+
+def update_prometheus_targets(nodes, exporter, reload=True):
+    """
+    Regenerate the Prometheus config for the given topology nodes and optionally hot-reload it.
+
+    Args:
+        nodes (list): Topology nodes from extractTopology()
+        exporter: MininetExporter used for node categorization and name sanitizing
+        reload (bool): POST /-/reload to the running Prometheus afterwards
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    try:
+        categorized = exporter.categorize_nodes(nodes)
+        targets = collect_topology_targets(categorized, exporter.sanitize_variable_name)
+        write_prometheus_config(build_prometheus_config(targets))
+        count = sum(len(c) for c in targets['core'].values()) + len(targets['gnbs']) + len(targets['ues'])
+        message = f"Prometheus targets generated for {count} topology containers"
+        if reload:
+            reloaded, reload_message = reload_prometheus()
+            if not reloaded:
+                warning_print(reload_message)
+            message = f"{message}; {reload_message}"
+        return True, message
+    except Exception as e:
+        error_print(f"Failed to generate Prometheus config: {e}")
+        return False, str(e)
@@ -0,0 +1,117 @@
+"""
+Teardown engine for NetFlux5G Editor
+Stops Mininet and NetFlux5G containers concurrently with short graceful timeouts and per-resource timing
+"""
+import subprocess
+from utils.debug import debug_print, error_print, warning_print
+from utils.docker_async import AsyncDockerEngine, DockerOperation
+
+# All service containers managed by the editor
+NETFLUX5G_SERVICE_CONTAINERS = [
+    "netflux5g-ryu-controller",
+    "netflux5g-onos-controller",
+    "netflux5g-mongodb",
+    "netflux5g-webui",
+    "netflux5g-cadvisor",
+    "netflux5g-grafana",
+    "netflux5g-prometheus",
+    "netflux5g-node-exporter",
+    "netflux5g-blackbox-exporter",
+    "netflux5g-alertmanager",
+    "netflux5g-webshark"
+]
+
+
+def _terminate_process(process, grace_period):
+    """Terminate a subprocess.Popen, killing it after grace_period seconds."""
+    if process is None or process.poll() is not None:
+        return True, "Mininet process not running"
+    try:
+        process.terminate()
+        process.wait(timeout=grace_period)
+        return True, "Mininet process terminated gracefully"
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait(timeout=5)
+        return True, f"Mininet process killed after {grace_period}s grace period"
+
+
+def build_topology_teardown_operations(mininet_process=None, grace_period=5, cleanup_timeout=30):
+    """
+    Build the Mininet teardown operations.
+
+    'mn -c' and the removal of leftover mn.* containers both start as soon as the
+    Mininet process is gone and run concurrently.
+    """
+    async def stop_process(engine, report):
+        return await engine.loop.run_in_executor(None, _terminate_process, mininet_process, grace_period)
+
+    async def mininet_cleanup(engine, report):
+        report("Executing 'sudo mn -c' to clean Mininet...")
+        result = await engine.run_command(["sudo", "mn", "-c"], timeout=cleanup_timeout)
+        # Optional leftovers; failures here are normal
+        await engine.run_command(["sudo", "ovs-vsctl", "--if-exists", "del-br", "ovs-br"], timeout=10)
+        await engine.run_command(["sudo", "ip", "netns", "del", "mn-ns"], timeout=10)
+        if result['returncode'] == 0:
+            return True, "Mininet cleanup completed successfully"
+        warning_print(f"Mininet cleanup warning: {result['stderr']}")
+        return True, "Mininet cleanup completed with warnings"
+
+    async def remove_topology_containers(engine, report):
+        listed = await engine.run_command(
+            ['docker', 'ps', '-a', '--filter', 'name=^mn\\.', '--format', '{{.Names}}'], timeout=10)
+        names = listed['stdout'].split()
+        if not names:
+            return True, "No topology containers left"
+        report(f"Removing {len(names)} topology container(s)...")
+        result = await engine.run_command(['docker', 'rm', '-f'] + names, timeout=cleanup_timeout)
+        if result['returncode'] == 0:
+            return True, f"Removed {len(names)} topology container(s)"
+        return False, f"Failed to remove topology containers: {result['stderr']}"
+
+    return [
+        DockerOperation('mininet_process', stop_process, description="Mininet process"),
+        DockerOperation('mininet_cleanup', mininet_cleanup, depends_on=['mininet_process'],
+                        description="Mininet cleanup"),
+        DockerOperation('topology_containers', remove_topology_containers, depends_on=['mininet_process'],
+                        description="Topology containers"),
+    ]
+
+
+def build_container_teardown_operations(container_names=None, grace_period=3, timeout=20):
+    """Build one independent stop-and-remove operation per service container."""
+    operations = []
+    for container_name in (container_names or NETFLUX5G_SERVICE_CONTAINERS):
+        async def stop(engine, report, name=container_name):
+            return await engine.stop_container(name, grace_period=grace_period, timeout=timeout)
+        operations.append(DockerOperation(container_name, stop, description=container_name))
+    return operations
+
+
+def build_teardown_operations(mininet_process=None, container_names=None, grace_period=3):
+    """Build the full Stop All teardown: Mininet cleanup alongside container removal."""
+    return (build_topology_teardown_operations(mininet_process) +
+            build_container_teardown_operations(container_names, grace_period=grace_period))
+
+
+def run_teardown(operations, max_concurrency=12, event_callback=None):
+    """
+    Run teardown operations and block until they finish.
+
+    Returns:
+        dict: resource name -> { 'success', 'message', 'elapsed', 'status' }
+    """
+    engine = AsyncDockerEngine(max_concurrency=max_concurrency, event_callback=event_callback)
+    results = engine.run(operations)
+    log_teardown_timing(results)
+    return results
+
+
+def log_teardown_timing(results):
+    """Print per-resource teardown timing, slowest first."""
+    for name, result in sorted(results.items(), key=lambda item: item[1]['elapsed'], reverse=True):
+        line = f"Teardown {name}: {result['status']} in {result['elapsed']:.2f}s - {result['message']}"
+        if result['success']:
+            debug_print(line)
+        else:
+            error_print(line)
@@ -9,8 +9,12 @@ This ensures templates work correctly regardless of where the application is ins
 import os
 import json
 import glob
+import threading
 from utils.debug import debug_print, error_print, warning_print
 
+# Records which templates were already checked against the current config path
+STAMP_NAME = ".template-paths.json"
+
 class TemplateUpdater:
     """Updates template files to use correct config paths for the current installation."""
     
@@ -19,11 +23,86 @@ class TemplateUpdater:
         # Get the base directory of the NetFlux5G installation
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.config_base_path = os.path.join(self.base_dir, "export", "5g-configs")
-        
-    def update_all_templates(self):
-        """Update all template files in the examples directory."""
+        self.examples_dir = os.path.join(self.base_dir, "examples")
+        self.stamp_path = os.path.join(self.examples_dir, STAMP_NAME)
+        # Serializes the background pass with templates being opened
+        self._lock = threading.RLock()
+        self._stamp = None
+        self.background_thread = None
+
+    def _load_stamp(self):
+        if self._stamp is None:
+            try:
+                with open(self.stamp_path, 'r', encoding='utf-8') as f:
+                    stamp = json.load(f)
+            except (OSError, ValueError):
+                stamp = {}
+            if stamp.get('config_base_path') != self.config_base_path:
+                # Installation moved: every template needs checking again
+                stamp = {'config_base_path': self.config_base_path, 'files': {}}
+            self._stamp = stamp
+        return self._stamp
+
+    def _save_stamp(self):
         try:
-            examples_dir = os.path.join(self.base_dir, "examples")
+            tmp_path = f"{self.stamp_path}.tmp-{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._stamp, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.stamp_path)
+        except OSError as e:
+            debug_print(f"Could not save template stamp: {e}")
+
+    @staticmethod
+    def _file_signature(template_file):
+        stat = os.stat(template_file)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def is_template_current(self, template_file):
+        """True if template_file was already checked and has not changed since."""
+        try:
+            signature = self._file_signature(template_file)
+        except OSError:
+            return False
+        return self._load_stamp()['files'].get(os.path.basename(template_file)) == signature
+
+    def ensure_template(self, template_file):
+        """
+        Fix the config paths of one template before it is opened (first use).
+
+        Files outside the examples directory and templates already checked for
+        this installation are left alone without being parsed.
+        """
+        if os.path.dirname(os.path.abspath(template_file)) != self.examples_dir:
+            return False
+        with self._lock:
+            if self.is_template_current(template_file):
+                return False
+            updated = self.update_template_file(template_file)
+            self._record_checked([template_file])
+            return updated
+
+    def _record_checked(self, template_files):
+        stamp = self._load_stamp()
+        for template_file in template_files:
+            try:
+                stamp['files'][os.path.basename(template_file)] = self._file_signature(template_file)
+            except OSError:
+                continue
+        self._save_stamp()
+
+    def update_in_background(self):
+        """Run update_all_templates on a daemon thread so it never delays startup."""
+        if self.background_thread and self.background_thread.is_alive():
+            return self.background_thread
+        self.background_thread = threading.Thread(target=self.update_all_templates,
+                                                  name="template-updater", daemon=True)
+        self.background_thread.start()
+        return self.background_thread
+
+    def update_all_templates(self, force=False):
+        """Update all template files in the examples directory (only those changed since the last pass unless force)."""
+        try:
+            examples_dir = self.examples_dir
             
             if not os.path.exists(examples_dir):
                 warning_print(f"Examples directory not found: {examples_dir}")
@@ -37,11 +116,19 @@ class TemplateUpdater:
                 return False
             
             updated_count = 0
-            for template_file in template_files:
-                if self.update_template_file(template_file):
-                    updated_count += 1
+            with self._lock:
+                if force:
+                    self._stamp = None
+                    self._load_stamp()['files'] = {}
+                pending = [path for path in template_files if not self.is_template_current(path)]
+                for template_file in pending:
+                    if self.update_template_file(template_file):
+                        updated_count += 1
+                if pending:
+                    self._record_checked(pending)
                     
-            debug_print(f"Updated {updated_count} template files with correct config paths")
+            debug_print(f"Updated {updated_count} template files with correct config paths "
+                        f"({len(template_files) - len(pending)} unchanged since last check)")
             return True
             
         except Exception as e:
@@ -69,8 +156,11 @@ class TemplateUpdater:
             
             # Save the file if changes were made
             if changes_made:
-                with open(template_file, 'w', encoding='utf-8') as f:
+                # Write atomically: a template may be opened while the background pass runs
+                tmp_path = f"{template_file}.tmp-{os.getpid()}"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
                     json.dump(template_data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, template_file)
                 debug_print(f"Successfully updated {os.path.basename(template_file)}")
                 return True
             else:
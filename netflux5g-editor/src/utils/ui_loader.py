@@ -0,0 +1,158 @@
+"""
+Precompiled UI loader for NetFlux5G Editor
+Compiles Qt Designer .ui files to Python modules once and builds widgets from the compiled code
+"""
+import io
+import os
+import re
+import sys
+import types
+import importlib.util
+import threading
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.debug import debug_print, error_print, warning_print
+
+UI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui", "ui")
+COMPILED_DIR = os.path.join(UI_DIR, "compiled")
+# Used when the source tree is read-only (system wide installs)
+FALLBACK_COMPILED_DIR = os.path.join(os.path.expanduser("~"), ".cache", "netflux5g", "ui")
+
+HEADER_PREFIX = "# netflux5g-ui "
+
+# Icon and pixmap paths in the .ui files are relative to the .ui file; the compiled
+# module resolves them against the ui directory instead of the working directory
+_PIXMAP_PATTERN = re.compile(r'QtGui\.QPixmap\("((?:[^"\\]|\\.)*)"\)')
+# Slot auto-connection is done by load_ui on request: PyQt looks up every attribute of
+# the widget while connecting, which would build the main window's lazy managers
+_CONNECT_SLOTS_PATTERN = re.compile(r'^\s*QtCore\.QMetaObject\.connectSlotsByName\(\w+\)\n', re.MULTILINE)
+
+_form_cache = {}
+_form_lock = threading.Lock()
+
+
+def _source_stamp(ui_file):
+    from PyQt5.QtCore import PYQT_VERSION_STR
+    stat = os.stat(ui_file)
+    return f"{HEADER_PREFIX}{stat.st_mtime_ns} {stat.st_size} {PYQT_VERSION_STR}"
+
+
+def compiled_path(ui_file, compiled_dir=COMPILED_DIR):
+    name = os.path.splitext(os.path.basename(ui_file))[0]
+    return os.path.join(compiled_dir, f"ui_{re.sub(r'[^0-9A-Za-z_]', '_', name)}.py")
+
+
+def _is_current(path, stamp):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.readline().rstrip('\n') == stamp
+    except OSError:
+        return False
+
+
+def _relocate_pixmaps(source):
+    def absolute(match):
+        path = match.group(1)
+        if path.startswith(':') or os.path.isabs(path):
+            return match.group(0)
+        return f'QtGui.QPixmap(os.path.join(_UI_DIR, "{path}"))'
+    return _PIXMAP_PATTERN.sub(absolute, source)
+
+
+def compile_ui(ui_file, compiled_dir=COMPILED_DIR, force=False):
+    """
+    Compile ui_file into compiled_dir unless an up-to-date module already exists.
+
+    Returns:
+        str: Path of the compiled module
+    """
+    from PyQt5 import uic
+    path = compiled_path(ui_file, compiled_dir)
+    stamp = _source_stamp(ui_file)
+    if not force and _is_current(path, stamp):
+        return path
+
+    buffer = io.StringIO()
+    with open(ui_file, 'r', encoding='utf-8') as f:
+        uic.compileUi(f, buffer)
+    source = (f"{stamp}\n"
+              "import os\n"
+              "_UI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))\n"
+              f"{_CONNECT_SLOTS_PATTERN.sub('', _relocate_pixmaps(buffer.getvalue()))}")
+
+    os.makedirs(compiled_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    debug_print(f"Compiled {os.path.basename(ui_file)} -> {path}")
+    return path
+
+
+def _compile_anywhere(ui_file):
+    try:
+        return compile_ui(ui_file)
+    except OSError:
+        return compile_ui(ui_file, FALLBACK_COMPILED_DIR)
+
+
+def load_form_class(ui_file):
+    """Return the generated Ui_* class for ui_file, compiling and importing it once per process."""
+    ui_file = os.path.abspath(ui_file)
+    with _form_lock:
+        form_class = _form_cache.get(ui_file)
+        if form_class is not None:
+            return form_class
+        path = _compile_anywhere(ui_file)
+        module_name = f"netflux5g_ui.{os.path.splitext(os.path.basename(path))[0]}"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        form_class = next(value for name, value in vars(module).items()
+                          if name.startswith('Ui_') and isinstance(value, type))
+        _form_cache[ui_file] = form_class
+        return form_class
+
+
+def load_ui(ui_file, widget, connect_slots=False):
+    """
+    Build the contents of ui_file into widget, like uic.loadUi(ui_file, widget).
+
+    The generated setupUi is run with the widget itself as the form object, so child
+    widgets and actions become attributes of widget exactly as with loadUi. The
+    editor connects its signals explicitly, so on_<object>_<signal> slots are only
+    connected with connect_slots=True. Falls back to uic.loadUi if the file cannot
+    be compiled.
+    """
+    try:
+        form_class = load_form_class(ui_file)
+    except Exception as e:
+        warning_print(f"WARNING: Using uic.loadUi for {os.path.basename(ui_file)}: {e}")
+        from PyQt5 import uic
+        return uic.loadUi(ui_file, widget)
+    widget.retranslateUi = types.MethodType(form_class.retranslateUi, widget)
+    form_class.setupUi(widget, widget)
+    if connect_slots:
+        from PyQt5.QtCore import QMetaObject
+        QMetaObject.connectSlotsByName(widget)
+    return widget
+
+
+def compile_all(ui_dir=UI_DIR, force=False):
+    """Precompile every .ui file in ui_dir; returns the number of files compiled or checked."""
+    count = 0
+    for name in sorted(os.listdir(ui_dir)):
+        if name.endswith('.ui'):
+            try:
+                compile_ui(os.path.join(ui_dir, name), force=force)
+                count += 1
+            except Exception as e:
+                error_print(f"Failed to compile {name}: {e}")
+    return count
+
+
+if __name__ == '__main__':
+    count = compile_all(force='--force' in sys.argv)
+    print(f"{count} UI files compiled into {COMPILED_DIR}")